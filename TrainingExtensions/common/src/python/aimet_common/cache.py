@@ -38,12 +38,20 @@
 """Cache Implementation"""
 import abc
 import contextlib
+import dataclasses
+import enum
 import functools
+import hashlib
 import os
 import pickle
-from typing import Any, Callable, Optional, Generic, TypeVar
+import shutil
+import tempfile
+import types
+from typing import Any, Callable, Dict, Optional, Generic, Type, TypeVar
 
-from aimet_common.utils import AimetLogger
+import numpy as np
+
+from aimet_common.utils import AimetLogger, Version_Info
 
 
 _logger = AimetLogger.get_area_logger(AimetLogger.LogAreas.Utils)
@@ -137,6 +145,110 @@ class _PickleSerializationProtocol(SerializationProtocolBase):
         raise CacheMiss
 
 
+_FINGERPRINT_HANDLERS: Dict[Type, Callable[[Any], Any]] = {}
+
+
+def register_fingerprint_handler(obj_type: Type, handler: Callable[[Any], Any]):
+    """
+    Register a function that converts objects of the given type into data that can be fingerprinted,
+    i.e. (nested tuples, lists and dicts of) primitive types, bytes and numpy arrays.
+
+    :param obj_type: Type of objects to convert. Subclasses are also converted by the handler.
+    :param handler: Function that converts an object of obj_type.
+    """
+    _FINGERPRINT_HANDLERS[obj_type] = handler
+
+
+def has_fingerprint_handler(obj: Any) -> bool:
+    """
+    Check if a handler is registered for the type of obj with register_fingerprint_handler.
+
+    :param obj: Object to check.
+    :return: True if obj is converted by a registered handler when fingerprinted.
+    """
+    return any(isinstance(obj, obj_type) for obj_type in _FINGERPRINT_HANDLERS)
+
+
+def _code_fingerprint(code: types.CodeType):
+    # Constants other than primitives and nested code objects (e.g. Ellipsis) are fingerprinted by their repr
+    consts = tuple(const if isinstance(const, (types.CodeType, type(None), bool, int, float, complex, str, bytes,
+                                               tuple, frozenset)) else repr(const)
+                   for const in code.co_consts)
+    return code.co_code, code.co_names, consts
+
+
+def _function_fingerprint(function: types.FunctionType):
+    # NOTE: Only the code of the function is fingerprinted, not the objects captured by its closure
+    return function.__module__, function.__qualname__, function.__code__
+
+
+register_fingerprint_handler(types.CodeType, _code_fingerprint)
+register_fingerprint_handler(types.FunctionType, _function_fingerprint)
+register_fingerprint_handler(types.MethodType, lambda method: method.__func__)
+
+
+def _update_fingerprint(hasher, obj: Any):
+    """
+    Feed the content of obj into hasher.
+
+    :param hasher: hashlib hash object.
+    :param obj: Object to fingerprint.
+    :raises: TypeError if obj contains an object that can't be fingerprinted.
+    """
+    # pylint: disable=too-many-branches
+    def update_tag(tag: str):
+        hasher.update(f"<{tag}>".encode())
+
+    if obj is None or isinstance(obj, (bool, int, float, complex, str, enum.Enum)):
+        update_tag(type(obj).__qualname__)
+        hasher.update(repr(obj).encode())
+    elif isinstance(obj, (bytes, bytearray)):
+        update_tag("bytes")
+        hasher.update(len(obj).to_bytes(8, "little"))
+        hasher.update(obj)
+    elif isinstance(obj, np.ndarray):
+        update_tag(f"ndarray:{obj.dtype.str}:{obj.shape}")
+        hasher.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, (tuple, list)):
+        update_tag(f"{type(obj).__qualname__}:{len(obj)}")
+        for item in obj:
+            _update_fingerprint(hasher, item)
+    elif isinstance(obj, dict):
+        update_tag(f"dict:{len(obj)}")
+        for key, value in obj.items():
+            _update_fingerprint(hasher, key)
+            _update_fingerprint(hasher, value)
+    elif isinstance(obj, (set, frozenset)):
+        # Sets are unordered; combine the fingerprints of the items in sorted order
+        update_tag(f"set:{len(obj)}")
+        for digest in sorted(get_fingerprint(item) for item in obj):
+            hasher.update(digest.encode())
+    elif dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        update_tag(type(obj).__qualname__)
+        _update_fingerprint(hasher, {field.name: getattr(obj, field.name) for field in dataclasses.fields(obj)})
+    else:
+        for obj_type, handler in _FINGERPRINT_HANDLERS.items():
+            if isinstance(obj, obj_type):
+                update_tag(type(obj).__qualname__)
+                _update_fingerprint(hasher, handler(obj))
+                return
+        raise TypeError(f"Can't fingerprint an object of type {type(obj)}.")
+
+
+def get_fingerprint(obj: Any) -> str:
+    """
+    Get a stable fingerprint of the content of obj.
+
+    :param obj: Object to fingerprint. Should consist of primitive types, bytes, numpy arrays, dataclasses,
+        tuples, lists, dicts, sets and objects of the types registered with register_fingerprint_handler.
+    :return: Hex digest of the content.
+    :raises: TypeError if obj contains an object that can't be fingerprinted.
+    """
+    hasher = hashlib.sha256()
+    _update_fingerprint(hasher, obj)
+    return hasher.hexdigest()
+
+
 class Cache:
     """
     Cache that performs return value caching.
@@ -162,8 +274,12 @@ class Cache:
 
     def __init__(self):
         self._cache_dir = None
+        self._max_size = None
 
-    def mark(self, cache_key: str, protocol: SerializationProtocolBase = None):
+    def mark(self,
+             cache_key: str,
+             protocol: SerializationProtocolBase = None,
+             fingerprint: Callable[..., Any] = None):
         """
         Mark functions that are subject to caching.
         The functions decorated with this mark will save/load the outputs
@@ -173,6 +289,10 @@ class Cache:
             caches the results of the decorated function.
         :param protocol: Serialization protocol for the return values of the function.
             By default, we use pickle serialization protocol.
+        :param fingerprint: Function that takes the same arguments as the decorated function
+            and returns the data the return value depends on (e.g. model weights and parameters).
+            If specified, the fingerprint of this data and the library version are appended to
+            the cache key, so that results computed from different inputs are cached separately.
         :return: A decorator that registers the decorated functions.
         """
         # Use pickle serialization by default.
@@ -187,28 +307,109 @@ class Cache:
 
                 working_dir = self._cache_dir
                 filename_prefix = cache_key
+                if fingerprint is not None:
+                    digest = get_fingerprint((Version_Info, cache_key, fingerprint(*args, **kwargs)))
+                    filename_prefix = f"{cache_key}-{digest}"
                 try:
                     # Try loading the previously evaluated result from cache.
-                    _logger.debug("Loading result of %s from %s.", cache_key, self._cache_dir)
-                    return protocol.load(working_dir, filename_prefix)
+                    _logger.debug("Loading result of %s from %s.", filename_prefix, self._cache_dir)
+                    ret = protocol.load(working_dir, filename_prefix)
+                    self._touch(filename_prefix)
+                    return ret
                 except CacheMiss:
                     _logger.debug("Cache miss.")
                     ret = fn(*args, **kwargs)
-                    _logger.debug("Caching result of %s to %s.", cache_key, self._cache_dir)
-                    protocol.save(ret, working_dir, filename_prefix)
+                    _logger.debug("Caching result of %s to %s.", filename_prefix, self._cache_dir)
+                    self._save(protocol, ret, filename_prefix)
                     return ret
             return caching_helper
 
         return lambda fn: _wrap(fn, cache_key)
 
+    def _save(self, protocol: SerializationProtocolBase, obj: Any, filename_prefix: str):
+        """
+        Save obj to the cache directory atomically, and evict least recently used entries
+        if the cache directory exceeds the size limit.
+
+        The object is first saved to a temporary directory and the saved files are moved into
+        the cache directory afterwards, so that an interrupted save never leaves partially
+        written files behind.
+
+        :param protocol: Serialization protocol.
+        :param obj: Object to save.
+        :param filename_prefix: File name prefix.
+        """
+        tmp_dir = tempfile.mkdtemp(prefix=".tmp-", dir=self._cache_dir)
+        try:
+            protocol.save(obj, tmp_dir, filename_prefix)
+            for name in os.listdir(tmp_dir):
+                dst = os.path.join(self._cache_dir, name)
+                if os.path.isdir(dst):
+                    shutil.rmtree(dst)
+                os.replace(os.path.join(tmp_dir, name), dst)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        if self._max_size is not None:
+            self._evict(exclude=filename_prefix)
+
+    def _get_entries(self) -> Dict[str, list]:
+        """
+        Group the files in the cache directory by the file name prefix.
+
+        :return: Dictionary which maps file name prefix to the list of paths.
+        """
+        entries = {}
+        for name in os.listdir(self._cache_dir):
+            if name.startswith(".tmp-"):
+                continue
+            entries.setdefault(name.split(".", 1)[0], []).append(os.path.join(self._cache_dir, name))
+        return entries
+
+    def _touch(self, filename_prefix: str):
+        """
+        Mark the entry as recently used.
+
+        :param filename_prefix: File name prefix of the entry.
+        """
+        for path in self._get_entries().get(filename_prefix, []):
+            os.utime(path)
+
+    def _evict(self, exclude: str):
+        """
+        Remove least recently used entries until the size of the cache directory is within the size limit.
+
+        :param exclude: File name prefix of the entry that should not be removed.
+        """
+        entries = self._get_entries()
+        sizes = {prefix: sum(_get_size(path) for path in paths) for prefix, paths in entries.items()}
+        total_size = sum(sizes.values())
+        last_used = {prefix: max(os.path.getmtime(path) for path in paths) for prefix, paths in entries.items()}
+
+        for prefix in sorted(entries, key=last_used.get):
+            if total_size <= self._max_size:
+                break
+            if prefix == exclude:
+                continue
+            _logger.debug("Evicting %s from %s.", prefix, self._cache_dir)
+            for path in entries[prefix]:
+                if os.path.isdir(path):
+                    shutil.rmtree(path)
+                else:
+                    os.remove(path)
+            total_size -= sizes[prefix]
+
     @contextlib.contextmanager
-    def enable(self, cache_dir: Optional[str]):
+    def enable(self, cache_dir: Optional[str], max_size: Optional[int] = None):
         """
         Enable caching.
 
         :param cache_dir: Directory to read/save the cached results from/to.
+        :param max_size: Maximum size of the cache directory in bytes. If exceeded,
+            least recently used entries are removed. If None, the size is not limited.
         """
         self._cache_dir = cache_dir
+        self._max_size = max_size
         try:
             if self._cache_dir is not None:
                 os.makedirs(self._cache_dir, exist_ok=True)
@@ -216,3 +417,17 @@ class Cache:
             yield
         finally:
             self._cache_dir = None
+            self._max_size = None
+
+
+def _get_size(path: str) -> int:
+    """
+    Get the size of a file, or the total size of the files in a directory.
+
+    :param path: Path to a file or a directory.
+    :return: Size in bytes.
+    """
+    if not os.path.isdir(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(root, name))
+               for root, _, names in os.walk(path) for name in names)
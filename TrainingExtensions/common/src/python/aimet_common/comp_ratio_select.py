@@ -41,9 +41,11 @@ import abc
 from decimal import Decimal
 from typing import Dict, List, Tuple, Any, Optional
 import math
+import multiprocessing
 import pickle
 import statistics
 import os
+import tempfile
 import aimet_common.libpymo as pymo
 
 from aimet_common.bokeh_plots import DataTable
@@ -52,7 +54,7 @@ from aimet_common.bokeh_plots import ProgressBar
 from aimet_common.utils import AimetLogger
 from aimet_common.curve_fit import MonotonicIncreasingCurveFit
 from aimet_common.defs import CostMetric, LayerCompRatioPair, GreedyCompressionRatioSelectionStats, \
-    TarCompressionRatioSelectionStats, LayerCompRatioEvalScore, EvalFunction
+    TarCompressionRatioSelectionStats, LayerCompRatioEvalScore, EvalFunction, ProgressiveEvalParameters
 from aimet_common.pruner import Pruner
 from aimet_common import cost_calculator as cc
 from aimet_common.layer_database import Layer, LayerDatabase
@@ -62,6 +64,166 @@ from aimet_common.comp_ratio_rounder import CompRatioRounder
 logger = AimetLogger.get_area_logger(AimetLogger.LogAreas.CompRatioSelect)
 
 
+class EvalScoreCache:
+    """
+    Memo of eval scores keyed by (layer name, compression ratio, eval config).
+    If a path is given, the scores are loaded from and saved to the file, so that they are reused across runs
+    """
+
+    def __init__(self, path: Optional[str] = None, eval_config: Tuple = ()):
+        """
+        :param path: Path to the pickle file of eval scores. If None, scores are only memoized in memory
+        :param eval_config: Everything besides the layer and compression ratio which affects the eval score,
+                e.g. pruning scheme, eval iterations and evaluation mode. Scores of other configs are kept in the file
+                but never returned
+        """
+        self._path = path
+        self._eval_config = eval_config
+        self._scores: Dict[Tuple[str, Decimal, Tuple], float] = {}
+        self._num_unsaved_scores = 0
+        # Only the process which created the cache writes to the file, not the forked eval workers
+        self._owner_pid = os.getpid()
+
+        if path and os.path.exists(path):
+            with open(path, 'rb') as f:
+                self._scores = pickle.load(f)
+            logger.info("Loaded %d cached eval scores from %s", len(self._scores), path)
+
+    def get(self, layer_name: str, comp_ratio: Decimal) -> Optional[float]:
+        """
+        :param layer_name: Name of the pruned layer
+        :param comp_ratio: Compression ratio of the pruned layer
+        :return: Cached eval score, or None if not cached
+        """
+        return self._scores.get((layer_name, comp_ratio, self._eval_config))
+
+    def add(self, layer_name: str, comp_ratio: Decimal, eval_score: float):
+        """
+        Adds an eval score to the cache. Call save() to write the added scores to file
+
+        :param layer_name: Name of the pruned layer
+        :param comp_ratio: Compression ratio of the pruned layer
+        :param eval_score: Eval score of the model with the layer pruned
+        """
+        self._scores[(layer_name, comp_ratio, self._eval_config)] = eval_score
+        self._num_unsaved_scores += 1
+
+    def save(self):
+        """
+        Saves the cache to file if a path is given and scores were added since the last save.
+        The file is replaced atomically, so an interrupted save never corrupts it
+        """
+        if not self._path or not self._num_unsaved_scores or os.getpid() != self._owner_pid:
+            return
+
+        _pickle_atomically(self._scores, self._path)
+        self._num_unsaved_scores = 0
+
+
+def _pickle_atomically(obj: Any, path: str):
+    """
+    Pickles the object to a temporary file next to path, and then renames it to path
+    """
+    dir_name = os.path.dirname(path)
+    if dir_name and not os.path.exists(dir_name):
+        os.makedirs(dir_name)
+
+    with tempfile.NamedTemporaryFile(dir=dir_name or '.', suffix='.tmp', delete=False) as f:
+        tmp_path = f.name
+    try:
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(obj, f)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+_MIN_PROGRESSIVE_EVAL_CHUNKS = 3
+
+
+def _get_eval_mode(progressive_eval_params: Optional[ProgressiveEvalParameters]) -> Tuple:
+    """
+    :return: Hashable description of how the eval scores are computed, full or progressive with the given parameters
+    """
+    if progressive_eval_params is None:
+        return ('full',)
+    return ('progressive', progressive_eval_params.threshold, progressive_eval_params.num_stages,
+            progressive_eval_params.confidence_factor, progressive_eval_params.initial_iterations)
+
+
+def _get_progressive_eval_schedule(eval_iterations: int, params: ProgressiveEvalParameters) -> List[int]:
+    """
+    :return: Number of iterations evaluated so far after each stage. Starting from params.initial_iterations,
+        the number doubles in each stage, and the last stage evaluates up to eval_iterations
+    """
+    num_stages = params.num_stages
+    if num_stages is None:
+        num_stages = max(1, (eval_iterations // params.initial_iterations).bit_length())
+
+    schedule = [params.initial_iterations * 2 ** stage for stage in range(num_stages - 1)]
+    schedule = [iterations for iterations in schedule if iterations < eval_iterations]
+    schedule.append(eval_iterations)
+    return schedule
+
+
+def evaluate_progressively(eval_func: EvalFunction, model: Any, eval_iterations: Optional[int], use_cuda: bool,
+                           params: ProgressiveEvalParameters) -> float:
+    """
+    Evaluates the model on a growing number of batches until the eval score is clearly below or above the threshold.
+
+    Each stage evaluates the next chunk of batches only, by calling
+    eval_func(model, chunk_size, use_cuda=use_cuda, start_iteration=num_evaluated_batches),
+    which is assumed to return the mean of per-batch scores over the chunk. The eval score is the mean over all the
+    evaluated batches, so a candidate evaluated in all the stages costs the same as a single full evaluation.
+    The standard error of the eval score is estimated from the spread of the chunk means.
+    At least three chunks are required before stopping, since the spread of two chunk means is too noisy an estimate.
+
+    :param eval_func: Eval function
+    :param model: Model to evaluate
+    :param eval_iterations: Number of iterations to evaluate on at most
+    :param use_cuda: If True, evaluate on GPU
+    :param params: Progressive evaluation parameters
+    :return: Eval score
+    """
+    if eval_iterations is None:
+        return eval_func(model, eval_iterations, use_cuda=use_cuda)
+
+    start_iteration = 0
+    chunk_sizes, chunk_scores = [], []
+
+    for iterations in _get_progressive_eval_schedule(eval_iterations, params):
+        chunk_size = iterations - start_iteration
+        chunk_sizes.append(chunk_size)
+        chunk_scores.append(eval_func(model, chunk_size, use_cuda=use_cuda, start_iteration=start_iteration))
+        start_iteration = iterations
+
+        eval_score = sum(size * score for size, score in zip(chunk_sizes, chunk_scores)) / iterations
+
+        if iterations == eval_iterations or len(chunk_sizes) < _MIN_PROGRESSIVE_EVAL_CHUNKS:
+            continue
+
+        # A chunk mean of n batches has a variance of per-batch variance / n
+        variance = sum(size * (score - eval_score) ** 2 for size, score in zip(chunk_sizes, chunk_scores)) / \
+            (len(chunk_sizes) - 1)
+        std_error = math.sqrt(variance / iterations)
+
+        if abs(eval_score - params.threshold) > params.confidence_factor * std_error:
+            logger.debug("Progressive evaluation: stopped after %d of %d iterations, eval_score=%f, std_error=%f",
+                         iterations, eval_iterations, eval_score, std_error)
+            break
+
+    return eval_score
+
+
+class _EvalScoresDict(dict):
+    """
+    Eval scores dictionary of {layer_name: {compression_ratio: eval_score}} tagged with the eval mode
+    the scores were computed in. Pickled dictionaries load as plain dictionaries for other readers
+    """
+    eval_mode = _get_eval_mode(None)
+
+
 class CompRatioSelectAlgo(metaclass=abc.ABCMeta):
     """
     Abstract interface for all compression-ratio selection algorithms
@@ -100,7 +262,8 @@ class GreedyCompRatioSelectAlgo(CompRatioSelectAlgo):
     def __init__(self, layer_db: LayerDatabase, pruner: Pruner, cost_calculator: cc.CostCalculator,
                  eval_func: EvalFunction, eval_iterations, cost_metric: CostMetric, target_comp_ratio: float,
                  num_candidates: int, use_monotonic_fit: bool, saved_eval_scores_dict: Optional[str],
-                 comp_ratio_rounding_algo: CompRatioRounder, use_cuda: bool, bokeh_session):
+                 comp_ratio_rounding_algo: CompRatioRounder, use_cuda: bool, bokeh_session, num_workers: int = 1,
+                 progressive_eval_params: Optional[ProgressiveEvalParameters] = None):
 
         # pylint: disable=too-many-arguments
         CompRatioSelectAlgo.__init__(self, layer_db, cost_calculator, cost_metric, comp_ratio_rounding_algo)
@@ -113,33 +276,36 @@ class GreedyCompRatioSelectAlgo(CompRatioSelectAlgo):
         self._saved_eval_scores_dict = saved_eval_scores_dict
         self._target_comp_ratio = target_comp_ratio
         self._use_monotonic_fit = use_monotonic_fit
+        self._num_workers = num_workers
+        self._progressive_eval_params = progressive_eval_params
 
-        if saved_eval_scores_dict:
-            self._comp_ratio_candidates = 0
-
-        else:
-            self._comp_ratio_candidates = []
-            for index in range(1, num_candidates):
-                self._comp_ratio_candidates.append((Decimal(1) / Decimal(num_candidates)) * index)
+        # Candidates are also needed with a saved eval scores dict to resume an interrupted sweep
+        self._comp_ratio_candidates = []
+        for index in range(1, num_candidates):
+            self._comp_ratio_candidates.append((Decimal(1) / Decimal(num_candidates)) * index)
 
     def _pickle_eval_scores_dict(self, eval_scores_dict):
 
-        if not os.path.exists('./data'):
-            os.makedirs('./data')
-
-        with open(self.PICKLE_FILE_EVAL_DICT, 'wb') as file:
-            pickle.dump(eval_scores_dict, file)
+        eval_scores_dict = _EvalScoresDict(eval_scores_dict)
+        eval_scores_dict.eval_mode = _get_eval_mode(self._progressive_eval_params)
+        _pickle_atomically(eval_scores_dict, self.PICKLE_FILE_EVAL_DICT)
 
         logger.info("Greedy selection: Saved eval dict to %s", self.PICKLE_FILE_EVAL_DICT)
 
-    @staticmethod
-    def _unpickle_eval_scores_dict(saved_eval_scores_dict_path: str):
+    def _unpickle_eval_scores_dict(self, saved_eval_scores_dict_path: str):
 
         with open(saved_eval_scores_dict_path, 'rb') as f:
             eval_dict = pickle.load(f)
 
+        # Dictionaries saved before eval modes were recorded only hold scores of full evaluation
+        saved_eval_mode = getattr(eval_dict, 'eval_mode', _get_eval_mode(None))
+        eval_mode = _get_eval_mode(self._progressive_eval_params)
+        if saved_eval_mode != eval_mode:
+            raise ValueError(f"Eval scores in {saved_eval_scores_dict_path} were computed with eval mode "
+                             f"{saved_eval_mode}, which doesn't match the current eval mode {eval_mode}")
+
         logger.info("Greedy selection: Read eval dict from %s", saved_eval_scores_dict_path)
-        return eval_dict
+        return dict(eval_dict)
 
     @staticmethod
     def _calculate_function_value_by_interpolation(comp_ratio: Decimal, layer_eval_score_dict: dict,
@@ -207,12 +373,19 @@ class GreedyCompRatioSelectAlgo(CompRatioSelectAlgo):
         if self._saved_eval_scores_dict:
             eval_scores_dict = self._unpickle_eval_scores_dict(self._saved_eval_scores_dict)
 
+            # A dict checkpointed by an interrupted sweep only has entries of the layers analyzed so far.
+            # Resume the sweep for the remaining layers
+            if any(layer.name not in eval_scores_dict for layer in self._layer_db.get_selected_layers()):
+                logger.info("Greedy selection: Resuming eval scores computation from %s",
+                            self._saved_eval_scores_dict)
+                eval_scores_dict = self._compute_eval_scores_for_all_comp_ratio_candidates(eval_scores_dict)
+
         else:
-            # Create the eval scores dictionary
+            # Create the eval scores dictionary.
+            # The dictionary is saved to file after each layer (in case the user wants to reuse
+            # the dictionary in the future, or resume an interrupted sweep)
             eval_scores_dict = self._compute_eval_scores_for_all_comp_ratio_candidates()
 
-            # save the dictionary to file (in case the user wants to reuse the dictionary in the future)
-            self._pickle_eval_scores_dict(eval_scores_dict)
         return eval_scores_dict
 
     def select_per_layer_comp_ratios(self):
@@ -365,15 +538,20 @@ class GreedyCompRatioSelectAlgo(CompRatioSelectAlgo):
 
         return min_score, max_score
 
-    def _compute_eval_scores_for_all_comp_ratio_candidates(self) -> Dict[str, Dict[Decimal, float]]:
+    def _compute_eval_scores_for_all_comp_ratio_candidates(self, eval_scores_dict: Dict = None) \
+            -> Dict[str, Dict[Decimal, float]]:
         """
         Creates and returns the eval scores dictionary
 
+        :param eval_scores_dict: Partially computed eval scores dictionary to resume from.
+                 Layers already in this dictionary are not analyzed again
         :return: Dictionary of {layer_name: {compression_ratio: eval_score}}  for all selected layers
                  and all compression-ratio candidates
         """
 
-        selected_layers = self._layer_db.get_selected_layers()
+        eval_scores_dict = dict(eval_scores_dict) if eval_scores_dict else {}
+        selected_layers = [layer for layer in self._layer_db.get_selected_layers()
+                           if layer.name not in eval_scores_dict]
 
         # inputs to initialize a TabularProgress object
         num_candidates = len(self._comp_ratio_candidates)
@@ -391,13 +569,27 @@ class GreedyCompRatioSelectAlgo(CompRatioSelectAlgo):
             data_table = None
             progress_bar = None
 
-        eval_scores_dict = {}
+        if self._num_workers > 1 and not self._is_cuda:
+            self._compute_eval_scores_in_parallel(selected_layers, eval_scores_dict, data_table, progress_bar)
+
+            # Layers are finished out of order in parallel. Restore the order of the layer database
+            layer_names = [layer.name for layer in self._layer_db.get_selected_layers()]
+            return dict(sorted(eval_scores_dict.items(),
+                               key=lambda item: layer_names.index(item[0]) if item[0] in layer_names else -1))
+
+        if self._num_workers > 1:
+            logger.warning("Greedy selection: Parallel evaluation is not supported with CUDA. "
+                           "Falling back to serial evaluation")
+
         for layer in selected_layers:
 
             layer_wise_eval_scores = self._compute_layerwise_eval_score_per_comp_ratio_candidate(data_table,
                                                                                                  progress_bar, layer)
             eval_scores_dict[layer.name] = layer_wise_eval_scores
 
+            # Checkpoint the scores so that an interrupted sweep can be resumed
+            self._pickle_eval_scores_dict(eval_scores_dict)
+
         return eval_scores_dict
 
     def _compute_layerwise_eval_score_per_comp_ratio_candidate(self, tabular_progress_object, progress_bar,
@@ -420,19 +612,9 @@ class GreedyCompRatioSelectAlgo(CompRatioSelectAlgo):
         for comp_ratio in self._comp_ratio_candidates:
             logger.info("Analyzing compression ratio: %s =====================>", comp_ratio)
 
-            # Prune layer given this comp ratio
-            pruned_layer_db = self._pruner.prune_model(self._layer_db,
-                                                       [LayerCompRatioPair(layer, comp_ratio)],
-                                                       self._cost_metric,
-                                                       trainer=None)
-
-            eval_score = self._eval_func(pruned_layer_db.model, self._eval_iter, use_cuda=self._is_cuda)
+            eval_score = self._compute_eval_score(layer, comp_ratio)
             layer_wise_eval_scores_dict[comp_ratio] = eval_score
 
-            # destroy the layer database
-            pruned_layer_db.destroy()
-            pruned_layer_db = None
-
             logger.info("Layer %s, comp_ratio %f ==> eval_score=%f", layer.name, comp_ratio,
                         eval_score)
 
@@ -449,6 +631,91 @@ class GreedyCompRatioSelectAlgo(CompRatioSelectAlgo):
 
         return layer_wise_eval_scores_dict
 
+    def _compute_eval_score(self, layer: Layer, comp_ratio: Decimal) -> float:
+        """
+        Prunes a given layer with a given compression-ratio and evaluates the pruned model
+        :param layer: Layer to prune
+        :param comp_ratio: Compression-ratio
+        :return: Eval score of the pruned model
+        """
+        # Prune layer given this comp ratio.
+        # If possible, prune an overlay of the layer database to avoid copying the whole model for each candidate
+        if getattr(self._pruner, 'supports_overlay', False) is True:
+            pruned_layer_db = self._pruner.prune_model(self._layer_db,
+                                                       [LayerCompRatioPair(layer, comp_ratio)],
+                                                       self._cost_metric,
+                                                       trainer=None,
+                                                       use_overlay=True)
+        else:
+            pruned_layer_db = self._pruner.prune_model(self._layer_db,
+                                                       [LayerCompRatioPair(layer, comp_ratio)],
+                                                       self._cost_metric,
+                                                       trainer=None)
+
+        try:
+            if self._progressive_eval_params is not None:
+                eval_score = evaluate_progressively(self._eval_func, pruned_layer_db.model, self._eval_iter,
+                                                    self._is_cuda, self._progressive_eval_params)
+            else:
+                eval_score = self._eval_func(pruned_layer_db.model, self._eval_iter, use_cuda=self._is_cuda)
+        finally:
+            # destroy the layer database. This also restores the original model if it was an overlay
+            pruned_layer_db.destroy()
+            pruned_layer_db = None
+
+        return eval_score
+
+    def _compute_eval_scores_in_parallel(self, layers: List[Layer], eval_scores_dict: Dict[str, Dict[Decimal, float]],
+                                         tabular_progress_object, progress_bar):
+        """
+        Computes eval scores for all (layer, compression-ratio) candidates using a pool of worker processes.
+        Workers are forked, so each of them evaluates on its own replica of the model without serializing it.
+        Eval scores of a layer are added to eval_scores_dict and checkpointed as soon as all its candidates
+        are evaluated
+
+        :param layers: Layers for which to calculate eval scores
+        :param eval_scores_dict: Dictionary of {layer_name: {compression_ratio: eval_score}} to update
+        """
+        pending_scores = {layer.name: {} for layer in layers}
+        tasks = [(layer.name, comp_ratio) for layer in layers for comp_ratio in self._comp_ratio_candidates]
+
+        context = multiprocessing.get_context('fork')
+        with context.Pool(self._num_workers, initializer=_init_eval_worker, initargs=(self,)) as pool:
+            for layer_name, comp_ratio, eval_score in pool.imap_unordered(_eval_worker_task, tasks):
+                logger.info("Layer %s, comp_ratio %f ==> eval_score=%f", layer_name, comp_ratio, eval_score)
+
+                layer_scores = pending_scores[layer_name]
+                layer_scores[comp_ratio] = eval_score
+
+                if self.bokeh_session:
+                    tabular_progress_object.update_table(str(comp_ratio), layer_name, eval_score)
+                    progress_bar.update()
+
+                if len(layer_scores) == len(self._comp_ratio_candidates):
+                    eval_scores_dict[layer_name] = {comp_ratio: layer_scores[comp_ratio]
+                                                    for comp_ratio in self._comp_ratio_candidates}
+                    del pending_scores[layer_name]
+
+                    # Checkpoint the scores so that an interrupted sweep can be resumed
+                    self._pickle_eval_scores_dict(eval_scores_dict)
+                    logger.info("Greedy selection: Finished analyzing layer %s", layer_name)
+
+
+# Greedy selection algorithm instance of the current worker process
+_worker_algo: Optional[GreedyCompRatioSelectAlgo] = None
+
+
+def _init_eval_worker(algo: GreedyCompRatioSelectAlgo):
+    global _worker_algo # pylint: disable=global-statement
+    _worker_algo = algo
+
+
+def _eval_worker_task(task: Tuple[str, Decimal]) -> Tuple[str, Decimal, float]:
+    layer_name, comp_ratio = task
+    layer = _worker_algo._layer_db.find_layer_by_name(layer_name) # pylint: disable=protected-access
+    eval_score = _worker_algo._compute_eval_score(layer, comp_ratio) # pylint: disable=protected-access
+    return layer_name, comp_ratio, eval_score
+
 
 class ManualCompRatioSelectAlgo(CompRatioSelectAlgo):
     """
@@ -479,7 +746,9 @@ class TarRankSelectAlgo(CompRatioSelectAlgo):
 
     def __init__(self, layer_db: LayerDatabase, pruner: Pruner, cost_calculator: cc.CostCalculator,
                  eval_func: EvalFunction, eval_iterations, cost_metric: CostMetric,
-                 num_rank_indices: int, use_cuda: bool, pymo_utils_lib):
+                 num_rank_indices: int, use_cuda: bool, pymo_utils_lib,
+                 progressive_eval_params: Optional[ProgressiveEvalParameters] = None,
+                 eval_scores_cache: Optional[str] = None):
 
         # pylint: disable=too-many-arguments
         CompRatioSelectAlgo.__init__(self, layer_db, cost_calculator, cost_metric,
@@ -492,6 +761,11 @@ class TarRankSelectAlgo(CompRatioSelectAlgo):
         self._num_rank_indices = num_rank_indices
         self._svd_lib_ref = pymo.GetSVDInstance()
         self._pymo_utils_lib = pymo_utils_lib
+        self._progressive_eval_params = progressive_eval_params
+
+        eval_config = (type(pruner).__name__, str(cost_metric), eval_iterations,
+                       _get_eval_mode(progressive_eval_params))
+        self._eval_scores_cache = EvalScoreCache(eval_scores_cache, eval_config)
 
     def _compute_compressed_model_cost(self, layer_ratio_list, original_model_cost):
         """
@@ -517,6 +791,39 @@ class TarRankSelectAlgo(CompRatioSelectAlgo):
 
         return model_compression_ratio
 
+    def _compute_eval_score(self, layer: Layer, comp_ratio: Decimal) -> float:
+        """
+        Prunes a given layer with a given compression-ratio and evaluates the pruned model
+        :param layer: Layer to prune
+        :param comp_ratio: Compression-ratio
+        :return: Eval score of the pruned model
+        """
+        eval_score = self._eval_scores_cache.get(layer.name, comp_ratio)
+        if eval_score is not None:
+            logger.info("Layer %s, comp_ratio %f ==> using cached eval_score", layer.name, comp_ratio)
+            return eval_score
+
+        pruned_layer_db = self._pruner.prune_model(self._layer_db,
+                                                   [LayerCompRatioPair(layer=layer,
+                                                                       comp_ratio=comp_ratio)],
+                                                   self._cost_metric,
+                                                   None)
+
+        try:
+            if self._progressive_eval_params is not None:
+                eval_score = evaluate_progressively(self._eval_func, pruned_layer_db.model, self._eval_iter,
+                                                    self._is_cuda, self._progressive_eval_params)
+            else:
+                eval_score = self._eval_func(pruned_layer_db.model, self._eval_iter, use_cuda=self._is_cuda)
+        finally:
+            # destroy the layer database
+            pruned_layer_db.destroy()
+            pruned_layer_db = None
+
+        self._eval_scores_cache.add(layer.name, comp_ratio, eval_score)
+
+        return eval_score
+
     def _compute_comp_ratios_and_eval_scores(self, rank_index):
         """
         :param rank_index: Rank index for which the comp ratio and
@@ -536,17 +843,7 @@ class TarRankSelectAlgo(CompRatioSelectAlgo):
             comp_ratio = self._cost_calculator.calculate_comp_ratio_given_rank(layer, rank[0], self._cost_metric)
 
             # Eval_score for this comp_ratio
-            pruned_layer_db = self._pruner.prune_model(self._layer_db,
-                                                       [LayerCompRatioPair(layer=layer,
-                                                                           comp_ratio=comp_ratio)],
-                                                       self._cost_metric,
-                                                       None)
-
-            eval_score = self._eval_func(pruned_layer_db.model, self._eval_iter, use_cuda=self._is_cuda)
-
-            # destroy the layer database
-            pruned_layer_db.destroy()
-            pruned_layer_db = None
+            eval_score = self._compute_eval_score(layer, comp_ratio)
 
             comp_ratio_eval_score_across_layers.append(LayerCompRatioEvalScore(layer, comp_ratio, eval_score))
             layer_ratio_list.append(LayerCompRatioPair(layer=layer, comp_ratio=comp_ratio))
@@ -580,6 +877,9 @@ class TarRankSelectAlgo(CompRatioSelectAlgo):
             layer_ratio_list, comp_ratio_eval_score_across_layers[rank_index] = \
                 self._compute_comp_ratios_and_eval_scores(rank_index)
 
+            # Save the scores of the rank index so that they can be reused by another run
+            self._eval_scores_cache.save()
+
             # --- Begin ---
             # Logic to pick a rank_index which maximizes both compression achieved and performance of the model.
 
@@ -188,14 +188,55 @@ class TarPerRankIndexData:
                                                                                     self.eval_score)
 
 
+class ProgressiveEvalParameters:
+    """
+    Configuration parameters for progressive evaluation of the compression-ratio candidates.
+    Each candidate is evaluated on a growing number of batches, and the evaluation stops as soon as the eval score
+    is clearly below or above the given threshold. Each stage only evaluates the batches not evaluated yet, so the
+    eval function must accept a 'start_iteration' keyword argument and return the mean of per-batch scores over
+    'iterations' batches starting from batch 'start_iteration', in the same batch order across calls.
+
+    :ivar threshold: Eval score around which candidates need to be evaluated precisely,
+            e.g. the lowest acceptable eval score of the compressed model
+    :ivar num_stages: Number of evaluation stages. The number of evaluated batches is doubled in each stage,
+            and the last stage evaluates up to all the eval iterations. By default, the stages double up to the eval
+            iterations, i.e. 1 + floor(log2(eval_iterations / initial_iterations)) stages
+    :ivar confidence_factor: Evaluation stops once the eval score is more than confidence_factor standard errors
+            away from the threshold. Default value=3.0
+    :ivar initial_iterations: Number of batches evaluated in the first stage. Default value=2
+    """
+
+    def __init__(self, threshold: float, num_stages: Optional[int] = None, confidence_factor: float = 3.0,
+                 initial_iterations: int = 2):
+
+        # Sanity check
+        if num_stages is not None and num_stages < 1:
+            raise ValueError("Error: num_stages={}. Need at least 1 stage for "
+                             "progressive evaluation".format(num_stages))
+        if initial_iterations < 1:
+            raise ValueError("Error: initial_iterations={}. Need at least 1 iteration in the first stage of "
+                             "progressive evaluation".format(initial_iterations))
+
+        self.threshold = threshold
+        self.num_stages = num_stages
+        self.confidence_factor = confidence_factor
+        self.initial_iterations = initial_iterations
+
+
 class TarRankSelectionParameters:
     """
     Configuration parameters for the TAR compression-ratio selection algorithm
 
     :ivar num_rank_indices: Number of rank indices for ratio selection.
+    :ivar progressive_eval_params: If given, the per-layer candidates are evaluated progressively
+    :ivar eval_scores_cache: Path to a pickle file of eval scores keyed by layer name, compression ratio and
+            evaluation settings (pruning scheme, cost metric, eval iterations and progressive evaluation parameters).
+            Scores found in the file are not evaluated again, and new scores are added to the file after each
+            rank index. Only reuse the file with the same model and eval function.
 
     """
-    def __init__(self, num_rank_indices: int):
+    def __init__(self, num_rank_indices: int, progressive_eval_params: Optional[ProgressiveEvalParameters] = None,
+                 eval_scores_cache: Optional[str] = None):
 
         # Sanity check
         if num_rank_indices < 2:
@@ -203,6 +244,8 @@ class TarRankSelectionParameters:
                              "TAR based compression-ratio selection".format(num_rank_indices))
 
         self.num_rank_indices = num_rank_indices
+        self.progressive_eval_params = progressive_eval_params
+        self.eval_scores_cache = eval_scores_cache
 
 
 EvalFunction = Callable[[Any, Optional[int], bool], float]
@@ -224,14 +267,24 @@ class GreedySelectionParameters:
             saved in a previous run. This is useful to speed-up experiments when trying
             different target compression-ratios for example. aimet will save eval_scores
             dictionary pickle file automatically in a ./data directory relative to the
-            current path. num_comp_ratio_candidates parameter will be ignored when this option is used.
+            current path. The dictionary is saved after each analyzed layer, so passing the dictionary
+            of an interrupted run resumes the analysis from the first layer missing in the dictionary.
+            num_comp_ratio_candidates parameter is only used for the missing layers when this option is used.
+            A dictionary is only reused with the same evaluation mode (full or progressive with the same
+            progressive_eval_params) it was computed with.
+    :ivar num_workers: Number of worker processes used to evaluate the comp-ratio candidates of the layers
+            in parallel. Each worker evaluates on its own (forked) replica of the model. Parallel evaluation is only
+            supported on CPU. By default, candidates are evaluated serially.
+    :ivar progressive_eval_params: If given, the comp-ratio candidates are evaluated progressively
     """
 
     def __init__(self,
                  target_comp_ratio: float,
                  num_comp_ratio_candidates: int = 10,
                  use_monotonic_fit: bool = False,
-                 saved_eval_scores_dict: Optional[str] = None):
+                 saved_eval_scores_dict: Optional[str] = None,
+                 num_workers: int = 1,
+                 progressive_eval_params: Optional[ProgressiveEvalParameters] = None):
 
         self.target_comp_ratio = target_comp_ratio
 
@@ -243,6 +296,8 @@ class GreedySelectionParameters:
         self.num_comp_ratio_candidates = num_comp_ratio_candidates
         self.use_monotonic_fit = use_monotonic_fit
         self.saved_eval_scores_dict = saved_eval_scores_dict
+        self.num_workers = num_workers
+        self.progressive_eval_params = progressive_eval_params
 
 
 class GreedyCompressionRatioSelectionStats:
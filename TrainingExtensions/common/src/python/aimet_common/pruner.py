@@ -51,8 +51,13 @@ class Pruner(abc.ABC):
     Models a ML Model Pruner
     """
 
+    # Pruners which replace layers with newly created modules, leaving the original modules untouched,
+    # can prune an overlay of the layer database instead of a full copy. Only set for pruners whose
+    # layer database provides overlay()
+    supports_overlay = False
+
     def prune_model(self, layer_db: LayerDatabase, layer_comp_ratio_list: List[LayerCompRatioPair],
-                    cost_metric: CostMetric, trainer) -> LayerDatabase:
+                    cost_metric: CostMetric, trainer, use_overlay: bool = False) -> LayerDatabase:
         """
         Prune a model given a list of layer-comp_ratio pairs
 
@@ -60,11 +65,18 @@ class Pruner(abc.ABC):
         :param layer_db: Layer database of the model to prune
         :param layer_comp_ratio_list: List of layer-comp_ratio pairs
         :param trainer: Used for
+        :param use_overlay: If True, prune a copy-on-write overlay of layer_db instead of a deep copy.
+            The model of layer_db is modified until the returned LayerDatabase is destroyed
         :return: Compressed copy of the LayerDatabase
         """
 
-        # Copy the db
-        comp_layer_db = copy.deepcopy(layer_db)
+        if use_overlay:
+            if not self.supports_overlay:
+                raise ValueError(f"{type(self).__name__} does not support pruning a layer database overlay")
+            comp_layer_db = layer_db.overlay()
+        else:
+            # Copy the db
+            comp_layer_db = copy.deepcopy(layer_db)
         for layer_comp_ratio in layer_comp_ratio_list:
 
             layer = comp_layer_db.find_layer_by_name(layer_comp_ratio.layer.name)
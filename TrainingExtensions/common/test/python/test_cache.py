@@ -41,8 +41,9 @@ import random
 from typing import Callable
 
 import numpy as np
+import pytest
 
-from aimet_common.cache import Cache, SerializationProtocolBase
+from aimet_common.cache import Cache, SerializationProtocolBase, get_fingerprint, has_fingerprint_handler
 
 
 SEED = 18452
@@ -109,3 +110,103 @@ def test_cache_numpy_array():
     def assert_equal(x, y):
         assert np.array_equal(x, y)
     _test_cache(lambda: np.random.randn(10, 10), assert_equal_fn=assert_equal)
+
+
+def test_cache_fingerprint():
+    cache_dir = "/tmp/test_dir"
+    if os.path.exists(cache_dir):
+        shutil.rmtree(cache_dir)
+
+    try:
+        cache = Cache()
+        call_count = 0
+
+        @cache.mark("test", fingerprint=lambda x, scale: (x, scale))
+        def _fn(x, scale):
+            nonlocal call_count
+            call_count += 1
+            return x * scale
+
+        x = np.random.randn(10, 10)
+        with cache.enable(cache_dir):
+            ret = _fn(x, 2)
+            assert np.array_equal(_fn(x.copy(), 2), ret)
+            assert call_count == 1
+
+            # Different inputs should not hit the cached result
+            assert np.array_equal(_fn(x, 3), x * 3)
+            assert call_count == 2
+            assert np.array_equal(_fn(x + 1, 2), (x + 1) * 2)
+            assert call_count == 3
+
+        assert len(os.listdir(cache_dir)) == 3
+        assert all(name.startswith("test-") and name.endswith(".pkl") for name in os.listdir(cache_dir))
+    finally:
+        if os.path.exists(cache_dir):
+            shutil.rmtree(cache_dir)
+
+
+def test_get_fingerprint():
+    x = np.random.randn(10, 10)
+    assert get_fingerprint(x) == get_fingerprint(x.copy())
+    assert get_fingerprint(x) != get_fingerprint(x.astype(np.float32))
+    assert get_fingerprint(x) != get_fingerprint(x.reshape(100))
+    assert get_fingerprint({"a": 1, "b": [1.0, None]}) == get_fingerprint({"a": 1, "b": [1.0, None]})
+    assert get_fingerprint((1, 2)) != get_fingerprint([1, 2])
+    assert get_fingerprint({1, 2, 3}) == get_fingerprint({3, 2, 1})
+
+    with pytest.raises(TypeError):
+        get_fingerprint(object())
+
+
+def test_get_function_fingerprint():
+    def make_fns():
+        return lambda x: x + 1, lambda x: x + 2
+
+    (add_one, add_two), (other_add_one, _) = make_fns(), make_fns()
+    assert has_fingerprint_handler(add_one)
+    assert not has_fingerprint_handler(object())
+    # Functions are fingerprinted by their code
+    assert get_fingerprint(add_one) == get_fingerprint(other_add_one)
+    assert get_fingerprint(add_one) != get_fingerprint(add_two)
+    assert get_fingerprint(test_get_fingerprint) != get_fingerprint(test_cache_max_size)
+
+
+def test_cache_max_size():
+    cache_dir = "/tmp/test_dir"
+    if os.path.exists(cache_dir):
+        shutil.rmtree(cache_dir)
+
+    try:
+        cache = Cache()
+        call_count = 0
+
+        @cache.mark("test", fingerprint=lambda i: i)
+        def _fn(i):
+            nonlocal call_count
+            call_count += 1
+            return np.full(1000, i, dtype=np.float64)
+
+        with cache.enable(cache_dir, max_size=20000):
+            _fn(0)
+            _fn(1)
+            # Mark the entry of 0 as recently used
+            _fn(0)
+            assert call_count == 2
+
+            # Entry of 1 is the least recently used, so it should be evicted
+            _fn(2)
+            assert call_count == 3
+            assert len(os.listdir(cache_dir)) == 2
+
+            _fn(0)
+            _fn(2)
+            assert call_count == 3
+            _fn(1)
+            assert call_count == 4
+
+        # No temporary files should be left behind
+        assert not any(name.startswith(".tmp-") for name in os.listdir(cache_dir))
+    finally:
+        if os.path.exists(cache_dir):
+            shutil.rmtree(cache_dir)
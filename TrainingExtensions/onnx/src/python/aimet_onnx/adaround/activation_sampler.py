@@ -37,7 +37,7 @@
 
 """ Sample output from original module for Adaround feature """
 
-from typing import Tuple, List, Dict, Union
+from typing import Tuple, List, Dict, Union, Optional
 
 import numpy as np
 import onnxruntime as ort
@@ -65,7 +65,7 @@ class ActivationSampler:
     """
     def __init__(self, orig_op: str, quant_op: str,
                  orig_model: ModelProto, quant_model: QuantizationSimModel, use_cuda: bool,
-                 device: int = 0, user_onnx_libs: List[str] = None):
+                 device: int = 0, user_onnx_libs: List[str] = None, session_pool: Optional['SessionPool'] = None):
         """
         :param orig_op: Single un quantized op from the original session
         :param quant_op: Corresponding quant op from the Quant sim session
@@ -74,20 +74,19 @@ class ActivationSampler:
         :param use_cuda: If we should use cuda
         :param device: CUDA device ID
         :param user_onnx_libs: List of paths to all compiled ONNX custom ops libraries
+        :param session_pool: Pool of sessions to reuse. If None, a new session is built for every sample.
         :return: Input data to quant op, Output data from original op
         """
         self._org_model = orig_model
-        self._use_cuda = use_cuda
+        self.providers = get_providers(use_cuda, device)
+        self._use_cuda = self.providers[0] != 'CPUExecutionProvider'
 
-        if 'CUDAExecutionProvider' not in ort.get_available_providers():
-            self._use_cuda = False
-        if self._use_cuda:
-            self.providers = [('CUDAExecutionProvider', {'device_id': device, 'cudnn_conv_algo_search': 'DEFAULT'}), 'CPUExecutionProvider']
-        else:
-            self.providers = ['CPUExecutionProvider']
+        orig_session = quant_session = None
+        if session_pool is not None:
+            orig_session, quant_session = session_pool.orig_session, session_pool.quant_session
 
-        self._orig_module_collector = ModuleData(orig_model, orig_op, self.providers, user_onnx_libs)
-        self._quant_module_collector = ModuleData(quant_model, quant_op, self.providers, user_onnx_libs)
+        self._orig_module_collector = ModuleData(orig_model, orig_op, self.providers, user_onnx_libs, orig_session)
+        self._quant_module_collector = ModuleData(quant_model, quant_op, self.providers, user_onnx_libs, quant_session)
 
     def sample_and_place_all_acts_on_cpu(self, dataset) -> Tuple:
         """
@@ -141,17 +140,20 @@ class ModuleData:
     Collect input and output data to and from module
     """
 
-    def __init__(self, model: ModelProto, node_name: str, providers: List, user_onnx_libs: List[str] = None):
+    def __init__(self, model: ModelProto, node_name: str, providers: List, user_onnx_libs: List[str] = None,
+                 session: Optional['ActivationSession'] = None):
         """
-        :param session: ONNX session
+        :param model: ONNX model
         :param node: Module reference
         :param providers: CPU/GPU execution providers
         :param user_onnx_libs: List of paths to all compiled ONNX custom ops libraries
+        :param session: Session which exposes node_name as an output. If None, a new session is built for every call.
         """
         self._model = model
         self._module_name = node_name
         self._providers = providers
         self._user_onnx_libs = user_onnx_libs
+        self._session = session
 
     def collect_inp_out_data(self, model_input: Dict[str, List[np.ndarray]],
                              collect_input: bool, collect_output: bool) -> Union[Tuple[None, List], Tuple[List, None]]:
@@ -164,13 +166,118 @@ class ModuleData:
         :return: Module's input and output data
         """
 
-        handle = add_hook_to_get_activation(self._model.model, self._module_name)
-        sess = QuantizationSimModel.build_session(self._model.model, self._providers, self._user_onnx_libs)
-        outputs = sess.run([self._module_name], model_input)
-        remove_activation_hooks(self._model.model, handle)
+        if self._session is not None:
+            outputs = self._session.run([self._module_name], model_input)
+        else:
+            handle = add_hook_to_get_activation(self._model.model, self._module_name)
+            sess = QuantizationSimModel.build_session(self._model.model, self._providers, self._user_onnx_libs)
+            outputs = sess.run([self._module_name], model_input)
+            remove_activation_hooks(self._model.model, handle)
 
         if collect_output:
             return None, outputs
         if collect_input:
             return outputs, None
         return None, None
+
+
+class ActivationSession:
+    """
+    Inference session which exposes the given intermediate activations as graph outputs.
+    The session is built once and reused across layers and batches. Weights that change after
+    the session is built can be overridden without rebuilding the session.
+    """
+
+    def __init__(self, model: onnx.ModelProto, activation_names: List[str], providers: List,
+                 user_onnx_libs: List[str] = None, weight_names: List[str] = ()):
+        """
+        :param model: ONNX model
+        :param activation_names: Names of the activations to expose as graph outputs
+        :param providers: CPU/GPU execution providers
+        :param user_onnx_libs: List of paths to all compiled ONNX custom ops libraries
+        :param weight_names: Names of the initializers that can be overridden with update_weight
+        """
+        graph_outputs = {output.name for output in model.graph.output}
+        activation_names = [name for name in dict.fromkeys(activation_names) if name not in graph_outputs]
+        handles = [add_hook_to_get_activation(model, name) for name in activation_names]
+
+        # Initializers that are also listed in graph inputs can be fed at runtime
+        graph_inputs = {inp.name for inp in model.graph.input}
+        weight_inputs = [onnx.helper.make_tensor_value_info(tensor.name, tensor.data_type, tensor.dims)
+                         for tensor in model.graph.initializer
+                         if tensor.name in set(weight_names) and tensor.name not in graph_inputs]
+        model.graph.input.extend(weight_inputs)
+
+        try:
+            self._session = QuantizationSimModel.build_session(model, providers, user_onnx_libs)
+        finally:
+            remove_activation_hooks(model, handles)
+            for weight_input in weight_inputs:
+                model.graph.input.remove(weight_input)
+
+        self._weights = {}
+
+    def update_weight(self, name: str, weight: np.ndarray):
+        """
+        Override the value of a weight in the subsequent runs.
+
+        :param name: Name of the weight
+        :param weight: New value of the weight
+        """
+        self._weights[name] = weight
+
+    def run(self, output_names: List[str], model_input: Dict[str, List[np.ndarray]]) -> List[np.ndarray]:
+        """
+        Run the session.
+
+        :param output_names: Names of the activations to fetch
+        :param model_input: Input to model
+        :return: Activations data
+        """
+        return self._session.run(output_names, {**model_input, **self._weights})
+
+
+class SessionPool:
+    """
+    Sessions of the original model and the QuantSim model shared by the activation samplers of all layers
+    """
+
+    def __init__(self, orig_model: ModelProto, quant_model: QuantizationSimModel,
+                 orig_activation_names: List[str], quant_activation_names: List[str], weight_names: List[str],
+                 use_cuda: bool, device: int = 0, user_onnx_libs: List[str] = None):
+        """
+        :param orig_model: The original, un quantized, model
+        :param quant_model: Model with quantization simulations ops
+        :param orig_activation_names: Names of the activations to collect from the original model
+        :param quant_activation_names: Names of the activations to collect from the QuantSim model
+        :param weight_names: Names of the weights of the QuantSim model that are updated during sampling
+        :param use_cuda: If we should use cuda
+        :param device: CUDA device ID
+        :param user_onnx_libs: List of paths to all compiled ONNX custom ops libraries
+        """
+        providers = get_providers(use_cuda, device)
+        self.orig_session = ActivationSession(orig_model.model, orig_activation_names, providers, user_onnx_libs)
+        self.quant_session = ActivationSession(quant_model.model, quant_activation_names, providers,
+                                               user_onnx_libs, weight_names)
+
+    def update_weight(self, name: str, weight: np.ndarray):
+        """
+        Update a weight of the QuantSim session.
+
+        :param name: Name of the weight
+        :param weight: New value of the weight
+        """
+        self.quant_session.update_weight(name, weight)
+
+
+def get_providers(use_cuda: bool, device: int = 0) -> List:
+    """
+    Get the execution providers
+
+    :param use_cuda: If we should use cuda
+    :param device: CUDA device ID
+    :return: CPU/GPU execution providers
+    """
+    if use_cuda and 'CUDAExecutionProvider' in ort.get_available_providers():
+        return [('CUDAExecutionProvider', {'device_id': device, 'cudnn_conv_algo_search': 'DEFAULT'}), 'CPUExecutionProvider']
+    return ['CPUExecutionProvider']
@@ -48,7 +48,7 @@ from packaging import version  # pylint: disable=wrong-import-order
 
 # Import AIMET specific modules
 from aimet_common.utils import AimetLogger
-from aimet_onnx.adaround.activation_sampler import ActivationSampler
+from aimet_onnx.adaround.activation_sampler import ActivationSampler, SessionPool
 from aimet_onnx.quantsim import QuantizationSimModel
 from aimet_onnx.adaround.utils import ModuleInfo, read_attributes_for_op
 from aimet_onnx.utils import create_input_dict
@@ -80,7 +80,8 @@ class AdaroundOptimizer:
                         orig_model: ModelProto, quant_model: QuantizationSimModel,
                         act_func: Union[torch.nn.Module, None], cached_dataset: Dataset,
                         opt_params: AdaroundHyperParameters, param_to_adaround_tensor_quantizer: Dict,
-                        use_cuda: bool, device: int = 0, user_onnx_libs: List[str] = None):
+                        use_cuda: bool, device: int = 0, user_onnx_libs: List[str] = None,
+                        session_pool: SessionPool = None):
         """
         Adaround module
 
@@ -96,12 +97,14 @@ class AdaroundOptimizer:
         :param use_cuda: If we should use cuda
         :param device: CUDA device ID
         :param user_onnx_libs: List of paths to all compiled ONNX custom ops libraries
+        :param session_pool: Pool of sessions shared by all modules. If None, sessions are built for every sample.
         """
         # pylint: disable=too-many-arguments
 
         # Optimize weight rounding
         cls._optimize_rounding(module, quantized_input_name, orig_model, quant_model, act_func, cached_dataset,
-                               opt_params, param_to_adaround_tensor_quantizer, use_cuda, device, user_onnx_libs)
+                               opt_params, param_to_adaround_tensor_quantizer, use_cuda, device, user_onnx_libs,
+                               session_pool)
 
         # After optimization, set the optimized layer's rounding mode to "Hard rounding"
         param_to_adaround_tensor_quantizer[module.params['weight'].name].use_soft_rounding = False
@@ -112,7 +115,8 @@ class AdaroundOptimizer:
                            orig_model: ModelProto, quant_model: QuantizationSimModel,
                            act_func: Union[None, str], cached_dataset: Dataset,
                            opt_params: AdaroundHyperParameters, param_to_adaround_tensor_quantizer: Dict,
-                           use_cuda: bool, device: int = 0, user_onnx_libs: List[str] = None):
+                           use_cuda: bool, device: int = 0, user_onnx_libs: List[str] = None,
+                           session_pool: SessionPool = None):
         """
         Optimizes the weight rounding of quantized wrapper module
         :param module: Original module
@@ -124,6 +128,7 @@ class AdaroundOptimizer:
         :param opt_params: Optimization parameters
         :param param_to_adaround_tensor_quantizer: Param name to adaround tensor quantizer dictionary
         :param user_onnx_libs: List of paths to all compiled ONNX custom ops libraries
+        :param session_pool: Pool of sessions shared by all modules
         """
         # pylint: disable=too-many-locals, too-many-arguments
         adaround_quantizer = param_to_adaround_tensor_quantizer[module.params['weight'].name]
@@ -146,7 +151,7 @@ class AdaroundOptimizer:
         # Check if we can cache intermediate activation data.
         model_inputs = cached_dataset[0]
         act_sampler = ActivationSampler(module.outputs[0], quantized_input_name, orig_model, quant_model,
-                                        use_cuda, device, user_onnx_libs)
+                                        use_cuda, device, user_onnx_libs, session_pool)
         inp_data, out_data = act_sampler.sample_acts(create_input_dict(orig_model.model, model_inputs))
         inp_data_torch, out_data_torch = torch.from_numpy(inp_data[0]), torch.from_numpy(out_data[0])
         use_cache_acts_data = TorchAdaroundOptimizer._can_cache_acts_data(len(cached_dataset), inp_data_torch.shape,
@@ -203,10 +208,11 @@ class AdaroundOptimizer:
                              iteration, float(total_loss), float(recon_loss), float(round_loss))
 
         adaround_quantizer.use_soft_rounding = True
-        adarounded_weights = adaround_quantizer.adaround_weights(weights)
-        weights = adarounded_weights.detach().cpu().numpy().tobytes()
+        adarounded_weights = adaround_quantizer.adaround_weights(weights).detach().cpu().numpy()
         weight_name = module.params['weight'].name
-        update_sim_weight(quant_model, weights, weight_name)
+        update_sim_weight(quant_model, adarounded_weights.tobytes(), weight_name)
+        if session_pool is not None:
+            session_pool.update_weight(weight_name, adarounded_weights)
 
     @classmethod
     def _compute_recons_metrics(cls, quant_module: ModuleInfo, act_func: Union[None, str], inp_data: torch.Tensor,
@@ -56,6 +56,7 @@ from aimet_onnx.quantsim import QuantizationSimModel
 from aimet_onnx.qc_quantize_op import OpMode
 from aimet_onnx.meta.utils import get_module_act_func_pair, get_ordered_ops
 from aimet_onnx import utils
+from aimet_onnx.adaround.activation_sampler import SessionPool
 from aimet_onnx.adaround.adaround_optimizer import AdaroundOptimizer
 from aimet_onnx.adaround.utils import ModelData
 
@@ -242,6 +243,16 @@ class Adaround:
             quantized_layer_to_input_tensor_name = Adaround._get_quantized_layer_input_tensor_name(quant_sim)
             # AdaRound must be applied to modules in the order of occurrence
             modules = get_ordered_ops(model)
+
+            # Build the sessions exposing the activations of all modules only once and reuse them for all modules
+            adaround_module_names = [module.name for module in modules if module.type in AdaroundSupportedModules]
+            session_pool = SessionPool(model, quant_sim.model,
+                                       [model_data.module_to_info[name].outputs[0] for name in adaround_module_names],
+                                       [quantized_layer_to_input_tensor_name[name] for name in adaround_module_names],
+                                       [model_data.module_to_info[name].params['weight'].name
+                                        for name in adaround_module_names],
+                                       use_cuda, device, user_onnx_libs)
+
             for module in tqdm(modules):
                 if module.type in AdaroundSupportedModules:
                     name = module.name
@@ -252,7 +263,7 @@ class Adaround:
                     AdaroundOptimizer.adaround_module(model_data.module_to_info[name], quantized_input_name,
                                                       model, quant_sim.model, act_func,
                                                       cached_dataset, opt_params, param_to_tensor_quantizer_dict,
-                                                      use_cuda, device, user_onnx_libs)
+                                                      use_cuda, device, user_onnx_libs, session_pool)
 
         finally:
             if os.path.exists(WORKING_DIR):
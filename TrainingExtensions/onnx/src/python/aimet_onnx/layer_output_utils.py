@@ -38,7 +38,7 @@
 """ This module contains utilities to capture and save intermediate layer-outputs of a model """
 
 import copy
-from typing import List, Dict, Tuple, Union
+from typing import List, Dict, Tuple, Union, Optional
 import re
 import numpy as np
 import onnxruntime as ort
@@ -64,15 +64,20 @@ logger = AimetLogger.get_area_logger(AimetLogger.LogAreas.LayerOutputs)
 class LayerOutputUtil:
     """ Implementation to capture and save outputs of intermediate layers of a model (fp32/quantsim) """
 
-    def __init__(self, model: ModelProto, dir_path: str, device: int = 0):
+    def __init__(self, model: ModelProto, dir_path: str, device: int = 0,
+                 layer_output_names: Optional[List[str]] = None, chunk_size: Optional[int] = None):
         """
         Constructor - It initializes the utility classes that captures and saves layer-outputs
 
         :param model: ONNX model
         :param dir_path: Directory wherein layer-outputs will be saved
         :param device: CUDA device-id to be used
+        :param layer_output_names: Names of the layer-outputs to save. If None, outputs of all the layers are saved.
+        :param chunk_size: If given, input batches are split into chunks of this many input instances which are run and
+            saved one at a time.
         """
         self.model = model
+        self.chunk_size = chunk_size
 
         # Fetch appropriate execution providers depending on availability
         providers = ['CPUExecutionProvider']
@@ -80,7 +85,8 @@ class LayerOutputUtil:
             providers = [('CUDAExecutionProvider', {'device_id': device}), 'CPUExecutionProvider']
 
         # Utility to capture layer-outputs
-        self.layer_output = LayerOutput(model=model, providers=providers, dir_path=dir_path)
+        self.layer_output = LayerOutput(model=model, providers=providers, dir_path=dir_path,
+                                        layer_output_names=layer_output_names)
 
         # Utility to save model inputs and their corresponding layer-outputs
         self.save_input_output = SaveInputOutput(dir_path, 'NCHW')
@@ -94,25 +100,46 @@ class LayerOutputUtil:
         """
         logger.info("Generating layer-outputs for %d input instances", len(input_batch))
 
-        input_dict = create_input_dict(self.model, input_batch)
+        for input_chunk in self._split_input_batch(input_batch):
+            input_dict = create_input_dict(self.model, input_chunk)
 
-        layer_output_dict = self.layer_output.get_outputs(input_dict)
-        self.save_input_output.save(input_batch, layer_output_dict)
+            layer_output_dict = self.layer_output.get_outputs(input_dict)
+            self.save_input_output.save(input_chunk, layer_output_dict)
 
         logger.info('Layer-outputs generated for %d input instances', len(input_batch))
 
+    def _split_input_batch(self, input_batch: Union[np.ndarray, List[np.ndarray], Tuple[np.ndarray]]) -> \
+            List[Union[np.ndarray, List[np.ndarray], Tuple[np.ndarray]]]:
+        """
+        Splits the input batch into chunks of chunk_size input instances
+
+        :param input_batch: input batch
+        :return: list of input chunks
+        """
+        if self.chunk_size is None:
+            return [input_batch]
+
+        if isinstance(input_batch, np.ndarray):
+            return [input_batch[i:i + self.chunk_size] for i in range(0, len(input_batch), self.chunk_size)]
+
+        return [type(input_batch)(x[i:i + self.chunk_size] for x in input_batch)
+                for i in range(0, len(input_batch[0]), self.chunk_size)]
+
 
 class LayerOutput:
     """
     This class creates a layer-output name to layer-output dictionary.
     """
-    def __init__(self, model: ModelProto, providers: List, dir_path: str):
+    def __init__(self, model: ModelProto, providers: List, dir_path: str,
+                 layer_output_names: Optional[List[str]] = None):
         """
         Constructor - It initializes few lists that are required for capturing and naming layer-outputs.
 
         :param model: ONNX model
         :param providers: execution providers to execute onnxruntime
         :param dir_path: directory to store topological order of layer-output names
+        :param layer_output_names: Names of the layer-outputs to capture. If None, outputs of all the layers are
+            captured.
         """
         self.model = copy.deepcopy(model)
         self.activation_names = LayerOutput.get_activation_names(self.model)
@@ -121,13 +148,22 @@ class LayerOutput:
         if quantized_activation_names:
             self.activation_names = quantized_activation_names
 
+        # Replace special characters with underscore. This gives valid file names to store activation tensors.
+        self.sanitized_activation_names = [re.sub(r'\W+', "_", name.replace('_updated', '')) for name in self.activation_names]
+
+        # Only fetch the requested layer-outputs from the session
+        if layer_output_names is not None:
+            missing_layer_output_names = set(layer_output_names) - set(self.sanitized_activation_names)
+            if missing_layer_output_names:
+                raise ValueError(f"Layer-outputs {sorted(missing_layer_output_names)} not found in the model")
+            indices = [idx for idx, name in enumerate(self.sanitized_activation_names) if name in layer_output_names]
+            self.activation_names = [self.activation_names[idx] for idx in indices]
+            self.sanitized_activation_names = [self.sanitized_activation_names[idx] for idx in indices]
+
         LayerOutput.register_activations(self.model, self.activation_names)
 
         self.session = QuantizationSimModel.build_session(self.model, providers)
 
-        # Replace special characters with underscore. This gives valid file names to store activation tensors.
-        self.sanitized_activation_names = [re.sub(r'\W+', "_", name.replace('_updated', '')) for name in self.activation_names]
-
         # Save activation names which are in topological order of model graph. This order can be used while comparing layer-outputs.
         save_layer_output_names(self.sanitized_activation_names, dir_path)
 
@@ -37,10 +37,15 @@
 
 """ Unit tests for Adaround Activation Sampler """
 
+import copy
 import numpy as np
+from onnx import numpy_helper
 
-from models.models_for_tests import simple_relu_model
-from aimet_onnx.adaround.activation_sampler import ActivationSampler
+from models.models_for_tests import simple_relu_model, single_residual_model
+from aimet_onnx.adaround.activation_sampler import ActivationSampler, SessionPool
+from aimet_onnx.adaround.adaround_optimizer import update_sim_weight
+from aimet_onnx.adaround.adaround_weight import Adaround
+from aimet_onnx.adaround.utils import ModelData
 from aimet_onnx.quantsim import QuantizationSimModel
 from aimet_onnx.utils import CachedDataset
 
@@ -61,6 +66,50 @@ class TestAdaroundActivationSampler:
         assert np.allclose(all_out_data, all_inp_data, atol=1e-5)
         assert all_inp_data[0].shape == (1, 3, 32, 32)
 
+    def test_activation_sampler_with_session_pool(self):
+        """ Test ActivationSampler reusing the sessions of SessionPool """
+        np.random.seed(0)
+        model = single_residual_model()
+        model_data = ModelData(model.model)
+        sim = QuantizationSimModel(copy.deepcopy(model))
+        quantized_input_names = Adaround._get_quantized_layer_input_tensor_name(sim)
+        conv1_info, conv2_info = model_data.module_to_info['/conv1/Conv'], model_data.module_to_info['/conv2/Conv']
+        conv1_weight_name = conv1_info.params['weight'].name
+
+        session_pool = SessionPool(model, sim.model,
+                                   [conv1_info.outputs[0], conv2_info.outputs[0]],
+                                   [quantized_input_names['/conv1/Conv'], quantized_input_names['/conv2/Conv']],
+                                   [conv1_weight_name], False)
+        num_outputs = len(model.model.graph.output)
+
+        data_loader = dataloader()
+        cached_dataset = CachedDataset(data_loader, 1, './')
+
+        def sample(session_pool):
+            activation_sampler = ActivationSampler(conv2_info.outputs[0], quantized_input_names['/conv2/Conv'],
+                                                   model, sim.model, False, session_pool=session_pool)
+            return activation_sampler.sample_and_place_all_acts_on_cpu(cached_dataset)
+
+        all_inp_data, all_out_data = sample(session_pool)
+        expected_inp_data, expected_out_data = sample(None)
+        assert np.allclose(all_inp_data, expected_inp_data)
+        assert np.allclose(all_out_data, expected_out_data)
+
+        # Model graph should be left unchanged
+        assert len(model.model.graph.output) == num_outputs
+
+        # Updated weights should be reflected without rebuilding the sessions
+        for tensor in sim.model.model.graph.initializer:
+            if tensor.name == conv1_weight_name:
+                new_weight = numpy_helper.to_array(tensor) * 2
+        update_sim_weight(sim.model, new_weight.tobytes(), conv1_weight_name)
+        session_pool.update_weight(conv1_weight_name, new_weight)
+
+        all_inp_data, _ = sample(session_pool)
+        new_expected_inp_data, _ = sample(None)
+        assert np.allclose(all_inp_data, new_expected_inp_data)
+        assert not np.allclose(all_inp_data, expected_inp_data)
+
 def dataloader():
     class DataLoader:
         """
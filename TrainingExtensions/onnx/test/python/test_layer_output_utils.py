@@ -38,6 +38,7 @@
 import os
 import shutil
 
+import pytest
 import torch
 import numpy as np
 import onnxruntime as ort
@@ -135,6 +136,32 @@ class TestLayerOutput:
         shutil.rmtree(temp_dir_path, ignore_errors=False, onerror=None)
         pass
 
+    def test_get_selected_layer_outputs(self):
+        """ Test whether only the requested layer-outputs are fetched """
+
+        # Get original model artifacts
+        model, output_names, input_dict = get_original_model_artifacts()
+
+        temp_dir_path = os.path.dirname(os.path.abspath(__file__))
+        temp_dir_path = os.path.join(temp_dir_path, 'temp_dir')
+
+        # Obtain a subset of layer-outputs of original model
+        selected_output_names = [output_names[1], 'output']
+        layer_output = LayerOutput(model, providers, temp_dir_path, layer_output_names=selected_output_names)
+        output_name_to_output_val_dict = layer_output.get_outputs(input_dict)
+        assert list(output_name_to_output_val_dict) == selected_output_names
+
+        all_outputs = LayerOutput(model, providers, temp_dir_path).get_outputs(input_dict)
+        for name in selected_output_names:
+            assert np.array_equal(all_outputs[name], output_name_to_output_val_dict[name])
+
+        # Unknown layer-output names are rejected
+        with pytest.raises(ValueError):
+            LayerOutput(model, providers, temp_dir_path, layer_output_names=['not_a_layer_output'])
+
+        # Delete temp_dir
+        shutil.rmtree(temp_dir_path, ignore_errors=False, onerror=None)
+
 
 def get_dataset_artifacts():
     class DummyDataset(Dataset):
@@ -196,3 +223,34 @@ class TestLayerOutputUtil:
 
         # Delete temp_dir
         shutil.rmtree(temp_dir_path, ignore_errors=False, onerror=None)
+
+    def test_generate_layer_outputs_in_chunks(self):
+        """ Test whether chunked input batches generate the same files as whole input batches """
+
+        # Get original model artifacts
+        model, output_names, _ = get_original_model_artifacts()
+
+        # Get dataset artifacts
+        dummy_dataset, _, data_count = get_dataset_artifacts()
+        input_batch = next(iter(DataLoader(dummy_dataset, batch_size=data_count))).numpy()
+
+        temp_dir_path = os.path.dirname(os.path.abspath(__file__))
+        temp_dir_path = os.path.join(temp_dir_path, 'temp_dir')
+        dir_paths = [os.path.join(temp_dir_path, 'whole'), os.path.join(temp_dir_path, 'chunked')]
+
+        # Generate layer-outputs of the whole input batch, and in chunks of one input instance
+        LayerOutputUtil(model=model, dir_path=dir_paths[0]).generate_layer_outputs(input_batch)
+        LayerOutputUtil(model=model, dir_path=dir_paths[1], chunk_size=1).generate_layer_outputs(input_batch)
+
+        # Verify that the saved inputs and layer-outputs are identical
+        assert data_count == len(os.listdir(os.path.join(dir_paths[1], 'inputs')))
+        assert data_count == len(os.listdir(os.path.join(dir_paths[1], 'outputs')))
+        for idx in range(data_count):
+            for name in output_names:
+                file_name = os.path.join('outputs', f'layer_outputs_{idx}', f'{name}.raw')
+                whole = np.fromfile(os.path.join(dir_paths[0], file_name), dtype=np.float32)
+                chunked = np.fromfile(os.path.join(dir_paths[1], file_name), dtype=np.float32)
+                assert np.allclose(whole, chunked, atol=1e-6)
+
+        # Delete temp_dir
+        shutil.rmtree(temp_dir_path, ignore_errors=False, onerror=None)
@@ -95,7 +95,10 @@ class CompressionFactory:
                                                                greedy_params.use_monotonic_fit,
                                                                greedy_params.saved_eval_scores_dict,
                                                                comp_ratio_rounding_algo, use_cuda,
-                                                               bokeh_session=bokeh_session)
+                                                               bokeh_session=bokeh_session,
+                                                               num_workers=greedy_params.num_workers,
+                                                               progressive_eval_params=
+                                                               greedy_params.progressive_eval_params)
             layer_selector = ConvNoDepthwiseLayerSelector()
             modules_to_ignore = params.mode_params.modules_to_ignore
 
@@ -0,0 +1,122 @@
+# -*- mode: python -*-
+# =============================================================================
+#  @@-COPYRIGHT-START-@@
+#
+#  Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright notice,
+#     this list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright notice,
+#     this list of conditions and the following disclaimer in the documentation
+#     and/or other materials provided with the distribution.
+#
+#  3. Neither the name of the copyright holder nor the names of its contributors
+#     may be used to endorse or promote products derived from this software
+#     without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+#  SPDX-License-Identifier: BSD-3-Clause
+#
+#  @@-COPYRIGHT-END-@@
+# =============================================================================
+"""
+Micro-benchmarks of quantization backends on typical conv and linear shapes.
+
+Usage::
+
+    python TrainingExtensions/torch/benchmarks/v2/benchmark_backends.py [--device cuda] [--iterations 50] [--backward]
+"""
+import argparse
+import time
+import torch
+from aimet_torch.v2.quantization.affine.backends import torch_builtins, fused
+
+
+# (name, input shape, encoding shape, block size)
+BENCHMARK_CASES = [
+    ('conv act per-tensor', (32, 64, 56, 56), (), None),
+    ('conv act per-tensor', (32, 256, 14, 14), (), None),
+    ('conv weight per-channel', (256, 256, 3, 3), (256, 1, 1, 1), None),
+    ('linear act per-tensor', (8, 512, 4096), (), None),
+    ('linear weight per-channel', (4096, 4096), (4096, 1), None),
+    ('linear weight block-wise', (4096, 4096), (4096, 32), [1, 128]),
+]
+
+BACKENDS = {
+    'torch_builtins': torch_builtins,
+    'fused': fused,
+}
+
+
+def _synchronize(device: torch.device):
+    if device.type == 'cuda':
+        torch.cuda.synchronize(device)
+
+
+def _benchmark(fn, device: torch.device, iterations: int, warmup: int = 3) -> float:
+    """
+    Returns average latency of fn in milliseconds
+    """
+    for _ in range(warmup):
+        fn()
+    _synchronize(device)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    _synchronize(device)
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+def run_benchmarks(device: torch.device, iterations: int, backward: bool):
+    """
+    Run quantize-dequantize benchmarks for all backends and print the results
+
+    :param device: Device to run benchmarks on
+    :param iterations: Number of iterations per measurement
+    :param backward: If True, measure forward + backward instead of forward only
+    """
+    header = f"{'case':<28}{'input shape':<24}" + "".join(f"{name:>18}" for name in BACKENDS) + f"{'speedup':>10}"
+    print(header)
+    print('-' * len(header))
+
+    for name, input_shape, encoding_shape, block_size in BENCHMARK_CASES:
+        tensor = torch.randn(input_shape, device=device, requires_grad=backward)
+        scale = torch.full(encoding_shape, 0.02, device=device, requires_grad=backward)
+        offset = torch.full(encoding_shape, -128., device=device, requires_grad=backward)
+        grad = torch.randn(input_shape, device=device)
+
+        latencies = []
+        for backend in BACKENDS.values():
+            def fn(backend=backend):
+                with torch.set_grad_enabled(backward):
+                    out = backend.quantize_dequantize(tensor, scale, offset, 0, 255, block_size)
+                if backward:
+                    out.backward(grad)
+            latencies.append(_benchmark(fn, device, iterations))
+
+        row = f"{name:<28}{str(list(input_shape)):<24}" + "".join(f"{t:>15.3f} ms" for t in latencies)
+        print(row + f"{latencies[0] / latencies[-1]:>9.2f}x")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--device', default='cpu')
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--backward', action='store_true')
+    args = parser.parse_args()
+    run_benchmarks(torch.device(args.device), args.iterations, args.backward)
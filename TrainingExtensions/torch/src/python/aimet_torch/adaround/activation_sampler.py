@@ -36,16 +36,22 @@
 # =============================================================================
 
 """ Sample input to quantized wrapper module and output from original module for Adaround feature """
-from typing import Tuple, Union, List, Callable, Any, Dict, Type, Optional
+from typing import Tuple, Union, List, Callable, Any, Dict, Type, Optional, Iterable
+import contextlib
+import functools
+import os
 import torch
+import torch.fx
 from torch.utils.data import Dataset
 
 # Import AIMET specific modules
 from aimet_common.utils import AimetLogger
 from aimet_torch.utils import CachedDataset, ModuleData, get_named_module, cache_intermediate_datasets,\
-    change_tensor_device_placement, in_eval_mode, save_to_cache, get_ordered_list_of_modules
+    change_tensor_device_placement, in_eval_mode, save_to_cache, get_ordered_list_of_modules, get_device
 from aimet_torch.qc_quantize_op import QcQuantizeWrapper
+from aimet_torch.tensor_store import TensorStore
 from aimet_torch.quantsim import QuantizationSimModel
+from aimet_torch.adaround.adaround_wrapper import AdaroundWrapperBase
 
 logger = AimetLogger.get_area_logger(AimetLogger.LogAreas.Quant)
 
@@ -141,32 +147,38 @@ def get_block_outputs(fp_block: torch.nn.ModuleList, quant_block: torch.nn.Modul
 
     fp_iterator = iter(cached_fp_dataset)
     quant_iterator = iter(cached_quant_dataset)
-    for idx in range(len(cached_fp_dataset)): # pylint: disable=consider-using-enumerate
-        fp_inputs = change_tensor_device_placement(next(fp_iterator), device)
-        quant_inputs = change_tensor_device_placement(next(quant_iterator), device)
-
-        with in_eval_mode(fp_block), in_eval_mode(quant_block), torch.no_grad():
-            fp_outputs = forward_fn(fp_block, fp_inputs)
-            fp_outputs = fp_outputs[0].cpu() if isinstance(fp_outputs, (tuple, list)) else fp_outputs.cpu()
-            quant_outputs = forward_fn(quant_block, quant_inputs)
-            quant_outputs = quant_outputs[0].cpu() if isinstance(quant_outputs, (tuple, list)) else quant_outputs.cpu()
-
-            # Check if the next ModuleList needs static inputs or not and assign
-            # the outputs (fp32/quant) from current block to be the input (fp32/quant) of next block
-            if include_static_inputs == "True":
-                fp_inputs[0], quant_inputs[0] = fp_outputs, quant_outputs
-            else:
-                fp_inputs, quant_inputs = [fp_outputs], [quant_outputs]
-
-            # Cache the outputs on CPU or disk
-            if cache_on_cpu:
-                cached_fp_dataset[idx] = fp_inputs
-                cached_quant_dataset[idx] = quant_inputs
-            else:
-                fp32_cache_path = working_dir + 'fp32/'
-                quant_cache_path = working_dir + 'quant/'
-                save_to_cache(fp_inputs, fp32_cache_path, idx)
-                save_to_cache(quant_inputs, quant_cache_path, idx)
+    with contextlib.ExitStack() as stack:
+        if not cache_on_cpu:
+            # Write the index of each tensor store once per block instead of once per batch
+            stack.enter_context(TensorStore.open(working_dir + 'fp32/').batch_writes())
+            stack.enter_context(TensorStore.open(working_dir + 'quant/').batch_writes())
+        for idx in range(len(cached_fp_dataset)): # pylint: disable=consider-using-enumerate
+            fp_inputs = change_tensor_device_placement(next(fp_iterator), device)
+            quant_inputs = change_tensor_device_placement(next(quant_iterator), device)
+
+            with in_eval_mode(fp_block), in_eval_mode(quant_block), torch.no_grad():
+                fp_outputs = forward_fn(fp_block, fp_inputs)
+                fp_outputs = fp_outputs[0].cpu() if isinstance(fp_outputs, (tuple, list)) else fp_outputs.cpu()
+                quant_outputs = forward_fn(quant_block, quant_inputs)
+                quant_outputs = quant_outputs[0].cpu() if isinstance(quant_outputs, (tuple, list)) \
+                    else quant_outputs.cpu()
+
+                # Check if the next ModuleList needs static inputs or not and assign
+                # the outputs (fp32/quant) from current block to be the input (fp32/quant) of next block
+                if include_static_inputs == "True":
+                    fp_inputs[0], quant_inputs[0] = fp_outputs, quant_outputs
+                else:
+                    fp_inputs, quant_inputs = [fp_outputs], [quant_outputs]
+
+                # Cache the outputs on CPU or disk
+                if cache_on_cpu:
+                    cached_fp_dataset[idx] = fp_inputs
+                    cached_quant_dataset[idx] = quant_inputs
+                else:
+                    fp32_cache_path = working_dir + 'fp32/'
+                    quant_cache_path = working_dir + 'quant/'
+                    save_to_cache(fp_inputs, fp32_cache_path, idx)
+                    save_to_cache(quant_inputs, quant_cache_path, idx)
 
     fp_block.cpu()
     quant_block.cpu()
@@ -257,6 +269,243 @@ class ActivationSampler:
                                                                            collect_output=True)
         return inp_data, out_data
 
+class SequentialActivationSampler:
+    """
+    Samples the inputs to the modules of the original model and the weight quantized QuantSim model
+    in order of occurrence, without replaying the models from the model inputs for every module.
+
+    The live intermediate activations ("frontier") of both models are kept for every cached batch, and only the
+    segment of the graph between the previously sampled module and the next one is run to advance the frontier.
+    Modules must be sampled in order of occurrence for this to be efficient; sampling an earlier module restarts
+    from the model inputs.
+
+    If a path is given, the frontier is kept in memory-mapped tensor stores on disk, one entry per batch, so that
+    only the activations of a single batch are held in memory at a time. Otherwise the frontier of all the batches
+    is kept in host memory.
+    """
+    ORIG_FRONTIER_DIR = 'orig_frontier'
+    QUANT_FRONTIER_DIR = 'quant_frontier'
+
+    def __init__(self, orig_model: torch.nn.Module, quant_model: torch.nn.Module, graph: torch.fx.Graph,
+                 cached_dataset: Dataset, path: Optional[str] = None):
+        """
+        :param orig_model: Original model.
+        :param quant_model: Sim model.
+        :param graph: Graph of the original model in which every module replaced in the sim model is a leaf.
+        :param cached_dataset: Cached dataset of model inputs.
+        :param path: Optional directory to store the frontier in. If None, the frontier is kept in host memory.
+        """
+        self._orig_model = orig_model
+        self._quant_model = quant_model
+        self._nodes = list(graph.nodes)
+        self._cached_dataset = cached_dataset
+
+        # Index of the last node that consumes each node's output.
+        # Activations which are not consumed beyond the current position are dropped from the frontier
+        self._last_use = {}
+        for index, node in enumerate(self._nodes):
+            for input_node in node.all_input_nodes:
+                self._last_use[input_node.name] = index
+
+        self._position = 0
+        # Frontier of every batch, mapping node names to their outputs
+        if path is None:
+            self._orig_frontier = [None] * len(cached_dataset)
+            self._quant_frontier = [None] * len(cached_dataset)
+        else:
+            self._orig_frontier = TensorStore(os.path.join(path, self.ORIG_FRONTIER_DIR))
+            self._quant_frontier = TensorStore(os.path.join(path, self.QUANT_FRONTIER_DIR))
+
+    @classmethod
+    def create(cls, orig_model: torch.nn.Module, quant_model: torch.nn.Module,
+               cached_dataset: Dataset, path: Optional[str] = None) -> Optional['SequentialActivationSampler']:
+        """
+        Creates a sequential activation sampler if the original model can be symbolically traced.
+
+        :param orig_model: Original model.
+        :param quant_model: Sim model.
+        :param cached_dataset: Cached dataset of model inputs.
+        :param path: Optional directory to store the frontier in. If None, the frontier is kept in host memory.
+        :return: Sequential activation sampler, or None if the model can't be traced.
+        """
+        replaced_modules = set()
+        for name, module in orig_model.named_modules():
+            if not name:
+                continue
+            try:
+                quant_module = get_named_module(quant_model, name)
+            except AttributeError:
+                quant_module = None
+            if type(quant_module) is not type(module): # pylint: disable=unidiomatic-typecheck
+                replaced_modules.add(module)
+
+        class Tracer(torch.fx.Tracer):
+            """
+            Tracer which keeps the modules replaced in the sim model as leaf modules
+            """
+            def is_leaf_module(self, m: torch.nn.Module, module_qualified_name: str) -> bool:
+                return m in replaced_modules or super().is_leaf_module(m, module_qualified_name)
+
+        try:
+            with in_eval_mode(orig_model):
+                graph = Tracer().trace(orig_model)
+        except Exception as e: # pylint: disable=broad-except
+            logger.info('Unable to symbolically trace the model. Falling back to sampling activations '
+                        'by running the model from its inputs for every module. Error: %s', e)
+            return None
+
+        return cls(orig_model, quant_model, graph, cached_dataset, path)
+
+    def sample_inputs(self, module_name: str) -> Optional[Dataset]:
+        """
+        For every cached batch, get the inputs to the given module in the original model and the sim model.
+        NOTE: The sim model is run with its current state, so the modules preceding the given module must be
+        optimized before sampling it.
+
+        :param module_name: Name of the module.
+        :return: Dataset of (original model inputs, sim model inputs) of the module for every batch,
+         or None if the module is not called in the graph with positional inputs only.
+         The dataset reads from the frontier, so it is only valid until the next call to sample_inputs.
+        """
+        index = next((i for i, node in enumerate(self._nodes)
+                      if node.op == 'call_module' and node.target == module_name), None)
+        if index is None or self._nodes[index].kwargs:
+            return None
+
+        if index < self._position or not self._position:
+            self._reset()
+
+        self._advance(self._orig_frontier, self._orig_model, index)
+        self._advance(self._quant_frontier, self._quant_model, index)
+        self._position = index
+
+        return _SampledModuleInputs(self._nodes[index], self._orig_frontier, self._quant_frontier)
+
+    def invalidate(self, module_names: Iterable[str]):
+        """
+        Discard the frontier if any of the given modules of the sim model, e.g. modules modified in place since the
+        frontier was computed, is run before the current position. The frontier is then computed again from the
+        model inputs on the next call to sample_inputs.
+
+        :param module_names: Names of the modules.
+        """
+        def is_related(target: str, name: str) -> bool:
+            return target == name or target.startswith(name + '.') or name.startswith(target + '.')
+
+        module_names = list(module_names)
+        if any(node.op == 'call_module' and any(is_related(node.target, name) for name in module_names)
+               for node in self._nodes[:self._position]):
+            self._position = 0
+
+    @staticmethod
+    def forward_fn(module: torch.nn.Module, inputs: Tuple[List, List]):
+        """
+        Forward function to run a module sampled by sample_inputs(). Adaround wrappers are run with the
+        sim model inputs and all the other modules with the original model inputs.
+
+        :param module: Module from original model or its adaround wrapper.
+        :param inputs: Tuple of (original model inputs, sim model inputs) of the module.
+        """
+        orig_inputs, quant_inputs = inputs
+        if isinstance(module, AdaroundWrapperBase):
+            return module(*quant_inputs)
+        return module(*orig_inputs)
+
+    def _reset(self):
+        """
+        Reset the frontier of both models to the model inputs
+        """
+        placeholders = [node for node in self._nodes if node.op == 'placeholder']
+        with _batch_writes(self._orig_frontier), _batch_writes(self._quant_frontier):
+            for batch_index, batch in enumerate(self._cached_dataset):
+                # Same convention as ModuleData.default_forward_fn
+                inputs = batch
+                if isinstance(inputs, (list, tuple)):
+                    inputs, _ = inputs
+                if isinstance(inputs, torch.Tensor):
+                    inputs = [inputs]
+                env = {}
+                for i, node in enumerate(placeholders):
+                    if node.target.startswith('**'):
+                        env[node.name] = {}
+                    elif node.target.startswith('*'):
+                        env[node.name] = tuple(inputs[i:])
+                    else:
+                        env[node.name] = inputs[i] if i < len(inputs) else node.args[0]
+                self._orig_frontier[batch_index] = env
+                self._quant_frontier[batch_index] = dict(env)
+        self._position = len(placeholders)
+
+    def _advance(self, frontier: Union[List[Dict], TensorStore], model: torch.nn.Module, end: int):
+        """
+        Run the nodes between the current position and the given end position for every batch
+
+        :param frontier: Frontier of every batch at current position. Updated to the frontier at the end position.
+        :param model: Model whose modules and attributes are used to run the nodes.
+        :param end: Position to advance the frontier to.
+        """
+        device = get_device(model)
+        nodes = self._nodes[self._position:end]
+        with in_eval_mode(model), torch.no_grad(), _batch_writes(frontier):
+            for batch_index in range(len(self._cached_dataset)):
+                env = change_tensor_device_placement(frontier[batch_index], device)
+                for node in nodes:
+                    env[node.name] = self._run_node(node, env, model)
+                frontier[batch_index] = {
+                    name: change_tensor_device_placement(value, torch.device('cpu'))
+                    for name, value in env.items() if self._last_use.get(name, -1) >= end
+                }
+
+    @staticmethod
+    def _run_node(node: torch.fx.Node, env: Dict, model: torch.nn.Module):
+        """
+        Run a single graph node, resolving the modules and attributes from the given model
+        """
+        args = torch.fx.node.map_arg(node.args, lambda n: env[n.name])
+        kwargs = torch.fx.node.map_arg(node.kwargs, lambda n: env[n.name])
+
+        if node.op == 'get_attr':
+            return functools.reduce(getattr, node.target.split('.'), model)
+        if node.op == 'call_function':
+            return node.target(*args, **kwargs)
+        if node.op == 'call_method':
+            self_obj, *args = args
+            return getattr(self_obj, node.target)(*args, **kwargs)
+        if node.op == 'call_module':
+            return get_named_module(model, node.target)(*args, **kwargs)
+
+        raise RuntimeError(f'Unexpected node {node.name} of op type {node.op}')
+
+
+class _SampledModuleInputs(Dataset):
+    """
+    Dataset of (original model inputs, sim model inputs) of a module, read from the frontier of every batch
+    """
+    def __init__(self, node: torch.fx.Node, orig_frontier: Union[List[Dict], TensorStore],
+                 quant_frontier: Union[List[Dict], TensorStore]):
+        self._node = node
+        self._orig_frontier = orig_frontier
+        self._quant_frontier = quant_frontier
+
+    def __len__(self):
+        return len(self._orig_frontier)
+
+    def __getitem__(self, index: int) -> Tuple[List, List]:
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        orig_env = self._orig_frontier[index]
+        quant_env = self._quant_frontier[index]
+        return (list(torch.fx.node.map_arg(self._node.args, lambda n: orig_env[n.name])),
+                list(torch.fx.node.map_arg(self._node.args, lambda n: quant_env[n.name])))
+
+
+def _batch_writes(frontier: Union[List[Dict], TensorStore]):
+    """
+    Returns a context which writes the index of the frontier tensor store only once at exit
+    """
+    return frontier.batch_writes() if isinstance(frontier, TensorStore) else contextlib.nullcontext()
+
+
 def create_cached_block_schedule_list(model: torch.nn.Module, dummy_input, block_names: List[str], supported_modules: Tuple[Type]) \
         -> List[Tuple[Optional[Tuple[torch.nn.Module, str]], List[Tuple[str, torch.nn.Module]]]]:
     """
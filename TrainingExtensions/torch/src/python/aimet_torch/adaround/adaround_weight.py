@@ -61,7 +61,7 @@ from aimet_torch.adaround.adaround_wrapper import AdaroundWrapper
 from aimet_torch.adaround.adaround_optimizer import AdaroundOptimizer
 from aimet_torch.adaround.adaround_loss import AdaroundHyperParameters
 from aimet_torch.adaround.activation_sampler import create_modulelist_for_group_modules, get_block_inputs, \
-    get_block_outputs, create_cached_block_schedule_list
+    get_block_outputs, create_cached_block_schedule_list, SequentialActivationSampler
 from aimet_torch.utils import get_named_module
 
 logger = AimetLogger.get_area_logger(AimetLogger.LogAreas.Quant)
@@ -319,8 +319,15 @@ class Adaround:
                             del cached_quant_dataset
             else:
                 modules = utils.get_ordered_list_of_modules(model, dummy_input)
+                # Carry the activations forward layer by layer instead of replaying the model for every layer.
+                # This relies on the default forward function to map the cached model inputs to the graph inputs.
+                # The activations are kept on disk next to the cached dataset, one batch in memory at a time
+                act_sampler = None
+                if params.forward_fn is None:
+                    act_sampler = SequentialActivationSampler.create(model, quant_sim.model, cached_dataset,
+                                                                     path=WORKING_DIR)
                 cls._run_adaround_model(modules, model, quant_sim.model, module_act_func_pair, opt_params,
-                                        params.forward_fn, cached_dataset)
+                                        params.forward_fn, cached_dataset, act_sampler=act_sampler)
         finally:
             try:
                 logger.info('Deleting model inputs from location: %s', WORKING_DIR)
@@ -332,7 +339,8 @@ class Adaround:
     def _run_adaround_model(cls, modules: List, model: torch.nn.Module, quant_sim_model: torch.nn.Module,
                             module_act_func_pair: Dict, opt_params: AdaroundHyperParameters, forward_fn: Callable,
                             cached_dataset: utils.CachedDataset,
-                            cached_quant_dataset: Optional[utils.CachedDataset] = None):
+                            cached_quant_dataset: Optional[utils.CachedDataset] = None,
+                            act_sampler: Optional[SequentialActivationSampler] = None):
         """
         Iterate through all modules to find out Adaround supported modules and
          apply Adaround optimization to those modules
@@ -346,6 +354,8 @@ class Adaround:
          yielded from the data loader
         :param cached_dataset: Cached dataset for the fp32 model
         :param cached_quant_dataset: Cached dataset for the quant model
+        :param act_sampler: Optional sampler to get the module inputs from the activations of preceding modules
+         instead of running the models from the cached dataset
         """
         # pylint: disable=too-many-arguments, too-many-locals, protected-access
         for name, module in tqdm(modules):
@@ -355,6 +365,9 @@ class Adaround:
                 if not quant_wrapper:
                     continue
 
+                # Sample module inputs before replacing the quant module since the preceding graph segment is run
+                module_inputs = act_sampler.sample_inputs(name) if act_sampler else None
+
                 # Wraps the quant module with adaround wrapper
                 # and temporarily replace quant module with wrapped module
                 with cls._replace_quantization_layer(quant_sim_model, name) as adaround_wrapper:
@@ -363,8 +376,14 @@ class Adaround:
                     act_func = module_act_func_pair[module]
 
                     logger.info("Started Optimizing weight rounding of module: %s", name)
-                    AdaroundOptimizer.adaround_module(module, adaround_wrapper, model, quant_sim_model, act_func,
-                                                      cached_dataset, forward_fn, opt_params, cached_quant_dataset)
+                    if module_inputs is not None:
+                        AdaroundOptimizer.adaround_module(module, adaround_wrapper, module, adaround_wrapper,
+                                                          act_func, module_inputs, act_sampler.forward_fn,
+                                                          opt_params)
+                    else:
+                        AdaroundOptimizer.adaround_module(module, adaround_wrapper, model, quant_sim_model,
+                                                          act_func, cached_dataset, forward_fn, opt_params,
+                                                          cached_quant_dataset)
                     weight = adaround_wrapper.weight
 
                     # Fold trained alpha to weight
@@ -40,7 +40,7 @@ from typing import Callable, Union, Tuple
 import torch
 
 from aimet_common.utils import AimetLogger
-from aimet_torch.meta.connectedgraph import ConnectedGraph
+from aimet_torch.meta.connectedgraph import get_connected_graph
 from aimet_torch.arch_checker.arch_checker_rules import  TorchActivations
 from aimet_torch.arch_checker.arch_checker_utils import (ArchCheckerReport,
                                                          OpStructure,
@@ -140,7 +140,7 @@ class ArchChecker:
                     for op in failed_check_ops:
                         logger.info("Graph/Node: %s: %s fails check: %s", op.dotted_name, op.get_module(), {_check.__name__})
 
-        connected_graph = ConnectedGraph(model, dummy_input)
+        connected_graph = get_connected_graph(model, dummy_input)
         # Run all node checkes
         logger.info("Running node checkes.")
         run_node_checks()
@@ -40,6 +40,7 @@
 import copy
 import contextlib
 from collections import OrderedDict, defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 import functools
 import itertools
@@ -51,6 +52,7 @@ import io
 from unittest.mock import patch
 from typing import Any, Callable, Dict, List, Optional, Tuple, Union, Mapping
 import pickle
+import threading
 from uuid import uuid4
 import torch
 from torch.utils.data import DataLoader
@@ -67,9 +69,10 @@ from aimet_torch.utils import get_all_quantizers, in_eval_mode
 from aimet_torch.onnx_utils import OnnxExportApiArgs
 from aimet_torch.model_preparer import prepare_model
 from aimet_torch.model_validator.model_validator import ModelValidator
+from aimet_torch.cache import TorchSerializationProtocol
 
 from aimet_common.auto_quant import Diagnostics
-from aimet_common.cache import Cache
+from aimet_common.cache import Cache, has_fingerprint_handler
 from aimet_common.defs import QuantScheme
 from aimet_common.utils import AimetLogger, Spinner
 from aimet_common.quantsim import validate_quantsim_inputs
@@ -85,6 +88,55 @@ cache = Cache()
 NUM_SAMPLES_FOR_PERFORMANCE_EVALUATION = None
 
 
+def _read_file_contents(path: Optional[str]) -> Optional[bytes]:
+    """
+    :return: Contents of the file, or None if no path is given
+    """
+    if path is None:
+        return None
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _get_data_loader_fingerprint(data_loader: DataLoader, num_batches: int) -> Any:
+    """
+    Get the data that identifies the calibration data consumed from data_loader.
+
+    If a handler was registered with aimet_common.cache.register_fingerprint_handler for the data loader or its
+    dataset, e.g. to identify a dataset by its name and version, the handler is used.
+    Otherwise, the first num_batches batches of the data loader are fingerprinted.
+
+    :param data_loader: Data loader
+    :param num_batches: Number of batches consumed from data_loader
+    :return: Data to be fingerprinted.
+    """
+    if has_fingerprint_handler(data_loader):
+        return data_loader
+
+    dataset = getattr(data_loader, "dataset", None)
+    if dataset is not None and has_fingerprint_handler(dataset):
+        return dataset
+
+    return list(itertools.islice(data_loader, num_batches))
+
+
+def _get_callable_fingerprint(fn: Optional[Callable]) -> Any:
+    """
+    Get the data that identifies the code of a function or callable object.
+
+    :param fn: Function or callable object
+    :return: Data to be fingerprinted.
+    """
+    if fn is None or has_fingerprint_handler(fn):
+        return fn
+
+    call = getattr(type(fn), "__call__", None)
+    if has_fingerprint_handler(call):
+        return type(fn).__qualname__, call
+
+    return type(fn).__module__, type(fn).__qualname__
+
+
 @dataclass(frozen=True)
 class _QuantSchemePair:
     param_quant_scheme: QuantScheme
@@ -297,6 +349,8 @@ class AutoQuant: # pylint: disable=too-many-instance-attributes
 
         self._quant_scheme_candidates = _QUANT_SCHEME_CANDIDATES
         self._fp32_acc = None
+        self._num_workers = 1
+        self._memory_budget = None
 
     def _evaluate_model_performance(self, model) -> float:
         """
@@ -356,6 +410,50 @@ class AutoQuant: # pylint: disable=too-many-instance-attributes
         """
         self.adaround_params = adaround_params
 
+    def set_scheduler_params(self,
+                             num_workers: int = 1,
+                             memory_budget: Optional[int] = None,
+                             resume: bool = False) -> None:
+        """
+        Set parameters for scheduling the independent branches of AutoQuant.
+
+        If num_workers > 1, quant scheme candidates are evaluated concurrently, and
+        batchnorm folding and cross-layer equalization are applied and evaluated
+        speculatively while W32 evaluation is running. Speculative branches are stopped
+        as soon as their results are known to be unnecessary.
+        The branches run in threads of the current process and share the fp32 model, eval_callback,
+        and the data loaders (including the AdaRound data loader). Each branch works on its own copy of the
+        model and the connected graph cache of the fp32 model is guarded by a lock, but eval_callback and
+        the data loaders are called concurrently without any locking and must therefore be thread-safe.
+        Use num_workers=1 if they are not.
+
+        :param num_workers: Maximum number of branches to run concurrently.
+        :param memory_budget: Maximum number of bytes that can be taken by the model copies of
+            concurrently running branches. Each branch is assumed to hold two copies of the model.
+            If None, concurrency is bounded only by num_workers.
+        :param resume: If True, results of the sessions completed by a previous run with
+            the same results_dir are loaded instead of being recomputed.
+        """
+        if num_workers < 1:
+            raise ValueError(f"`num_workers` must be a positive value. Got {num_workers}")
+
+        self._num_workers = num_workers
+        self._memory_budget = memory_budget
+        self.eval_manager.resume = resume
+
+    def _get_num_workers(self) -> int:
+        """
+        Get the number of branches to run concurrently under the memory budget.
+
+        :return: Number of workers.
+        """
+        if self._memory_budget is None:
+            return self._num_workers
+
+        model_size = sum(tensor.numel() * tensor.element_size()
+                         for tensor in itertools.chain(self.fp32_model.parameters(), self.fp32_model.buffers()))
+        return max(1, min(self._num_workers, self._memory_budget // max(2 * model_size, 1)))
+
     def set_export_params(self,
                           onnx_export_args: OnnxExportApiArgs = -1,
                           propagate_encodings: bool = None) -> None:
@@ -511,7 +609,34 @@ class AutoQuant: # pylint: disable=too-many-instance-attributes
             )
         return prepared_model
 
-    @cache.mark("batchnorm_folding")
+    def _get_model_fingerprint(self, model: torch.nn.Module):
+        """
+        Get the data that the results of the PTQ techniques applied to model depend on.
+
+        :param model: Model to apply PTQ techniques.
+        :return: Data to be fingerprinted.
+        """
+        return model, self.dummy_input
+
+    def _get_adaround_fingerprint(self, model: torch.nn.Module):
+        """
+        Get the data that the result of adaround applied to model depends on.
+
+        :param model: Model to apply adaround.
+        :return: Data to be fingerprinted.
+        """
+        params = self.adaround_params
+        quantsim_params = dict(self._quantsim_params)
+        quantsim_params["config_file"] = _read_file_contents(quantsim_params["config_file"])
+        return (self._get_model_fingerprint(model),
+                quantsim_params,
+                _get_data_loader_fingerprint(params.data_loader, params.num_batches),
+                _get_callable_fingerprint(params.forward_fn),
+                (params.num_batches, params.num_iterations, params.reg_param,
+                 params.beta_range, params.warm_start))
+
+    @cache.mark("batchnorm_folding", TorchSerializationProtocol(),
+                fingerprint=lambda self, model: self._get_model_fingerprint(model)) # pylint: disable=protected-access
     def _apply_batchnorm_folding(self, model: torch.nn.Module)\
             -> Tuple[torch.nn.Module, List[Tuple]]:
         """
@@ -526,7 +651,8 @@ class AutoQuant: # pylint: disable=too-many-instance-attributes
         folded_pairs = fold_all_batch_norms(model, None, self.dummy_input)
         return model, folded_pairs
 
-    @cache.mark("cle")
+    @cache.mark("cle", TorchSerializationProtocol(),
+                fingerprint=lambda self, model: self._get_model_fingerprint(model)) # pylint: disable=protected-access
     def _apply_cross_layer_equalization(self, model: torch.nn.Module) -> torch.nn.Module:
         """
         Apply cross-layer equalization.
@@ -544,7 +670,8 @@ class AutoQuant: # pylint: disable=too-many-instance-attributes
         equalize_model(model, input_shape)
         return model
 
-    @cache.mark("adaround")
+    @cache.mark("adaround", TorchSerializationProtocol(),
+                fingerprint=lambda self, model: self._get_adaround_fingerprint(model)) # pylint: disable=protected-access
     def _apply_adaround(self, model: torch.nn.Module) -> Tuple[torch.nn.Module, str]:
         """
         Apply adaround.
@@ -678,6 +805,11 @@ class AutoQuant: # pylint: disable=too-many-instance-attributes
         assert candidates
 
         # Find the quant scheme that yields the best eval score
+        num_workers = self._get_num_workers()
+        if num_workers > 1:
+            with ThreadPoolExecutor(max_workers=num_workers) as executor:
+                eval_scores = list(executor.map(eval_fn, candidates))
+            return candidates[eval_scores.index(max(eval_scores))]
         return max(candidates, key=eval_fn)
 
     def _optimize_main(self, fp32_model: torch.nn.Module, target_acc: float):
@@ -698,6 +830,49 @@ class AutoQuant: # pylint: disable=too-many-instance-attributes
         with self.eval_manager.session("QuantScheme Selection") as sess:
             self._quantsim_params["quant_scheme"] = sess.wrap(self._choose_default_quant_scheme)()
 
+        with self._speculative_branches(fp32_model) as branches:
+            return self._optimize_ptq_techniques(fp32_model, target_acc, branches)
+
+    @contextlib.contextmanager
+    def _speculative_branches(self, fp32_model: torch.nn.Module):
+        """
+        Start applying and evaluating batchnorm folding and cross-layer equalization
+        in the background if more than one worker is available.
+
+        :param fp32_model: Model to apply PTQ techniques.
+        :return: Speculative branches.
+        """
+        num_workers = self._get_num_workers()
+        branches = _SpeculativeBranches(num_workers - 1)
+        try:
+            if num_workers > 1:
+                # Create W32 evaluation session first to keep the order of sessions in diagnostics
+                self.eval_manager.session("W32 Evaluation")
+                for title, apply_fn in (("Batchnorm Folding", self._apply_batchnorm_folding),
+                                        ("Cross-Layer Equalization", self._apply_cross_layer_equalization)):
+                    if self.eval_manager.session(title, ptq=True).ptq_result is None:
+                        branches.submit(title, apply_fn, fp32_model,
+                                        self._create_quantsim_and_encodings,
+                                        self._evaluate_model_performance)
+            yield branches
+        finally:
+            branches.cancel()
+
+    def _optimize_ptq_techniques(self,
+                                 fp32_model: torch.nn.Module,
+                                 target_acc: float,
+                                 branches: "_SpeculativeBranches"):
+        """
+        Helper function of _optimize_main().
+
+        :param fp32_model: Model to apply PTQ techniques.
+        :param target_acc: Target eval score.
+        :param branches: Speculative branches of batchnorm folding and cross-layer equalization.
+
+        :raises RuntimeError: If none of the PTQ techniques were finished successfully.
+
+        :return: The best ptq result as a dictionary.
+        """
         with self.eval_manager.session("W32 Evaluation") as sess:
             w32_eval_score = sess.wrap(sess.eval)(model=fp32_model, param_bw=32)
             _logger.info("Evaluation finished: W32A%d (eval score: %f)",
@@ -725,11 +900,12 @@ class AutoQuant: # pylint: disable=too-many-instance-attributes
 
         # Batchnorm Folding
         with self.eval_manager.session("Batchnorm Folding", ptq=True) as sess:
-            model, _ = sess.wrap(self._apply_batchnorm_folding)(fp32_model)
+            model, _ = sess.wrap(branches.wrap(sess.title, self._apply_batchnorm_folding))(fp32_model)
             if sess.ptq_result is None:
-                sess.set_ptq_result(model=model,
-                                    applied_techniques=["batchnorm_folding"],
-                                    export_kwargs=self._export_kwargs)
+                branches.set_ptq_result(sess,
+                                        model=model,
+                                        applied_techniques=["batchnorm_folding"],
+                                        export_kwargs=self._export_kwargs)
 
         best_result = self.eval_manager.get_best_ptq_result()
         if best_result and best_result.accuracy >= target_acc:
@@ -738,11 +914,12 @@ class AutoQuant: # pylint: disable=too-many-instance-attributes
 
         # Cross-Layer Equalization
         with self.eval_manager.session("Cross-Layer Equalization", ptq=True) as sess:
-            model = sess.wrap(self._apply_cross_layer_equalization)(fp32_model)
+            model = sess.wrap(branches.wrap(sess.title, self._apply_cross_layer_equalization))(fp32_model)
             if sess.ptq_result is None:
-                sess.set_ptq_result(model=model,
-                                    applied_techniques=["cross_layer_equalization"],
-                                    export_kwargs=self._export_kwargs)
+                branches.set_ptq_result(sess,
+                                        model=model,
+                                        applied_techniques=["cross_layer_equalization"],
+                                        export_kwargs=self._export_kwargs)
 
         best_result = self.eval_manager.get_best_ptq_result()
         if best_result and best_result.accuracy >= target_acc:
@@ -760,8 +937,8 @@ class AutoQuant: # pylint: disable=too-many-instance-attributes
 
         # AdaRound
         with self.eval_manager.session("AdaRound", ptq=True) as sess:
-            model, encoding_path = self._apply_adaround(model)
             if sess.ptq_result is None:
+                model, encoding_path = self._apply_adaround(model)
                 sess.set_ptq_result(model=model,
                                     encoding_path=encoding_path,
                                     applied_techniques=[*applied_techniques, "adaround"],
@@ -809,6 +986,107 @@ class PtqResult:
                     applied_techniques=self.applied_techniques)
 
 
+class _SpeculativeBranches:
+    """
+    PTQ techniques applied and evaluated in the background, ahead of the sessions that consume their results.
+    """
+    def __init__(self, max_workers: int):
+        """
+        :param max_workers: Maximum number of branches to run concurrently. If 0, no branch is run.
+        """
+        self._executor = ThreadPoolExecutor(max_workers=max_workers) if max_workers > 0 else None
+        self._futures: Dict[str, Future] = {}
+        self._cancelled = threading.Event()
+
+    def submit(self,
+               title: str,
+               apply_fn: Callable,
+               model: torch.nn.Module,
+               quantsim_factory: Callable,
+               eval_func: Callable[[torch.nn.Module], float]):
+        """
+        Start applying the PTQ technique and evaluating the result in the background.
+
+        :param title: Title of the session that consumes the result.
+        :param apply_fn: Function that applies the PTQ technique.
+        :param model: Model to apply the PTQ technique.
+        :param quantsim_factory: A factory function that returns QuantizationSimModel.
+        :param eval_func: Evaluation function.
+        """
+        if self._executor is not None:
+            self._futures[title] = self._executor.submit(self._run, apply_fn, model, quantsim_factory, eval_func)
+
+    def _run(self,
+             apply_fn: Callable,
+             model: torch.nn.Module,
+             quantsim_factory: Callable,
+             eval_func: Callable[[torch.nn.Module], float]):
+        """
+        Apply the PTQ technique and evaluate the result unless cancelled in the meantime.
+        Cancellation is checked between the stages (apply, create quantsim, evaluate).
+
+        :return: Return value of apply_fn, and (sim, eval score) or None if cancelled.
+        """
+        if self._cancelled.is_set():
+            return None, None
+        ret = apply_fn(model)
+        output_model = ret[0] if isinstance(ret, tuple) else ret
+        if self._cancelled.is_set():
+            return ret, None
+        sim = quantsim_factory(output_model)
+        if self._cancelled.is_set():
+            return ret, None
+        return ret, (sim, eval_func(sim.model))
+
+    def wrap(self, title: str, apply_fn: Callable) -> Callable:
+        """
+        Return a function that returns the result of the branch if the branch was started,
+        otherwise apply_fn itself.
+
+        :param title: Title of the session.
+        :param apply_fn: Function that applies the PTQ technique.
+        :return: Function that applies the PTQ technique.
+        """
+        future = self._futures.get(title)
+        if future is None:
+            return apply_fn
+
+        @functools.wraps(apply_fn)
+        def wrapper(*_, **__):
+            ret, _ = future.result()
+            return ret
+        return wrapper
+
+    def set_ptq_result(self, sess: "_EvalSession", model: torch.nn.Module, **kwargs):
+        """
+        Set the result of PTQ to the session, reusing the evaluation done in the background if any.
+
+        :param sess: Session to set the result.
+        :param model: Result of PTQ.
+        :param kwargs: Additional arguments to sess.set_ptq_result.
+        """
+        future = self._futures.get(sess.title)
+        evaluated = future.result()[1] if future is not None else None
+        if evaluated is None:
+            sess.set_ptq_result(model=model, **kwargs)
+        else:
+            sim, acc = evaluated
+            sess.set_ptq_result(sim=sim, acc=acc, **kwargs)
+
+    def cancel(self):
+        """
+        Stop all the outstanding branches and wait for them to finish.
+        Branches already running are stopped after their current stage, so that no model copy
+        of a speculative branch outlives this call and exceeds the memory budget.
+        """
+        self._cancelled.set()
+        for future in self._futures.values():
+            future.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+        self._futures.clear()
+
+
 class _EvalManager:
     """
     Evaluation manager for AutoQuant.
@@ -832,6 +1110,9 @@ class _EvalManager:
         self._results_dir = results_dir
         self._strict_validation = strict_validation
 
+        # If True, sessions completed by a previous run are loaded from results_dir
+        self.resume = False
+
         os.makedirs(self._results_dir, exist_ok=True)
 
         self._all_sessions = OrderedDict() # type: OrderedDict[str, _EvalSession]
@@ -870,6 +1151,8 @@ class _EvalManager:
                                    results_dir=os.path.join(self._results_dir, ".trace"),
                                    strict_validation=self._strict_validation,
                                    ptq=ptq)
+            if self.resume:
+                session.load_state()
             self._all_sessions[title] = session
         return self._all_sessions[title]
 
@@ -1011,30 +1294,48 @@ class _EvalSession: # pylint: disable=too-many-instance-attributes
         :returns: Function whose return value is cached.
         """
 
-        results_dir = self._results_dir
-        class CachedResult:
-            """Cached result """
-            def __init__(self, obj):
-                self._filename = os.path.join(results_dir, f".{uuid4()}")
-                while os.path.exists(self._filename):
-                    self._filename = os.path.join(results_dir, f".{uuid4()}")
-                with open(self._filename, "wb") as f:
-                    pickle.dump(obj, f)
-
-            def load(self):
-                """Load cached result """
-                with open(self._filename, "rb") as f:
-                    return pickle.load(f)
-
         @functools.wraps(fn)
         def wrapper(*args, **kwargs):
             if self._cached_result:
                 return self._cached_result.load()
             ret = fn(*args, **kwargs)
-            self._cached_result = CachedResult(ret)
+            self._cached_result = _CachedResult(ret, self._results_dir)
             return ret
         return wrapper
 
+    @property
+    def _state_path(self) -> str:
+        return os.path.join(self._results_dir, f"{self.title_lowercase}.session")
+
+    def save_state(self):
+        """
+        Save the results of the session so that the session can be resumed by later runs.
+        """
+        state = dict(result=self.result,
+                     ptq_result=self._ptq_result,
+                     cached_result=self._cached_result,
+                     log=self._log.getvalue())
+        tmp_path = f"{self._state_path}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(state, f)
+        os.replace(tmp_path, self._state_path)
+
+    def load_state(self):
+        """
+        Load the results of the session saved by a previous run, if any.
+        """
+        if not os.path.exists(self._state_path):
+            return
+
+        with open(self._state_path, "rb") as f:
+            state = pickle.load(f)
+
+        self.result = state["result"]
+        self._ptq_result = state["ptq_result"]
+        self._cached_result = state["cached_result"]
+        self._log.write(state["log"])
+        _logger.info("Resuming session: %s", self.title)
+
     def eval(self, model: torch.nn.Module, **kwargs):
         """
         Evaluate the model.
@@ -1083,6 +1384,7 @@ class _EvalSession: # pylint: disable=too-many-instance-attributes
         self.result["error"] = exc_val
         if not exc_val:
             self.result["status"] = "success"
+            self.save_state()
         elif self._strict_validation:
             self.result["status"] = "error-failed"
         else:
@@ -1185,6 +1487,27 @@ class _EvalSession: # pylint: disable=too-many-instance-attributes
         return model_path, encoding_path
 
 
+class _CachedResult:
+    """
+    Return value of a session saved to a file.
+    """
+    def __init__(self, obj: Any, results_dir: str):
+        """
+        :param obj: Object to save.
+        :param results_dir: Directory to save the object.
+        """
+        self._filename = os.path.join(results_dir, f".{uuid4()}")
+        while os.path.exists(self._filename):
+            self._filename = os.path.join(results_dir, f".{uuid4()}")
+        with open(self._filename, "wb") as f:
+            pickle.dump(obj, f)
+
+    def load(self):
+        """Load cached result """
+        with open(self._filename, "rb") as f:
+            return pickle.load(f)
+
+
 @contextlib.contextmanager
 def spy_auto_quant(auto_quant: AutoQuant):
     """
@@ -37,10 +37,8 @@
 
 """ Optimization code to fold batch-norm layers """
 
-import contextlib
-import math
+import collections
 from typing import List, Tuple, Union, Dict, Iterable, Set, Any
-import numpy as np
 import torch
 import torch.nn
 from torch.nn.modules.batchnorm import BatchNorm1d, BatchNorm2d
@@ -56,7 +54,7 @@ from aimet_common.utils import AimetLogger
 # pylint: disable=unused-import
 from aimet_torch.defs import PassThroughOp
 from aimet_torch import utils
-from aimet_torch.meta.connectedgraph import ConnectedGraph
+from aimet_torch.meta.connectedgraph import ConnectedGraph, get_connected_graph
 from aimet_torch.quantsim import QuantizationSimModel
 from aimet_torch.qc_quantize_op import QcQuantizeWrapper
 from aimet_torch.tensor_quantizer import LearnedGridTensorQuantizer
@@ -80,72 +78,38 @@ def _delete_bn_from_model(model: torch.nn.Module, bn_layer_list: Iterable[BatchN
     utils.replace_modules_with_instances_of_new_type(model, bn_layer_list, torch.nn.Identity)
 
 
-@contextlib.contextmanager
-def _expand_shape_to_4d(weight_tensor: libpymo.TensorParams):
-    """ Expand the shape of the weight into 4d.  """
-    dims = len(weight_tensor.shape)
-
-    if dims > 5:
-        raise RuntimeError
-
-    if dims == 4:
-        yield weight_tensor
-
-    else:
-        orig_shape = weight_tensor.shape
-        if dims < 4:
-            # If we have less dimensions, we add 1s to make 4 dimensions
-            _4d_shape = np.append(orig_shape, [1 for _ in range(4-dims)]).astype(int)
-        else:
-            # If we have more dimensions, we concatenate all the dimensions beyond 3 into one dimension
-            _4d_shape = np.array(orig_shape[:3] + [math.prod(orig_shape[3:])])
-
-        try:
-            weight_tensor.shape = _4d_shape
-            yield weight_tensor
-        finally:
-            weight_tensor.shape = orig_shape
-
-
-def _call_mo_batch_norm_fold(weight: torch.Tensor,
-                             bias: torch.Tensor,
-                             bn: BatchNormType,
-                             fold_backward: bool):
+def _get_bn_scale_and_shift(bn_layers: List[BatchNormType]) -> List[Tuple[torch.Tensor, torch.Tensor]]:
     """
-    Calls C++ batch norm folding API.
+    Computes gamma / sigma and beta - mean * gamma / sigma for each BatchNorm, on the device of its parameters.
+    BatchNorms sharing device, dtype and eps are computed together. Half precision parameters are computed in fp32.
 
-    :param weight: Weight or scale tensor to fold BN into.
-    :param bias: Bias tensor to fold BN into.
-    :param bn: Batch Norm layer
-    :param fold_backward: True if BatchNorm comes after Conv/Linear layer
+    :param bn_layers: BatchNorm layers
+    :return: Scale and shift for each BatchNorm in order
     """
-    with torch.no_grad():
-        bn_params = libpymo.BNParams()
-        bn_params.gamma = bn.weight.detach().cpu().numpy().reshape(-1)
-        bn_params.beta = bn.bias.detach().cpu().numpy().reshape(-1)
-        bn_params.runningMean = bn.running_mean.detach().cpu().numpy().reshape(-1)
-        sigma = torch.sqrt(bn.running_var + bn.eps)
-        bn_params.runningVar = sigma.detach().cpu().numpy().reshape(-1)
-
-        weight_tensor = libpymo.TensorParams()
-
-        weight_tensor.data = weight.detach().cpu().numpy().reshape(-1)
-        weight_tensor.shape = np.array(weight.shape)
+    groups = collections.defaultdict(list)
+    for index, bn in enumerate(bn_layers):
+        groups[(bn.running_var.device, bn.running_var.dtype, bn.eps)].append(index)
 
-        bias_tensor = libpymo.TensorParams()
+    scale_and_shift = [None] * len(bn_layers)
+    for (_, dtype, eps), indices in groups.items():
+        compute_dtype = torch.promote_types(dtype, torch.float32)
+        group = [bn_layers[index] for index in indices]
 
-        bias_tensor.data = bias.detach().cpu().numpy().reshape(-1)
-        bias_tensor.shape = np.array(bias.shape)
-        is_bias_valid = True
+        running_var = torch.cat([bn.running_var.detach().reshape(-1) for bn in group]).to(compute_dtype)
+        running_mean = torch.cat([bn.running_mean.detach().reshape(-1) for bn in group]).to(compute_dtype)
+        gamma = torch.cat([bn.weight.detach().reshape(-1) if bn.weight is not None
+                           else torch.ones_like(bn.running_var) for bn in group]).to(compute_dtype)
+        beta = torch.cat([bn.bias.detach().reshape(-1) if bn.bias is not None
+                          else torch.zeros_like(bn.running_mean) for bn in group]).to(compute_dtype)
 
-        with _expand_shape_to_4d(weight_tensor):
-            _bias = libpymo.fold(bn_params, weight_tensor, bias_tensor, is_bias_valid, fold_backward)
+        scale = gamma / torch.sqrt(running_var + eps)
+        shift = beta - running_mean * scale
 
-        bias.copy_(torch.tensor(_bias, device=bias.device, dtype=bias.dtype)
-                   .reshape_as(bias))
+        split_sizes = [bn.running_var.numel() for bn in group]
+        for index, bn_scale, bn_shift in zip(indices, scale.split(split_sizes), shift.split(split_sizes)):
+            scale_and_shift[index] = (bn_scale, bn_shift)
 
-        weight.copy_(torch.tensor(weight_tensor.data, device=weight.device, dtype=weight.dtype)
-                     .reshape_as(weight))
+    return scale_and_shift
 
 
 class _BatchNormFoldingNotSupported(RuntimeError):
@@ -253,18 +217,17 @@ def _fold_to_scale(conv_wrapper: QcQuantizeWrapper, bn_wrapper: QcQuantizeWrappe
         conv_wrapper.param_quantizers["bias"] = bias_quantizer
 
 
-def _fold_to_weight(conv_linear: LayerType, bn: BatchNormType, fold_backward: bool):
+def _fold_to_weight(conv_linear: LayerType, bn: BatchNormType, fold_backward: bool,
+                    bn_scale_and_shift: Tuple[torch.Tensor, torch.Tensor] = None):
     """
     Fold BatchNorm into the weight and bias of the given layer.
 
     :param conv_linear: Conv or linear layer to fold BN into.
     :param bn: BatchNorm to fold.
+    :param fold_backward: True if BatchNorm comes after Conv/Linear layer
+    :param bn_scale_and_shift: Scale and shift of the BatchNorm as computed by _get_bn_scale_and_shift.
+        Computed here if not given.
     """
-    # Transpose weights to C, N, H, W from N, C, H, W since axis are flipped for transposed conv
-    # However depthwise conv layers are always N, 1, H, W whether transposed-conv or not, so no need to transpose
-    if isinstance(conv_linear, torch.nn.ConvTranspose2d) and conv_linear.groups == 1:
-        conv_linear.weight.data = conv_linear.weight.data.permute(1, 0, 2, 3)
-
     if conv_linear.bias is None:
         out_channels = conv_linear.out_features if isinstance(conv_linear, torch.nn.Linear)\
                        else conv_linear.out_channels
@@ -273,11 +236,38 @@ def _fold_to_weight(conv_linear: LayerType, bn: BatchNormType, fold_backward: bo
                            dtype=conv_linear.weight.dtype)
         conv_linear.bias = torch.nn.Parameter(bias)
 
-    _call_mo_batch_norm_fold(conv_linear.weight, conv_linear.bias, bn, fold_backward=fold_backward)
+    if bn_scale_and_shift is None:
+        bn_scale_and_shift, = _get_bn_scale_and_shift([bn])
+    scale, shift = bn_scale_and_shift
+
+    weight = conv_linear.weight
+    bias = conv_linear.bias
 
-    # Transpose weight back to N, C, H, W for transposed Conv2D, for non-depthwise layers
-    if isinstance(conv_linear, torch.nn.ConvTranspose2d) and conv_linear.groups == 1:
-        conv_linear.weight.data = conv_linear.weight.data.permute(1, 0, 2, 3)
+    # Axis are flipped for transposed conv. However depthwise conv layers are always N, 1, H, W whether
+    # transposed-conv or not
+    out_axis, in_axis = 0, 1
+    if isinstance(conv_linear, _ConvTransposeNd) and conv_linear.groups == 1:
+        out_axis, in_axis = 1, 0
+
+    with torch.no_grad():
+        compute_weight = weight.to(scale.dtype)
+        compute_bias = bias.to(scale.dtype)
+        channel_shape = [1] * weight.dim()
+
+        if fold_backward:
+            # W' = W * gamma / sigma, b' = beta + (b - mean) * gamma / sigma
+            channel_shape[out_axis] = -1
+            new_bias = shift + compute_bias * scale
+        else:
+            # W' = W * gamma / sigma, b' = b + sum(W) @ (beta - mean * gamma / sigma)
+            channel_shape[in_axis] = -1
+            reduced_weight = compute_weight.reshape(weight.shape[0], weight.shape[1], -1).sum(dim=2)
+            if out_axis == 1:
+                reduced_weight = reduced_weight.transpose(0, 1)
+            new_bias = compute_bias + reduced_weight @ shift
+
+        weight.copy_(compute_weight * scale.view(channel_shape))
+        bias.copy_(new_bias.reshape_as(bias))
 
 
 def fold_given_batch_norms(model, layer_pairs):
@@ -336,6 +326,13 @@ def _fold_given_batch_norms(model,
 
     bn_modules = []
 
+    # Scale and shift of all the BatchNorms folded to weight are computed together
+    bns_to_fold_to_weight = [bn for conv, bn in conv_bn_pairs
+                             if not isinstance(conv, QcQuantizeWrapper) and not isinstance(bn, QcQuantizeWrapper)]
+    bns_to_fold_to_weight += [bn for bn, _ in bn_conv_pairs]
+    with torch.no_grad():
+        bn_scale_and_shift = dict(zip(bns_to_fold_to_weight, _get_bn_scale_and_shift(bns_to_fold_to_weight)))
+
     def _fold(conv, bn, fold_backward):
         is_wrapped = isinstance(conv, QcQuantizeWrapper) or isinstance(bn, QcQuantizeWrapper)
         try:
@@ -344,7 +341,8 @@ def _fold_given_batch_norms(model,
                 _fold_to_scale(conv, bn)
                 bn_modules.append(bn._module_to_wrap)
             else:
-                _fold_to_weight(conv, bn, fold_backward=fold_backward)
+                _fold_to_weight(conv, bn, fold_backward=fold_backward,
+                                bn_scale_and_shift=bn_scale_and_shift.get(bn))
         except _BatchNormFoldingNotSupported as e:
             bn_name = utils.get_layer_name(model, bn)
             conv_name = utils.get_layer_name(model, conv)
@@ -376,11 +374,11 @@ def find_all_batch_norms_to_fold(model, input_shapes, dummy_input: Union[torch.T
     """
     device = utils.get_device(model)
     if dummy_input is not None:
-        connected_graph = ConnectedGraph(model, dummy_input)
+        connected_graph = get_connected_graph(model, dummy_input)
     else:
         device = utils.get_device(model)
         inp_tensor_list = utils.create_rand_tensors_given_shapes(input_shapes, device)
-        connected_graph = ConnectedGraph(model, inp_tensor_list)
+        connected_graph = get_connected_graph(model, inp_tensor_list)
 
     conv_bn_pairs, bn_conv_pairs, _ = _find_all_batch_norms_to_fold(connected_graph)
     return conv_bn_pairs + bn_conv_pairs
@@ -490,7 +488,7 @@ def fold_all_batch_norms_to_weight(
         inp_tensor_list = utils.create_rand_tensors_given_shapes(input_shapes, device)
     else:
         inp_tensor_list = dummy_input
-    connected_graph = ConnectedGraph(model, inp_tensor_list)
+    connected_graph = get_connected_graph(model, inp_tensor_list)
 
     conv_bn_pairs, bn_conv_pairs, bn_to_fold = _find_all_batch_norms_to_fold(connected_graph)
 
@@ -593,7 +591,7 @@ def find_all_conv_bn_with_activation(model: torch.nn.Module, input_shape: Tuple)
     """
     device = utils.get_device(model)
     inp_tensor_list = utils.create_rand_tensors_given_shapes(input_shape, device)
-    connected_graph = ConnectedGraph(model, inp_tensor_list)
+    connected_graph = get_connected_graph(model, inp_tensor_list)
     return find_all_conv_bn_with_activation_in_graph(connected_graph)
 
 
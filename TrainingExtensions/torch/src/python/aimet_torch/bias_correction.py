@@ -53,7 +53,7 @@ from aimet_common.graph_searcher import GraphSearcher
 
 from aimet_torch import utils
 from aimet_torch import quantsim as qsim
-from aimet_torch.meta.connectedgraph import ConnectedGraph
+from aimet_torch.meta.connectedgraph import get_connected_graph
 from aimet_torch.quantsim import QcQuantizeWrapper
 from aimet_torch.save_utils import SaveUtils
 from aimet_common.utils import AimetLogger
@@ -144,11 +144,119 @@ def get_output_data(layer: torch.nn.Module, model: torch.nn.Module, images_in_on
     return output_data
 
 
-def call_empirical_mo_correct_bias(layer: torch.nn.Module, bias_correction: libpymo.BiasCorrection):
+class EmpiricalBiasCorrection:
+    """
+    Accumulates per-channel running sums of the reference and quantized outputs of a layer on the layer's device.
+    Only the per-channel means are needed to correct the bias, so full output tensors are never retained.
+    """
+
+    def __init__(self, layer: torch.nn.Module):
+        """
+        :param layer: Conv/FC layer whose outputs are accumulated
+        """
+        # Linear layers have their channels in the last dimension, conv layers in the second dimension
+        self._channel_axis = -1 if isinstance(layer, torch.nn.Linear) else 1
+        self._reference_sum = None
+        self._reference_count = 0
+        self._quantized_sum = None
+        self._quantized_count = 0
+
+    def _get_channel_sum(self, output: torch.Tensor) -> Tuple[torch.Tensor, int]:
+        """
+        Sums the output over every dimension except the channel dimension
+        :param output: output of the layer
+        :return: per-channel sum and number of elements summed per channel
+        """
+        output = output.detach().movedim(self._channel_axis, 0).flatten(1)
+        return output.sum(dim=1, dtype=torch.float64), output.shape[1]
+
+    def store_reference_output(self, output: torch.Tensor):
+        """
+        :param output: output of the layer in the reference (FP32) model for one batch
+        """
+        channel_sum, count = self._get_channel_sum(output)
+        self._reference_sum = channel_sum if self._reference_sum is None else self._reference_sum + channel_sum
+        self._reference_count += count
+
+    def store_quantized_output(self, output: torch.Tensor):
+        """
+        :param output: output of the layer in the quantized model for one batch
+        """
+        channel_sum, count = self._get_channel_sum(output)
+        self._quantized_sum = channel_sum if self._quantized_sum is None else self._quantized_sum + channel_sum
+        self._quantized_count += count
+
+    def get_bias_error(self) -> torch.Tensor:
+        """
+        :return: per-channel mean of the quantized output minus per-channel mean of the reference output
+        """
+        if self._reference_count == 0 or self._reference_count != self._quantized_count:
+            raise RuntimeError('Number of quantized outputs do not match number of reference outputs')
+
+        return self._quantized_sum / self._quantized_count - self._reference_sum / self._reference_count
+
+
+def store_reference_outputs(model: torch.nn.Module, bias_corrections: Dict[torch.nn.Module, EmpiricalBiasCorrection],
+                            images_in_one_batch: torch.Tensor):
+    """
+    Runs one forward pass of the reference model and stores the output of every given layer. The forward pass
+    stops as soon as all the layers have been visited.
+    :param model: reference model
+    :param bias_corrections: Dict of reference layer to the EmpiricalBiasCorrection collecting its outputs
+    :param images_in_one_batch: one batch of input data
+    """
+    visited_layers = set()
+
+    def _hook_to_store_output_data(module, _, out_data):
+        # Only the first invocation of a layer is stored, same as get_output_data
+        if module in visited_layers:
+            return
+        visited_layers.add(module)
+        bias_corrections[module].store_reference_output(out_data)
+        if len(visited_layers) == len(bias_corrections):
+            raise StopForwardException
+
+    hook_handles = [register_fwd_hook_for_layer(layer, _hook_to_store_output_data) for layer in bias_corrections]
+    try:
+        forward_pass(model, images_in_one_batch)
+    finally:
+        for hook_handle in hook_handles:
+            hook_handle.remove()
+
+
+def store_quantized_output(layer: torch.nn.Module, model: torch.nn.Module, bias_correction: EmpiricalBiasCorrection,
+                           images_in_one_batch: torch.Tensor):
+    """
+    Runs the quantized model up to the given layer and stores the output of the layer
+    :param layer: quantized layer
+    :param model: quantized model
+    :param bias_correction: EmpiricalBiasCorrection collecting the outputs of the layer
+    :param images_in_one_batch: one batch of input data
+    """
+    def _hook_to_store_output_data(module, _, out_data):
+        bias_correction.store_quantized_output(out_data)
+        raise StopForwardException
+
+    hook_handle = register_fwd_hook_for_layer(layer, _hook_to_store_output_data)
+    try:
+        forward_pass(model, images_in_one_batch)
+    finally:
+        hook_handle.remove()
+
+
+def call_empirical_mo_correct_bias(layer: torch.nn.Module,
+                                   bias_correction: Union[EmpiricalBiasCorrection, libpymo.BiasCorrection]):
     """
     :param layer: Layer to be corrected
-    :param bias_correction: BiasCorrection object to call pymo interface
+    :param bias_correction: EmpiricalBiasCorrection holding the accumulated outputs of the layer, or BiasCorrection
+           object to call pymo interface
     """
+    if isinstance(bias_correction, EmpiricalBiasCorrection):
+        bias_error = bias_correction.get_bias_error()
+        with torch.no_grad():
+            layer.bias.sub_(bias_error.to(device=layer.bias.device, dtype=layer.bias.dtype))
+        return
+
     device = layer.bias.device
 
     bias_tensor = libpymo.TensorParamBiasCorrection()
@@ -306,6 +414,28 @@ def correct_bias(model: torch.nn.Module, quant_params: qsim.QuantParams,
             logger.info('Corrected bias for the layer')
             ordered_conv_linear_nodes.pop(0)
 
+    # Layers corrected empirically, mapped to the accumulator of their reference and quantized outputs
+    empirical_bias_corrections = {}
+    for module_name, module in ordered_conv_linear_nodes:
+        if module in layers_to_ignore or module not in conv_bn_dict.keys():
+            continue
+        bn_layer_info = conv_bn_dict[module]
+        if perform_only_empirical_bias_corr or bn_layer_info is None or bn_layer_info.input_bn is None:
+            empirical_bias_corrections[module] = EmpiricalBiasCorrection(module)
+
+    # Batches are read once and replayed for every layer corrected empirically
+    bias_corr_batches = [images_in_one_batch for images_in_one_batch, *_ in data_loader_n_samples_bias_corr] \
+        if empirical_bias_corrections else []
+
+    # The reference model is never modified, so the reference outputs of all the layers are collected together with
+    # one forward pass per batch
+    reference_bias_corrections = {utils.get_layer_by_name(model_copy, module_name):
+                                  empirical_bias_corrections[module]
+                                  for module_name, module in ordered_conv_linear_nodes
+                                  if module in empirical_bias_corrections}
+    for images_in_one_batch in bias_corr_batches:
+        store_reference_outputs(model_copy, reference_bias_corrections, images_in_one_batch)
+
     for module_name, module in ordered_conv_linear_nodes:
         # Ignore all layers which are skipped by user
         if module in layers_to_ignore:
@@ -314,30 +444,20 @@ def correct_bias(model: torch.nn.Module, quant_params: qsim.QuantParams,
             # make sure module is in the model used by qsim.
             assert(module in list(q.model.modules()))
             # Analytical Bias Correction is only done for Conv layers
-            reference_layer = utils.get_layer_by_name(model_copy, module_name)
             quantize_layer = utils.get_layer_by_name(model, module_name)
 
             if module in conv_bn_dict.keys():
 
                 bn_layer_info = conv_bn_dict[module]
 
-                if perform_only_empirical_bias_corr or bn_layer_info is None or bn_layer_info.input_bn is None:
+                if module in empirical_bias_corrections:
                     logger.info('Correcting layer %s using Empirical Bias Correction', module_name)
-                    bias_correction = libpymo.BiasCorrection()
-
-                    # Get output from quantized model and reference model
-
-                    for images_in_one_batch, *_ in data_loader_n_samples_bias_corr:
-                        reference_output_batch = get_output_data(reference_layer, model_copy, images_in_one_batch)
-                        quantized_model_output_batch = get_output_data(quantize_layer, model, images_in_one_batch)
-
-                        if isinstance(reference_layer, torch.nn.Linear):
-                            extended_shape = np.concatenate((reference_output_batch.shape, np.array([1, 1])))
-                            reference_output_batch = reference_output_batch.reshape(extended_shape)
-                            quantized_model_output_batch = quantized_model_output_batch.reshape(extended_shape)
+                    bias_correction = empirical_bias_corrections.pop(module)
 
-                        bias_correction.storePreActivationOutput(reference_output_batch)
-                        bias_correction.storeQuantizedPreActivationOutput(quantized_model_output_batch)
+                    # Quantized outputs depend on the corrections of all the preceding layers, so they are
+                    # collected only once those layers have been corrected
+                    for images_in_one_batch in bias_corr_batches:
+                        store_quantized_output(quantize_layer, model, bias_correction, images_in_one_batch)
 
                     call_empirical_mo_correct_bias(module, bias_correction)
 
@@ -386,7 +506,7 @@ def find_all_conv_bn_with_activation(model: torch.nn.Module, input_shape: Tuple)
                                                    action=layer_select_handler))
 
     device = utils.get_device(model)
-    connected_graph = ConnectedGraph(model, (torch.rand(input_shape).to(device),))
+    connected_graph = get_connected_graph(model, (torch.rand(input_shape).to(device),))
 
     # create graph searcher instance with connected graph and patterns to search
     graph_searcher = GraphSearcher(connected_graph, patterns_with_callbacks)
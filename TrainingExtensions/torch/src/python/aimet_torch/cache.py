@@ -0,0 +1,94 @@
+# -*- mode: python -*-
+# =============================================================================
+#  @@-COPYRIGHT-START-@@
+#
+#  Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright notice,
+#     this list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright notice,
+#     this list of conditions and the following disclaimer in the documentation
+#     and/or other materials provided with the distribution.
+#
+#  3. Neither the name of the copyright holder nor the names of its contributors
+#     may be used to endorse or promote products derived from this software
+#     without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+#  SPDX-License-Identifier: BSD-3-Clause
+#
+#  @@-COPYRIGHT-END-@@
+# =============================================================================
+"""Defines PyTorch-specific serialization protocols and fingerprints for cache"""
+import os
+import pickle
+
+import torch
+
+from aimet_common.cache import SerializationProtocolBase, T, CacheMiss, register_fingerprint_handler
+
+
+class TorchSerializationProtocol(SerializationProtocolBase[T]):
+    """
+    Serialization protocol for objects containing torch tensors and modules.
+    Tensors are serialized with torch's storage-aware format rather than plain pickle.
+    """
+    def save(self, obj: T, working_dir: str, filename_prefix: str) -> None:
+        """
+        Save an object using torch.save.
+
+        :param obj: Object to save.
+        :param working_dir: Directory to save the file.
+        :param filename_prefix: File name prefix.
+        :raises: TypeError if obj is not serializable by torch.save.
+        """
+        file_path = os.path.join(working_dir, f"{filename_prefix}.pt")
+        try:
+            torch.save(obj, file_path)
+        except (pickle.PicklingError, AttributeError, TypeError) as e:
+            raise TypeError(f"Object of type {type(obj)} can't be serialized by torch.save.") from e
+
+    def load(self, working_dir: str, filename_prefix: str) -> T:
+        """
+        Load the saved object.
+
+        :param working_dir: Directory to load the file.
+        :param filename_prefix: File name prefix.
+        :return: Loaded object.
+        :raises: Cache miss if the combination of working_dir and
+            filename_prefix fails to find a previously saved cache entry.
+        """
+        file_path = os.path.join(working_dir, f"{filename_prefix}.pt")
+        if os.path.exists(file_path):
+            # Cached entries contain whole modules written by this process, not only weights
+            return torch.load(file_path, weights_only=False)
+        raise CacheMiss
+
+
+def _tensor_fingerprint(tensor: torch.Tensor):
+    tensor = tensor.detach().cpu().contiguous()
+    return str(tensor.dtype), tuple(tensor.shape), tensor.reshape(-1).view(torch.uint8).numpy()
+
+
+def _module_fingerprint(module: torch.nn.Module):
+    # NOTE: Generated code of torch.fx.GraphModule is not shown by repr()
+    return type(module).__qualname__, repr(module), getattr(module, "code", None), dict(module.state_dict())
+
+
+register_fingerprint_handler(torch.Tensor, _tensor_fingerprint)
+register_fingerprint_handler(torch.nn.Module, _module_fingerprint)
@@ -48,7 +48,7 @@ from aimet_common.cost_calculator import CostCalculator, Cost
 from aimet_common.pruner import Pruner
 from aimet_common.channel_pruner import select_channels_to_prune
 from aimet_torch.layer_database import LayerDatabase, Layer
-from aimet_torch.data_subsampler import DataSubSampler
+from aimet_torch.data_subsampler import DataSubSampler, ActivationFrontier
 from aimet_torch.channel_pruning.weight_reconstruction import WeightReconstructor
 from aimet_torch import utils
 from aimet_torch.winnow.winnow import winnow_model
@@ -72,6 +72,8 @@ class InputChannelPruner(Pruner):
         self._input_shape = input_shape
         self._num_reconstruction_samples = num_reconstruction_samples
         self._allow_custom_downsample_ops = allow_custom_downsample_ops
+        # Cached batches and activation frontiers, shared by the layers reconstructed within prune_model()
+        self._activation_frontier = None
 
     @staticmethod
     def _select_inp_channels(layer: torch.nn.Module, comp_ratio: float) -> list:
@@ -113,10 +115,19 @@ class InputChannelPruner(Pruner):
         :param comp_model: compressed model
         :return: Nothing
         """
-        inp_data, out_data = DataSubSampler.get_sub_sampled_data(orig_layer, pruned_layer, orig_model, comp_model,
-                                                                 self._data_loader, self._num_reconstruction_samples)
+        # Normal equations are accumulated batch by batch on the device of the model,
+        # so that the sub sampled data need not be gathered on host memory all at once
+        fit_intercept = pruned_layer.bias is not None
 
-        WeightReconstructor.reconstruct_params_for_conv2d(pruned_layer, inp_data, out_data)
+        if self._activation_frontier is not None and orig_layer in self._activation_frontier:
+            xtx, xty = self._activation_frontier.get_normal_equations(orig_layer, pruned_layer, comp_model,
+                                                                      fit_intercept=fit_intercept)
+        else:
+            xtx, xty = DataSubSampler.get_normal_equations(orig_layer, pruned_layer, orig_model, comp_model,
+                                                           self._data_loader, self._num_reconstruction_samples,
+                                                           fit_intercept=fit_intercept)
+
+        WeightReconstructor.reconstruct_params_for_conv2d_from_normal_equations(pruned_layer, xtx, xty)
 
     def _sort_on_occurrence(self, model: torch.nn.Module, layer_comp_ratio_list: List[LayerCompRatioPair]) -> \
             List[LayerCompRatioPair]:
@@ -181,6 +192,9 @@ class InputChannelPruner(Pruner):
 
         # 3) data sub sampling and reconstruction
         if perform_reconstruction:
+            if self._activation_frontier is not None and module_list:
+                # Activations of the compressed model computed with the winnowed modules are stale
+                self._activation_frontier.invalidate(name for name, _ in module_list)
             # get original layer reference
             orig_layer = orig_layer_db.find_layer_by_name(layer.name)
             self._data_subsample_and_reconstruction(orig_layer.module, layer.module, orig_layer_db.model,
@@ -246,9 +260,21 @@ class InputChannelPruner(Pruner):
 
         # sort all the layers in layer_comp_ratio_list based on occurrence
         layer_comp_ratio_list = self._sort_on_occurrence(layer_db.model, layer_comp_ratio_list)
-        # call the base class method
-        comp_layer_db = Pruner.prune_model(self, layer_db,
-                                           layer_comp_ratio_list, cost_metric, trainer)
+
+        # Original and compressed models are advanced from one layer to reconstruct to the next,
+        # instead of being run from the model inputs for every layer
+        layers_to_reconstruct = [layer_db.find_layer_by_name(pair.layer.name).module
+                                 for pair in layer_comp_ratio_list
+                                 if pair.comp_ratio is not None and pair.comp_ratio < 1.0]
+        self._activation_frontier = ActivationFrontier(layer_db.model, layers_to_reconstruct, self._data_loader,
+                                                       self._num_reconstruction_samples)
+        try:
+            # call the base class method
+            comp_layer_db = Pruner.prune_model(self, layer_db,
+                                               layer_comp_ratio_list, cost_metric, trainer)
+        finally:
+            self._activation_frontier.close()
+            self._activation_frontier = None
 
         return comp_layer_db
 
@@ -167,3 +167,57 @@ class WeightReconstructor:
         # update layer with newer weights and bias (if exist)
         #TODO: PyLint crashes here with the error: "RecursionError: maximum recursion depth exceeded"
         cls._update_layer_params(layer=layer, new_weight=new_weight, new_bias=new_bias) # pylint: disable=all
+
+    @staticmethod
+    def _solve_normal_equations(xtx: torch.Tensor, xty: torch.Tensor) -> torch.Tensor:
+        """
+        Solve the normal equations (X^T X) W = X^T Y of least squares linear regression.
+        Cholesky factorization is used if X^T X is positive definite, otherwise falls back to the
+        minimum norm solution using pseudo inverse (e.g. when some of input channels are all zeros).
+
+        :param xtx: X^T X, in the shape of [n_features, n_features]
+        :param xty: X^T Y, in the shape of [n_features, n_targets]
+        :return: solution W, in the shape of [n_features, n_targets]
+        """
+        factor, info = torch.linalg.cholesky_ex(xtx)
+
+        if info.item() == 0:
+            return torch.cholesky_solve(xty, factor)
+
+        logger.info("normal equations are singular, falling back to pseudo inverse")
+        return torch.linalg.pinv(xtx, hermitian=True) @ xty
+
+    @classmethod
+    def reconstruct_params_for_conv2d_from_normal_equations(cls, layer: torch.nn.Conv2d, xtx: torch.Tensor,
+                                                            xty: torch.Tensor):
+        """
+        Reconstruction of conv2d params (weights and biases) by solving the normal equations of linear regression
+        on the device where normal equations are stored.
+
+        :param layer: layer
+        :param xtx: X^T X, in the shape of [Nic * k_h * k_w (+ 1), Nic * k_h * k_w (+ 1)]
+        :param xty: X^T Y, in the shape of [Nic * k_h * k_w (+ 1), Noc]
+        :return: Nothing
+
+        The last row and column of normal equations correspond to the intercept if layer has bias
+        Nic, Noc = input and output channels of given layer
+        k_h, k_w = kernel dimensions of given layer (height, width)
+        """
+        assert isinstance(layer, torch.nn.Conv2d)
+
+        calculate_bias = bool(layer.bias is not None)
+        num_features = int(np.prod(layer.weight.shape[1:4]))
+
+        assert xtx.shape == (num_features + calculate_bias, num_features + calculate_bias)
+        assert xty.shape == (num_features + calculate_bias, layer.out_channels)
+
+        solution = cls._solve_normal_equations(xtx, xty)
+
+        logger.info("finished linear regression fit ")
+
+        new_weight = solution[:num_features].T.reshape(layer.weight.shape)
+        layer.weight.data = new_weight.to(device=layer.weight.device, dtype=layer.weight.dtype).contiguous()
+
+        if calculate_bias:
+            new_bias = solution[num_features]
+            layer.bias.data = new_bias.to(device=layer.bias.device, dtype=layer.bias.dtype).contiguous()
@@ -102,7 +102,10 @@ class CompressionFactory:
                                                                greedy_params.use_monotonic_fit,
                                                                greedy_params.saved_eval_scores_dict,
                                                                comp_ratio_rounding_algo, use_cuda,
-                                                               bokeh_session=bokeh_session)
+                                                               bokeh_session=bokeh_session,
+                                                               num_workers=greedy_params.num_workers,
+                                                               progressive_eval_params=
+                                                               greedy_params.progressive_eval_params)
             layer_selector = ConvNoDepthwiseLayerSelector()
             modules_to_ignore = params.mode_params.modules_to_ignore
         else:
@@ -167,7 +170,10 @@ class CompressionFactory:
                                                                greedy_params.use_monotonic_fit,
                                                                greedy_params.saved_eval_scores_dict,
                                                                comp_ratio_rounding_algo, use_cuda,
-                                                               bokeh_session=bokeh_session)
+                                                               bokeh_session=bokeh_session,
+                                                               num_workers=greedy_params.num_workers,
+                                                               progressive_eval_params=
+                                                               greedy_params.progressive_eval_params)
             layer_selector = ConvNoDepthwiseLayerSelector()
             modules_to_ignore = params.mode_params.modules_to_ignore
 
@@ -237,7 +243,10 @@ class CompressionFactory:
                                                                    saved_eval_scores_dict=greedy_params.saved_eval_scores_dict,
                                                                    comp_ratio_rounding_algo=comp_ratio_rounding_algo,
                                                                    use_cuda=use_cuda,
-                                                                   bokeh_session=bokeh_session)
+                                                                   bokeh_session=bokeh_session,
+                                                                   num_workers=greedy_params.num_workers,
+                                                                   progressive_eval_params=
+                                                                   greedy_params.progressive_eval_params)
             # TAR method
             elif params.mode_params.rank_select_scheme is RankSelectScheme.tar:
                 tar_params = params.mode_params.select_params
@@ -247,7 +256,10 @@ class CompressionFactory:
                                                            eval_iterations=eval_iterations,
                                                            cost_metric=cost_metric,
                                                            num_rank_indices=tar_params.num_rank_indices,
-                                                           use_cuda=use_cuda, pymo_utils_lib=pymo_utils)
+                                                           use_cuda=use_cuda, pymo_utils_lib=pymo_utils,
+                                                           progressive_eval_params=
+                                                           tar_params.progressive_eval_params,
+                                                           eval_scores_cache=tar_params.eval_scores_cache)
             else:
                 raise ValueError("Unknown Rank selection scheme: {}".format(params.AutoModeParams.rank_select_scheme))
 
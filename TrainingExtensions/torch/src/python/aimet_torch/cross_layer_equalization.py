@@ -47,11 +47,10 @@ from enum import Enum
 import numpy as np
 import torch
 
-import aimet_common.libpymo as libpymo      # pylint: disable=import-error
 
 from aimet_common.utils import AimetLogger
 from aimet_torch import utils
-from aimet_torch.meta.connectedgraph import ConnectedGraph
+from aimet_torch.meta.connectedgraph import ConnectedGraph, get_connected_graph
 from aimet_torch.batch_norm_fold import fold_all_batch_norms
 from aimet_torch.utils import get_device, get_ordered_list_of_modules, create_rand_tensors_given_shapes
 
@@ -136,7 +135,7 @@ class GraphSearchUtils:
             inp_tensor_list = tuple(utils.create_rand_tensors_given_shapes(input_shapes, get_device(model)))
         else:
             inp_tensor_list = dummy_input
-        self._connected_graph = ConnectedGraph(model, inp_tensor_list)
+        self._connected_graph = get_connected_graph(model, inp_tensor_list)
         self._ordered_module_list = get_ordered_list_of_conv_modules(model, inp_tensor_list)
 
 
@@ -343,6 +342,47 @@ class GraphSearchUtils:
         return is_relu_activation_in_cls_sets
 
 
+def _get_weight_view(layer: ClsSupportedLayer) -> torch.Tensor:
+    """
+    :param layer: Conv or transposed conv layer
+    :return: Weight of the layer viewed with output channels along the first axis and input channels along the second
+    """
+    weight = layer.weight.data
+    # Axis are flipped for transposed conv
+    if isinstance(layer, (torch.nn.ConvTranspose1d, torch.nn.ConvTranspose2d)) and layer.groups == 1:
+        weight = weight.transpose(0, 1)
+    return weight
+
+
+def _get_channel_range(layer: ClsSupportedLayer, axis: int) -> torch.Tensor:
+    """
+    :param layer: Conv or transposed conv layer
+    :param axis: 0 for the range of each output channel, 1 for the range of each input channel
+    :return: Maximum absolute weight of each channel
+    """
+    weight = _get_weight_view(layer)
+    return weight.abs().amax(dim=[dim for dim in range(weight.dim()) if dim != axis])
+
+
+def _scale_channels(layer: ClsSupportedLayer, scale: torch.Tensor, axis: int, bias_scale: torch.Tensor = None):
+    """
+    Scales the weight of a layer, one scale per channel
+
+    :param layer: Conv or transposed conv layer
+    :param scale: Scale of each channel
+    :param axis: 0 to scale output channels, 1 to scale input channels
+    :param bias_scale: If given, bias of the layer is scaled by it
+    """
+    # Axis are flipped for transposed conv
+    if isinstance(layer, (torch.nn.ConvTranspose1d, torch.nn.ConvTranspose2d)) and layer.groups == 1:
+        axis = 1 - axis
+    shape = [1] * layer.weight.dim()
+    shape[axis] = -1
+    layer.weight.data = layer.weight.data * scale.view(shape)
+    if bias_scale is not None and layer.bias is not None:
+        layer.bias.data = layer.bias.data * bias_scale
+
+
 class CrossLayerScaling:
     """
     Code to apply the cross-layer-scaling technique to a model
@@ -351,16 +391,19 @@ class CrossLayerScaling:
     @staticmethod
     def scale_cls_sets(cls_sets: List[ClsSet]) -> List[ScaleFactor]:
         """
-        Scale multiple CLS sets
+        Scale multiple CLS sets. CLS sets are scaled in batches on the device of their layers, each batch holding CLS
+        sets that share no layer with each other or with a CLS set still waiting to be scaled.
 
         :param cls_sets: List of CLS sets
         :return: Scaling factors calculated and applied for each CLS set in order
         """
-        scale_factor_list = []
-        for cls_set in cls_sets:
-            scale_factor = CrossLayerScaling.scale_cls_set(cls_set)
-            scale_factor_list.append(scale_factor)
-        return scale_factor_list
+        scale_factor_list = [None] * len(cls_sets)
+        for batch in CrossLayerScaling._get_independent_cls_set_batches(cls_sets):
+            scale_factors = CrossLayerScaling._scale_independent_cls_sets([cls_sets[index] for index in batch])
+            for index, scale_factor in zip(batch, scale_factors):
+                scale_factor_list[index] = scale_factor
+
+        return CrossLayerScaling._scale_factors_to_numpy(scale_factor_list)
 
     @staticmethod
     def scale_cls_set(cls_set: ClsSet) -> ScaleFactor:
@@ -384,32 +427,12 @@ class CrossLayerScaling:
         :param cls_set: Consecutive Conv layers Tuple whose weights and biases need to be equalized
         :return: Scaling factor S_12 for each conv layer pair: numpy array
         """
-        on_gpu = False
         for module in cls_set:
             if not isinstance(module, cls_supported_layers):
                 raise ValueError("Only Conv or Transposed Conv layers are supported for cross layer equalization")
-            if module.weight.is_cuda:
-                on_gpu = True
-                module.cpu()
-
-        # Create structs for holding layer weights and bias parameters
-        prev_layer_params = libpymo.EqualizationParams()
-        curr_layer_params = libpymo.EqualizationParams()
-
-        # Prepare and pack data structures for cls set.
-        cls._pack_params_for_conv(cls_set, prev_layer_params, curr_layer_params)
 
-        # Scales weights and bias for consecutive layers and updates data structures in-place.
-        scaling_factor = libpymo.scaleLayerParams(prev_layer_params, curr_layer_params)
-
-        # Update weight and biases for cls set using updated data structures.
-        cls._update_params_for_conv(cls_set, prev_layer_params, curr_layer_params)
-
-        if on_gpu:
-            for module in cls_set:
-                module.to(device="cuda")
-
-        return scaling_factor
+        scale_factors = cls._scale_independent_cls_sets([cls_set])
+        return cls._scale_factors_to_numpy(scale_factors)[0]
 
     @classmethod
     def scale_cls_set_with_depthwise_layers(cls, cls_set: ClsSet) -> [np.ndarray, np.ndarray]:
@@ -420,33 +443,116 @@ class CrossLayerScaling:
                         Second Conv layer is a depth-wise conv and third conv layer is point-wise conv
         :return: Scaling factors S_12 and S_23 : numpy arrays
         """
-        on_gpu = False
         for module in cls_set:
             if not isinstance(module, cls_supported_layers):
                 raise ValueError("Only conv layers are supported for cross layer equalization")
-            if module.weight.is_cuda:
-                on_gpu = True
-                module.cpu()
 
-        # Create structs for holding layer weights and bias parameters
-        prev_layer_params = libpymo.EqualizationParams()
-        curr_layer_params = libpymo.EqualizationParams()
-        next_layer_params = libpymo.EqualizationParams()
+        assert cls_set[1].groups > 1
+
+        scale_factors = cls._scale_independent_cls_sets([cls_set])
+        return cls._scale_factors_to_numpy(scale_factors)[0]
 
-        # Prepare and pack data structures for cls set.
-        cls._pack_params_for_depthwise_conv(cls_set, prev_layer_params, curr_layer_params, next_layer_params)
+    @staticmethod
+    def _get_independent_cls_set_batches(cls_sets: List[ClsSet]) -> List[List[int]]:
+        """
+        Splits CLS sets into batches that can be scaled together. A CLS set is placed in the batch after the last batch
+        holding any of its layers, so every layer is scaled in the same order as when scaling the CLS sets one by one.
 
-        # Scales weights and bias for consecutive layers and updates data structures in-place.
-        scaling_params = libpymo.scaleDepthWiseSeparableLayer(prev_layer_params, curr_layer_params, next_layer_params)
+        :param cls_sets: List of CLS sets
+        :return: Batches of indices into cls_sets, in the order they need to be scaled
+        """
+        batches = []
+        last_batch_of_layer = {}
+        for index, cls_set in enumerate(cls_sets):
+            batch_index = max((last_batch_of_layer[layer] + 1 for layer in cls_set if layer in last_batch_of_layer),
+                              default=0)
+            if batch_index == len(batches):
+                batches.append([])
+            batches[batch_index].append(index)
+            for layer in cls_set:
+                last_batch_of_layer[layer] = batch_index
 
-        # Update weight and biases for cls set using updated data structures.
-        cls._update_params_for_depthwise_conv(cls_set, prev_layer_params, curr_layer_params, next_layer_params)
+        return batches
 
-        if on_gpu:
-            for module in cls_set:
-                module.to(device="cuda")
+    @staticmethod
+    def _scale_independent_cls_sets(cls_sets: List[ClsSet]) -> List[Union[torch.Tensor, Tuple[torch.Tensor]]]:
+        """
+        Scales CLS sets that share no layer with each other. Channel ranges of all the CLS sets are concatenated so the
+        scaling factors of the whole batch are computed together.
+
+        :param cls_sets: List of CLS sets sharing no layer
+        :return: Scaling factors calculated and applied for each CLS set in order, on the device of the layers
+        """
+        conv_sets = [cls_set for cls_set in cls_sets if len(cls_set) == 2]
+        depthwise_sets = [cls_set for cls_set in cls_sets if len(cls_set) == 3]
+        scale_factors = {}
+
+        if conv_sets:
+            ranges = [(_get_channel_range(cls_set[0], 0), _get_channel_range(cls_set[1], 1)) for cls_set in conv_sets]
+            for cls_set, (range_1, range_2) in zip(conv_sets, ranges):
+                if range_1.numel() == 0 or range_1.numel() != range_2.numel():
+                    raise ValueError("Output channels of {} do not match input channels of {}".format(*cls_set))
+
+            # S = range1 / sqrt(range1 * range2), no scaling where either range is zero
+            range_1 = torch.cat([range_1 for range_1, _ in ranges])
+            range_2 = torch.cat([range_2 for _, range_2 in ranges])
+            sqrt_range = torch.sqrt(range_1 * range_2)
+            scale = torch.where(sqrt_range != 0, range_1 / sqrt_range, torch.ones_like(range_1))
+
+            for cls_set, scale_12 in zip(conv_sets, scale.split([range_1.numel() for range_1, _ in ranges])):
+                _scale_channels(cls_set[0], 1 / scale_12, axis=0, bias_scale=1 / scale_12)
+                _scale_channels(cls_set[1], scale_12, axis=1)
+                scale_factors[cls_set] = scale_12
+
+        if depthwise_sets:
+            ranges = [(_get_channel_range(cls_set[0], 0), _get_channel_range(cls_set[1], 0),
+                       _get_channel_range(cls_set[2], 1)) for cls_set in depthwise_sets]
+            for cls_set, (range_1, range_2, range_3) in zip(depthwise_sets, ranges):
+                if range_1.numel() == 0 or not range_1.numel() == range_2.numel() == range_3.numel():
+                    raise ValueError("Channels of {}, {} and {} do not match".format(*cls_set))
+
+            # S12 = range1 / cbrt(range1 * range2 * range3) and S23 = cbrt(range1 * range2 * range3) / range3,
+            # no scaling where any range is zero
+            range_1, range_2, range_3 = (torch.cat(layer_ranges) for layer_ranges in zip(*ranges))
+            cbrt_range = torch.pow(range_1 * range_2 * range_3, 1.0 / 3)
+            is_nonzero = (range_1 != 0) & (range_2 != 0) & (range_3 != 0)
+            scale_12 = torch.where(is_nonzero, range_1 / cbrt_range, torch.ones_like(range_1))
+            scale_23 = torch.where(is_nonzero, cbrt_range / range_3, torch.ones_like(range_3))
+
+            split_sizes = [layer_ranges[0].numel() for layer_ranges in ranges]
+            for cls_set, set_scale_12, set_scale_23 in zip(depthwise_sets, scale_12.split(split_sizes),
+                                                           scale_23.split(split_sizes)):
+                _scale_channels(cls_set[0], 1 / set_scale_12, axis=0, bias_scale=1 / set_scale_12)
+                _scale_channels(cls_set[1], set_scale_12 / set_scale_23, axis=0, bias_scale=1 / set_scale_23)
+                _scale_channels(cls_set[2], set_scale_23, axis=1)
+                scale_factors[cls_set] = (set_scale_12, set_scale_23)
+
+        return [scale_factors[cls_set] for cls_set in cls_sets]
+
+    @staticmethod
+    def _scale_factors_to_numpy(scale_factors: List[Union[torch.Tensor, Tuple[torch.Tensor]]]) -> List[ScaleFactor]:
+        """
+        Copies scaling factors to host memory with a single transfer
 
-        return scaling_params.scalingMatrix12, scaling_params.scalingMatrix23
+        :param scale_factors: Scaling factors for each CLS set, on device
+        :return: Scaling factors for each CLS set as numpy arrays
+        """
+        flat_scale_factors = [scale for scale_factor in scale_factors
+                              for scale in (scale_factor if isinstance(scale_factor, tuple) else (scale_factor,))]
+        if not flat_scale_factors:
+            return []
+
+        sizes = [scale.numel() for scale in flat_scale_factors]
+        host_scale_factors = iter(np.split(torch.cat(flat_scale_factors).cpu().numpy(), np.cumsum(sizes)[:-1]))
+
+        numpy_scale_factors = []
+        for scale_factor in scale_factors:
+            if isinstance(scale_factor, tuple):
+                numpy_scale_factors.append(tuple(next(host_scale_factors) for _ in scale_factor))
+            else:
+                numpy_scale_factors.append(next(host_scale_factors))
+
+        return numpy_scale_factors
 
     @staticmethod
     def create_cls_set_info_list(cls_sets: List[ClsSet], scale_factors: List[ScaleFactor],
@@ -498,8 +604,10 @@ class CrossLayerScaling:
         """
         if isinstance(model, torch.nn.DataParallel):
             return CrossLayerScaling.scale_model(model.module, input_shapes, dummy_input=dummy_input)
-        device = get_device(model)
-        model.cpu()
+
+        # Layers are scaled on the device the model is on
+        if dummy_input is not None:
+            dummy_input = utils.change_tensor_device_placement(dummy_input, get_device(model))
 
         # Find layer groups
         graph_search = GraphSearchUtils(model, input_shapes, dummy_input=dummy_input)
@@ -521,193 +629,8 @@ class CrossLayerScaling:
         cls_set_info_list = CrossLayerScaling.create_cls_set_info_list(cls_sets, scale_factors,
                                                                        is_relu_activation_in_cls_sets)
 
-        model.to(device=device)
         return cls_set_info_list
 
-    @staticmethod
-    def _pack_params_for_conv(cls_set: ClsSet,
-                              prev_layer_params: libpymo.EqualizationParams,
-                              curr_layer_params: libpymo.EqualizationParams):
-        """
-        Prepare and pack data structure for previous and current layer in given cls set.
-
-        :param cls_set: Consecutive Conv layers Tuple whose weights and biases need to be equalized.
-        :param prev_layer_params: Data structure holding weight and bias for previous layer in cls set.
-        :param curr_layer_params: Data structure holding weight and bias for current layer in cls set.
-        """
-        weight_set_0 = cls_set[0].weight
-
-        # Transpose weights to C, N, H, W from N, C, H, W since axis are flipped for transposed conv
-        if isinstance(cls_set[0], torch.nn.ConvTranspose2d):
-            weight_set_0 = weight_set_0.permute(1, 0, 2, 3)
-        if isinstance(cls_set[0], torch.nn.ConvTranspose1d):
-            weight_set_0 = weight_set_0.permute(1, 0, 2)
-
-        prev_layer_params.weight = weight_set_0.detach().numpy().reshape(-1)
-        prev_layer_params.weightShape = np.array(weight_set_0.shape)
-        if len(prev_layer_params.weightShape) == 3:
-            prev_layer_params.weightShape = prev_layer_params.weightShape + [1]
-
-        weight_set_1 = cls_set[1].weight
-
-        # Transpose weights to C, N, H, W from N, C, H, W since axis are flipped for transposed conv
-        if isinstance(cls_set[1], torch.nn.ConvTranspose2d):
-            weight_set_1 = weight_set_1.permute(1, 0, 2, 3)
-        if isinstance(cls_set[1], torch.nn.ConvTranspose1d):
-            weight_set_1 = weight_set_1.permute(1, 0, 2)
-
-        curr_layer_params.weight = weight_set_1.detach().numpy().reshape(-1)
-        curr_layer_params.weightShape = np.array(weight_set_1.shape)
-        if len(curr_layer_params.weightShape) == 3:
-            curr_layer_params.weightShape = curr_layer_params.weightShape + [1]
-
-        if cls_set[0].bias is not None:
-            prev_layer_params.bias = cls_set[0].bias.detach().numpy()
-        else:
-            prev_layer_params.isBiasNone = True
-
-    @staticmethod
-    def _update_params_for_conv(cls_set: ClsSet,
-                                prev_layer_params: libpymo.EqualizationParams,
-                                curr_layer_params: libpymo.EqualizationParams):
-        """
-        Update weight and biases for cls set using updated data structures.
-
-        :param cls_set: Consecutive Conv layers Tuple whose weights and biases need to be equalized.
-        :param prev_layer_params: Data structure holding weight and bias for previous layer in cls set.
-        :param curr_layer_params: Data structure holding weight and bias for current layer in cls set.
-        """
-        if isinstance(cls_set[0], (torch.nn.Conv1d, torch.nn.ConvTranspose1d)):
-            prev_layer_params.weightShape = prev_layer_params.weightShape[:-1]
-        cls_set[0].weight.data = torch.from_numpy(np.reshape(prev_layer_params.weight,
-                                                             prev_layer_params.weightShape))
-        cls_set[0].weight.data = cls_set[0].weight.data.type(torch.FloatTensor)
-
-
-        # Transpose weight back to N, C, H, W for transposed Conv2D
-        if isinstance(cls_set[0], torch.nn.ConvTranspose2d):
-            cls_set[0].weight.data = cls_set[0].weight.data.permute(1, 0, 2, 3).contiguous()
-        if isinstance(cls_set[0], torch.nn.ConvTranspose1d):
-            cls_set[0].weight.data = cls_set[0].weight.data.permute(1, 0, 2).contiguous()
-
-        if isinstance(cls_set[1], (torch.nn.Conv1d, torch.nn.ConvTranspose1d)):
-            curr_layer_params.weightShape = curr_layer_params.weightShape[:-1]
-        cls_set[1].weight.data = torch.from_numpy(np.reshape(curr_layer_params.weight,
-                                                             curr_layer_params.weightShape))
-        cls_set[1].weight.data = cls_set[1].weight.data.type(torch.FloatTensor)
-
-        # Transpose weight back to N, C, H, W for transposed Conv2D
-        if isinstance(cls_set[1], torch.nn.ConvTranspose2d):
-            cls_set[1].weight.data = cls_set[1].weight.data.permute(1, 0, 2, 3).contiguous()
-        if isinstance(cls_set[1], torch.nn.ConvTranspose1d):
-            cls_set[1].weight.data = cls_set[1].weight.data.permute(1, 0, 2).contiguous()
-
-        if cls_set[0].bias is not None:
-            cls_set[0].bias.data = torch.from_numpy(np.reshape(prev_layer_params.bias,
-                                                               prev_layer_params.weightShape[0]))
-            cls_set[0].bias.data = cls_set[0].bias.data.type(torch.FloatTensor)
-
-    @staticmethod
-    def _pack_params_for_depthwise_conv(cls_set: ClsSet,
-                                        prev_layer_params: libpymo.EqualizationParams,
-                                        curr_layer_params: libpymo.EqualizationParams,
-                                        next_layer_params: libpymo.EqualizationParams):
-        """
-        Prepare and pack data structure for previous, current and next layer in given cls set.
-
-        :param cls_set: Consecutive Conv layers Tuple whose weights and biases need to be equalized.
-        :param prev_layer_params: Data structure holding weight and bias for previous layer in cls set.
-        :param curr_layer_params: Data structure holding weight and bias for current layer in cls set.
-        :param next_layer_params: Data structure holding weight and bias for next layer in cls set.
-        """
-        if isinstance(cls_set[0], torch.nn.ConvTranspose2d):
-            cls_set[0].weight.data = cls_set[0].weight.data.permute(1, 0, 2, 3).contiguous()
-        if isinstance(cls_set[0], torch.nn.ConvTranspose1d):
-            cls_set[0].weight.data = cls_set[0].weight.data.permute(1, 0, 2).contiguous()
-
-        if isinstance(cls_set[2], torch.nn.ConvTranspose2d):
-            cls_set[2].weight.data = cls_set[2].weight.data.permute(1, 0, 2, 3).contiguous()
-        if isinstance(cls_set[2], torch.nn.ConvTranspose1d):
-            cls_set[2].weight.data = cls_set[2].weight.data.permute(1, 0, 2).contiguous()
-
-        assert cls_set[1].groups > 1
-
-        prev_layer_params.weight = cls_set[0].weight.detach().numpy().flatten()
-        prev_layer_params.weightShape = np.array(cls_set[0].weight.shape)
-        if len(prev_layer_params.weightShape) == 3:
-            prev_layer_params.weightShape = prev_layer_params.weightShape + [1]
-
-        curr_layer_params.weight = cls_set[1].weight.detach().numpy().flatten()
-        curr_layer_params.weightShape = np.array(cls_set[1].weight.shape)
-        if len(curr_layer_params.weightShape) == 3:
-            curr_layer_params.weightShape = curr_layer_params.weightShape + [1]
-
-        next_layer_params.weight = cls_set[2].weight.detach().numpy().flatten()
-        next_layer_params.weightShape = np.array(cls_set[2].weight.shape)
-        if len(next_layer_params.weightShape) == 3:
-            next_layer_params.weightShape = next_layer_params.weightShape + [1]
-
-
-        if cls_set[0].bias is not None:
-            prev_layer_params.bias = cls_set[0].bias.detach().numpy()
-        else:
-            prev_layer_params.isBiasNone = True
-
-        if cls_set[1].bias is not None:
-            curr_layer_params.bias = cls_set[1].bias.detach().numpy()
-        else:
-            curr_layer_params.isBiasNone = True
-
-    @staticmethod
-    def _update_params_for_depthwise_conv(cls_set: ClsSet,
-                                          prev_layer_params: libpymo.EqualizationParams,
-                                          curr_layer_params: libpymo.EqualizationParams,
-                                          next_layer_params: libpymo.EqualizationParams):
-        """
-        Update weight and biases for cls set using updated data structures.
-
-        :param cls_set: Consecutive Conv layers Tuple whose weights and biases need to be equalized.
-        :param prev_layer_params: Data structure holding weight and bias for previous layer in cls set.
-        :param curr_layer_params: Data structure holding weight and bias for current layer in cls set.
-        :param next_layer_params: Data structure holding weight and bias for next layer in cls set.
-        """
-        if isinstance(cls_set[0], (torch.nn.Conv1d, torch.nn.ConvTranspose1d)):
-            prev_layer_params.weightShape = prev_layer_params.weightShape[:-1]
-        cls_set[0].weight.data = torch.from_numpy(np.reshape(prev_layer_params.weight,
-                                                             prev_layer_params.weightShape))
-        cls_set[0].weight.data = cls_set[0].weight.data.type(torch.FloatTensor)
-        if isinstance(cls_set[0], torch.nn.ConvTranspose2d):
-            cls_set[0].weight.data = cls_set[0].weight.data.permute(1, 0, 2, 3).contiguous()
-        if isinstance(cls_set[0], torch.nn.ConvTranspose1d):
-            cls_set[0].weight.data = cls_set[0].weight.data.permute(1, 0, 2).contiguous()
-
-        if isinstance(cls_set[1], (torch.nn.Conv1d, torch.nn.ConvTranspose1d)):
-            curr_layer_params.weightShape = curr_layer_params.weightShape[:-1]
-        cls_set[1].weight.data = torch.from_numpy(np.reshape(curr_layer_params.weight,
-                                                             curr_layer_params.weightShape))
-        cls_set[1].weight.data = cls_set[1].weight.data.type(torch.FloatTensor)
-
-        if isinstance(cls_set[2], (torch.nn.Conv1d, torch.nn.ConvTranspose1d)):
-            next_layer_params.weightShape = next_layer_params.weightShape[:-1]
-
-        cls_set[2].weight.data = torch.from_numpy(np.reshape(next_layer_params.weight,
-                                                             next_layer_params.weightShape))
-        cls_set[2].weight.data = cls_set[2].weight.data.type(torch.FloatTensor)
-        if isinstance(cls_set[2], torch.nn.ConvTranspose2d):
-            cls_set[2].weight.data = cls_set[2].weight.data.permute(1, 0, 2, 3).contiguous()
-        if isinstance(cls_set[2], torch.nn.ConvTranspose1d):
-            cls_set[2].weight.data = cls_set[2].weight.data.permute(1, 0, 2).contiguous()
-
-        if cls_set[0].bias is not None:
-            cls_set[0].bias.data = torch.from_numpy(np.reshape(prev_layer_params.bias,
-                                                               prev_layer_params.weightShape[0]))
-            cls_set[0].bias.data = cls_set[0].bias.data.type(torch.FloatTensor)
-
-        if cls_set[1].bias is not None:
-            cls_set[1].bias.data = torch.from_numpy(np.reshape(curr_layer_params.bias,
-                                                               curr_layer_params.weightShape[0]))
-            cls_set[1].bias.data = cls_set[1].bias.data.type(torch.FloatTensor)
-
 
 class HighBiasFold:
     """
@@ -738,93 +661,59 @@ class HighBiasFold:
                         (cls_pair_info.layer1 not in bn_layers):
                     continue
 
-                # Create data structures for holding layer weights and bias parameters.
-                prev_layer_params = libpymo.LayerParams()
-                curr_layer_params = libpymo.LayerParams()
-                prev_layer_bn_params = libpymo.BNParamsHighBiasFold()
-
-                # Prepare and pack data structures for high bias fold.
-                cls._pack_bn_layer_params(cls_pair_info, bn_layers, prev_layer_bn_params)
-                cls._pack_previous_and_current_layer_params(cls_pair_info, prev_layer_params, curr_layer_params)
-
-                # Update bias for previous and current layer and data structures in-place.
-                libpymo.updateBias(prev_layer_params, curr_layer_params, prev_layer_bn_params)
-
-                # Set updated biases for previous and current layer.
-                cls._update_previous_and_current_layer_bias(cls_pair_info, prev_layer_params, curr_layer_params)
+                absorb_bias = cls._get_absorb_bias(cls_pair_info, bn_layers)
+                cls._update_previous_and_current_layer_bias(cls_pair_info, absorb_bias)
 
     @staticmethod
-    def _pack_bn_layer_params(cls_pair_info: ClsSetInfo.ClsSetLayerPairInfo,
-                              bn_layers: Dict[torch.nn.Module, torch.nn.BatchNorm2d],
-                              prev_layer_bn_params: libpymo.BNParamsHighBiasFold):
+    def _get_absorb_bias(cls_pair_info: ClsSetInfo.ClsSetLayerPairInfo,
+                         bn_layers: Dict[torch.nn.Module, torch.nn.BatchNorm2d]) -> torch.Tensor:
         """
-        Helper method to pack batch norm layer parameter for high bias fold.
+        Helper method to compute the bias to be absorbed from the previous layer into the current layer.
 
         :param cls_pair_info: Layer pairs that were scaled using CLS and related information.
         :param bn_layers: Dictionary with Key being Conv/Linear layer and value being corresponding folded BN layer.
-        :param prev_layer_bn_params: Data structure to pack batch norm parameter.
+        :return: Bias to be absorbed for each output channel of the previous layer, on the device of the layer
         """
-        scaling_parameter = cls_pair_info.scale_factor
+        bias = cls_pair_info.layer1.bias
+        scaling_parameter = torch.as_tensor(cls_pair_info.scale_factor, dtype=bias.dtype, device=bias.device)
+        scaling_parameter = scaling_parameter.reshape(-1)
 
         # Scaling gamma and beta parameter of batch norm layer
-        prev_layer_bn_params.gamma = bn_layers[cls_pair_info.layer1].weight.detach().numpy().reshape(-1)
-        prev_layer_bn_params.beta = bn_layers[cls_pair_info.layer1].bias.detach().numpy().reshape(-1)
+        gamma = bn_layers[cls_pair_info.layer1].weight.detach().to(device=bias.device).reshape(-1)
+        beta = bn_layers[cls_pair_info.layer1].bias.detach().to(device=bias.device).reshape(-1)
 
-        if len(scaling_parameter) != len(prev_layer_bn_params.gamma) or \
-                len(scaling_parameter) != len(prev_layer_bn_params.beta):
+        if len(scaling_parameter) != len(gamma) or len(scaling_parameter) != len(beta):
             raise ValueError("High Bias absorption is not supported for networks with fold-forward BatchNorms")
-        prev_layer_bn_params.gamma = np.divide(prev_layer_bn_params.gamma, scaling_parameter)
-        prev_layer_bn_params.beta = np.divide(prev_layer_bn_params.beta, scaling_parameter)
+        gamma = gamma / scaling_parameter
+        beta = beta / scaling_parameter
 
-    @staticmethod
-    def _pack_previous_and_current_layer_params(cls_pair_info, prev_layer_params, curr_layer_params):
-        """
-        Helper method to pack information of previous and current layer.
+        if not cls_pair_info.relu_activation_between_layers:
+            return beta
 
-        :param cls_pair_info: Layer pairs that were scaled using CLS and related information.
-        :param prev_layer_params: Data structure to pack previous layer parameters.
-        :param curr_layer_params: Data structure to pack current layer parameters.
-        """
-        prev_layer_params.activationIsRelu = cls_pair_info.relu_activation_between_layers
-        prev_layer_params.bias = cls_pair_info.layer1.bias.detach().numpy()
-
-        weight = cls_pair_info.layer2.weight
-
-        if isinstance(cls_pair_info.layer2, (torch.nn.Conv1d, torch.nn.ConvTranspose1d)):
-            weight = torch.unsqueeze(weight, dim=-1)
-
-        # Transpose weights to C, N, H, W from N, C, H, W since axis are flipped for transposed conv
-        if isinstance(cls_pair_info.layer2, (torch.nn.ConvTranspose1d, torch.nn.ConvTranspose2d)) and \
-                cls_pair_info.layer2.groups == 1:
-            weight = weight.permute(1, 0, 2, 3)
-
-        curr_layer_params.bias = cls_pair_info.layer2.bias.detach().numpy()
-        curr_layer_params.weight = weight.detach().numpy().reshape(-1)
-        curr_layer_params.weightShape = np.array(weight.shape)
+        return torch.clamp(beta - 3 * gamma.abs(), min=0)
 
     @staticmethod
     def _update_previous_and_current_layer_bias(cls_pair_info: ClsSetInfo.ClsSetLayerPairInfo,
-                                                prev_layer_params: libpymo.LayerParams,
-                                                curr_layer_params: libpymo.LayerParams):
+                                                absorb_bias: torch.Tensor):
         """
         Update biases for previous and current layer.
 
         :param cls_pair_info: Layer pairs that were scaled using CLS and related information.
-        :param prev_layer_params: Data structure holding weight and bias for previous layer in cls set.
-        :param curr_layer_params: Data structure holding weight and bias for current layer in cls set.
+        :param absorb_bias: Bias to be absorbed for each output channel of the previous layer.
         """
-        prev_layer_bias_shape = cls_pair_info.layer1.weight.shape[0]
-        if (isinstance(cls_pair_info.layer1, (torch.nn.ConvTranspose1d, torch.nn.ConvTranspose2d))) and \
-                (cls_pair_info.layer1.groups == 1):
-            prev_layer_bias_shape = cls_pair_info.layer1.weight.shape[1]
+        cls_pair_info.layer1.bias.data = cls_pair_info.layer1.bias.data - absorb_bias
 
-        cls_pair_info.layer1.bias.data = torch.from_numpy(np.reshape(prev_layer_params.bias,
-                                                                     prev_layer_bias_shape))
-        cls_pair_info.layer1.bias.data = cls_pair_info.layer1.bias.data.type(torch.FloatTensor)
+        # Sum the weight of current layer over its kernel, giving one value per output and input channel
+        weight = _get_weight_view(cls_pair_info.layer2)
+        reduced_weight = weight.sum(dim=list(range(2, weight.dim())))
 
-        cls_pair_info.layer2.bias.data = torch.from_numpy(np.reshape(curr_layer_params.bias,
-                                                                     curr_layer_params.weightShape[0]))
-        cls_pair_info.layer2.bias.data = cls_pair_info.layer2.bias.data.type(torch.FloatTensor)
+        if reduced_weight.shape[1] == 1:
+            # Depthwise layer
+            bias_correction = reduced_weight[:, 0] * absorb_bias
+        else:
+            bias_correction = reduced_weight @ absorb_bias
+
+        cls_pair_info.layer2.bias.data = cls_pair_info.layer2.bias.data + bias_correction
 
 
 def equalize_model(model: torch.nn.Module, input_shapes: Union[Tuple, List[Tuple]],
@@ -841,7 +730,9 @@ def equalize_model(model: torch.nn.Module, input_shapes: Union[Tuple, List[Tuple
         # The use of input_shapes will be removed in a future release. It is maintained now for backward compatibility.
         # Note, create_rand_tensors_given_shapes() creates all FP32 tensors where as some multi-input models might
         # additionally use Integer Tensors.
-        dummy_input = create_rand_tensors_given_shapes(input_shapes, torch.device('cpu'))
+        dummy_input = create_rand_tensors_given_shapes(input_shapes, get_device(model))
+    else:
+        dummy_input = utils.change_tensor_device_placement(dummy_input, get_device(model))
     if isinstance(dummy_input, (list, tuple)):
         input_shapes = [i.shape for i in dummy_input]
     else:
@@ -850,14 +741,10 @@ def equalize_model(model: torch.nn.Module, input_shapes: Union[Tuple, List[Tuple
     if isinstance(model, torch.nn.DataParallel):
         equalize_model(model.module, input_shapes, dummy_input)
     else:
-        device = get_device(model)
-        model.cpu()
         # fold batchnorm layers
         folded_pairs = fold_all_batch_norms(model, input_shapes, dummy_input)
         equalize_bn_folded_model(model, input_shapes, folded_pairs, dummy_input=dummy_input)
 
-        model.to(device=device)
-
 def equalize_bn_folded_model(model: torch.nn.Module,
                              input_shapes: Union[Tuple, List[Tuple]],
                              folded_pairs: List[Tuple[torch.nn.Module, torch.nn.BatchNorm2d]],
@@ -876,8 +763,6 @@ def equalize_bn_folded_model(model: torch.nn.Module,
     if isinstance(model, torch.nn.DataParallel):
         equalize_bn_folded_model(model.module, input_shapes, folded_pairs, dummy_input=dummy_input)
     else:
-        device = get_device(model)
-        model.cpu()
         bn_dict = {}
         for conv_bn in folded_pairs:
             bn_dict[conv_bn[0]] = conv_bn[1]
@@ -890,5 +775,3 @@ def equalize_bn_folded_model(model: torch.nn.Module,
 
         # high-bias fold
         HighBiasFold.bias_fold(cls_set_info_list, bn_dict)
-
-        model.to(device=device)
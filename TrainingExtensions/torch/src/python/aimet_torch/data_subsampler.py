@@ -37,9 +37,10 @@
 
 """ Sub-sample data for weight reconstruction for channel pruning feature """
 
-from typing import Iterator, Callable, Tuple, Union, List
+from typing import Iterator, Iterable, Callable, Tuple, Union, List, Optional, Dict
 import abc
 import math
+import tempfile
 import numpy as np
 
 import torch
@@ -50,9 +51,13 @@ import torch.nn
 from aimet_common.utils import AimetLogger
 from aimet_common.input_match_search import InputMatchSearch
 from aimet_torch import utils
+from aimet_torch.adaround.activation_sampler import SequentialActivationSampler
 
 logger = AimetLogger.get_area_logger(AimetLogger.LogAreas.ChannelPruning)
 
+# Number of output pixels sampled per image for weight reconstruction
+_SAMPLES_PER_IMAGE = 10
+
 
 class StopForwardException(Exception):
     """ Dummy exception to early-terminate forward-pass """
@@ -92,6 +97,57 @@ class LayerSubSampler(abc.ABC):
         :return: (sub sampled input data, sub sampled output data)
         """
 
+    @abc.abstractmethod
+    def select_output_pixels(self, orig_layer: torch.nn.Module, output_shape: torch.Size, samples_per_image: int,
+                             device: torch.device) -> Optional[Tuple[torch.Tensor, torch.Tensor, torch.Tensor]]:
+        """
+        Randomly select the output pixels to sub-sample
+
+        :param orig_layer: original layer
+        :param output_shape: shape of output data of original layer
+        :param samples_per_image: samples per image (default 10)
+        :param device: device to place the selected indices on
+        :return: (image indices, height indices, width indices) each of shape [num_images, samples_per_image],
+                 or None if no sub sampling is needed
+        """
+
+    @abc.abstractmethod
+    def get_input_matches(self, orig_layer: torch.nn.Module, input_data: torch.Tensor,
+                          output_pixels: Optional[Tuple[torch.Tensor, torch.Tensor, torch.Tensor]]) -> torch.Tensor:
+        """
+        :param orig_layer: original layer
+        :param input_data: input data collected from compressed model
+        :param output_pixels: output pixels returned by select_output_pixels
+        :return: sub sampled input data of shape [num_samples, num_features]
+        """
+
+    @abc.abstractmethod
+    def get_output_matches(self, output_data: torch.Tensor,
+                           output_pixels: Optional[Tuple[torch.Tensor, torch.Tensor, torch.Tensor]]) -> torch.Tensor:
+        """
+        :param output_data: output data collected from un compressed model
+        :param output_pixels: output pixels returned by select_output_pixels
+        :return: sub sampled output data of shape [num_samples, num_outputs]
+        """
+
+    def get_sub_sampled_tensors(self, orig_layer: torch.nn.Module, input_data: torch.Tensor,
+                                output_data: torch.Tensor, samples_per_image: int) -> Tuple[torch.Tensor, torch.Tensor]:
+        """
+        Same as get_sub_sampled_data, but sub-samples torch tensors on their device
+
+        :param orig_layer: original layer
+        :param input_data: input data collected from compressed model
+        :param output_data: output data collected from un compressed model
+        :param samples_per_image: samples per image (default 10)
+        :return: (sub sampled input data of shape [num_samples, num_features],
+                  sub sampled output data of shape [num_samples, num_outputs])
+        """
+        output_pixels = self.select_output_pixels(orig_layer, output_data.shape, samples_per_image,
+                                                  output_data.device)
+
+        return self.get_input_matches(orig_layer, input_data, output_pixels), \
+            self.get_output_matches(output_data, output_pixels)
+
 
 class Conv2dSubSampler(LayerSubSampler):
     """
@@ -127,6 +183,48 @@ class Conv2dSubSampler(LayerSubSampler):
 
         return sub_sampled_inp_data, sub_sampled_out_data
 
+    def select_output_pixels(self, orig_layer: torch.nn.Module, output_shape: torch.Size, samples_per_image: int,
+                             device: torch.device) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+
+        layer_attributes = (orig_layer.kernel_size, orig_layer.stride, orig_layer.padding)
+
+        height_range, width_range = \
+            InputMatchSearch._determine_output_pixel_height_width_range_for_random_selection( # pylint: disable=protected-access
+                layer_attributes=layer_attributes, out_shape=output_shape)
+
+        # randomly pick samples per image for height and width dimension
+        num_images = output_shape[0]
+        heights = torch.randint(*height_range, size=(num_images, samples_per_image), device=device)
+        widths = torch.randint(*width_range, size=(num_images, samples_per_image), device=device)
+        images = torch.arange(num_images, device=device).unsqueeze(1).expand_as(heights)
+
+        return images, heights, widths
+
+    def get_input_matches(self, orig_layer: torch.nn.Module, input_data: torch.Tensor,
+                          output_pixels: Tuple[torch.Tensor, torch.Tensor, torch.Tensor]) -> torch.Tensor:
+
+        (kernel_h, kernel_w), (stride_h, stride_w), (padding_h, padding_w) = \
+            orig_layer.kernel_size, orig_layer.stride, orig_layer.padding
+        images, heights, widths = output_pixels
+        device = input_data.device
+
+        # Input match of output pixel (h, w) is the kernel window at (h * stride, w * stride) of zero-padded input
+        padded_input_data = torch.nn.functional.pad(input_data, (padding_w, padding_w, padding_h, padding_h))
+        rows = (heights * stride_h).unsqueeze(-1) + torch.arange(kernel_h, device=device)
+        cols = (widths * stride_w).unsqueeze(-1) + torch.arange(kernel_w, device=device)
+
+        # [num_images, samples_per_image, k_h, k_w, Nic] -> [num_images * samples_per_image, Nic * k_h * k_w]
+        input_matches = padded_input_data[images[..., None, None], :, rows[..., :, None], cols[..., None, :]]
+        return input_matches.permute(0, 1, 4, 2, 3).reshape(images.numel(), -1)
+
+    def get_output_matches(self, output_data: torch.Tensor,
+                           output_pixels: Tuple[torch.Tensor, torch.Tensor, torch.Tensor]) -> torch.Tensor:
+
+        images, heights, widths = output_pixels
+
+        # [num_images, samples_per_image, Noc] -> [num_images * samples_per_image, Noc]
+        return output_data[images, :, heights, widths].reshape(images.numel(), -1)
+
 
 class LinearSubSampler(LayerSubSampler):
     """
@@ -155,6 +253,23 @@ class LinearSubSampler(LayerSubSampler):
         # just return the input and output data as it is. No sub sampling needed
         return input_data, output_data
 
+    def select_output_pixels(self, orig_layer: torch.nn.Module, output_shape: torch.Size, samples_per_image: int,
+                             device: torch.device) -> None:
+
+        # No sub sampling needed
+        return None
+
+    def get_input_matches(self, orig_layer: torch.nn.Module, input_data: torch.Tensor,
+                          output_pixels: None) -> torch.Tensor:
+
+        # just return the input data as it is. No sub sampling needed
+        return input_data
+
+    def get_output_matches(self, output_data: torch.Tensor, output_pixels: None) -> torch.Tensor:
+
+        # just return the output data as it is. No sub sampling needed
+        return output_data
+
 
 class DataSubSampler:
     """ Utilities to sub-sample data for weight reconstruction """
@@ -193,14 +308,61 @@ class DataSubSampler:
         hook_handle = layer.register_forward_hook(hook)
         return hook_handle
 
+    @staticmethod
+    def _get_layer_sub_sampler(orig_layer: Union[torch.nn.Conv2d, torch.nn.Linear],
+                               pruned_layer: Union[torch.nn.Conv2d, torch.nn.Linear]) -> LayerSubSampler:
+        """
+        Get the sub sampler depending on the layer type
+
+        :param orig_layer: original layer
+        :param pruned_layer: pruned layer
+        :return: sub sampler
+        """
+        if isinstance(orig_layer, torch.nn.Conv2d) and isinstance(pruned_layer, torch.nn.Conv2d):
+            sub_sampler = Conv2dSubSampler()
+
+        elif isinstance(orig_layer, torch.nn.Linear) and isinstance(pruned_layer, torch.nn.Linear):
+            sub_sampler = LinearSubSampler()
+
+        else:
+            raise ValueError('Layer type not supported!')
+
+        # verify the layers
+        sub_sampler.verify_layers(orig_layer, pruned_layer)
+
+        return sub_sampler
+
+    @staticmethod
+    def _get_number_of_batches(sub_sampler: LayerSubSampler, data_loader: Iterator,
+                               orig_layer: Union[torch.nn.Conv2d, torch.nn.Linear],
+                               num_reconstruction_samples: int) -> int:
+        """
+        Get number of batches depending on the layer type
+
+        :param sub_sampler: sub sampler for the layer type
+        :param data_loader: data loader
+        :param orig_layer: original layer
+        :param num_reconstruction_samples: The number of reconstruction samples
+        :return: number of batches
+        """
+        num_of_batches = sub_sampler.get_number_of_batches(data_loader, orig_layer, num_reconstruction_samples,
+                                                           _SAMPLES_PER_IMAGE)
+
+        # Todo - I am not sure if checking the length of a data loader is a great idea.
+        if num_of_batches > len(data_loader) or num_of_batches < 1:
+            raise ValueError("There are insufficient batches of data in the provided data loader for the "
+                             "purpose of weight reconstruction or number of reconstruction samples!")
+
+        return num_of_batches
+
     @classmethod
-    def get_sub_sampled_data(cls, orig_layer: Union[torch.nn.Conv2d, torch.nn.Linear],
-                             pruned_layer: Union[torch.nn.Conv2d, torch.nn.Linear],
-                             orig_model: torch.nn.Module, comp_model: torch.nn.Module, data_loader: Iterator,
-                             num_reconstruction_samples: int) -> (np.ndarray, np.ndarray):
-        # pylint: disable=too-many-locals
+    def _collect_layer_data(cls, orig_layer: Union[torch.nn.Conv2d, torch.nn.Linear],
+                            pruned_layer: Union[torch.nn.Conv2d, torch.nn.Linear],
+                            orig_model: torch.nn.Module, comp_model: torch.nn.Module, data_loader: Iterator,
+                            num_reconstruction_samples: int) \
+            -> Iterator[Tuple[LayerSubSampler, torch.Tensor, torch.Tensor]]:
         """
-        Get all the input data from pruned model and output data from original model
+        Generator of the input data of pruned layer and output data of original layer for each batch
 
         :param orig_layer: original layer
         :param pruned_layer: pruned layer
@@ -208,96 +370,416 @@ class DataSubSampler:
         :param comp_model: comp. model, this is potentially already pruned in the upstreams layers of given layer name
         :param data_loader: data loader
         :param num_reconstruction_samples: The number of reconstruction samples
-        :return: input_data, output_data
+        :return: (sub sampler for the layer type, input_data, output_data) for each batch
         """
 
         def _hook_to_collect_input_data(module, inp_data, _):  # pylint: disable=unused-argument
             """
             hook to collect input data
             """
-            inp_data = utils.to_numpy(inp_data[0])
-            pruned_layer_inp_data.append(inp_data)
+            pruned_layer_inp_data.append(inp_data[0].detach())
             raise StopForwardException
 
         def _hook_to_collect_output_data(module, _, out_data):  # pylint: disable=unused-argument
             """
             hook to collect output data
             """
-            out_data = utils.to_numpy(out_data)
-            orig_layer_out_data.append(out_data)
+            orig_layer_out_data.append(out_data.detach())
             raise StopForwardException
 
-        if isinstance(orig_layer, torch.nn.Conv2d) and isinstance(pruned_layer, torch.nn.Conv2d):
-            sub_sampler = Conv2dSubSampler()
+        sub_sampler = cls._get_layer_sub_sampler(orig_layer, pruned_layer)
+        num_of_batches = cls._get_number_of_batches(sub_sampler, data_loader, orig_layer, num_reconstruction_samples)
 
-        elif isinstance(orig_layer, torch.nn.Linear) and isinstance(pruned_layer, torch.nn.Linear):
-            sub_sampler = LinearSubSampler()
+        hook_handles = list()
 
-        else:
-            raise ValueError('Layer type not supported!')
+        orig_layer_out_data = list()
+        pruned_layer_inp_data = list()
 
-        # verify the layers
-        sub_sampler.verify_layers(orig_layer, pruned_layer)
+        # register forward hooks
+        hook_handles.append(cls._register_fwd_hook_for_layer(orig_layer, _hook_to_collect_output_data))
 
-        # hard coded value
-        samples_per_image = 10
+        hook_handles.append(cls._register_fwd_hook_for_layer(pruned_layer, _hook_to_collect_input_data))
 
-        # get number of batches depending on the layer type
-        num_of_batches = sub_sampler.get_number_of_batches(data_loader, orig_layer, num_reconstruction_samples,
-                                                           samples_per_image)
+        try:
+            # forward pass for given number of batches for both original model and compressed model
+            for batch_index, batch in enumerate(data_loader):
 
-        # Todo - I am not sure if checking the length of a data loader is a great idea.
-        if num_of_batches > len(data_loader) or num_of_batches < 1:
-            raise ValueError("There are insufficient batches of data in the provided data loader for the "
-                             "purpose of weight reconstruction or number of reconstruction samples!")
+                assert isinstance(batch, (tuple, list)), 'data loader should provide data in list or tuple format' \
+                                                         '(input_data, labels) or [input_data, labels]'
 
-        hook_handles = list()
+                batch, _ = batch
 
-        orig_layer_out_data = list()
-        pruned_layer_inp_data = list()
+                DataSubSampler._forward_pass(orig_model, batch)
+                DataSubSampler._forward_pass(comp_model, batch)
+
+                input_data = torch.cat(pruned_layer_inp_data)
+                output_data = torch.cat(orig_layer_out_data)
+
+                # delete list entries used for hooks
+                del pruned_layer_inp_data[:]
+                del orig_layer_out_data[:]
+
+                yield sub_sampler, input_data, output_data
 
+                if batch_index == num_of_batches - 1:
+                    logger.debug("batch index : %s reached number of batches: %s", batch_index + 1, num_of_batches)
+                    break
+        finally:
+            # remove hook handles
+            for hook_handle in hook_handles:
+                hook_handle.remove()
+
+    @classmethod
+    def get_sub_sampled_data(cls, orig_layer: Union[torch.nn.Conv2d, torch.nn.Linear],
+                             pruned_layer: Union[torch.nn.Conv2d, torch.nn.Linear],
+                             orig_model: torch.nn.Module, comp_model: torch.nn.Module, data_loader: Iterator,
+                             num_reconstruction_samples: int) -> (np.ndarray, np.ndarray):
+        """
+        Get all the input data from pruned model and output data from original model
+
+        :param orig_layer: original layer
+        :param pruned_layer: pruned layer
+        :param orig_model: original model, un-pruned, used to provide the actual outputs
+        :param comp_model: comp. model, this is potentially already pruned in the upstreams layers of given layer name
+        :param data_loader: data loader
+        :param num_reconstruction_samples: The number of reconstruction samples
+        :return: input_data, output_data
+        """
         all_sub_sampled_inp_data = list()
         all_sub_sampled_out_data = list()
 
-        # register forward hooks
-        hook_handles.append(cls._register_fwd_hook_for_layer(orig_layer, _hook_to_collect_output_data))
+        for sub_sampler, input_data, output_data in cls._collect_layer_data(orig_layer, pruned_layer,
+                                                                             orig_model, comp_model,
+                                                                             data_loader, num_reconstruction_samples):
+            # get the sub sampled input and output data depending on layer type
+            sub_sampled_inp_data, sub_sampled_out_data = sub_sampler.get_sub_sampled_data(orig_layer,
+                                                                                          utils.to_numpy(input_data),
+                                                                                          utils.to_numpy(output_data),
+                                                                                          _SAMPLES_PER_IMAGE)
 
-        hook_handles.append(cls._register_fwd_hook_for_layer(pruned_layer, _hook_to_collect_input_data))
+            all_sub_sampled_inp_data.append(sub_sampled_inp_data)
+            all_sub_sampled_out_data.append(sub_sampled_out_data)
+
+        # accumulate total sub sampled input and output data
 
-        # forward pass for given number of batches for both original model and compressed model
-        for batch_index, batch in enumerate(data_loader):
+        return np.vstack(all_sub_sampled_inp_data), np.vstack(all_sub_sampled_out_data)
+
+    @classmethod
+    def get_normal_equations(cls, orig_layer: Union[torch.nn.Conv2d, torch.nn.Linear],
+                             pruned_layer: Union[torch.nn.Conv2d, torch.nn.Linear],
+                             orig_model: torch.nn.Module, comp_model: torch.nn.Module, data_loader: Iterator,
+                             num_reconstruction_samples: int, fit_intercept: bool) -> Tuple[torch.Tensor, torch.Tensor]:
+        """
+        Get the normal equations X^T X and X^T Y of the least squares problem X W = Y, where X is the sub-sampled
+        input data from pruned model and Y is the corresponding output data from original model.
+        The normal equations are accumulated batch by batch on the device of the model, so the full sub-sampled
+        data is never materialized.
+
+        :param orig_layer: original layer
+        :param pruned_layer: pruned layer
+        :param orig_model: original model, un-pruned, used to provide the actual outputs
+        :param comp_model: comp. model, this is potentially already pruned in the upstreams layers of given layer name
+        :param data_loader: data loader
+        :param num_reconstruction_samples: The number of reconstruction samples
+        :param fit_intercept: If True, X is augmented with a column of ones to fit the bias
+        :return: X^T X of shape [num_features (+ 1), num_features (+ 1)],
+                 X^T Y of shape [num_features (+ 1), num_outputs] in float64
+        """
+        def _sub_sampled_tensors():
+            for sub_sampler, input_data, output_data in cls._collect_layer_data(orig_layer, pruned_layer,
+                                                                                 orig_model, comp_model, data_loader,
+                                                                                 num_reconstruction_samples):
+                # get the sub sampled input and output data depending on layer type
+                yield sub_sampler.get_sub_sampled_tensors(orig_layer, input_data, output_data, _SAMPLES_PER_IMAGE)
+
+        return cls._accumulate_normal_equations(_sub_sampled_tensors(), fit_intercept)
+
+    @staticmethod
+    def _accumulate_normal_equations(sub_sampled_data: Iterable[Tuple[torch.Tensor, torch.Tensor]],
+                                     fit_intercept: bool) -> Tuple[torch.Tensor, torch.Tensor]:
+        """
+        Accumulate the normal equations X^T X and X^T Y over the chunks of sub sampled data
+
+        :param sub_sampled_data: Iterable of (sub sampled input data, sub sampled output data)
+        :param fit_intercept: If True, X is augmented with a column of ones to fit the bias
+        :return: X^T X, X^T Y in float64
+        """
+        xtx = xty = None
+
+        for sub_sampled_inp_data, sub_sampled_out_data in sub_sampled_data:
+            # Accumulate in float64 since normal equations square the condition number
+            sub_sampled_inp_data = sub_sampled_inp_data.reshape(sub_sampled_inp_data.shape[0], -1).double()
+            sub_sampled_out_data = sub_sampled_out_data.double()
+
+            if fit_intercept:
+                ones = torch.ones_like(sub_sampled_inp_data[:, :1])
+                sub_sampled_inp_data = torch.cat([sub_sampled_inp_data, ones], dim=1)
+
+            if xtx is None:
+                xtx = sub_sampled_inp_data.T @ sub_sampled_inp_data
+                xty = sub_sampled_inp_data.T @ sub_sampled_out_data
+            else:
+                xtx.addmm_(sub_sampled_inp_data.T, sub_sampled_inp_data)
+                xty.addmm_(sub_sampled_inp_data.T, sub_sampled_out_data)
+
+        return xtx, xty
+
+
+class ActivationFrontier:
+    """
+    Per batch cache of the data for reconstructing a sequence of layers in order of occurrence.
+
+    The batches of the data loader are loaded once and kept on CPU. If the original model can be symbolically traced,
+    the original and compressed models are advanced from one layer to reconstruct to the next with a
+    SequentialActivationSampler, starting from the activations at the previous layer instead of the model inputs.
+    Hence, each model runs over the batches about once in total, instead of once per layer. Modules of the compressed
+    model modified since the previous layer must be reported with invalidate(), so that the compressed frontier is
+    recomputed if they precede it.
+
+    Otherwise, the original model is run once over the batches to record the sub sampled output data of all the
+    layers to reconstruct, and reconstructing each layer needs a forward pass of the compressed model up to that layer,
+    starting from the cached batches. The recorded data are kept on CPU, and each batch is moved to the device of
+    the model only while it is used.
+    """
+
+    def __init__(self, orig_model: torch.nn.Module, orig_layers: List[Union[torch.nn.Conv2d, torch.nn.Linear]],
+                 data_loader: Iterator, num_reconstruction_samples: int):
+        """
+        :param orig_model: original model, un-pruned, used to provide the actual outputs
+        :param orig_layers: layers of original model to reconstruct, in order of occurrence
+        :param data_loader: data loader
+        :param num_reconstruction_samples: The number of reconstruction samples
+        """
+        self._orig_model = orig_model
+        self._orig_layers = orig_layers
+        self._data_loader = data_loader
+        self._num_reconstruction_samples = num_reconstruction_samples
+
+        self._batches = None
+        # original layer -> number of batches to sub sample the layer from
+        self._num_of_batches: Dict[torch.nn.Module, int] = {}
+        # original layer -> list of (output pixels, sub sampled output data) per batch
+        self._orig_out_data: Optional[Dict[torch.nn.Module, List[Tuple]]] = None
+
+        self._layer_names = {module: name for name, module in orig_model.named_modules()}
+        self._comp_model = None
+        self._sampler = None
+        self._sampler_dir = None
+
+    def __contains__(self, orig_layer: torch.nn.Module) -> bool:
+        return any(orig_layer is layer for layer in self._orig_layers)
+
+    def close(self):
+        """
+        Release the cached batches and the frontier of the sampler
+        """
+        self._batches = None
+        self._orig_out_data = None
+        self._comp_model = None
+        self._sampler = None
+        if self._sampler_dir is not None:
+            self._sampler_dir.cleanup()
+            self._sampler_dir = None
+
+    def invalidate(self, comp_module_names: Iterable[str]):
+        """
+        Report modules of the compressed model modified in place, e.g. by winnowing, since the last call to
+        get_normal_equations.
+
+        :param comp_module_names: names of the modified modules
+        """
+        if self._sampler is not None:
+            self._sampler.invalidate(comp_module_names)
+
+    def _load_batches(self):
+        """
+        Cache the batches needed to sub sample all the original layers
+        """
+        # pylint: disable=protected-access
+        for layer in self._orig_layers:
+            sub_sampler = DataSubSampler._get_layer_sub_sampler(layer, layer)
+            self._num_of_batches[layer] = DataSubSampler._get_number_of_batches(sub_sampler, self._data_loader, layer,
+                                                                                self._num_reconstruction_samples)
+        self._batches = list()
+        cpu = torch.device('cpu')
+        for batch in self._data_loader:
 
             assert isinstance(batch, (tuple, list)), 'data loader should provide data in list or tuple format' \
                                                      '(input_data, labels) or [input_data, labels]'
 
             batch, _ = batch
+            self._batches.append(utils.change_tensor_device_placement(batch, cpu))
 
-            DataSubSampler._forward_pass(orig_model, batch)
-            DataSubSampler._forward_pass(comp_model, batch)
+            if len(self._batches) == max(self._num_of_batches.values()):
+                break
 
-            input_data = np.vstack(pruned_layer_inp_data)
-            output_data = np.vstack(orig_layer_out_data)
+    def _record(self):
+        """
+        Record sub sampled output data of all the original layers in one pass over the cached batches
+        """
+        # pylint: disable=protected-access
+        sub_samplers = {layer: DataSubSampler._get_layer_sub_sampler(layer, layer) for layer in self._orig_layers}
+        pending_layers = list()
 
-            # delete list entries used for hooks
-            del pruned_layer_inp_data[:]
-            del orig_layer_out_data[:]
+        def _make_hook_to_record_output_data(layer: torch.nn.Module) -> Callable:
+            def _hook_to_record_output_data(module, _, out_data):  # pylint: disable=unused-argument
+                """
+                hook to record sub sampled output data, stops forward pass once all the layers are recorded
+                """
+                if layer not in pending_layers:
+                    return
 
-            # get the sub sampled input and output data depending on layer type
-            sub_sampled_inp_data, sub_sampled_out_data = sub_sampler.get_sub_sampled_data(orig_layer, input_data,
-                                                                                          output_data,
-                                                                                          samples_per_image)
+                out_data = out_data.detach()
+                output_pixels = sub_samplers[layer].select_output_pixels(layer, out_data.shape, _SAMPLES_PER_IMAGE,
+                                                                         out_data.device)
+                output_matches = sub_samplers[layer].get_output_matches(out_data, output_pixels)
+                self._orig_out_data[layer].append((utils.change_tensor_device_placement(output_pixels, cpu),
+                                                   output_matches.to(cpu)))
 
-            all_sub_sampled_inp_data.append(sub_sampled_inp_data)
-            all_sub_sampled_out_data.append(sub_sampled_out_data)
+                pending_layers.remove(layer)
+                if not pending_layers:
+                    raise StopForwardException
 
-            if batch_index == num_of_batches - 1:
-                logger.debug("batch index : %s reached number of batches: %s", batch_index + 1, num_of_batches)
-                break
+            return _hook_to_record_output_data
+
+        self._orig_out_data = {layer: list() for layer in self._orig_layers}
+        hook_handles = [DataSubSampler._register_fwd_hook_for_layer(layer, _make_hook_to_record_output_data(layer))
+                        for layer in self._orig_layers]
+
+        cpu = torch.device('cpu')
+
+        try:
+            for batch_index, batch in enumerate(self._batches):
+                pending_layers[:] = [layer for layer in self._orig_layers
+                                     if batch_index < self._num_of_batches[layer]]
+                DataSubSampler._forward_pass(self._orig_model, batch)
+        finally:
+            for hook_handle in hook_handles:
+                hook_handle.remove()
+
+    def _get_sampler(self, comp_model: torch.nn.Module) -> Optional[SequentialActivationSampler]:
+        """
+        Returns the sampler of the original and the given compressed model, or None if the original model can't be
+        symbolically traced
+        """
+        if comp_model is not self._comp_model:
+            if self._sampler_dir is not None:
+                self._sampler_dir.cleanup()
+            # Frontier of every batch is spilled to disk, so that only the activations of one batch are in memory
+            self._sampler_dir = tempfile.TemporaryDirectory() # pylint: disable=consider-using-with
+            cached_dataset = [(batch, None) for batch in self._batches]
+            self._sampler = SequentialActivationSampler.create(self._orig_model, comp_model, cached_dataset,
+                                                               self._sampler_dir.name)
+            self._comp_model = comp_model
+        return self._sampler
+
+    def get_normal_equations(self, orig_layer: Union[torch.nn.Conv2d, torch.nn.Linear],
+                             pruned_layer: Union[torch.nn.Conv2d, torch.nn.Linear],
+                             comp_model: torch.nn.Module, fit_intercept: bool) -> Tuple[torch.Tensor, torch.Tensor]:
+        """
+        Same as DataSubSampler.get_normal_equations, but uses the cached batches, advancing the frontier of both the
+        models up to the given layer if possible.
+
+        :param orig_layer: original layer
+        :param pruned_layer: pruned layer
+        :param comp_model: comp. model, this is potentially already pruned in the upstreams layers of given layer name
+        :param fit_intercept: If True, X is augmented with a column of ones to fit the bias
+        :return: X^T X, X^T Y in float64
+        """
+        assert orig_layer in self
+
+        if self._batches is None:
+            self._load_batches()
+
+        sampler = self._get_sampler(comp_model) if self._orig_out_data is None else None
+        sampled_inputs = sampler.sample_inputs(self._layer_names[orig_layer]) if sampler is not None else None
+        if sampled_inputs is None:
+            sub_sampled_tensors = self._sub_sampled_tensors_from_batches(orig_layer, pruned_layer, comp_model)
+        else:
+            sub_sampled_tensors = self._sub_sampled_tensors_from_frontier(orig_layer, pruned_layer, comp_model,
+                                                                          sampled_inputs)
+
+        # pylint: disable=protected-access
+        return DataSubSampler._accumulate_normal_equations(sub_sampled_tensors, fit_intercept)
 
-        # remove hook handles
-        for hook_handle in hook_handles:
+    def _sub_sampled_tensors_from_frontier(self, orig_layer: torch.nn.Module, pruned_layer: torch.nn.Module,
+                                           comp_model: torch.nn.Module, sampled_inputs: torch.utils.data.Dataset):
+        """
+        Yields sub sampled input and output data of every batch, computed from the inputs of the layer in the
+        frontier of the original and the compressed model
+        """
+        # pylint: disable=protected-access
+        sub_sampler = DataSubSampler._get_layer_sub_sampler(orig_layer, pruned_layer)
+        # Pruned layer may have been replaced in the compressed model, e.g. prepended with a down sample layer
+        comp_module = utils.get_named_module(comp_model, self._layer_names[orig_layer])
+        orig_device = utils.get_device(self._orig_model)
+        comp_device = utils.get_device(comp_model)
+        pruned_layer_inp_data = list()
+
+        def _hook_to_collect_input_data(module, inp_data, _):  # pylint: disable=unused-argument
+            """
+            hook to collect input data
+            """
+            pruned_layer_inp_data.append(inp_data[0].detach())
+            raise StopForwardException
+
+        hook_handle = DataSubSampler._register_fwd_hook_for_layer(pruned_layer, _hook_to_collect_input_data)
+
+        try:
+            with utils.in_eval_mode([orig_layer, comp_module]), torch.no_grad():
+                for batch_index in range(self._num_of_batches[orig_layer]):
+                    orig_inputs, comp_inputs = sampled_inputs[batch_index]
+
+                    out_data = orig_layer(*utils.change_tensor_device_placement(orig_inputs, orig_device))
+                    output_pixels = sub_sampler.select_output_pixels(orig_layer, out_data.shape, _SAMPLES_PER_IMAGE,
+                                                                     out_data.device)
+                    output_matches = sub_sampler.get_output_matches(out_data, output_pixels)
+
+                    try:
+                        comp_module(*utils.change_tensor_device_placement(comp_inputs, comp_device))
+                    except StopForwardException:
+                        pass
+                    input_data = pruned_layer_inp_data.pop()
+
+                    output_pixels = utils.change_tensor_device_placement(output_pixels, input_data.device)
+                    yield sub_sampler.get_input_matches(orig_layer, input_data, output_pixels), \
+                        output_matches.to(input_data.device)
+        finally:
             hook_handle.remove()
 
-        # accumulate total sub sampled input and output data
+    def _sub_sampled_tensors_from_batches(self, orig_layer: torch.nn.Module, pruned_layer: torch.nn.Module,
+                                          comp_model: torch.nn.Module):
+        """
+        Yields sub sampled input and output data of every batch, using the recorded output data of the original layer
+        and running the compressed model from the cached batches. Recorded output data of the layer is released
+        afterwards.
+        """
+        # pylint: disable=protected-access
+        if self._orig_out_data is None:
+            self._record()
 
-        return np.vstack(all_sub_sampled_inp_data), np.vstack(all_sub_sampled_out_data)
+        sub_sampler = DataSubSampler._get_layer_sub_sampler(orig_layer, pruned_layer)
+        orig_out_data = self._orig_out_data.pop(orig_layer)
+        pruned_layer_inp_data = list()
+
+        def _hook_to_collect_input_data(module, inp_data, _):  # pylint: disable=unused-argument
+            """
+            hook to collect input data
+            """
+            pruned_layer_inp_data.append(inp_data[0].detach())
+            raise StopForwardException
+
+        hook_handle = DataSubSampler._register_fwd_hook_for_layer(pruned_layer, _hook_to_collect_input_data)
+
+        try:
+            for batch, (output_pixels, output_matches) in zip(self._batches, orig_out_data):
+                DataSubSampler._forward_pass(comp_model, batch)
+
+                input_data = torch.cat(pruned_layer_inp_data)
+                del pruned_layer_inp_data[:]
+
+                output_pixels = utils.change_tensor_device_placement(output_pixels, input_data.device)
+                yield sub_sampler.get_input_matches(orig_layer, input_data, output_pixels), \
+                    output_matches.to(input_data.device)
+        finally:
+            hook_handle.remove()
@@ -37,7 +37,7 @@
 
 """Stores and updates Layer Attributes"""
 import copy
-from typing import Tuple, Union, List
+from typing import Tuple, Union, List, Optional
 import torch
 
 from aimet_common.utils import AimetLogger
@@ -95,6 +95,9 @@ class LayerDatabase(aimet_common.layer_database.LayerDatabase):
     Also stores compressible layers to model optimization
     """
 
+    # (parent module, attribute name, original module) of the modules swapped into the model by an overlay
+    _swapped_modules: Optional[List[Tuple[torch.nn.Module, str, torch.nn.Module]]] = None
+
     def __init__(self, model: torch.nn.Module, dummy_input: Union[torch.Tensor, Tuple]):
         """
         LayerDatabase constructor
@@ -136,6 +139,30 @@ class LayerDatabase(aimet_common.layer_database.LayerDatabase):
         layer_db.set_reference_to_parent_module(layer_db._model, layer_db._compressible_layers)
         return layer_db
 
+    def overlay(self) -> 'LayerDatabase':
+        """
+        Creates a copy-on-write overlay of the layer database.
+        The overlay shares the model and all unmodified modules with this database instead of cloning them.
+        Layers replaced in the overlay are swapped into the shared model, and swapped back when the overlay is
+        destroyed. This database should not be used until then.
+
+        :return: Overlay of the layer database
+        """
+        # pylint: disable=protected-access
+        layer_db = copy.copy(self)
+        layer_db._compressible_layers = copy.copy(self._compressible_layers)
+        layer_db._swapped_modules = []
+        return layer_db
+
+    def _swap_module(self, parent_module: torch.nn.Module, var_name_in_parent: str, new_module: torch.nn.Module):
+        """
+        Replace a child module of the model, keeping track of the original module if this is an overlay
+        """
+        if self._swapped_modules is not None:
+            self._swapped_modules.append((parent_module, var_name_in_parent,
+                                          getattr(parent_module, var_name_in_parent)))
+        setattr(parent_module, var_name_in_parent, new_module)
+
     def replace_layer(self, old_layer: Layer, new_layer: Layer):
         """
         Replace given layer with a new layer in the LayerDatabase
@@ -165,7 +192,7 @@ class LayerDatabase(aimet_common.layer_database.LayerDatabase):
         seq = torch.nn.Sequential(layer_a.module, layer_b.module)
 
         # Replace the original layer_to_replace in the model with this sequential
-        setattr(layer_to_replace.parent_module, layer_to_replace.var_name_of_module_in_parent, seq)
+        self._swap_module(layer_to_replace.parent_module, layer_to_replace.var_name_of_module_in_parent, seq)
 
         # Set parent correctly
         layer_a.parent_module = seq
@@ -281,8 +308,14 @@ class LayerDatabase(aimet_common.layer_database.LayerDatabase):
 
     def destroy(self):
         """
-        Destroys the layer database
+        Destroys the layer database.
+        If this is an overlay, the modules swapped into the shared model are restored
         """
+        if self._swapped_modules is not None:
+            for parent_module, var_name_in_parent, orig_module in reversed(self._swapped_modules):
+                setattr(parent_module, var_name_in_parent, orig_module)
+            self._swapped_modules.clear()
+
         # clear the dictionary
         self._compressible_layers.clear()
         self._model = None
@@ -38,9 +38,11 @@
 """ This module contains utilities to capture and save intermediate layer-outputs of a model. """
 
 import os
-from typing import Union, Dict, List, Tuple
+from typing import Callable, Union, Dict, List, Tuple, Optional
 from enum import Enum
+import queue
 import shutil
+import threading
 import re
 
 import numpy as np
@@ -56,6 +58,7 @@ from aimet_torch import torchscript_utils
 from aimet_torch.onnx_utils import OnnxSaver, OnnxExportApiArgs
 from aimet_torch.qc_quantize_recurrent import QcQuantizeRecurrent
 from aimet_torch.v2.nn.base import BaseQuantizationMixin
+from aimet_torch.tensor_store import TensorStore
 
 logger = AimetLogger.get_area_logger(AimetLogger.LogAreas.LayerOutputs)
 
@@ -74,8 +77,13 @@ class NamingScheme(Enum):
 class LayerOutputUtil:
     """ Implementation to capture and save outputs of intermediate layers of a model (fp32/quantsim). """
 
+    STREAMED_INPUTS_DIR = 'streamed_inputs'
+    STREAMED_OUTPUTS_DIR = 'streamed_outputs'
+
     def __init__(self, model: torch.nn.Module, dir_path: str, naming_scheme: NamingScheme = NamingScheme.PYTORCH,
-                 dummy_input: Union[torch.Tensor, Tuple, List] = None, onnx_export_args: Union[OnnxExportApiArgs, Dict] = None):
+                 dummy_input: Union[torch.Tensor, Tuple, List] = None, onnx_export_args: Union[OnnxExportApiArgs, Dict] = None,
+                 layer_output_names: Optional[List[str]] = None, streaming: bool = False,
+                 chunk_size: Optional[int] = None):
         """
         Constructor for LayerOutputUtil.
 
@@ -87,15 +95,25 @@ class LayerOutputUtil:
         :param onnx_export_args: Should be same as that passed to quantsim export API to have consistency between
             layer-output names present in exported onnx model and generated layer-outputs. Required if naming_scheme is
             'NamingScheme.ONNX'.
+        :param layer_output_names: Names of the layer-outputs to save. If None, outputs of all the layers are saved.
+        :param streaming: If True, each layer-output is handed over to a background thread as soon as it is produced
+            and appended to a memory-mapped store under dir_path, instead of saving all the layer-outputs of a batch
+            as raw files at once. Streamed layer-outputs can be read with load_streamed_layer_output().
+        :param chunk_size: If given, input batches are split into chunks of this many input instances which are
+            processed one at a time.
         """
 
         # Utility to capture layer-outputs
         self.layer_output = LayerOutput(model=model, naming_scheme=naming_scheme, dir_path=dir_path, dummy_input=dummy_input,
-                                        onnx_export_args=onnx_export_args)
+                                        onnx_export_args=onnx_export_args, layer_output_names=layer_output_names)
 
         # Utility to save model inputs and their corresponding layer-outputs
         self.save_input_output = SaveInputOutput(dir_path=dir_path, axis_layout='NCHW')
 
+        self.dir_path = dir_path
+        self.streaming = streaming
+        self.chunk_size = chunk_size
+
     def generate_layer_outputs(self, input_batch: Union[torch.Tensor, List[torch.Tensor], Tuple[torch.Tensor]]):
         """
         This method captures output of every layer of a model & saves the inputs and corresponding layer-outputs to disk.
@@ -107,18 +125,82 @@ class LayerOutputUtil:
         input_instance_count = len(input_batch) if isinstance(input_batch, torch.Tensor) else len(input_batch[0])
         logger.info("Generating layer-outputs for %d input instances", input_instance_count)
 
-        # Obtain layer-output name to output dictionary
-        layer_output_batch_dict = self.layer_output.get_outputs(input_batch)
+        if self.streaming:
+            self._stream_layer_outputs(input_batch)
+        else:
+            for input_chunk in self._split_input_batch(input_batch):
+                # Obtain layer-output name to output dictionary
+                layer_output_batch_dict = self.layer_output.get_outputs(input_chunk)
 
-        # Place inputs and layer-outputs on CPU
-        input_batch = LayerOutputUtil._get_input_batch_in_numpy(input_batch)
-        layer_output_batch_dict = LayerOutputUtil._get_layer_output_batch_in_numpy(layer_output_batch_dict)
+                # Place inputs and layer-outputs on CPU
+                input_chunk = LayerOutputUtil._get_input_batch_in_numpy(input_chunk)
+                layer_output_batch_dict = LayerOutputUtil._get_layer_output_batch_in_numpy(layer_output_batch_dict)
 
-        # Save inputs and layer-outputs
-        self.save_input_output.save(input_batch, layer_output_batch_dict)
+                # Save inputs and layer-outputs
+                self.save_input_output.save(input_chunk, layer_output_batch_dict)
 
         logger.info('Successfully generated layer-outputs for %d input instances', input_instance_count)
 
+    def _stream_layer_outputs(self, input_batch: Union[torch.Tensor, List[torch.Tensor], Tuple[torch.Tensor]]):
+        """
+        Captures layer-outputs chunk by chunk, and appends each of them to its store as soon as it is produced.
+
+        :param input_batch: Batch of inputs for which we want to obtain layer-outputs.
+        """
+        writer = _LayerOutputWriter(self.dir_path)
+        try:
+            for input_chunk in self._split_input_batch(input_batch):
+                writer.put(self.STREAMED_INPUTS_DIR, input_chunk)
+                self.layer_output.get_outputs(
+                    input_chunk,
+                    output_callback=lambda name, output: writer.put(os.path.join(self.STREAMED_OUTPUTS_DIR, name),
+                                                                    output))
+        finally:
+            writer.close()
+
+    def _split_input_batch(self, input_batch: Union[torch.Tensor, List[torch.Tensor], Tuple[torch.Tensor]]) -> \
+            List[Union[torch.Tensor, List[torch.Tensor], Tuple[torch.Tensor]]]:
+        """
+        Splits the input batch into chunks of chunk_size input instances
+        :param input_batch: input batch
+        :return: list of input chunks
+        """
+        if self.chunk_size is None:
+            return [input_batch]
+
+        if isinstance(input_batch, torch.Tensor):
+            return list(torch.split(input_batch, self.chunk_size))
+
+        return [type(input_batch)(chunk) for chunk in zip(*(torch.split(x, self.chunk_size) for x in input_batch))]
+
+    @classmethod
+    def load_streamed_layer_output(cls, dir_path: str, layer_output_name: str) -> torch.Tensor:
+        """
+        Loads a layer-output saved in streaming mode.
+
+        :param dir_path: Directory wherein layer-outputs were saved.
+        :param layer_output_name: Name of the layer-output.
+        :return: Layer-outputs of all the input instances, in the order the inputs were given.
+        """
+        store = TensorStore.open(os.path.join(dir_path, cls.STREAMED_OUTPUTS_DIR, layer_output_name))
+        return torch.cat([store[index] for index in range(len(store))])
+
+    @classmethod
+    def load_streamed_inputs(cls, dir_path: str) -> Union[torch.Tensor, List[torch.Tensor], Tuple[torch.Tensor]]:
+        """
+        Loads the inputs saved in streaming mode.
+
+        :param dir_path: Directory wherein layer-outputs were saved.
+        :return: All the input instances with the same structure as the input batches.
+        """
+        store = TensorStore.open(os.path.join(dir_path, cls.STREAMED_INPUTS_DIR))
+        chunks = [store[index] for index in range(len(store))]
+
+        if isinstance(chunks[0], torch.Tensor):
+            return torch.cat(chunks)
+
+        return type(chunks[0])(torch.cat(inputs) for inputs in zip(*chunks))
+
     @staticmethod
     def _get_input_batch_in_numpy(input_batch: Union[torch.Tensor, List[torch.Tensor], Tuple[torch.Tensor]]) -> \
             Union[np.ndarray, List[np.ndarray], Tuple[np.ndarray]]:
@@ -147,13 +229,74 @@ class LayerOutputUtil:
         return layer_output_numpy_dict
 
 
+class _LayerOutputWriter:
+    """
+    Appends tensors to memory-mapped tensor stores on a background thread.
+    The number of tensors waiting to be written is bounded, so that the producer is blocked rather than
+    accumulating all the layer-outputs in memory if the writer falls behind.
+    """
+
+    _STOP = object()
+
+    def __init__(self, dir_path: str, max_queued_tensors: int = 16):
+        """
+        :param dir_path: Directory under which the stores are created.
+        :param max_queued_tensors: Maximum number of tensors waiting to be written.
+        """
+        self._dir_path = dir_path
+        self._queue = queue.Queue(maxsize=max_queued_tensors)
+        self._stores: Dict[str, TensorStore] = {}
+        self._error = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def put(self, store_name: str, data: Union[torch.Tensor, List[torch.Tensor], Tuple[torch.Tensor]]):
+        """
+        Queues data to be appended to the given store.
+
+        :param store_name: Name of the store relative to dir_path.
+        :param data: Tensor or list/tuple of tensors. Must not be modified afterwards.
+        """
+        self._raise_error()
+        self._queue.put((store_name, data))
+
+    def close(self):
+        """
+        Waits for all the queued data to be written and stops the background thread.
+        """
+        self._queue.put(self._STOP)
+        self._thread.join()
+        self._raise_error()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is self._STOP:
+                return
+
+            if self._error is None:
+                store_name, data = item
+                try:
+                    if store_name not in self._stores:
+                        self._stores[store_name] = TensorStore.open(os.path.join(self._dir_path, store_name))
+                    self._stores[store_name].append(data)
+                except Exception as e: # pylint: disable=broad-exception-caught
+                    # Keep consuming the queue so that the producer isn't blocked. The error is raised to the producer
+                    self._error = e
+
+    def _raise_error(self):
+        if self._error is not None:
+            raise RuntimeError('Failed to write layer-outputs') from self._error
+
+
 class LayerOutput:
     """
     This class creates a layer-output name to layer-output dictionary. The layer-output names are as per the AIMET exported
     pytorch/onnx/torchscript model.
     """
     def __init__(self, model: torch.nn.Module, dir_path: str, naming_scheme: NamingScheme = NamingScheme.PYTORCH,
-                 dummy_input: Union[torch.Tensor, Tuple, List] = None, onnx_export_args: Union[OnnxExportApiArgs, Dict] = None):
+                 dummy_input: Union[torch.Tensor, Tuple, List] = None, onnx_export_args: Union[OnnxExportApiArgs, Dict] = None,
+                 layer_output_names: Optional[List[str]] = None):
         """
         Constructor - It initializes few dictionaries that are required for capturing and naming layer-outputs.
 
@@ -166,8 +309,11 @@ class LayerOutput:
         :param onnx_export_args: Should be same as that passed to quantsim export API to have consistency between
             layer-output names present in exported onnx model and generated layer-outputs (required if naming_scheme is
             'onnx').
+        :param layer_output_names: Names of the layer-outputs to capture. If None, outputs of all the layers are captured.
         """
         self.model = model
+        self._output_callback = None
+        self._streamed_layer_names = set()
         self.module_to_name_dict = utils.get_module_to_name_dict(model=model, prefix='')
 
         # Check whether the given model is quantsim model
@@ -189,20 +335,36 @@ class LayerOutput:
         for layer_name, output_name in self.layer_name_to_layer_output_name_dict.items():
             self.layer_name_to_layer_output_name_dict[layer_name] = re.sub(r'\W+', "_", output_name)
 
+        # Only capture the requested layer-outputs
+        if layer_output_names is not None:
+            missing_layer_output_names = set(layer_output_names) - set(self.layer_name_to_layer_output_name_dict.values())
+            if missing_layer_output_names:
+                raise ValueError(f"Layer-outputs {sorted(missing_layer_output_names)} not found in the model")
+            self.layer_name_to_layer_output_name_dict = {
+                layer_name: output_name for layer_name, output_name in self.layer_name_to_layer_output_name_dict.items()
+                if output_name in layer_output_names
+            }
+
         # Save layer-output names which are in topological order of model graph. This order can be used while comparing layer-outputs.
         layer_output_names = list(self.layer_name_to_layer_output_name_dict.values())
         save_layer_output_names(layer_output_names, dir_path)
 
-    def get_outputs(self, input_batch: Union[torch.Tensor, List[torch.Tensor], Tuple[torch.Tensor]]) -> Dict[str, torch.Tensor]:
+    def get_outputs(self, input_batch: Union[torch.Tensor, List[torch.Tensor], Tuple[torch.Tensor]],
+                    output_callback: Optional[Callable[[str, torch.Tensor], None]] = None) -> Dict[str, torch.Tensor]:
         """
         This function captures layer-outputs and renames them as per the AIMET exported pytorch/onnx/torchscript model.
 
         :param input_batch: Batch of inputs for which we want to obtain layer-outputs.
+        :param output_callback: If given, each layer-output is passed to this callable along with its layer-output name
+            as soon as it is produced, instead of being collected in the returned dict. If a layer is called multiple
+            times, only its first output is passed.
         :return: layer-name to layer-output batch dict
         """
 
         # Fetch outputs of all the layers
         self.layer_name_to_layer_output_dict = {}
+        self._output_callback = output_callback
+        self._streamed_layer_names = set()
         if self.is_quantsim_model:
             # Apply record-output hook to QuantizeWrapper modules (one node above leaf node in model graph)
             utils.run_hook_for_layers_with_given_input(self.model, input_batch, self.record_outputs,
@@ -212,6 +374,8 @@ class LayerOutput:
             # Apply record-output hook to Original modules (leaf node in model graph)
             utils.run_hook_for_layers_with_given_input(self.model, input_batch, self.record_outputs, leaf_node_only=True)
 
+        self._output_callback = None
+
         # Rename outputs according to pytorch/onnx/torchscript model
         layer_output_name_to_layer_output_dict = LayerOutput.rename_layer_outputs(self.layer_name_to_layer_output_dict,
                                                                                   self.layer_name_to_layer_output_name_dict)
@@ -228,10 +392,19 @@ class LayerOutput:
         :return: None
         """
         layer_name = self.module_to_name_dict[module]
-        if isinstance(output, torch.Tensor):
-            self.layer_name_to_layer_output_dict[layer_name] = output.clone()
-        else:
+        layer_output_name = self.layer_name_to_layer_output_name_dict.get(layer_name.replace('._module_to_wrap', ''))
+        if layer_output_name is None:
+            # Layer-output isn't requested
+            return
+
+        if not isinstance(output, torch.Tensor):
             logger.info("Skipping constant scalar output of layer %s", layer_name)
+        elif self._output_callback is not None:
+            if layer_name not in self._streamed_layer_names:
+                self._streamed_layer_names.add(layer_name)
+                self._output_callback(layer_output_name, output.detach().clone())
+        else:
+            self.layer_name_to_layer_output_dict[layer_name] = output.clone()
 
     @staticmethod
     def rename_layer_outputs(layer_name_to_layer_output_dict: Dict[str, torch.Tensor],
@@ -42,6 +42,15 @@ operations represent a module or a function that generates a tensor, while produ
 the tensors that are either input to the model (input, constant or parameter) or the
 result of an operation. Furthermore the graph representation is bi-directional."""
 
+import collections
+import copy
+import hashlib
+import io
+import os
+import pickle
+import tempfile
+import threading
+import types
 from typing import Tuple, Union, List, Dict, Type, Optional
 import torch
 
@@ -64,6 +73,40 @@ logger = AimetLogger.get_area_logger(AimetLogger.LogAreas.ConnectedGraph)
 # users as needed.
 jit_trace_args = {'check_trace': False}
 
+# Global dictionary holding settings for the ConnectedGraph cache used by get_connected_graph(). Can be imported and
+# modified by users as needed.
+# enabled: if False, get_connected_graph() does not reuse graphs held in memory for a model
+# max_entries_per_model: number of (structure, input signature) entries kept in memory for a single model
+# cache_dir: directory of the persistent cache used to reuse parsed graphs across processes and model instances of the
+#   same architecture. None disables it. Cache files are pickles, so only point this to a trusted directory.
+connected_graph_cache_args = {'enabled': True, 'max_entries_per_model': 4, 'cache_dir': None}
+
+# Version of the persistent ConnectedGraph cache format. Bump it whenever the attributes of ConnectedGraph, Op or
+# Product change so that stale cache files are ignored.
+_CONNECTED_GRAPH_FILE_CACHE_VERSION = 2
+
+# Classes which may be referenced by a persistent ConnectedGraph cache file. Loading any other class is refused so that
+# a tampered cache file can't execute arbitrary code.
+_CONNECTED_GRAPH_FILE_CACHE_CLASSES = {
+    ('aimet_torch.meta.connectedgraph', 'ConnectedGraph'),
+    ('aimet_torch.meta.operation', 'Op'),
+    ('aimet_common.connected_graph.product', 'Product'),
+    ('aimet_common.connected_graph.operation', 'OpInformation'),
+    ('aimet_common.model_module', 'PytorchModelModule'),
+    ('aimet_common.utils', 'ModelApi'),
+    ('torch', 'Size'),
+    ('builtins', 'set'),
+    ('builtins', 'frozenset'),
+    ('builtins', 'slice'),
+    ('collections', 'OrderedDict'),
+}
+
+# Name of the attribute holding a model's ConnectedGraph cache
+_CONNECTED_GRAPH_CACHE_ATTR = '_aimet_connected_graph_cache'
+
+# Guards creation of the per-model ConnectedGraph caches
+_connected_graph_cache_creation_lock = threading.Lock()
+
 # Dictionary mapping connected graph op types to a tuple consisting of:
 # index 0: number of expected inputs
 # index 1: whether in the order of inputs to the op, if the expected inputs come at the front of the list (True) or the
@@ -1417,3 +1460,437 @@ def _get_module_tensor_shapes_entry(tensors: Union[torch.Tensor, List, Dict, Non
     logger.debug('Unexpected data type for tensor %s. Supported types include tensors, or Lists, Tuples, and Dicts of '
                  'tensors.', type(tensors))
     return None
+
+
+class _ConnectedGraphCache:
+    """
+    Per-model cache of ConnectedGraphs keyed by module structure and input signature. It is stored as an attribute of
+    the model so that cached graphs (which hold references to the model's modules) live exactly as long as the model.
+    Deep copies of the model carry the cached graphs over, rebound to the copied modules, so that a copy does not need
+    to be traced again. Pickles of the model start with an empty cache.
+
+    All accesses are guarded by a reentrant lock so that threads sharing a model (e.g. the speculative branches of
+    AutoQuant) can look up, build and copy cached graphs concurrently.
+    """
+    def __init__(self):
+        self._entries = collections.OrderedDict()
+        self.lock = threading.RLock()
+
+    def __deepcopy__(self, memo):
+        cache = _ConnectedGraphCache()
+        with self.lock:
+            entries = list(self._entries.items())
+        for (structure_signature, *other_keys), connected_graph in entries:
+            # Modules are copied through the memo of the enclosing deepcopy, so these are the very modules of the copy
+            module_copies = {module: copy.deepcopy(module, memo) for module in connected_graph._module_to_name}
+            id_to_copy_id = {id(module): id(module_copy) for module, module_copy in module_copies.items()}
+            if any(module_id not in id_to_copy_id for _, module_id, _, _ in structure_signature):
+                continue
+            copy_structure_signature = tuple((name, id_to_copy_id[module_id], module_type, param_shapes)
+                                             for name, module_id, module_type, param_shapes in structure_signature)
+            name_to_module_copy = {name: module_copies[module]
+                                   for module, name in connected_graph._module_to_name.items()}
+            try:
+                cache._entries[(copy_structure_signature, *other_keys)] = \
+                    _rebind_connected_graph(connected_graph, name_to_module_copy)
+            except Exception as e: # pylint: disable=broad-except
+                logger.debug('Failed to copy cached connected graph: %s', e)
+        return cache
+
+    def __reduce__(self):
+        return _ConnectedGraphCache, ()
+
+    def get(self, key: Tuple) -> Optional[ConnectedGraph]:
+        """
+        Look up a cached graph, marking it as most recently used
+        :param key: Cache key of the graph
+        :return: Cached ConnectedGraph or None if not found
+        """
+        with self.lock:
+            connected_graph = self._entries.get(key)
+            if connected_graph is not None:
+                self._entries.move_to_end(key)
+            return connected_graph
+
+    def put(self, key: Tuple, connected_graph: ConnectedGraph, max_entries: int):
+        """
+        Add a graph to the cache, evicting the least recently used entries beyond max_entries
+        :param key: Cache key of the graph
+        :param connected_graph: ConnectedGraph to cache
+        :param max_entries: Maximum number of entries to keep
+        """
+        with self.lock:
+            self._entries[key] = connected_graph
+            while len(self._entries) > max(max_entries, 0):
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """ Remove all cached graphs """
+        with self.lock:
+            self._entries.clear()
+
+
+def get_connected_graph(model: torch.nn.Module, model_input: Union[torch.Tensor, Tuple]) -> ConnectedGraph:
+    """
+    Return a ConnectedGraph for the model, reusing a previously built graph if the model's module structure and the
+    input signature (nested structure, shapes, dtypes and devices of the input tensors) are unchanged. Structural edits
+    such as removing a batch norm or replacing a module invalidate the cached graph.
+
+    If connected_graph_cache_args['cache_dir'] is set, graphs are additionally persisted to disk keyed by a fingerprint
+    of the model architecture and input signature, so that a new process or another checkpoint of the same architecture
+    skips tracing altogether.
+
+    The returned graph is shared between callers and must be treated as read-only. Concurrent calls on the same model
+    are serialized, so the model is traced at most once per key.
+
+    :param model: Pytorch model to create connected graph from
+    :param model_input: Example input to model.  Can be a single tensor or a list/tuple of input tensors
+    :return: ConnectedGraph of the model
+    """
+    if not connected_graph_cache_args['enabled']:
+        return _load_or_create_connected_graph(model, model_input)
+
+    with _connected_graph_cache_creation_lock:
+        cache = model.__dict__.get(_CONNECTED_GRAPH_CACHE_ATTR)
+        if cache is None:
+            cache = _ConnectedGraphCache()
+            # Bypass nn.Module.__setattr__ so the cache is never registered as a submodule, parameter or buffer
+            object.__setattr__(model, _CONNECTED_GRAPH_CACHE_ATTR, cache)
+
+    key = (_get_model_structure_signature(model), _get_input_signature(model_input),
+           repr(sorted(jit_trace_args.items())))
+    # Hold the lock while tracing so that threads sharing the model neither trace it concurrently nor twice
+    with cache.lock:
+        connected_graph = cache.get(key)
+        if connected_graph is None:
+            connected_graph = _load_or_create_connected_graph(model, model_input)
+            cache.put(key, connected_graph, connected_graph_cache_args['max_entries_per_model'])
+        else:
+            logger.debug('Reusing cached connected graph for model %s', type(model).__name__)
+    return connected_graph
+
+
+def clear_connected_graph_cache(model: torch.nn.Module):
+    """
+    Drop all ConnectedGraphs cached for the model. Only needed after edits that get_connected_graph() can not detect,
+    for example changing a python attribute that alters control flow in forward().
+    :param model: Pytorch model whose cached graphs to drop
+    """
+    cache = model.__dict__.get(_CONNECTED_GRAPH_CACHE_ATTR)
+    if cache is not None:
+        cache.clear()
+
+
+def _get_model_structure_signature(model: torch.nn.Module) -> Tuple:
+    """
+    Generate a hashable signature of the model's module hierarchy. Module identities and types capture module
+    replacement or removal, and parameter shapes capture in-place changes such as winnowing.
+    :param model: Pytorch model
+    :return: Tuple describing the module structure of the model
+    """
+    signature = []
+    for name, module in model.named_modules():
+        param_shapes = tuple((param_name, tuple(param.shape))
+                             for param_name, param in module.named_parameters(recurse=False))
+        signature.append((name, id(module), type(module), param_shapes))
+    return tuple(signature)
+
+
+def _get_input_signature(model_input) -> Tuple:
+    """
+    Generate a hashable signature of the model input from the nested structure, shapes, dtypes and devices of its
+    tensors. Non-tensor values are represented by their type and repr since they may alter the traced graph.
+    :param model_input: Example input to model
+    :return: Tuple describing the model input
+    """
+    if isinstance(model_input, torch.Tensor):
+        return 'tensor', tuple(model_input.shape), model_input.dtype, str(model_input.device)
+    if isinstance(model_input, (List, Tuple)):
+        return type(model_input), tuple(_get_input_signature(entry) for entry in model_input)
+    if isinstance(model_input, Dict):
+        return type(model_input), tuple((repr(k), _get_input_signature(v)) for k, v in model_input.items())
+    return type(model_input), repr(model_input)
+
+
+class _ConnectedGraphPickler(pickle.Pickler):
+    """
+    Pickler for the persistent ConnectedGraph cache. Modules are stored by name so that no parameters end up in the
+    cache file, and ops and products are stored by index so that the graph is written as a flat list of nodes instead
+    of a deeply nested object tree.
+    """
+    def __init__(self, file, module_to_name: Dict[torch.nn.Module, str], node_to_index: Dict[int, int]):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._module_to_name = module_to_name
+        self._node_to_index = node_to_index
+
+    def persistent_id(self, obj):
+        if isinstance(obj, torch.nn.Module):
+            if obj not in self._module_to_name:
+                raise pickle.PicklingError(f'Module of type {type(obj).__name__} is not part of the model')
+            return 'module', self._module_to_name[obj]
+        index = self._node_to_index.get(id(obj))
+        if index is not None:
+            return 'node', index
+        return None
+
+
+class _RestrictedUnpickler(pickle.Unpickler):
+    """
+    Unpickler which only loads the classes that a persistent ConnectedGraph cache file may reference
+    """
+    def find_class(self, module, name):
+        if (module, name) in _CONNECTED_GRAPH_FILE_CACHE_CLASSES:
+            return super().find_class(module, name)
+        if module == 'torch' and isinstance(getattr(torch, name, None), torch.dtype):
+            return getattr(torch, name)
+        raise pickle.UnpicklingError(f'{module}.{name} is not allowed in a connected graph cache file')
+
+
+class _ConnectedGraphUnpickler(_RestrictedUnpickler):
+    """
+    Unpickler for the persistent ConnectedGraph cache. Binds module names to the modules of the given model and node
+    indices to preallocated ops and products.
+    """
+    def __init__(self, file, name_to_module: Dict[str, torch.nn.Module], nodes: List):
+        super().__init__(file)
+        self._name_to_module = name_to_module
+        self._nodes = nodes
+
+    def persistent_load(self, pid):
+        kind, key = pid
+        if kind == 'module':
+            if key not in self._name_to_module:
+                raise pickle.UnpicklingError(f'Module {key} is not part of the model')
+            return self._name_to_module[key]
+        return self._nodes[key]
+
+
+def _load_or_create_connected_graph(model: torch.nn.Module, model_input: Union[torch.Tensor, Tuple]) -> ConnectedGraph:
+    """
+    Load the ConnectedGraph of the model from the persistent cache if enabled and available, otherwise build it and
+    store it in the persistent cache.
+    :param model: Pytorch model to create connected graph from
+    :param model_input: Example input to model.  Can be a single tensor or a list/tuple of input tensors
+    :return: ConnectedGraph of the model
+    """
+    cache_dir = connected_graph_cache_args['cache_dir']
+    if cache_dir is None:
+        return ConnectedGraph(model, model_input)
+
+    fingerprint = _get_model_fingerprint(model, model_input)
+    file_name = f'connected_graph_{hashlib.sha256(fingerprint.encode()).hexdigest()}.pkl'
+    file_path = os.path.join(cache_dir, file_name)
+
+    if os.path.isfile(file_path):
+        try:
+            connected_graph = _load_connected_graph(model, file_path, fingerprint)
+        except Exception as e: # pylint: disable=broad-except
+            logger.warning('Failed to load connected graph from %s, rebuilding it: %s', file_path, e)
+            connected_graph = None
+        if connected_graph is not None:
+            logger.info('Loaded connected graph for model %s from %s', type(model).__name__, file_path)
+            return connected_graph
+
+    connected_graph = ConnectedGraph(model, model_input)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        _save_connected_graph(connected_graph, file_path, fingerprint)
+    except Exception as e: # pylint: disable=broad-except
+        logger.warning('Failed to save connected graph to %s: %s', file_path, e)
+    return connected_graph
+
+
+def _save_connected_graph(connected_graph: ConnectedGraph, file_path: str, fingerprint: str):
+    """
+    Write the parsed connected graph (ops, products, module bindings and shapes) to a cache file. The file is written
+    to a temporary path first and then renamed so that concurrent jobs never read a partially written file.
+    :param connected_graph: ConnectedGraph to save
+    :param file_path: Path of the cache file
+    :param fingerprint: Fingerprint of the model and input the graph was built from
+    """
+    nodes = _get_connected_graph_nodes(connected_graph)
+
+    with tempfile.NamedTemporaryFile(dir=os.path.dirname(file_path), suffix='.tmp', delete=False) as f:
+        tmp_file_path = f.name
+    try:
+        with open(tmp_file_path, 'wb') as f:
+            pickle.dump((_CONNECTED_GRAPH_FILE_CACHE_VERSION, fingerprint, [type(node) for node in nodes]), f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+            _dump_connected_graph(connected_graph, nodes, f)
+        os.replace(tmp_file_path, file_path)
+    finally:
+        if os.path.exists(tmp_file_path):
+            os.remove(tmp_file_path)
+
+
+def _load_connected_graph(model: torch.nn.Module, file_path: str, fingerprint: str) -> Optional[ConnectedGraph]:
+    """
+    Read a connected graph from a cache file and bind it to the modules of the given model.
+    :param model: Pytorch model the graph belongs to
+    :param file_path: Path of the cache file
+    :param fingerprint: Fingerprint of the model and input
+    :return: ConnectedGraph, or None if the cache file was written by another cache version or for another model
+    """
+    with open(file_path, 'rb') as f:
+        version, file_fingerprint, node_types = _RestrictedUnpickler(f).load()
+        if version != _CONNECTED_GRAPH_FILE_CACHE_VERSION or file_fingerprint != fingerprint:
+            return None
+        name_to_module = dict(model.named_modules(prefix=type(model).__name__))
+        return _load_connected_graph_nodes(f, name_to_module, node_types)
+
+
+def _get_connected_graph_nodes(connected_graph: ConnectedGraph) -> List:
+    """
+    Returns all ops and products of the connected graph
+    """
+    return list(connected_graph._ops.values()) + list(connected_graph._products.values())
+
+
+def _dump_connected_graph(connected_graph: ConnectedGraph, nodes: List, f):
+    """
+    Write the connected graph as a flat list of node states, referring to modules by name
+    :param connected_graph: ConnectedGraph to write
+    :param nodes: Ops and products of the connected graph
+    :param f: File object to write to
+    """
+    node_to_index = {id(node): index for index, node in enumerate(nodes)}
+    pickler = _ConnectedGraphPickler(f, connected_graph._module_to_name, node_to_index)
+    pickler.dump(([node.__dict__ for node in nodes], connected_graph.__dict__))
+
+
+def _load_connected_graph_nodes(f, name_to_module: Dict[str, torch.nn.Module],
+                                node_types: List[Type]) -> ConnectedGraph:
+    """
+    Read a connected graph written by _dump_connected_graph() and bind it to the given modules
+    :param f: File object to read from
+    :param name_to_module: Dictionary mapping module names to the modules to bind
+    :param node_types: Types of the ops and products of the connected graph
+    :return: ConnectedGraph
+    """
+    nodes = [node_type.__new__(node_type) for node_type in node_types]
+    node_states, graph_state = _ConnectedGraphUnpickler(f, name_to_module, nodes).load()
+
+    for node, node_state in zip(nodes, node_states):
+        node.__dict__.update(node_state)
+    connected_graph = ConnectedGraph.__new__(ConnectedGraph)
+    connected_graph.__dict__.update(graph_state)
+    return connected_graph
+
+
+def _rebind_connected_graph(connected_graph: ConnectedGraph,
+                            name_to_module: Dict[str, torch.nn.Module]) -> ConnectedGraph:
+    """
+    Create a copy of the connected graph bound to other modules, e.g. those of a deep copy of the model
+    :param connected_graph: ConnectedGraph to copy
+    :param name_to_module: Dictionary mapping module names to the modules to bind
+    :return: Copy of the ConnectedGraph
+    """
+    nodes = _get_connected_graph_nodes(connected_graph)
+    buffer = io.BytesIO()
+    _dump_connected_graph(connected_graph, nodes, buffer)
+    buffer.seek(0)
+    return _load_connected_graph_nodes(buffer, name_to_module, [type(node) for node in nodes])
+
+
+def _get_model_fingerprint(model: torch.nn.Module, model_input) -> str:
+    """
+    Generate a fingerprint of the model architecture and input signature which is stable across processes and model
+    instances. It covers module names and types, the code of each module type (all its methods and the functions of
+    its python module called by them), module hyperparameters as reported by extra_repr(), the primitive attributes of
+    each module which may alter control flow, and parameter shapes and dtypes, but not parameter values.
+    :param model: Pytorch model
+    :param model_input: Example input to model
+    :return: Fingerprint string
+    """
+    code_hashes = {}
+    modules = []
+    for name, module in model.named_modules():
+        module_type = type(module)
+        if module_type not in code_hashes:
+            code_hashes[module_type] = hashlib.sha256(repr(_get_class_code_signature(module_type)).encode()).hexdigest()
+        attributes = tuple((attr_name, repr(value)) for attr_name, value in sorted(vars(module).items())
+                           if attr_name != 'training' and _is_primitive(value))
+        params = tuple((param_name, tuple(param.shape), param.dtype)
+                       for param_name, param in module.named_parameters(recurse=False))
+        modules.append((name, f'{module_type.__module__}.{module_type.__qualname__}',
+                        code_hashes[module_type], module.extra_repr(), attributes, params))
+
+    return repr((_CONNECTED_GRAPH_FILE_CACHE_VERSION, torch.__version__, sorted(jit_trace_args.items()),
+                 tuple(modules), _get_input_signature(model_input)))
+
+
+def _is_primitive(value) -> bool:
+    """
+    Returns True if value is None, a bool, number or string, or a (nested) tuple or list of these
+    """
+    if isinstance(value, (tuple, list)):
+        return all(_is_primitive(item) for item in value)
+    return value is None or isinstance(value, (bool, int, float, str))
+
+
+def _get_class_code_signature(cls: type) -> Tuple:
+    """
+    Generate a process independent signature of the code of a class: all the functions defined by the class and its
+    base classes, along with the functions of their python modules they call.
+    :param cls: Class
+    :return: Tuple of code signatures
+    """
+    signatures = []
+    visited = set()
+    for klass in cls.__mro__:
+        for attr_name, attr in sorted(vars(klass).items()):
+            if isinstance(attr, (staticmethod, classmethod)):
+                attr = attr.__func__
+            if isinstance(attr, property):
+                functions = (attr.fget, attr.fset, attr.fdel)
+            else:
+                functions = (attr,)
+            for function in functions:
+                if isinstance(function, types.FunctionType):
+                    signatures.append((klass.__qualname__, attr_name,
+                                       _get_function_code_signature(function, klass.__module__, visited)))
+    return tuple(signatures)
+
+
+def _get_function_code_signature(function: types.FunctionType, module_name: str, visited: set) -> Tuple:
+    """
+    Generate a process independent signature of a function, including the functions defined in the given python
+    module which it calls as globals, recursively
+    :param function: Function
+    :param module_name: Name of the python module whose functions are followed
+    :param visited: Functions already included in the signature
+    :return: Tuple of code signatures
+    """
+    visited.add(function)
+    signature = [_get_code_signature(function.__code__)]
+    for global_name in function.__code__.co_names:
+        callee = function.__globals__.get(global_name)
+        if isinstance(callee, types.FunctionType) and callee.__module__ == module_name and callee not in visited:
+            signature.append((global_name, _get_function_code_signature(callee, module_name, visited)))
+    return tuple(signature)
+
+
+def _get_code_signature(code) -> Tuple:
+    """
+    Generate a process independent signature of a code object. Nested code objects (lambdas, comprehensions) are
+    expanded recursively since their repr contains memory addresses, and frozenset constants are sorted since their
+    iteration order depends on string hash randomization.
+    :param code: Code object
+    :return: Tuple of bytecode, constants and names
+    """
+    return code.co_code, tuple(_get_const_signature(const) for const in code.co_consts), code.co_names
+
+
+def _get_const_signature(const):
+    """
+    Generate a process independent signature of a code object constant
+    :param const: Constant
+    :return: Signature of the constant
+    """
+    if isinstance(const, types.CodeType):
+        return _get_code_signature(const)
+    if isinstance(const, frozenset):
+        return tuple(sorted(repr(item) for item in const))
+    if isinstance(const, tuple):
+        return tuple(_get_const_signature(item) for item in const)
+    return repr(const)
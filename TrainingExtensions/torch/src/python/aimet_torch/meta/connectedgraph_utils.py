@@ -44,7 +44,7 @@ import torch
 from aimet_common.connected_graph.connectedgraph_utils import CG_SPLIT
 from aimet_common.utils import AimetLogger
 from aimet_torch.meta.operation import Op
-from aimet_torch.meta.connectedgraph import ConnectedGraph
+from aimet_torch.meta.connectedgraph import ConnectedGraph, get_connected_graph
 from aimet_torch.utils import create_rand_tensors_given_shapes, get_device
 
 logger = AimetLogger.get_area_logger(AimetLogger.LogAreas.Utils)
@@ -74,7 +74,7 @@ def get_module_act_func_pair(model: torch.nn.Module, model_input: Union[Tuple[to
     model.eval()
 
     # Create ConnectedGraph
-    graph = ConnectedGraph(model, model_input)
+    graph = get_connected_graph(model, model_input)
 
     # Maps module to next following activation function else None
     module_act_func_pair = {}
@@ -127,7 +127,7 @@ def get_ops_with_missing_modules(model: torch.nn.Module, model_input: Union[torc
     :return: List of op names with missing modules
     """
     try:
-        conn_graph = ConnectedGraph(model, model_input)
+        conn_graph = get_connected_graph(model, model_input)
     except:
         logger.error('A connected graph failed to be built. This may prevent from AIMET features from being able to '
                      'run on the model. Please address the errors shown.')
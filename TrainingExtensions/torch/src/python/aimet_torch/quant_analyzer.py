@@ -38,9 +38,13 @@
 """ Quant Analyzer """
 
 import os
+import contextlib
+import pickle
+import tempfile
 from collections import OrderedDict, defaultdict
-from typing import Union, Tuple, Dict, List, Collection
+from typing import Union, Tuple, Dict, List, Collection, Optional
 import torch
+import torch.multiprocessing as mp
 from torch.utils.data import DataLoader
 
 from aimet_common.quant_analyzer import save_json, export_per_layer_sensitivity_analysis_plot,\
@@ -53,6 +57,7 @@ from aimet_torch.qc_quantize_op import QcQuantizeWrapper
 from aimet_torch.qc_quantize_recurrent import QcQuantizeRecurrent
 from aimet_torch.quantsim import QuantizationSimModel
 from aimet_torch.batch_norm_fold import fold_all_batch_norms
+from aimet_torch.tensor_store import TensorStore
 
 _logger = AimetLogger.get_area_logger(AimetLogger.LogAreas.QuantAnalyzer)
 
@@ -99,7 +104,10 @@ class QuantAnalyzer:
         self._eval_callback = eval_callback
         self._unlabeled_dataset_iterable = None
         self._num_batches = None
+        self._mse_loss_one_pass = False
         self._modules_to_ignore = modules_to_ignore
+        self._num_workers = 0
+        self._reuse_prefix = False
 
     def analyze(self,
                 quant_scheme: QuantScheme = QuantScheme.post_training_tf_enhanced,
@@ -151,7 +159,8 @@ class QuantAnalyzer:
         if self._unlabeled_dataset_iterable:
             self.export_per_layer_mse_loss(sim, results_dir)
 
-    def enable_per_layer_mse_loss(self, unlabeled_dataset_iterable: Union[DataLoader, Collection], num_batches: int):
+    def enable_per_layer_mse_loss(self, unlabeled_dataset_iterable: Union[DataLoader, Collection], num_batches: int,
+                                  one_pass: bool = False):
         """
         Enable per layer MSE loss analysis.
 
@@ -160,6 +169,10 @@ class QuantAnalyzer:
                 to be able to be passed directly to the model.
         :param num_batches: Number of batches. Approximately 256 samples/images are recommended,
                 so if batch size of data loader is 64, then 4 number of batches leads to 256 samples/images.
+        :param one_pass: If True, MSE loss of all the layers is collected by passing each batch through fp32 and
+                quantsim model only once, instead of once per layer. This trades memory for speed: output activations
+                of all the layers of the fp32 model are held in memory for one batch at a time, whereas the
+                layer-by-layer analysis only holds the output activations of a single layer.
         """
         # TODO: Make per layer MSE loss analysis as part of top level API.
         if len(unlabeled_dataset_iterable) < num_batches:
@@ -168,6 +181,27 @@ class QuantAnalyzer:
 
         self._unlabeled_dataset_iterable = unlabeled_dataset_iterable
         self._num_batches = num_batches
+        self._mse_loss_one_pass = one_pass
+
+    def enable_parallel_per_layer_analysis(self, num_workers: int, reuse_prefix: bool = False):
+        """
+        Enable parallel execution of per layer analysis.
+
+        :param num_workers: Number of worker processes evaluating quant wrappers in parallel. Each worker holds
+                its own copy of the quantsim model, so eval_callback and its arguments must be picklable.
+                If 0, quant wrappers are evaluated one by one in this process.
+        :param reuse_prefix: If True, outputs of all the quant wrappers are recorded while evaluating the model once
+                before any quant wrapper is toggled. When evaluating a toggled quant wrapper, recorded outputs are
+                replayed for the quant wrappers preceding it instead of being recomputed. This requires
+                eval_callback to pass the same data in the same order on every call. Recorded outputs are
+                written to a temporary directory and memory-mapped when replayed, so that workers share them
+                through the page cache instead of each holding its own copy.
+        """
+        if num_workers < 0:
+            raise ValueError(f'Number of workers must be non-negative; got {num_workers}.')
+
+        self._num_workers = num_workers
+        self._reuse_prefix = reuse_prefix
 
     def _create_quantsim_and_encodings(self, quant_scheme: QuantScheme, default_param_bw: int,
                                        default_output_bw: int, config_file: str) \
@@ -363,17 +397,29 @@ class QuantAnalyzer:
             for enabled_quantizers in enabled_quant_wrappers.values():
                 self._enable_disable_quantizers(enabled_quantizers, enabled=False)
 
-        eval_score_dict = {}
-        for name, quant_wrapper in sorted_quant_wrappers.items():
-            if quant_wrapper in enabled_quant_wrappers:
-                enabled_quantizers = enabled_quant_wrappers[quant_wrapper]
-                self._enable_disable_quantizers(enabled_quantizers, enabled=enabled_before)
-
-                # Record eval score.
-                eval_score_dict[name] = self._eval_model(sim.model)
-                _logger.debug("For layer: %s, the eval score is: %f", name, eval_score_dict[name])
+        evaluator = _PerLayerEvaluator(sim.model, self._eval_callback, sorted_quant_wrappers,
+                                       enabled_quant_wrappers, enabled_before, enabled_after)
+        names = [name for name, quant_wrapper in sorted_quant_wrappers.items()
+                 if quant_wrapper in enabled_quant_wrappers]
+
+        with contextlib.ExitStack() as stack:
+            if self._reuse_prefix:
+                evaluator.record_outputs(stack.enter_context(tempfile.TemporaryDirectory()))
+
+            if self._num_workers > 0:
+                # Workers unpickle their own copy of the evaluator (and the model in it).
+                # Recorded outputs aren't pickled; workers read them from the tensor store on demand.
+                context = mp.get_context('spawn')
+                with context.Pool(self._num_workers, initializer=_init_worker,
+                                  initargs=(pickle.dumps(evaluator),)) as pool:
+                    eval_scores = pool.map(_evaluate_in_worker, names, chunksize=1)
+            else:
+                eval_scores = [evaluator.evaluate(name) for name in names]
 
-                self._enable_disable_quantizers(enabled_quantizers, enabled=enabled_after)
+        eval_score_dict = {}
+        for name, eval_score in zip(names, eval_scores):
+            eval_score_dict[name] = eval_score
+            _logger.debug("For layer: %s, the eval score is: %f", name, eval_score_dict[name])
 
         if disable_all_quantizers:
             for enabled_quantizers in enabled_quant_wrappers.values():
@@ -632,11 +678,14 @@ class QuantAnalyzer:
             name_to_quant_wrapper_dict[name] = module
 
         modules = utils.get_ordered_list_of_modules(self._model, self._dummy_input)
-        mse_loss_dict = {}
-        for name, module in modules:
-            quant_wrapper = name_to_quant_wrapper_dict[name]
-            loss = self._compute_mse_loss(module, quant_wrapper, self._model, sim)
-            mse_loss_dict[name] = loss
+        if self._mse_loss_one_pass:
+            mse_loss_dict = self._compute_mse_loss_one_pass(modules, name_to_quant_wrapper_dict, sim)
+        else:
+            mse_loss_dict = {}
+            for name, module in modules:
+                quant_wrapper = name_to_quant_wrapper_dict[name]
+                loss = self._compute_mse_loss(module, quant_wrapper, self._model, sim)
+                mse_loss_dict[name] = loss
 
         export_per_layer_mse_plot(mse_loss_dict,
                                   results_dir,
@@ -681,6 +730,79 @@ class QuantAnalyzer:
         average_loss = loss/total
         return average_loss
 
+    def _compute_mse_loss_one_pass(self, modules: List[Tuple[str, torch.nn.Module]],
+                                   name_to_quant_wrapper_dict: Dict[str, torch.nn.Module],
+                                   sim: QuantizationSimModel) -> Dict[str, float]:
+        """
+        Compute MSE loss between fp32 and quantized output activations of all the given modules, passing each batch
+        through the fp32 and quantsim model only once.
+
+        NOTE: Each batch is passed through the whole fp32 model before the quantsim model, since the fp32 output
+        activations have to be computed from the fp32 inputs of each module. Hence, peak memory grows with
+        output activations of all the given modules for one batch, and each of them is released once the
+        corresponding quant wrapper is run. Only the running loss is kept across batches.
+        Modules which never produce a tensor output are left out of the result.
+
+        :param modules: List of (name, module) from the fp32 model.
+        :param name_to_quant_wrapper_dict: Dictionary which maps module name to module in the quantsim model.
+        :param sim: Quantsim model.
+        :return: layer wise MSE loss. dict[layer_name] = MSE loss.
+        """
+        # pylint: disable=too-many-locals
+        fp32_out_acts = {}
+        losses = {name: 0.0 for name, _ in modules}
+        totals = {name: 0 for name, _ in modules}
+
+        def fp32_hook(name: str):
+            def hook(_, __, out):
+                # Like ModuleData, only the first call of the module is taken into account
+                if name not in fp32_out_acts and isinstance(out, torch.Tensor):
+                    fp32_out_acts[name] = out.detach()
+            return hook
+
+        def quant_hook(name: str):
+            def hook(_, __, out):
+                fp32_out = fp32_out_acts.pop(name, None)
+                if fp32_out is not None and isinstance(out, torch.Tensor):
+                    # Accumulate on device in double precision, same as summing up the python floats
+                    loss = torch.nn.functional.mse_loss(fp32_out, out.detach())
+                    losses[name] = loss.double() + losses[name]
+                    totals[name] += fp32_out.size(0)
+            return hook
+
+        def adjust_input_dtype(module: torch.nn.Module, inp):
+            if hasattr(module, 'weight') and module.weight is not None:
+                dtype = module.weight.dtype
+                return utils.nested_map(inp, lambda x: x.to(dtype) if x.is_floating_point() else x)
+            return inp
+
+        handles = []
+        for model in (self._model, sim.model):
+            handles += [module.register_forward_pre_hook(adjust_input_dtype) for module in model.modules()]
+        for name, module in modules:
+            handles.append(module.register_forward_hook(fp32_hook(name)))
+            handles.append(name_to_quant_wrapper_dict[name].register_forward_hook(quant_hook(name)))
+
+        try:
+            with utils.in_eval_mode([self._model, sim.model]), torch.no_grad():
+                for batch_index, model_inputs in enumerate(self._unlabeled_dataset_iterable):
+                    if batch_index == self._num_batches:
+                        break
+                    assert isinstance(model_inputs, (torch.Tensor, tuple, list))
+                    for model in (self._model, sim.model):
+                        inputs = utils.change_tensor_device_placement(model_inputs, utils.get_device(model))
+                        utils.ModuleData.default_forward_fn(model, inputs)
+                    fp32_out_acts.clear()
+        finally:
+            for handle in handles:
+                handle.remove()
+
+        skipped = [name for name, _ in modules if not totals[name]]
+        if skipped:
+            _logger.info("Skipped MSE loss of layers without tensor output: %s", skipped)
+
+        return {name: float(losses[name]) / totals[name] for name, _ in modules if totals[name]}
+
     @staticmethod
     def _exclude_modules_from_quantization(model: torch.nn.Module, sim: QuantizationSimModel,
                                            modules_to_ignore: List[torch.nn.Module]):
@@ -706,3 +828,181 @@ class QuantAnalyzer:
             quant_wrappers_to_ignore.append(quant_wrapper)
 
         sim.exclude_layers_from_quantization(quant_wrappers_to_ignore)
+
+
+class _PerLayerEvaluator:
+    """
+    Evaluates the quantsim model with quantizers of one quant wrapper toggled at a time.
+
+    Quant wrappers and quantizers are referenced directly, so that a pickled copy of the evaluator
+    refers to the quant wrappers and quantizers of its own copy of the model.
+    """
+    def __init__(self,
+                 model: torch.nn.Module,
+                 eval_callback: CallbackFunc,
+                 sorted_quant_wrappers: Dict,
+                 enabled_quant_wrappers: Dict,
+                 enabled_before: bool,
+                 enabled_after: bool):
+        """
+        :param model: Quantsim model.
+        :param eval_callback: Callback function for model evaluation.
+        :param sorted_quant_wrappers: Ordered dictionary which maps wrapped module name to quant wrapper.
+        :param enabled_quant_wrappers: Dictionary which maps a quant wrapper to a list of enabled quantizers in it.
+        :param enabled_before: Flag to set enabled for quantizers before evaluation.
+        :param enabled_after: Flag to set enabled for quantizers after evaluation.
+        """
+        self._model = model
+        self._eval_callback = eval_callback
+        self._sorted_quant_wrappers = sorted_quant_wrappers
+        self._enabled_quant_wrappers = enabled_quant_wrappers
+        self._enabled_before = enabled_before
+        self._enabled_after = enabled_after
+        # Maps quant wrapper name to the indices of its recorded outputs in the tensor store
+        self._recorded_outputs: Optional[Dict[str, List[int]]] = None
+        self._store_path: Optional[str] = None
+        self._store: Optional[TensorStore] = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # Tensor store is opened again lazily from its path after unpickling
+        state['_store'] = None
+        return state
+
+    def evaluate(self, name: str) -> float:
+        """
+        Evaluate the model with quantizers of the given quant wrapper toggled.
+
+        :param name: Name of the quant wrapper.
+        :return: Eval score.
+        """
+        enabled_quantizers = self._enabled_quant_wrappers[self._sorted_quant_wrappers[name]]
+        QuantAnalyzer._enable_disable_quantizers(enabled_quantizers, enabled=self._enabled_before) # pylint: disable=protected-access
+
+        with self._replay_outputs(name):
+            eval_score = self._eval_model()
+
+        QuantAnalyzer._enable_disable_quantizers(enabled_quantizers, enabled=self._enabled_after) # pylint: disable=protected-access
+        return eval_score
+
+    def record_outputs(self, store_path: str):
+        """
+        Evaluate the model without toggling any quant wrapper and record outputs of all the quant wrappers.
+
+        :param store_path: Directory of the tensor store to write the recorded outputs to. The directory must
+            outlive the evaluator and all its pickled copies.
+        """
+        store = TensorStore.open(store_path)
+        recorded_outputs = defaultdict(list)
+
+        def record_hook(quant_wrapper: torch.nn.Module, _, output):
+            recorded_outputs[module_to_name[quant_wrapper]].append(store.append(output))
+
+        module_to_name = {quant_wrapper: name for name, quant_wrapper in self._sorted_quant_wrappers.items()}
+        handles = [quant_wrapper.register_forward_hook(record_hook) for quant_wrapper in module_to_name]
+        try:
+            with store.batch_writes():
+                self._eval_model()
+        finally:
+            for handle in handles:
+                handle.remove()
+
+        self._recorded_outputs = dict(recorded_outputs)
+        self._store_path = store_path
+        self._store = store
+
+    def _get_recorded_output(self, name: str, call_index: int, device: torch.device):
+        """
+        Read a recorded output of the quant wrapper from the tensor store.
+
+        :param name: Name of the quant wrapper.
+        :param call_index: Index of the call of the quant wrapper.
+        :param device: Device to place the output on.
+        :return: Recorded output.
+        """
+        if self._store is None:
+            self._store = TensorStore.open(self._store_path)
+        output = self._store[self._recorded_outputs[name][call_index]]
+        # Copy so that in-place operations of the following modules don't modify the memory-mapped output
+        return utils.nested_map(output, lambda t: t.to(device, copy=True))
+
+    @contextlib.contextmanager
+    def _replay_outputs(self, toggled_name: str):
+        """
+        Replace quant wrappers preceding the toggled quant wrapper with recorded outputs. Within each call of the
+        model, a quant wrapper is replayed only until the toggled quant wrapper is called for the first time.
+
+        :param toggled_name: Name of the toggled quant wrapper.
+        """
+        if self._recorded_outputs is None:
+            yield
+            return
+
+        names = list(self._sorted_quant_wrappers)
+        device = utils.get_device(self._model)
+        state = {'toggled': False}
+        call_counts = defaultdict(int)
+
+        def reset_hook(*_):
+            state['toggled'] = False
+
+        def toggled_hook(*_):
+            state['toggled'] = True
+
+        def make_replay_forward(name: str, forward):
+            def replay_forward(*args, **kwargs):
+                call_index = call_counts[name]
+                call_counts[name] += 1
+                if state['toggled']:
+                    return forward(*args, **kwargs)
+                return self._get_recorded_output(name, call_index, device)
+            return replay_forward
+
+        handles = [self._model.register_forward_pre_hook(reset_hook),
+                   self._sorted_quant_wrappers[toggled_name].register_forward_pre_hook(toggled_hook)]
+        replayed_quant_wrappers = []
+        for name in names[:names.index(toggled_name)]:
+            quant_wrapper = self._sorted_quant_wrappers[name]
+            if name in self._recorded_outputs:
+                quant_wrapper.forward = make_replay_forward(name, quant_wrapper.forward)
+                replayed_quant_wrappers.append(quant_wrapper)
+        try:
+            yield
+        finally:
+            for handle in handles:
+                handle.remove()
+            for quant_wrapper in replayed_quant_wrappers:
+                del quant_wrapper.forward
+
+    def _eval_model(self) -> float:
+        """
+        Evaluate the model performance.
+
+        :return: Scaler value representing model performance.
+        """
+        with utils.in_eval_mode(self._model), torch.no_grad():
+            return self._eval_callback.func(self._model, self._eval_callback.args)
+
+
+# Evaluator of the worker process
+_worker_evaluator: Optional[_PerLayerEvaluator] = None
+
+
+def _init_worker(pickled_evaluator: bytes):
+    """
+    Initialize worker process with its own copy of the evaluator.
+
+    :param pickled_evaluator: Pickled evaluator.
+    """
+    global _worker_evaluator # pylint: disable=global-statement
+    _worker_evaluator = pickle.loads(pickled_evaluator)
+
+
+def _evaluate_in_worker(name: str) -> float:
+    """
+    Evaluate the model with quantizers of the given quant wrapper toggled in the worker process.
+
+    :param name: Name of the quant wrapper.
+    :return: Eval score.
+    """
+    return _worker_evaluator.evaluate(name)
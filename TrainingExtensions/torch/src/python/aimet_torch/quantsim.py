@@ -69,7 +69,7 @@ from aimet_torch.qc_quantize_op import get_encoding_by_quantizer as _get_encodin
 from aimet_torch import torchscript_utils, utils, transformer_utils, onnx_utils
 from aimet_torch.utils import deprecated
 from aimet_torch.onnx_utils import OnnxSaver, OnnxExportApiArgs, CustomMarker, get_pytorch_name_from_onnx_name
-from aimet_torch.meta.connectedgraph import ConnectedGraph, Op
+from aimet_torch.meta.connectedgraph import Op, get_connected_graph
 from aimet_torch.qc_quantize_recurrent import QcQuantizeRecurrent
 from aimet_torch.v2.quantization.builder import LazyQuantizeWrapper
 from aimet_torch.v2.nn import BaseQuantizationMixin
@@ -247,8 +247,10 @@ class QuantizationSimModel:
         else:
             self.model = copy.deepcopy(model)
 
+        # Graphs already cached for the given model, e.g. by BN fold or CLE, are carried over to the copy, while
+        # the given model itself is left untouched
         try:
-            self.connected_graph = ConnectedGraph(self.model, dummy_input)
+            self.connected_graph = get_connected_graph(self.model, dummy_input)
         except (torch.jit.TracingCheckError, AssertionError):
             self.connected_graph = None
 
@@ -91,12 +91,16 @@ class SeqMseParams:
     :param loss_fn: Loss function. Available options are 'mse', 'l1' and 'sqnr'. Default 'mse'.
     :param forward_fn: Optional adapter function that performs forward pass given a model and inputs
      yielded from the data loader. The function expects model as first argument and inputs to model as second argument.
+    :param candidate_batch_size: Optional number of candidates to evaluate together with a single batched matmul per
+     batch. Larger values search faster at the cost of memory for the stacked quantized weights. If None (default),
+     candidates are evaluated one at a time.
     """
     num_batches: int
     num_candidates: int = 20
     inp_symmetry: str = 'symqt'
     loss_fn: str = 'mse'
     forward_fn: Callable = default_forward_fn
+    candidate_batch_size: Optional[int] = None
 
 
 class SequentialMse:
@@ -457,17 +461,20 @@ class SequentialMse:
             per_channel_min = torch.min(quant_module.weight, dim=1)[0].detach()
         candidates = cls.get_candidates(params.num_candidates, per_channel_max, per_channel_min)
 
-        total_loss = []
-        for cand_max, cand_min in candidates:
-            cls.compute_param_encodings(quant_module.param_quantizers['weight'], cand_min, cand_max)
-            w = quant_module.weight
-            wq = cls._get_quantized_weight(quant_module)
-            loss = torch.zeros(len(cand_max), device=w.device)
-            with torch.no_grad():
-                for batch_idx in range(params.num_batches):
-                    xqwq, xw = cls.compute_outputs(quant_module, x[batch_idx], xq[batch_idx], w, wq)
-                    loss += cls.compute_recon_loss(xqwq, xw, params)
-                total_loss.append(loss)
+        if params.candidate_batch_size:
+            total_loss = cls._compute_candidate_losses_batched(quant_module, x, xq, candidates, params)
+        else:
+            total_loss = []
+            for cand_max, cand_min in candidates:
+                cls.compute_param_encodings(quant_module.param_quantizers['weight'], cand_min, cand_max)
+                w = quant_module.weight
+                wq = cls._get_quantized_weight(quant_module)
+                loss = torch.zeros(len(cand_max), device=w.device)
+                with torch.no_grad():
+                    for batch_idx in range(params.num_batches):
+                        xqwq, xw = cls.compute_outputs(quant_module, x[batch_idx], xq[batch_idx], w, wq)
+                        loss += cls.compute_recon_loss(xqwq, xw, params)
+                    total_loss.append(loss)
 
         best_indices = torch.stack(total_loss).min(0, keepdim=True)[1]
         _logger.debug("Indices of optimal candidate: %s", best_indices.squeeze(0)[:params.num_candidates].tolist())
@@ -478,6 +485,55 @@ class SequentialMse:
         cls.compute_param_encodings(quant_module.param_quantizers['weight'], best_min, best_max)
         cls._freeze_quantizer_encoding(quant_module.param_quantizers['weight'])
 
+    @classmethod
+    def _compute_candidate_losses_batched(cls,
+                                          quant_module: QcQuantizeWrapper,
+                                          x: torch.Tensor,
+                                          xq: torch.Tensor,
+                                          candidates: List[Tuple[torch.Tensor, torch.Tensor]],
+                                          params: SeqMseParams) -> List[torch.Tensor]:
+        """
+        Compute per-channel reconstruction loss of every candidate. Quantized weights of up to
+        params.candidate_batch_size candidates are stacked so that X^W^ of the whole chunk is computed by a single
+        batched matmul, and XW is computed only once per batch for each chunk instead of once per candidate.
+
+        :param quant_module: Quant module to be optimized
+        :param x: Inputs to module from FP32 model
+        :param xq: Inputs to module from QuantSim model
+        :param candidates: List of (cand_max, cand_min) candidates
+        :param params: Sequenial MSE parameters
+        :return: List of per-channel losses, one for each candidate
+        """
+        # pylint: disable=too-many-locals
+        module = cls._get_original_module(quant_module)
+        if not isinstance(module, torch.nn.Linear):
+            raise ValueError('Unsupported module: ', module)
+
+        quantizer = quant_module.param_quantizers['weight']
+        w = quant_module.weight
+        total_loss = []
+        with torch.no_grad():
+            for start in range(0, len(candidates), params.candidate_batch_size):
+                chunk = candidates[start:start + params.candidate_batch_size]
+                wq = []
+                for cand_max, cand_min in chunk:
+                    cls.compute_param_encodings(quantizer, cand_min, cand_max)
+                    wq.append(cls._get_quantized_weight(quant_module).as_subclass(torch.Tensor))
+                # Transposed stack of quantized weights: (num_chunk_candidates, in_features, out_features)
+                wq_t = torch.stack(wq).transpose(1, 2)
+                del wq
+
+                loss = torch.zeros(len(chunk), w.shape[0], device=w.device)
+                for batch_idx in range(params.num_batches):
+                    xw = functional.linear(x[batch_idx], w, module.bias)
+                    xw = xw.reshape(-1, xw.shape[-1])
+                    xqwq = torch.matmul(xq[batch_idx].reshape(-1, xq.shape[-1]), wq_t)
+                    if module.bias is not None:
+                        xqwq += module.bias
+                    loss += cls._compute_batched_recon_loss(xqwq, xw, params)
+                total_loss.extend(loss)
+        return total_loss
+
     @staticmethod
     def compute_param_encodings(quantizer: Union[StaticGridPerTensorQuantizer, StaticGridPerChannelQuantizer],
                                 x_min: torch.Tensor,
@@ -531,15 +587,7 @@ class SequentialMse:
         :param params: Sequenial MSE parameters
         :return: loss
         """
-        if params.loss_fn == "mse":
-            loss_fn = functional.mse_loss
-        elif params.loss_fn == "l1":
-            loss_fn = functional.l1_loss
-        elif params.loss_fn == "sqnr":
-            loss_fn = neg_sqnr
-        else:
-            raise ValueError(f"Invalid loss function: {params.loss_fn}")
-
+        loss_fn = _get_loss_fn(params)
         channel_dim = xqwq.shape[-1]
         xqwq = xqwq.reshape(-1, channel_dim)
         xw = xw.reshape(-1, channel_dim)
@@ -547,6 +595,21 @@ class SequentialMse:
         assert loss.size() == torch.Size([channel_dim])
         return loss
 
+    @staticmethod
+    def _compute_batched_recon_loss(xqwq: torch.Tensor, xw: torch.Tensor, params: SeqMseParams):
+        """
+        Batched counterpart of compute_recon_loss with a leading candidate dimension.
+
+        :param xqwq: X^Q^ quantized-dequantized values of shape (num_candidates, N, channel)
+        :param xw: XW FP32 values of shape (N, channel)
+        :param params: Sequenial MSE parameters
+        :return: loss of shape (num_candidates, channel)
+        """
+        loss_fn = _get_loss_fn(params)
+        loss = loss_fn(xqwq, xw.expand_as(xqwq), reduction="none").sum(-2)
+        assert loss.size() == xqwq.shape[::2]
+        return loss
+
     @staticmethod
     def _is_symmetric_quantizer(quantizer: TensorQuantizer):
         return quantizer.use_symmetric_encodings
@@ -578,12 +641,28 @@ def neg_sqnr(pred: torch.Tensor, target: torch.Tensor, eps=1e-10, reduction="non
     """
     # pylint: disable=unused-argument
     quant_error = target - pred
-    exp_noise = torch.mean(quant_error ** 2, 0, keepdim=True) + eps
-    exp_signal = torch.mean(target ** 2, 0, keepdim=True)
+    exp_noise = torch.mean(quant_error ** 2, -2, keepdim=True) + eps
+    exp_signal = torch.mean(target ** 2, -2, keepdim=True)
     sqnr = exp_signal / exp_noise
     sqnr_db = 10 * torch.log10(sqnr)
     return -sqnr_db
 
+
+def _get_loss_fn(params: SeqMseParams) -> Callable:
+    """
+    Get reconstruction loss function specified by Sequential MSE parameters.
+
+    :param params: Sequenial MSE parameters
+    :return: Loss function
+    """
+    if params.loss_fn == "mse":
+        return functional.mse_loss
+    if params.loss_fn == "l1":
+        return functional.l1_loss
+    if params.loss_fn == "sqnr":
+        return neg_sqnr
+    raise ValueError(f"Invalid loss function: {params.loss_fn}")
+
 # Global variables for compatibility
 apply_seq_mse = SequentialMse.apply_seq_mse
 get_candidates = SequentialMse.get_candidates
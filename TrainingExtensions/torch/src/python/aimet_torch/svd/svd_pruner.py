@@ -58,6 +58,7 @@ class SpatialSvdPruner(aimet_common.svd_pruner.SpatialSvdPruner):
     """
     Pruner for Spatial-SVD method
     """
+    supports_overlay = True
 
     def _perform_svd_and_split_layer(self, layer: Layer, rank: int, comp_layer_db: LayerDatabase):
         """
@@ -88,6 +89,7 @@ class WeightSvdPruner(Pruner):
     """
     Pruner for Weight-SVD method
     """
+    supports_overlay = True
 
     def _prune_layer(self, orig_layer_db: LayerDatabase, comp_layer_db: LayerDatabase, layer: Layer, comp_ratio: float,
                      cost_metric: CostMetric):
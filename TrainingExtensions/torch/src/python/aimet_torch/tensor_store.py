@@ -0,0 +1,419 @@
+# -*- mode: python -*-
+# =============================================================================
+#  @@-COPYRIGHT-START-@@
+#
+#  Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright notice,
+#     this list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright notice,
+#     this list of conditions and the following disclaimer in the documentation
+#     and/or other materials provided with the distribution.
+#
+#  3. Neither the name of the copyright holder nor the names of its contributors
+#     may be used to endorse or promote products derived from this software
+#     without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+#  SPDX-License-Identifier: BSD-3-Clause
+#
+#  @@-COPYRIGHT-END-@@
+# =============================================================================
+""" Memory-mapped store of tensor data """
+
+import contextlib
+import os
+import pickle
+import threading
+import weakref
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import torch
+
+from aimet_common.utils import AimetLogger
+
+logger = AimetLogger.get_area_logger(AimetLogger.LogAreas.Utils)
+
+# Tensor data is aligned so that any dtype can be viewed directly from the memory-mapped bytes
+_ALIGNMENT = 64
+_PAGE_SIZE = 4096
+
+_COMPRESSION_DTYPES = (torch.float16, torch.bfloat16)
+
+
+class _TensorRecord(NamedTuple):
+    """ Location and layout of a tensor in the data file """
+    offset: int
+    shape: Tuple[int, ...]
+    dtype: torch.dtype
+    stored_dtype: torch.dtype
+
+    @property
+    def nbytes(self) -> int:
+        """ Number of bytes of the stored tensor """
+        numel = 1
+        for dim in self.shape:
+            numel *= dim
+        return numel * self.stored_dtype.itemsize
+
+
+class TensorStore:
+    """
+    Store of nested tensor structures (tensors, or nested tuples, lists and dicts of tensors).
+
+    All the tensors of an entry are written contiguously to a single data file which is memory-mapped for reading, so
+    the tensors are returned as zero-copy views of the page cache instead of being deserialized.
+    The layout of each entry (offsets, shapes and dtypes of the tensors, along with any non-tensor objects) is kept
+    in a small index file next to the data file.
+
+    Overwriting an existing entry releases its space in the data file, and the new data is written in place if it fits.
+    Released space is reused by later writes, so repeatedly overwriting the same entries, e.g. once per block in
+    block-wise algorithms, doesn't grow the data file. Tensors previously read from an overwritten entry must not be
+    used after the overwrite; copy them if they need to outlive it.
+    """
+    DATA_FILE = 'tensors.bin'
+    INDEX_FILE = 'index.pkl'
+
+    # Stores opened in this process, so that writers and readers of the same path share the index
+    _opened_stores = weakref.WeakValueDictionary()
+    _opened_stores_lock = threading.Lock()
+
+    def __init__(self, path: str, compression_dtype: Optional[torch.dtype] = None):
+        """
+        :param path: Directory of the store
+        :param compression_dtype: If torch.float16 or torch.bfloat16, floating point tensors of higher precision
+         are stored in this dtype and cast back to their original dtype when read
+        """
+        if compression_dtype is not None and compression_dtype not in _COMPRESSION_DTYPES:
+            raise ValueError(f'Compression dtype must be one of {_COMPRESSION_DTYPES}; got {compression_dtype}')
+
+        os.makedirs(path, exist_ok=True)
+        self._path = path
+        self._data_path = os.path.join(path, self.DATA_FILE)
+        self._index_path = os.path.join(path, self.INDEX_FILE)
+        self._compression_dtype = compression_dtype
+        self._lock = threading.RLock()
+        self._mapped_data = None
+        self._index_dirty = False
+        self._num_batched_writes = 0
+
+        # Make sure the data file exists so that it can be memory-mapped
+        open(self._data_path, 'ab').close() # pylint: disable=consider-using-with
+
+        self._index: Dict[int, Any] = {}
+        if os.path.exists(self._index_path):
+            with open(self._index_path, 'rb') as file:
+                self._index = pickle.load(file)
+
+        # Sorted list of [start, end) byte ranges of the data file not referenced by any entry
+        self._free_extents: List[List[int]] = []
+        offset = 0
+        for start, end in sorted(filter(None, map(_get_extent, self._index.values()))):
+            if start > offset + -offset % _ALIGNMENT:
+                self._free_extents.append([offset, start])
+            offset = max(offset, end)
+        self._data_size = max(offset, os.path.getsize(self._data_path))
+        if self._data_size > offset:
+            self._free_extents.append([offset, self._data_size])
+
+    @classmethod
+    def open(cls, path: str, compression_dtype: Optional[torch.dtype] = None) -> 'TensorStore':
+        """
+        Returns the store at the given path, reusing the store if it's already opened in this process
+
+        :param path: Directory of the store
+        :param compression_dtype: Compression dtype for the tensors written to the store
+        :return: Tensor store
+        """
+        key = os.path.abspath(path)
+        with cls._opened_stores_lock:
+            store = cls._opened_stores.get(key)
+            if store is None or not os.path.exists(store._index_path): # pylint: disable=protected-access
+                store = cls(path, compression_dtype)
+                cls._opened_stores[key] = store
+            elif compression_dtype is not None:
+                store._compression_dtype = compression_dtype # pylint: disable=protected-access
+            return store
+
+    @classmethod
+    def exists(cls, path: str) -> bool:
+        """
+        Returns True if a tensor store exists at the given path
+        """
+        return os.path.exists(os.path.join(path, cls.INDEX_FILE))
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, index: int) -> bool:
+        return index in self._index
+
+    def __setitem__(self, index: int, data: Any):
+        with self._lock:
+            old_layout = self._index.pop(index, None)
+            if old_layout is not None:
+                self._release(_get_extent(old_layout))
+
+            data = self._to_stored_tensors(data)
+            size = self._get_size(data, 0)
+            offset = self._allocate(size)
+            if offset < self._data_size:
+                # Reused space may be referenced by the tensors being written (e.g. the overwritten entry itself),
+                # so detach them from the mapped data file before writing
+                data = _nested_map(data, lambda stored: stored._replace(tensor=stored.tensor.clone()), _StoredTensor)
+                # Pages of the current mapping may have been copied on write, so map the file again on next read
+                self._mapped_data = None
+
+            with open(self._data_path, 'r+b') as file:
+                file.seek(offset)
+                self._index[index] = self._write(data, file)
+            self._data_size = max(self._data_size, offset + size)
+
+            self._index_dirty = True
+            if not self._num_batched_writes:
+                self.flush()
+
+    def __getitem__(self, index: int) -> Any:
+        return self.get(index)
+
+    def append(self, data: Any) -> int:
+        """
+        Appends data to the store
+
+        :param data: Tensor, or nested tuple, list or dict of tensors
+        :return: Index of the appended entry
+        """
+        with self._lock:
+            index = len(self._index)
+            self[index] = data
+            return index
+
+    def get(self, index: int, pin_memory: bool = False, populate: bool = False) -> Any:
+        """
+        Reads an entry from the store
+
+        :param index: Index of the entry
+        :param pin_memory: If True, copy the tensors into page-locked memory for fast/asynchronous host to
+         device transfer. Ignored if CUDA is not available.
+        :param populate: If True, read the memory-mapped pages eagerly instead of on first access.
+        :return: Entry with the same structure as written. Unless pinned or decompressed, the tensors are views of
+         the privately mapped data file, so in-place modifications are not written back to the store.
+        """
+        with self._lock:
+            if index not in self._index:
+                raise IndexError(f'Index {index} not found in tensor store at {self._path}')
+            layout = self._index[index]
+            data = self._read(layout, self._get_mapped_data(layout))
+
+        pin_memory = pin_memory and torch.cuda.is_available()
+        def postprocess(tensor: torch.Tensor) -> torch.Tensor:
+            if pin_memory:
+                return tensor.pin_memory()
+            if populate and tensor.numel():
+                # Touch one element per page to fault in the memory-mapped pages
+                tensor.reshape(-1)[::max(_PAGE_SIZE // tensor.element_size(), 1)].sum()
+            return tensor
+
+        return _nested_map(data, postprocess)
+
+    @contextlib.contextmanager
+    def batch_writes(self):
+        """
+        Context manager which defers writing the index file until the end of the context, instead of rewriting it
+        after every write to the store
+        """
+        with self._lock:
+            self._num_batched_writes += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._num_batched_writes -= 1
+                if not self._num_batched_writes:
+                    self.flush()
+
+    def flush(self):
+        """
+        Writes the index file if it has changed since it was last written
+        """
+        with self._lock:
+            if self._index_dirty:
+                self._save_index()
+                self._index_dirty = False
+
+    def _to_stored_tensors(self, data: Any) -> Any:
+        """
+        Converts all the tensors in data to contiguous CPU tensors of the dtype they are stored in
+        """
+        def to_stored_tensor(tensor: torch.Tensor) -> _StoredTensor:
+            tensor = tensor.detach()
+            stored_dtype = tensor.dtype
+            if self._compression_dtype is not None and tensor.is_floating_point() and \
+                    tensor.element_size() > self._compression_dtype.itemsize:
+                stored_dtype = self._compression_dtype
+            return _StoredTensor(tensor.to(device='cpu', dtype=stored_dtype).contiguous(), tensor.dtype)
+
+        return _nested_map(data, to_stored_tensor)
+
+    @staticmethod
+    def _get_size(data: Any, offset: int) -> int:
+        """
+        Returns the number of bytes needed to write data at the given aligned offset
+        """
+        end = offset
+        for stored in _iter_instances(data, _StoredTensor):
+            end += -end % _ALIGNMENT
+            end += stored.tensor.numel() * stored.tensor.element_size()
+        return end - offset
+
+    def _allocate(self, size: int) -> int:
+        """
+        Returns an aligned offset with size bytes of free space, taking it from the first free extent that fits or
+        from the end of the data file
+        """
+        for i, (start, end) in enumerate(self._free_extents):
+            offset = start + -start % _ALIGNMENT
+            if offset + size <= end or end == self._data_size:
+                if offset + size < end:
+                    self._free_extents[i][0] = offset + size
+                else:
+                    del self._free_extents[i]
+                return offset
+        return self._data_size + -self._data_size % _ALIGNMENT
+
+    def _release(self, extent: Optional[Tuple[int, int]]):
+        """
+        Marks the [start, end) byte range of the data file as free, merging it with adjacent free extents
+        """
+        if extent is None:
+            return
+        extents = sorted(self._free_extents + [list(extent)])
+        self._free_extents = [extents[0]]
+        for start, end in extents[1:]:
+            # Gaps smaller than the alignment can't hold any tensor, so the extents around them are merged
+            if start <= self._free_extents[-1][1] + -self._free_extents[-1][1] % _ALIGNMENT:
+                self._free_extents[-1][1] = max(self._free_extents[-1][1], end)
+            else:
+                self._free_extents.append([start, end])
+
+    def _write(self, data: Any, file) -> Any:
+        """
+        Writes all the stored tensors in data to the file and returns the layout of data
+        """
+        if isinstance(data, _StoredTensor):
+            tensor = data.tensor
+            offset = file.tell()
+            padding = -offset % _ALIGNMENT
+            file.write(bytes(padding))
+            offset += padding
+            file.write(tensor.reshape(-1).view(torch.uint8).numpy())
+            return _TensorRecord(offset, tuple(tensor.shape), data.dtype, tensor.dtype)
+
+        if isinstance(data, (tuple, list)):
+            cls = tuple if isinstance(data, tuple) else list
+            return cls(self._write(x, file) for x in data)
+
+        if isinstance(data, dict):
+            return {key: self._write(value, file) for key, value in data.items()}
+
+        return data
+
+    def _read(self, layout: Any, mapped_data: torch.Tensor) -> Any:
+        """
+        Reconstructs the data of given layout from the memory-mapped data file
+        """
+        if isinstance(layout, _TensorRecord):
+            tensor = mapped_data[layout.offset:layout.offset + layout.nbytes]
+            tensor = tensor.view(layout.stored_dtype).view(layout.shape)
+            if layout.stored_dtype != layout.dtype:
+                tensor = tensor.to(layout.dtype)
+            return tensor
+
+        if isinstance(layout, (tuple, list)):
+            cls = tuple if isinstance(layout, tuple) else list
+            return cls(self._read(x, mapped_data) for x in layout)
+
+        if isinstance(layout, dict):
+            return {key: self._read(value, mapped_data) for key, value in layout.items()}
+
+        return layout
+
+    def _get_mapped_data(self, layout: Any) -> torch.Tensor:
+        """
+        Returns the memory-mapped data file, remapping it if the given layout lies beyond the mapped region
+        """
+        end = max((record.offset + record.nbytes for record in _iter_records(layout)), default=0)
+        if end == 0:
+            return torch.empty(0, dtype=torch.uint8)
+        if self._mapped_data is None or self._mapped_data.numel() < end:
+            size = os.path.getsize(self._data_path)
+            # shared=False maps the file privately, so tensors can't modify the file
+            self._mapped_data = torch.from_file(self._data_path, shared=False, size=size, dtype=torch.uint8)
+        return self._mapped_data
+
+    def _save_index(self):
+        """
+        Atomically writes the index file
+        """
+        tmp_path = self._index_path + '.tmp'
+        with open(tmp_path, 'wb') as file:
+            pickle.dump(self._index, file)
+        os.replace(tmp_path, self._index_path)
+
+
+class _StoredTensor(NamedTuple):
+    """ CPU tensor in the dtype it is stored in, along with its original dtype """
+    tensor: torch.Tensor
+    dtype: torch.dtype
+
+
+def _iter_instances(data: Any, cls: type):
+    """ Yields all the instances of cls in a nested tuple, list or dict """
+    if isinstance(data, cls):
+        yield data
+    elif isinstance(data, (tuple, list)):
+        for x in data:
+            yield from _iter_instances(x, cls)
+    elif isinstance(data, dict):
+        for x in data.values():
+            yield from _iter_instances(x, cls)
+
+
+def _iter_records(layout: Any):
+    """ Yields all the tensor records in the layout """
+    yield from _iter_instances(layout, _TensorRecord)
+
+
+def _get_extent(layout: Any) -> Optional[Tuple[int, int]]:
+    """ Returns the [start, end) byte range of the data file spanned by the tensors of the layout """
+    records = list(_iter_records(layout))
+    if not records:
+        return None
+    return min(record.offset for record in records), max(record.offset + record.nbytes for record in records)
+
+
+def _nested_map(data, fn, leaf_type: type = torch.Tensor):
+    """ Applies fn to all the tensors (or instances of leaf_type) in a nested tuple, list or dict """
+    if isinstance(data, leaf_type):
+        return fn(data)
+    if isinstance(data, (tuple, list)):
+        cls = tuple if isinstance(data, tuple) else list
+        return cls(_nested_map(x, fn, leaf_type) for x in data)
+    if isinstance(data, dict):
+        return {key: _nested_map(value, fn, leaf_type) for key, value in data.items()}
+    return data
@@ -36,6 +36,7 @@
 # pylint: disable = too-many-lines
 """ Utilities that are used for different AIMET PyTorch features """
 
+import concurrent.futures
 import importlib
 import inspect
 import itertools
@@ -60,6 +61,7 @@ from aimet_common.utils import profile as _profile
 import aimet_common.libpymo as libpymo
 from aimet_torch import elementwise_ops
 from aimet_torch.tensor_quantizer import TensorQuantizer
+from aimet_torch.tensor_store import TensorStore
 from aimet_torch.v2.nn.base import BaseQuantizationMixin
 from aimet_torch.v2.utils import _ContextManager
 
@@ -197,15 +199,26 @@ class CachedDataset(Dataset):
     """
     Cache number of batches from the data loader at given path location and
     provide interface to fetch single batch of model inputs.
+
+    The batches are stored in a memory-mapped TensorStore, so reading a batch doesn't need deserialization.
+    Iterating over the dataset prefetches the next batch in the background.
     """
 
-    # pylint: disable=super-init-not-called
-    def __init__(self, data_loader: DataLoader, num_batches: int, path: str):
+    # pylint: disable=super-init-not-called, too-many-arguments
+    def __init__(self, data_loader: DataLoader, num_batches: int, path: str,
+                 compression_dtype: Optional[torch.dtype] = None, pin_memory: bool = False, prefetch: bool = True):
         """
         :param data_loader: Data loader
         :param num_batches: Number of batches to fetch from data loader
         :param path: Path to save model inputs
+        :param compression_dtype: Optional torch.float16 or torch.bfloat16 to store floating point tensors with
+        :param pin_memory: If True, batches are read into page-locked memory for faster transfer to GPU
+        :param prefetch: If True, read the next batch in the background while iterating over the dataset
         """
+        self._pin_memory = pin_memory
+        self._prefetch = prefetch
+        self._store = None
+
         if data_loader:
             if len(data_loader) < num_batches:
                 raise ValueError(f'Can not fetch {num_batches} batches from '
@@ -213,12 +226,18 @@ class CachedDataset(Dataset):
 
             self._num_batches = num_batches
             self._path = path
+            self._store = TensorStore.open(path, compression_dtype)
 
             self._cache_model_inputs(itertools.islice(data_loader, num_batches))
         else:
-            assert len(os.listdir(path)) == num_batches
             self._num_batches = num_batches
             self._path = path
+            if TensorStore.exists(path):
+                self._store = TensorStore.open(path)
+                assert len(self._store) == num_batches
+            else:
+                # Batches pickled individually, e.g. by older versions of save_to_cache
+                assert len(os.listdir(path)) == num_batches
             logger.info('Found %d batches of data at path location: %s', self._num_batches, self._path)
 
 
@@ -226,6 +245,32 @@ class CachedDataset(Dataset):
         return self._num_batches
 
     def __getitem__(self, index: int):
+        return self._load(index)
+
+    def __iter__(self):
+        if not self._prefetch:
+            for index in range(len(self)):
+                yield self[index]
+            return
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(self._load, 0, True) if len(self) else None
+            for index in range(len(self)):
+                batch = future.result()
+                if index + 1 < len(self):
+                    future = executor.submit(self._load, index + 1, True)
+                yield batch
+
+    def _load(self, index: int, populate: bool = False):
+        """
+        Load a single batch from the cache
+
+        :param index: Index of the batch
+        :param populate: If True, eagerly read the batch into memory
+        """
+        if self._store is not None:
+            return self._store.get(index, pin_memory=self._pin_memory, populate=populate)
+
         path = os.path.join(self._path, 'model_inputs_' + str(index))
 
         with open(path, 'rb') as file:
@@ -235,15 +280,11 @@ class CachedDataset(Dataset):
 
     def _cache_model_inputs(self, data_loader):
         """
-        Function to cache number of batches individually in separate file at provided path location
+        Function to cache number of batches at provided path location
         """
-        if not os.path.exists(self._path):
-            os.makedirs(self._path)
-
-        for i, batch in enumerate(data_loader):
-            path = os.path.join(self._path, f'model_inputs_{i}')
-            with open(path, 'wb') as file:
-                pickle.dump(batch, file)
+        with self._store.batch_writes():
+            for i, batch in enumerate(data_loader):
+                self._store[i] = batch
 
         logger.info('Caching %d batches from data loader at path location: %s', self._num_batches, self._path)
 
@@ -982,16 +1023,12 @@ def disable_all_quantizers(model: torch.nn.Module) -> Handle:
 
 def save_to_cache(tensor, dir_path, idx):
     """
-    Save tensor data into provided path with index
+    Save tensor data into the TensorStore at provided path with index
     :param tensor: Tensor
     :param dir_path: Provided path to save data
-    :param idx: Index of the file
+    :param idx: Index of the data
     """
-    if not os.path.exists(dir_path):
-        os.makedirs(dir_path)
-    path = os.path.join(dir_path, f'model_inputs_{idx}')
-    with open(path, 'wb') as cache:
-        pickle.dump(tensor, cache)
+    TensorStore.open(dir_path)[idx] = tensor
 
 
 def get_named_module(model, name):
@@ -1044,29 +1081,32 @@ def cache_intermediate_datasets(
     cached_data = []
     module = get_named_module(model, module_name)
     iterator = iter(cached_dataset)
-    for idx in range(len(cached_dataset)):
-        def fn(_, inputs):
-            if incl_kwargs:
-                module_forward_fn = inspect.currentframe().f_back
-                assert inspect.getframeinfo(module_forward_fn).function == '_call_impl'  # forward function proxy
-                kwargs = module_forward_fn.f_locals['kwargs']
-                if kwargs:
-                    inputs = add_foward_fn_kwargs_to_inputs(module, *inputs, **kwargs)
-
-            inputs = [*inputs]
-            if cache_on_cpu:
-                cached_data.append(change_tensor_device_placement(inputs, torch.device('cpu')))
-            else:
-                save_to_cache(inputs, path, idx)
-            raise StopForwardException
-        handle = module.register_forward_pre_hook(fn)
-        data = next(iterator)
-        try:
-            with in_eval_mode(model), torch.no_grad():
-                _ = forward_fn(model, data)
-        except StopForwardException:
-            pass
-        handle.remove()
+    # Write the index of the tensor store once after caching all the batches
+    store_context = contextlib.nullcontext() if cache_on_cpu else TensorStore.open(path).batch_writes()
+    with store_context:
+        for idx in range(len(cached_dataset)):
+            def fn(_, inputs):
+                if incl_kwargs:
+                    module_forward_fn = inspect.currentframe().f_back
+                    assert inspect.getframeinfo(module_forward_fn).function == '_call_impl'  # forward function proxy
+                    kwargs = module_forward_fn.f_locals['kwargs']
+                    if kwargs:
+                        inputs = add_foward_fn_kwargs_to_inputs(module, *inputs, **kwargs)
+
+                inputs = [*inputs]
+                if cache_on_cpu:
+                    cached_data.append(change_tensor_device_placement(inputs, torch.device('cpu')))
+                else:
+                    save_to_cache(inputs, path, idx)
+                raise StopForwardException
+            handle = module.register_forward_pre_hook(fn)
+            data = next(iterator)
+            try:
+                with in_eval_mode(model), torch.no_grad():
+                    _ = forward_fn(model, data)
+            except StopForwardException:
+                pass
+            handle.remove()
 
     return cached_data
 
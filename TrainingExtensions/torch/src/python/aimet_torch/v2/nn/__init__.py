@@ -72,3 +72,21 @@ def compute_param_encodings(model: torch.nn.Module):
     for module in model.modules():
         if isinstance(module, BaseQuantizationMixin): # pylint: disable=undefined-variable
             module.compute_param_encodings()
+
+
+@contextlib.contextmanager
+def cache_quantized_parameters(model: torch.nn.Module):
+    """
+    Cache quantized parameters of all quantized modules in the model and reuse them across forward passes.
+    Cached quantized parameters are invalidated automatically when the parameters or their encodings are modified.
+
+    .. note::
+        Caching only takes effect when gradient computation is disabled, e.g. under ``torch.no_grad()``.
+    """
+    with contextlib.ExitStack() as stack:
+        for module in model.modules():
+            if isinstance(module, BaseQuantizationMixin): # pylint: disable=undefined-variable
+                ctx = module.cache_quantized_parameters()
+                stack.enter_context(ctx)
+
+        yield
@@ -41,6 +41,7 @@ import contextlib
 import itertools
 from typing import Type, List, Dict, Union, Iterable, Mapping, Optional
 
+import torch
 import torch.nn as nn
 
 from aimet_torch.v2.quantization.base import QuantizerBase
@@ -78,6 +79,9 @@ class BaseQuantizationMixin(abc.ABC):
     output_quantizers: nn.ModuleList
     param_quantizers: nn.ModuleDict
 
+    # Cache of quantized parameters. Only used while cache_quantized_parameters() is enabled
+    _quantized_param_cache: Optional[Dict[str, '_QuantizedParamCacheEntry']] = None
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.__quant_init__()
@@ -120,11 +124,52 @@ class BaseQuantizationMixin(abc.ABC):
             for param_name, param_quantizer in self.param_quantizers.items():
                 if param_quantizer:
                     orig_param = getattr(self, param_name)
-                    quantized_param = param_quantizer(orig_param)
+                    quantized_param = self._quantize_param(param_name, orig_param, param_quantizer)
                     ctx = patch_attr(self, param_name, quantized_param)
                     stack.enter_context(ctx)
             yield
 
+    def _quantize_param(self, param_name: str, param: torch.Tensor, param_quantizer: QuantizerBase):
+        """
+        Quantize parameter, or return the cached quantized parameter if neither
+        the parameter nor the quantizer has changed since it was cached.
+        """
+        if self._quantized_param_cache is None or torch.is_grad_enabled():
+            return param_quantizer(param)
+
+        entry = self._quantized_param_cache.get(param_name)
+        if entry is None or not entry.is_valid(param, param_quantizer):
+            entry = _QuantizedParamCacheEntry(param, param_quantizer, param_quantizer(param))
+            self._quantized_param_cache[param_name] = entry
+
+        return entry.quantized_param
+
+    @contextlib.contextmanager
+    def cache_quantized_parameters(self):
+        """Enters the :meth:`cache_quantized_parameters` context, where quantized parameters are cached and reused
+        across forward passes instead of being quantized in every forward pass.
+
+        The cached quantized parameter is invalidated automatically when the parameter or the encodings of its
+        quantizer are modified. Caching only takes effect when gradient computation is disabled,
+        e.g. under ``torch.no_grad()``.
+
+        Example:
+
+            >>> qlinear = QuantizedLinear(10, 10)
+            >>> qlinear.param_quantizers['weight'] = QuantizeDequantize((10, 1), 8, symmetric=True)
+            >>> with qlinear.cache_quantized_parameters(), torch.no_grad():
+            >>>     for x in data_loader:
+            >>>         qlinear(x) # Weight is quantized only in the first iteration
+
+        """
+        if self._quantized_param_cache is not None:
+            # Already enabled
+            yield
+            return
+
+        with patch_attr(self, '_quantized_param_cache', {}):
+            yield
+
     def _compute_param_encodings(self, overwrite: bool):
         """
         :param bool overwrite: If True, the quantizers that are already initialized will also recompute encodings.
@@ -494,3 +539,37 @@ def _remove_quantizers(quantizers, keys):
         raise
     else:
         return ctx
+
+
+class _QuantizedParamCacheEntry:
+    """
+    Quantized parameter tagged with the versions of the tensors it was computed from
+    """
+    def __init__(self, param: torch.Tensor, param_quantizer: QuantizerBase, quantized_param: torch.Tensor):
+        self.objects, self.versions, self.config = self._get_key(param, param_quantizer)
+        self.quantized_param = quantized_param
+
+    @staticmethod
+    def _get_key(param: torch.Tensor, param_quantizer: QuantizerBase):
+        tensors = (param, *param_quantizer.parameters(), *param_quantizer.buffers())
+        # Tensor version counter is incremented by every in-place modification of the tensor.
+        # Dtype, device, and storage change without incrementing the version counter when module.to() or
+        # module.double() replaces the data of the parameter
+        # pylint: disable=protected-access
+        versions = tuple((tensor._version, tensor.dtype, tensor.device, tensor.data_ptr()) for tensor in tensors)
+        # Non-tensor quantizer attributes such as bitwidth, symmetry, and block size
+        config = tuple((name, value) for name, value in vars(param_quantizer).items()
+                       if isinstance(value, (bool, int, float, str, tuple, list, type(None))))
+        # Identity of the objects the quantized parameter depends on, including the forward function if patched
+        objects = (param_quantizer, vars(param_quantizer).get('forward'), *tensors)
+        return objects, versions, repr(config)
+
+    def is_valid(self, param: torch.Tensor, param_quantizer: QuantizerBase) -> bool:
+        """
+        Returns True if neither the parameter nor the quantizer has changed since the entry was created
+        """
+        objects, versions, config = self._get_key(param, param_quantizer)
+        return len(objects) == len(self.objects) and \
+               all(x is y for x, y in zip(objects, self.objects)) and \
+               versions == self.versions and \
+               config == self.config
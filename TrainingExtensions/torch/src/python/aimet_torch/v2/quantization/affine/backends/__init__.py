@@ -40,6 +40,9 @@ import math
 from typing import overload, Union, Tuple, Optional, List
 import torch
 from .utils import *
+from . import fused
+
+add_backend('fused', fused)
 
 
 @overload
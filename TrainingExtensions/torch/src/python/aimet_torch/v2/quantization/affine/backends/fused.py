@@ -0,0 +1,269 @@
+# -*- mode: python -*-
+# =============================================================================
+#  @@-COPYRIGHT-START-@@
+#
+#  Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright notice,
+#     this list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright notice,
+#     this list of conditions and the following disclaimer in the documentation
+#     and/or other materials provided with the distribution.
+#
+#  3. Neither the name of the copyright holder nor the names of its contributors
+#     may be used to endorse or promote products derived from this software
+#     without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+#  SPDX-License-Identifier: BSD-3-Clause
+#
+#  @@-COPYRIGHT-END-@@
+# =============================================================================
+""" Quantization backend that runs each quantization op as a single fused kernel """
+import functools
+from typing import Optional, List, Tuple
+import torch
+
+from aimet_torch.v2.quantization.affine.backends.torch_builtins import (
+    _validate_arguments,
+    _is_numerically_stable,
+    _is_range_representable,
+    get_encoding_shape_with_blocks,
+    reshape_tensor_for_blocks,
+)
+
+
+def _compile(fn):
+    """
+    Compile elementwise function into a fused kernel.
+    Falls back to TorchScript if torch.compile is not available (torch < 2.0)
+    """
+    if not hasattr(torch, 'compile'):
+        return torch.jit.script(fn)
+
+    options = {}
+    from torch._inductor import config as inductor_config # pylint: disable=import-outside-toplevel
+    if hasattr(inductor_config, 'emulate_precision_casts'):
+        # Round intermediate results of low-precision inputs (float16, bfloat16)
+        # the same way as eager mode does to produce identical results to torch_builtins
+        options['emulate_precision_casts'] = True
+    return torch.compile(fn, dynamic=True, options=options)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_kernel(name: str):
+    """
+    Lazily compile and return the kernel of the given name
+    """
+    return _compile(_KERNELS[name])
+
+
+def _quantize_kernel(tensor: torch.Tensor, scale: torch.Tensor, offset: torch.Tensor,
+                     qmin: float, qmax: float) -> torch.Tensor:
+    return torch.clamp(torch.round(tensor / scale) - offset, qmin, qmax)
+
+
+def _quantize_with_mask_kernel(tensor: torch.Tensor, scale: torch.Tensor, offset: torch.Tensor,
+                               qmin: float, qmax: float) -> Tuple[torch.Tensor, torch.Tensor]:
+    x_round = torch.round(tensor / scale) - offset
+    mask = (x_round >= qmin) & (x_round <= qmax)
+    return torch.clamp(x_round, qmin, qmax), mask
+
+
+def _quantize_backward_kernel(grad: torch.Tensor, tensor: torch.Tensor, scale: torch.Tensor,
+                              mask: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+    masked_grad = grad * mask
+    return masked_grad / scale, -masked_grad * tensor / scale / scale, -masked_grad
+
+
+def _dequantize_kernel(tensor: torch.Tensor, scale: torch.Tensor, offset: torch.Tensor) -> torch.Tensor:
+    return (tensor + offset) * scale
+
+
+def _quantize_dequantize_kernel(tensor: torch.Tensor, scale: torch.Tensor, offset: torch.Tensor,
+                                qmin: float, qmax: float) -> torch.Tensor:
+    return (torch.clamp(torch.round(tensor / scale) - offset, qmin, qmax) + offset) * scale
+
+
+def _quantize_dequantize_backward_kernel(grad: torch.Tensor, tensor: torch.Tensor, scale: torch.Tensor,
+                                         offset: torch.Tensor, qmin: float, qmax: float) \
+        -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+    # Recompute rounding and clamping mask from the input instead of saving them in forward.
+    # This is cheap since it is fused with the gradient computation
+    x_round = torch.round(tensor / scale) - offset
+    x_quant = torch.clamp(x_round, qmin, qmax)
+    mask = (x_round >= qmin) & (x_round <= qmax)
+    tensor_grad = grad * mask
+    scale_grad = grad * (x_quant + offset - mask * tensor / scale)
+    offset_grad = -grad * (mask * scale - scale)
+    return tensor_grad, scale_grad, offset_grad
+
+
+_KERNELS = {
+    'quantize': _quantize_kernel,
+    'quantize_with_mask': _quantize_with_mask_kernel,
+    'quantize_backward': _quantize_backward_kernel,
+    'dequantize': _dequantize_kernel,
+    'quantize_dequantize': _quantize_dequantize_kernel,
+    'quantize_dequantize_backward': _quantize_dequantize_backward_kernel,
+}
+
+
+def _requires_grad(*tensors: torch.Tensor) -> bool:
+    return torch.is_grad_enabled() and any(t.requires_grad for t in tensors)
+
+
+def quantize(tensor: torch.Tensor, scale: torch.Tensor, offset: torch.Tensor,
+             qmin: int, qmax: int, block_size: Optional[List] = None) -> torch.Tensor:
+    """
+    Performs differentiable quantization given scale, offset, and quantization range.
+
+    :param tensor: Tensor to quantize
+    :param scale: Scale factor for quantization
+    :param offset: Offset value for quantization
+    :param qmin: Minimum value of the quantization range
+    :param qmax: Maximum value of the quantization range
+    :param block_size: Block sizes per dimension
+    """
+    _validate_arguments(tensor, scale, offset, qmin, qmax, block_size)
+
+    if not _is_range_representable(tensor.dtype, qmin, qmax):
+        msg = f"{tensor.dtype} is unable to represent quantized output of range [{qmin}, {qmax}]."
+        raise RuntimeError(msg)
+
+    orig_tensor_shape = tensor.shape
+    tensor = reshape_tensor_for_blocks(tensor, scale.shape, block_size)
+    scale = scale.view(get_encoding_shape_with_blocks(scale.shape, block_size))
+    offset = offset.view(get_encoding_shape_with_blocks(offset.shape, block_size))
+
+    if _requires_grad(tensor, scale, offset):
+        output = QuantizeFunc.apply(tensor, scale, offset, qmin, qmax)
+    else:
+        output = _get_kernel('quantize')(tensor, scale, offset, float(qmin), float(qmax))
+    return output.view(orig_tensor_shape)
+
+
+def quantize_dequantize(tensor: torch.Tensor, scale: torch.Tensor, offset: torch.Tensor,
+                        qmin: int, qmax: int, block_size: Optional[List] = None) -> torch.Tensor:
+    """
+    Performs differentiable quantize-dequantize given scale, offset, and quantization range.
+
+    :param tensor: Tensor to quantize
+    :param scale: Scale factor for quantization
+    :param offset: Offset value for quantization
+    :param qmin: Minimum value of the quantization range
+    :param qmax: Maximum value of the quantization range
+    :param block_size: Block sizes per dimension
+    """
+    _validate_arguments(tensor, scale, offset, qmin, qmax, block_size)
+
+    output_dtype = internal_dtype = tensor.dtype
+
+    if not _is_numerically_stable(internal_dtype, qmin, qmax):
+        internal_dtype = torch.float32
+
+    if not _is_range_representable(internal_dtype, qmin, qmax):
+        msg = f"{internal_dtype} is unable to represent quantized output of range [{qmin}, {qmax}]."
+        raise RuntimeError(msg)
+
+    orig_tensor_shape = tensor.shape
+    tensor = reshape_tensor_for_blocks(tensor, scale.shape, block_size).to(internal_dtype)
+    scale = scale.view(get_encoding_shape_with_blocks(scale.shape, block_size)).to(internal_dtype)
+    offset = offset.view(get_encoding_shape_with_blocks(offset.shape, block_size)).to(internal_dtype)
+
+    if _requires_grad(tensor, scale, offset):
+        output = QuantDequantFunc.apply(tensor, scale, offset, qmin, qmax)
+    else:
+        output = _get_kernel('quantize_dequantize')(tensor, scale, offset, float(qmin), float(qmax))
+    return output.to(output_dtype).view(orig_tensor_shape)
+
+
+def dequantize(tensor: torch.Tensor, scale: torch.Tensor, offset: torch.Tensor, block_size: Optional[List] = None) \
+        -> torch.Tensor:
+    """
+    Performs differentiable dequantize operation given scale and offset.
+
+    :param tensor: Tensor to quantize
+    :param scale: Scale factor for quantization
+    :param offset: Offset value for quantization
+    :param block_size: Block sizes per dimension
+    :return: Resulting tensor
+    """
+    _validate_arguments(tensor, scale, offset, block_size=block_size)
+    orig_tensor_shape = tensor.shape
+    tensor = reshape_tensor_for_blocks(tensor, scale.shape, block_size)
+    scale = scale.view(get_encoding_shape_with_blocks(scale.shape, block_size))
+    offset = offset.view(get_encoding_shape_with_blocks(offset.shape, block_size))
+
+    # Dequantization is linear in all its inputs, so autograd of the compiled kernel
+    # yields the same gradients as torch_builtins.DequantizeFunc
+    return _get_kernel('dequantize')(tensor, scale, offset).view(orig_tensor_shape)
+
+
+# pylint: disable=abstract-method
+class QuantizeFunc(torch.autograd.Function):
+    """
+    Custom gradient function for quantization using fused kernels
+    """
+    # pylint: disable=arguments-differ
+    @staticmethod
+    def forward(ctx, tensor: torch.Tensor, scale: torch.Tensor, offset: torch.Tensor, qmin: int, qmax: int):
+        x_quant, mask = _get_kernel('quantize_with_mask')(tensor, scale, offset, float(qmin), float(qmax))
+        ctx.tensor_requires_grad = tensor.requires_grad
+        ctx.scale_requires_grad = scale.requires_grad
+        ctx.offset_requires_grad = offset.requires_grad
+        ctx.save_for_backward(tensor, scale, mask)
+        return x_quant
+
+    # pylint: disable=arguments-differ
+    @staticmethod
+    def backward(ctx, grad):
+        tensor, scale, mask = ctx.saved_tensors
+        tensor_grad, scale_grad, offset_grad = _get_kernel('quantize_backward')(grad, tensor, scale, mask)
+        return tensor_grad if ctx.tensor_requires_grad else None, \
+               scale_grad if ctx.scale_requires_grad else None, \
+               offset_grad if ctx.offset_requires_grad else None, \
+               None, None
+
+
+# pylint: disable=abstract-method
+class QuantDequantFunc(torch.autograd.Function):
+    """
+    Custom gradient function for quant-dequant using fused kernels
+    """
+    # pylint: disable=arguments-differ
+    @staticmethod
+    def forward(ctx, tensor: torch.Tensor, scale: torch.Tensor, offset: torch.Tensor, qmin: int, qmax: int):
+        ctx.tensor_requires_grad = tensor.requires_grad
+        ctx.scale_requires_grad = scale.requires_grad
+        ctx.offset_requires_grad = offset.requires_grad
+        ctx.qmin = float(qmin)
+        ctx.qmax = float(qmax)
+        ctx.save_for_backward(tensor, scale, offset)
+        return _get_kernel('quantize_dequantize')(tensor, scale, offset, ctx.qmin, ctx.qmax)
+
+    # pylint: disable=arguments-differ
+    @staticmethod
+    def backward(ctx, grad):
+        tensor, scale, offset = ctx.saved_tensors
+        tensor_grad, scale_grad, offset_grad = \
+            _get_kernel('quantize_dequantize_backward')(grad, tensor, scale, offset, ctx.qmin, ctx.qmax)
+        return tensor_grad if ctx.tensor_requires_grad else None, \
+               scale_grad if ctx.scale_requires_grad else None, \
+               offset_grad if ctx.offset_requires_grad else None, \
+               None, None
@@ -130,7 +130,8 @@ def quantize(tensor: torch.Tensor, scale: torch.Tensor, offset: torch.Tensor,
     return QuantizeFunc.apply(tensor, scale, offset, qmin, qmax).view(orig_tensor_shape)
 
 def quantize_dequantize(tensor: torch.Tensor, scale: torch.Tensor, offset: torch.Tensor,
-                        qmin: int, qmax: int, block_size: Optional[List] = None) -> torch.Tensor:
+                        qmin: int, qmax: int, block_size: Optional[List] = None,
+                        low_memory_backward: bool = False) -> torch.Tensor:
     """
     Performs differentiable quantize-dequantize given scale, offset, and quantization range.
 
@@ -140,6 +141,7 @@ def quantize_dequantize(tensor: torch.Tensor, scale: torch.Tensor, offset: torch
     :param qmin: Minimum value of the quantization range
     :param qmax: Maximum value of the quantization range
     :param block_size: Block sizes per dimension
+    :param low_memory_backward: If True, save bit-packed masks instead of the input for backward
     """
     _validate_arguments(tensor, scale, offset, qmin, qmax, block_size)
 
@@ -156,10 +158,11 @@ def quantize_dequantize(tensor: torch.Tensor, scale: torch.Tensor, offset: torch
     tensor = reshape_tensor_for_blocks(tensor, scale.shape, block_size)
     scale = scale.view(get_encoding_shape_with_blocks(scale.shape, block_size))
     offset = offset.view(get_encoding_shape_with_blocks(offset.shape, block_size))
-    return QuantDequantFunc.apply(tensor.to(internal_dtype),
-                                  scale.to(internal_dtype),
-                                  offset.to(internal_dtype),
-                                  qmin, qmax).to(output_dtype).view(orig_tensor_shape)
+    func = QuantDequantFuncLowMemory if low_memory_backward else QuantDequantFunc
+    return func.apply(tensor.to(internal_dtype),
+                      scale.to(internal_dtype),
+                      offset.to(internal_dtype),
+                      qmin, qmax).to(output_dtype).view(orig_tensor_shape)
 
 def dequantize(tensor: torch.Tensor, scale: torch.Tensor, offset: torch.Tensor, block_size: Optional[List] = None) \
         -> torch.Tensor:
@@ -277,6 +280,79 @@ class QuantDequantFunc(torch.autograd.Function):
         offset_grad = -grad * (mask * scale - scale) if ctx.offset_requires_grad else None
         return tensor_grad, scale_grad, offset_grad, None, None
 
+
+def _pack_bits(mask: torch.Tensor) -> torch.Tensor:
+    """
+    Pack a boolean tensor into a flat uint8 tensor holding 8 elements per byte
+    """
+    flat = mask.flatten().to(torch.uint8)
+    pad = -flat.numel() % 8
+    if pad:
+        flat = torch.nn.functional.pad(flat, (0, pad))
+    shifts = torch.arange(8, dtype=torch.uint8, device=flat.device)
+    return (flat.view(-1, 8) << shifts).sum(dim=-1, dtype=torch.uint8)
+
+
+def _unpack_bits(packed: torch.Tensor, shape: torch.Size) -> torch.Tensor:
+    """
+    Inverse of :func:`_pack_bits`
+    """
+    shifts = torch.arange(8, dtype=torch.uint8, device=packed.device)
+    flat = ((packed.unsqueeze(-1) >> shifts) & 1).flatten()
+    return flat[:shape.numel()].view(shape).to(torch.bool)
+
+
+# pylint: disable=abstract-method
+class QuantDequantFuncLowMemory(torch.autograd.Function):
+    """
+    Custom gradient function for quant-dequant which computes the same gradients as
+    :class:`QuantDequantFunc` while saving less state for backward.
+
+    Gradients w.r.t. input and offset only depend on the clamping mask and scale,
+    so only a bit-packed mask (1 bit per element) is saved for them and the input is never saved.
+    Gradient w.r.t. scale depends on the input itself, so if scale requires grad, the input is saved
+    and the quantized tensor and mask are recomputed in backward instead of being saved.
+    """
+    # pylint: disable=arguments-differ
+    @staticmethod
+    def forward(ctx, tensor: torch.Tensor, scale: torch.Tensor, offset: torch.Tensor, qmin: int, qmax: int):
+        x_round = torch.round(tensor / scale) - offset
+        x_quant = torch.clamp(x_round, qmin, qmax)
+        x_dequant = (x_quant + offset) * scale
+
+        ctx.tensor_requires_grad = tensor.requires_grad
+        ctx.scale_requires_grad = scale.requires_grad
+        ctx.offset_requires_grad = offset.requires_grad
+        ctx.qmin = qmin
+        ctx.qmax = qmax
+        ctx.shape = tensor.shape
+
+        if ctx.scale_requires_grad:
+            ctx.save_for_backward(tensor, scale, offset)
+        elif tensor.requires_grad or offset.requires_grad:
+            mask = (x_round >= qmin) * (x_round <= qmax)
+            ctx.save_for_backward(_pack_bits(mask), scale)
+        return x_dequant
+
+    # pylint: disable=arguments-differ
+    @staticmethod
+    def backward(ctx, grad):
+        if ctx.scale_requires_grad:
+            tensor, scale, offset = ctx.saved_tensors
+            x_round = torch.round(tensor / scale) - offset
+            x_quant = torch.clamp(x_round, ctx.qmin, ctx.qmax)
+            mask = (x_round >= ctx.qmin) * (x_round <= ctx.qmax)
+            scale_grad = grad * (x_quant + offset - mask * tensor / scale)
+        else:
+            packed_mask, scale = ctx.saved_tensors
+            mask = _unpack_bits(packed_mask, ctx.shape)
+            scale_grad = None
+
+        tensor_grad = grad * mask if ctx.tensor_requires_grad else None
+        offset_grad = -grad * (mask * scale - scale) if ctx.offset_requires_grad else None
+        return tensor_grad, scale_grad, offset_grad, None, None
+
+
 def get_encoding_shape_with_blocks(original_encoding_shape: torch.Size, block_size: List[int]):
     """
     Get new encoding param shape to account for block sizes. If block_size is not None, the original shape is
@@ -538,6 +538,9 @@ class QuantizeDequantize(MinMaxQuantizer):
 
     :ivar Tensor min: :math:`\theta_{min}` from which scale and offset will be derived.
     :ivar Tensor max: :math:`\theta_{max}` from which scale and offset will be derived.
+    :ivar bool low_memory_backward: If True, saves bit-packed clamping masks instead of the input for backward
+        unless the encodings require grad. If enabled, the quantizer always runs on the ``torch_builtins`` backend. False by default.
+        See also :func:`aimet_torch.v2.utils.enable_low_memory_backward`.
 
     .. note::
         :class:`QuantizeDequantize` cannot run :meth:`forward` until :attr:`min` and :attr:`max` are properly initialized,
@@ -593,6 +596,11 @@ class QuantizeDequantize(MinMaxQuantizer):
                              0.3765,  0.1725,  0.3137,  0.9882]],
                           grad_fn=<AliasBackward0>)
     """
+    def __init__(self, shape, bitwidth: int, symmetric: bool, encoding_analyzer: EncodingAnalyzer = None,
+                 block_size: Optional[Tuple] = None):
+        super().__init__(shape, bitwidth, symmetric, encoding_analyzer, block_size)
+        self.low_memory_backward = False
+
     def forward(self, input: torch.Tensor) -> DequantizedTensor:
         """Quantizes and dequantizes the input tensor
 
@@ -610,12 +618,22 @@ class QuantizeDequantize(MinMaxQuantizer):
             )
 
         encoding = self.get_encoding()
-        output = quantize_dequantize(input,
-                                     encoding.scale.to(input.dtype),
-                                     encoding.offset.to(input.dtype),
-                                     encoding.bitwidth,
-                                     encoding.signed,
-                                     block_size=self.block_size)
+        # NOTE: This forward can be also borrowed by other quantizers which don't define low_memory_backward
+        if getattr(self, 'low_memory_backward', False):
+            output = torch_builtins.quantize_dequantize(input,
+                                                        encoding.scale.to(input.dtype),
+                                                        encoding.offset.to(input.dtype),
+                                                        -encoding.num_negative_steps,
+                                                        encoding.num_positive_steps,
+                                                        block_size=self.block_size,
+                                                        low_memory_backward=True)
+        else:
+            output = quantize_dequantize(input,
+                                         encoding.scale.to(input.dtype),
+                                         encoding.offset.to(input.dtype),
+                                         encoding.bitwidth,
+                                         encoding.signed,
+                                         block_size=self.block_size)
         output = output.as_subclass(DequantizedTensor)
         output.encoding = encoding
         return output
@@ -140,74 +140,87 @@ class _HistogramObserver(_Observer[_Histogram]):
             self.stats.append(_Histogram())
 
 
-    # pylint: disable=too-many-locals
+    def _get_histogram_inputs(self, input_tensor: torch.Tensor) -> torch.Tensor:
+        """
+        Returns a channel-major view of input_tensor with shape (num_histograms, -1),
+        where the i-th row holds all the elements that fall into the i-th histogram
+        """
+        padded_histogram_shape = (
+            *itertools.repeat(1, input_tensor.dim() - len(self.shape)),
+            *self.shape
+        )
+        histogram_dims = tuple(axis for axis, dim in enumerate(padded_histogram_shape) if dim > 1)
+        other_dims = tuple(axis for axis, dim in enumerate(padded_histogram_shape) if dim == 1)
+        return input_tensor.permute(histogram_dims + other_dims).reshape(self.num_histograms, -1)
+
     @torch.no_grad()
     def collect_stats(self, input_tensor: torch.Tensor) -> List[_Histogram]:
         if not _is_expandable(self.shape, input_tensor.shape):
             raise RuntimeError(f"Shape {self.shape} is incompatible with input of shape {input_tensor.shape}")
 
-        hist_stats = []
-        input_shape = tuple(input_tensor.shape)
-        histogram_shape = self.shape
-
-        padded_histogram_shape = (
-            *itertools.repeat(1, len(input_shape) - len(histogram_shape)),
-            *histogram_shape
-        )
-
-        for hist_num in range(self.num_histograms):
-            hist_input = input_tensor
+        hist_inputs = self._get_histogram_inputs(input_tensor)
+        hist_min, hist_max = self._handle_inf_inputs(hist_inputs)
+        bin_edges = self._create_bin_edges(min_val=hist_min, max_val=hist_max, device=input_tensor.device)
+        histograms = self._batched_histc(hist_inputs, bin_edges[:, 0], bin_edges[:, -1])
 
-            for axis, dim in enumerate(padded_histogram_shape):
-                if dim == 1:
-                    continue
-                # elements in current axis, ex: could be W*C, C, or 1 for input_shape [H, W, C]
-                numel = torch.prod(torch.Tensor(padded_histogram_shape[axis+1:]), dtype=int)
-                # index where hist_input at current dimension will be sliced at
-                index = (hist_num // numel) % dim
-                hist_input = torch.unsqueeze(torch.select(hist_input, axis, index), axis)
-
-            hist_min, hist_max = self._handle_inf_inputs(hist_input)
-            bin_edges = self._create_bin_edges(min_val=hist_min, max_val=hist_max, device=input_tensor.device)
-            histogram = torch.histc(hist_input.to(torch.float), bins=self.num_bins, min=bin_edges[0], max=bin_edges[-1])
-
-            # clip inf values to hist_min and hist_max and adjust for any fp errors
-            histogram[0] += torch.sum(hist_input < bin_edges[0])
-            histogram[-1] += torch.sum(hist_input > bin_edges[-1])
-
-            hist_stats.append(_Histogram(histogram, bin_edges, hist_min, hist_max))
-
-        return hist_stats
+        return [
+            _Histogram(histogram, edges, min, max)
+            for histogram, edges, min, max in zip(histograms, bin_edges, hist_min, hist_max)
+        ]
 
     # pylint: disable=no-self-use
-    def _handle_inf_inputs(self, hist_input):
-        if torch.all(torch.isinf(hist_input)):
+    def _handle_inf_inputs(self, hist_inputs):
+        if torch.any(torch.all(torch.isinf(hist_inputs), dim=1)):
             raise ValueError('Input tensor cannot contain only infinite values')
 
-        min = hist_input[hist_input.isfinite()].min()
-        max = hist_input[hist_input.isfinite()].max()
+        is_finite = hist_inputs.isfinite()
+        inf = torch.tensor(float('inf'), dtype=hist_inputs.dtype, device=hist_inputs.device)
+        min = torch.where(is_finite, hist_inputs, inf).amin(dim=1)
+        max = torch.where(is_finite, hist_inputs, -inf).amax(dim=1)
 
         return min, max
 
     def _create_bin_edges(self, min_val, max_val, device):
+        """
+        Creates bin edges of shape (*min_val.shape, num_bins + 1) that evenly split [min_val, max_val]
+        """
         # Adjust min/max values to be in line with PyTorch's torch.histc implementation
-        if max_val == min_val:
-            min_val = min_val - 0.5
-            max_val = max_val + 0.5
-
-        min_val, max_val = min_val.float(), max_val.float()
+        is_singular = max_val == min_val
+        min_val = torch.where(is_singular, min_val - 0.5, min_val).float()
+        max_val = torch.where(is_singular, max_val + 0.5, max_val).float()
 
         step = (max_val - min_val) / self.num_bins
 
-        return torch.arange(0, self.num_bins + 1, device=device) * step + min_val
+        return torch.arange(0, self.num_bins + 1, device=device) * step[..., None] + min_val[..., None]
+
+    def _batched_histc(self, hist_inputs: torch.Tensor, bin_min: torch.Tensor, bin_max: torch.Tensor) -> torch.Tensor:
+        """
+        Computes the histograms of all rows of hist_inputs in a single pass.
+        Equivalent to calling torch.histc on each row with range [bin_min[i], bin_max[i]],
+        except that the values out of range (including infs) are clipped into the first/last bin.
+
+        :param hist_inputs: Tensor of shape (num_histograms, N)
+        :param bin_min: Tensor of shape (num_histograms,)
+        :param bin_max: Tensor of shape (num_histograms,)
+        :return: Histograms of shape (num_histograms, num_bins)
+        """
+        hist_inputs = hist_inputs.to(torch.float)
+        bin_min = bin_min.float()[:, None]
+        bin_max = bin_max.float()[:, None]
+
+        # Same arithmetic as torch.histc to get identical bin assignment
+        bin_index = (hist_inputs - bin_min) * self.num_bins / (bin_max - bin_min)
+        bin_index = bin_index.nan_to_num_(0).clamp_(0, self.num_bins - 1).to(torch.int64)
+        bin_index += self.num_bins * torch.arange(hist_inputs.shape[0], device=hist_inputs.device)[:, None]
+
+        # NaNs don't belong to any bin
+        counts = (~hist_inputs.isnan()).to(torch.float)
 
-    def _get_bin_num(self, bin_width: int, curr_min, data):
-        bin_tensor = torch.full(data.shape, self.num_bins - 1, device=data.device)
-        index_tensor = (data - curr_min) / bin_width
-        return torch.minimum(index_tensor.to(torch.int32), bin_tensor)
+        histograms = torch.zeros(hist_inputs.shape[0] * self.num_bins, device=hist_inputs.device)
+        histograms.index_add_(0, bin_index.flatten(), counts.flatten())
+        return histograms.view(-1, self.num_bins)
 
     # pylint: disable=arguments-differ
-    # pylint: disable=too-many-locals
     @torch.no_grad()
     def merge_stats(self, new_stats_list: List[_Histogram], input_tensor: torch.Tensor):
 
@@ -215,52 +228,36 @@ class _HistogramObserver(_Observer[_Histogram]):
             self.stats = new_stats_list
             return
 
-        hist_inputs = torch.reshape(input_tensor, (len(new_stats_list), -1))
-        for index, new_stats in enumerate(new_stats_list):
-            curr_stats = self.stats[index]
-            curr_input = hist_inputs[index]
-
-            updated_min = min(new_stats.min, curr_stats.min)
-            updated_max = max(new_stats.max, curr_stats.max)
-
-            # if the current histogram can capture new_stats within in its range
-            if updated_min == curr_stats.min and updated_max == curr_stats.max:
-                histogram_updates = curr_stats.histogram
-            else:
-
-                dest_bin_width = (updated_max - updated_min) / self.num_bins
-                src_bin_width = (curr_stats.max - curr_stats.min) / self.num_bins
-                histogram_updates = torch.zeros(self.num_bins).to(input_tensor.device)
-
-                src_bin_start = curr_stats.min + (src_bin_width * torch.arange(0, self.num_bins, device=input_tensor.device))
-                dest_bin_index = self._get_bin_num(dest_bin_width, updated_min, src_bin_start)
-                dest_bin_end = updated_min + dest_bin_width * (dest_bin_index + 1)
-
-                # split curr_hist if values in source bin cannot neatly fold into dest bin
-                split_hist_value = torch.round(((dest_bin_end - src_bin_start) / src_bin_width) * curr_stats.histogram)
-                dest_bin_updates = torch.minimum(split_hist_value, curr_stats.histogram)
-
-                # update appropriate bin with either the full or split curr_hist value
-                for i, dest_bin in enumerate(dest_bin_index):
-                    histogram_updates[dest_bin] += dest_bin_updates[i]
-
-                # if curr_hist is split, update other bin that the remaining values fall into
-                other_bins = torch.nonzero(torch.where(dest_bin_updates < curr_stats.histogram, 1, 0))
-                other_bin_index = self._get_bin_num(dest_bin_width, updated_min, src_bin_start + dest_bin_width)
-                other_bin_updates = curr_stats.histogram - dest_bin_updates
-                for bin_num in other_bins:
-                    histogram_updates[other_bin_index[bin_num]] += other_bin_updates[bin_num]
-
-            # create histogram given input tensor and full range
-            expanded_histogram = torch.histc(curr_input.to(torch.float), bins=self.num_bins, min=updated_min, max=updated_max)
-            expanded_histogram += histogram_updates.to(expanded_histogram.device)
-
-            # clip inf values to hist_min and hist_max
-            expanded_histogram[0] += torch.sum(curr_input == -float('inf'))
-            expanded_histogram[-1] += torch.sum(curr_input == float('inf'))
-
-            expanded_bin_edges = self._create_bin_edges(min_val=updated_min, max_val=updated_max, device=expanded_histogram.device)
-            self.stats[index] = _Histogram(expanded_histogram, expanded_bin_edges, updated_min, updated_max)
+        curr_histograms = torch.stack([stats.histogram for stats in self.stats])
+        curr_min = torch.stack([stats.min for stats in self.stats])
+        curr_max = torch.stack([stats.max for stats in self.stats])
+        new_min = torch.stack([stats.min for stats in new_stats_list])
+        new_max = torch.stack([stats.max for stats in new_stats_list])
+
+        updated_min = torch.minimum(new_min, curr_min)
+        updated_max = torch.maximum(new_max, curr_max)
+
+        # Redistribute the current histograms only if new_stats don't fit in their range
+        histogram_updates = curr_histograms
+        needs_rebinning = torch.logical_or(updated_min != curr_min, updated_max != curr_max)
+        if torch.any(needs_rebinning):
+            rebinned_histograms = _rebin_histograms(curr_histograms, curr_min, curr_max, updated_min, updated_max)
+            histogram_updates = torch.where(needs_rebinning[:, None], rebinned_histograms, curr_histograms)
+
+        # create histogram given input tensor and full range
+        hist_inputs = self._get_histogram_inputs(input_tensor)
+        bin_edges = self._create_bin_edges(min_val=updated_min, max_val=updated_max, device=input_tensor.device)
+        is_singular = updated_max == updated_min
+        histc_min = torch.where(is_singular, updated_min - 0.5, updated_min)
+        histc_max = torch.where(is_singular, updated_max + 0.5, updated_max)
+        # NOTE: infs are clipped to the first/last bin by _batched_histc
+        expanded_histograms = self._batched_histc(hist_inputs, histc_min, histc_max)
+        expanded_histograms += histogram_updates.to(expanded_histograms.device)
+
+        self.stats = [
+            _Histogram(histogram, edges, min, max)
+            for histogram, edges, min, max in zip(expanded_histograms, bin_edges, updated_min, updated_max)
+        ]
 
     def reset_stats(self):
         self.stats = []
@@ -270,6 +267,59 @@ class _HistogramObserver(_Observer[_Histogram]):
     def get_stats(self) -> List[_Histogram]:
         return self.stats
 
+# pylint: disable=too-many-locals
+@torch.no_grad()
+def _rebin_histograms(histograms: torch.Tensor,
+                      src_min: torch.Tensor,
+                      src_max: torch.Tensor,
+                      dest_min: torch.Tensor,
+                      dest_max: torch.Tensor) -> torch.Tensor:
+    """
+    Redistributes the counts of histograms over [src_min, src_max] into the same number of bins
+    spanning the wider range [dest_min, dest_max]. If a source bin straddles two destination bins,
+    its count is split between them in proportion to the overlap.
+
+    :param histograms: Histograms of shape (num_histograms, num_bins)
+    :param src_min: Lower bound of the source histograms with shape (num_histograms,)
+    :param src_max: Upper bound of the source histograms with shape (num_histograms,)
+    :param dest_min: Lower bound of the destination histograms with shape (num_histograms,)
+    :param dest_max: Upper bound of the destination histograms with shape (num_histograms,)
+    :return: Rebinned histograms of shape (num_histograms, num_bins)
+    """
+    num_histograms, num_bins = histograms.shape
+    device = histograms.device
+
+    src_min, src_max = src_min[:, None], src_max[:, None]
+    dest_min, dest_max = dest_min[:, None], dest_max[:, None]
+    dest_bin_width = (dest_max - dest_min) / num_bins
+    src_bin_width = (src_max - src_min) / num_bins
+
+    def get_bin_num(data):
+        bin_num = ((data - dest_min) / dest_bin_width).nan_to_num(0).clamp(0, num_bins - 1)
+        return bin_num.to(torch.int64)
+
+    src_bin_start = src_min + (src_bin_width * torch.arange(0, num_bins, device=device))
+    dest_bin_index = get_bin_num(src_bin_start)
+    dest_bin_end = dest_min + dest_bin_width * (dest_bin_index + 1)
+
+    # split histograms if values in source bin cannot neatly fold into dest bin
+    split_hist_value = torch.round(((dest_bin_end - src_bin_start) / src_bin_width) * histograms)
+    # histograms with a single observed value (src_min == src_max) have zero-width bins; never split them
+    split_hist_value = torch.where(src_bin_width > 0, split_hist_value, histograms)
+    dest_bin_updates = torch.minimum(split_hist_value, histograms)
+
+    # if a source bin is split, the remaining values fall into the next destination bin
+    other_bin_index = get_bin_num(src_bin_start + dest_bin_width)
+    other_bin_updates = histograms - dest_bin_updates
+
+    # Offset bin indices by histogram so that all histograms can be updated with a single index_add_
+    histogram_offset = num_bins * torch.arange(num_histograms, device=device)[:, None]
+    rebinned_histograms = torch.zeros(num_histograms * num_bins, dtype=histograms.dtype, device=device)
+    rebinned_histograms.index_add_(0, (dest_bin_index + histogram_offset).flatten(), dest_bin_updates.flatten())
+    rebinned_histograms.index_add_(0, (other_bin_index + histogram_offset).flatten(), other_bin_updates.flatten())
+    return rebinned_histograms.view(num_histograms, num_bins)
+
+
 class EncodingAnalyzer(Generic[_Statistics], ABC):
     def __init__(self, observer: _Observer):
         self.observer = observer
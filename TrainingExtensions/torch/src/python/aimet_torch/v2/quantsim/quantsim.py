@@ -36,8 +36,11 @@
 # =============================================================================
 """ Top level API for performing quantization simulation of a pytorch model """
 
+import contextlib
 import itertools
 import io
+import math
+from typing import Any, Callable, Dict, List, Sequence
 import torch
 
 from aimet_torch.quantsim import QuantizationSimModel as V1QuantizationSimModel, logger
@@ -47,8 +50,10 @@ from aimet_torch.v2.nn import FakeQuantizationMixin
 from aimet_torch.v2.nn import BaseQuantizationMixin
 from aimet_torch.v2.quantization.builder import LazyQuantizeWrapper
 from aimet_torch.v2.quantization.base import QuantizerBase
+from aimet_torch.v2.quantization.affine import MinMaxQuantizer
+from aimet_torch.v2.quantization.affine.backends import torch_builtins
 from aimet_torch.v2.quantization.encoding_analyzer import PercentileEncodingAnalyzer
-from aimet_torch.v2.utils import patch_attr
+from aimet_torch.v2.utils import patch_attr, StatisticsNotFoundError
 from aimet_torch import utils
 
 
@@ -174,3 +179,115 @@ class QuantizationSimModel(V1QuantizationSimModel):
 
     def _clamp_transformer_attention_mask_encoding(self):
         raise NotImplementedError()
+
+
+def compute_encodings_in_single_pass(sim_list: Sequence[QuantizationSimModel],
+                                     forward_pass_callback: Callable[[torch.nn.Module, Any], Any],
+                                     forward_pass_callback_args: Any):
+    """
+    Compute encodings for a list of QuantSims of the same model from a single shared forward pass.
+
+    The QuantSims may differ in quant scheme, percentile value, bitwidth and symmetry, but must
+    contain quantizers of the same names. The forward pass is run only once on the floating point
+    model, and the input statistics of each quantizer are collected once per distinct observer,
+    e.g. a single histogram is shared by all percentile and SQNR encoding analyzers of the same quantizer.
+    Encodings of all QuantSims are then computed from the shared statistics.
+
+    NOTE: Unlike QuantizationSimModel.compute_encodings, the activation statistics are collected
+          with unquantized parameters, so the resulting encodings may slightly differ.
+    NOTE: Only the encodings of MinMaxQuantizers are computed.
+          Other quantizers and the quantizers with frozen encodings are left unchanged.
+
+    :param sim_list: List of QuantSims to compute encodings for.
+    :param forward_pass_callback: A callback function that simply runs forward passes on the model.
+        This callback is invoked only once with the floating point model in place of sim.model.
+    :param forward_pass_callback_args: These argument(s) are passed to the forward_pass_callback as-is.
+    """
+    if not sim_list:
+        return
+
+    quantizers_per_sim = [
+        {name: module for name, module in sim.model.named_modules() if isinstance(module, QuantizerBase)}
+        for sim in sim_list
+    ]
+    base_quantizers = quantizers_per_sim[0]
+    for quantizers in quantizers_per_sim[1:]:
+        if quantizers.keys() != base_quantizers.keys():
+            raise ValueError("All QuantSims must contain quantizers of the same names.")
+
+    # Group the quantizers of the same name whose encoding analyzers can share statistics
+    groups: Dict[str, List[List[MinMaxQuantizer]]] = {}
+    for name in base_quantizers:
+        groups_by_key = {}
+        for quantizers in quantizers_per_sim:
+            quantizer = quantizers[name]
+            if not isinstance(quantizer, MinMaxQuantizer) or not quantizer._allow_overwrite: # pylint: disable=protected-access
+                continue
+            observer = quantizer.encoding_analyzer.observer
+            key = (type(observer), tuple(observer.shape), getattr(observer, 'num_bins', None),
+                   tuple(quantizer.shape),
+                   tuple(quantizer.block_size) if quantizer.block_size is not None else None)
+            groups_by_key.setdefault(key, []).append(quantizer)
+        groups[name] = list(groups_by_key.values())
+
+    def observe(name: str, input: torch.Tensor) -> torch.Tensor: # pylint: disable=redefined-builtin
+        for group in groups[name]:
+            for quantizer in group:
+                quantizer._realize_block_size(input) # pylint: disable=protected-access
+            quantizer = group[0]
+            expanded_input = torch_builtins.reshape_tensor_for_blocks(input, quantizer.shape, quantizer.block_size)
+            quantizer.encoding_analyzer.update_stats(expanded_input)
+        # Pass through the input to run forward pass in floating point
+        return input
+
+    model = sim_list[0].model
+    quantizer_names = {quantizer: name for name, quantizer in base_quantizers.items()}
+    param_quantizers = set()
+    try:
+        # Parameters don't depend on the input data. Observe each parameter only once
+        with torch.no_grad():
+            for module in model.modules():
+                if not isinstance(module, BaseQuantizationMixin):
+                    continue
+                for param_name, quantizer in module.param_quantizers.items():
+                    param = getattr(module, param_name)
+                    if quantizer is not None and param is not None:
+                        observe(quantizer_names[quantizer], param)
+                        param_quantizers.add(quantizer)
+
+        with contextlib.ExitStack() as stack:
+            for module in model.modules():
+                if isinstance(module, BaseQuantizationMixin):
+                    # Skip lazy initialization of parameter encodings, which would overwrite the patched forward
+                    stack.enter_context(patch_attr(module, '_compute_param_encodings', lambda overwrite: None))
+            for name, quantizer in base_quantizers.items():
+                if quantizer in param_quantizers:
+                    forward = lambda input: input
+                else:
+                    forward = lambda input, name=name: observe(name, input)
+                stack.enter_context(patch_attr(quantizer, 'forward', forward))
+            stack.enter_context(utils.in_eval_mode(model))
+            stack.enter_context(torch.no_grad())
+            _ = forward_pass_callback(model, forward_pass_callback_args)
+
+        for group in itertools.chain.from_iterable(groups.values()):
+            stats = group[0].encoding_analyzer.observer.get_stats()
+            for quantizer in group:
+                num_steps = math.pow(2, quantizer.bitwidth) - 1
+                try:
+                    enc_min, enc_max = quantizer.encoding_analyzer.compute_encodings_from_stats(stats,
+                                                                                                num_steps,
+                                                                                                quantizer.symmetric)
+                except StatisticsNotFoundError:
+                    continue
+
+                if enc_min is None or enc_max is None:
+                    continue
+
+                if quantizer.block_size is not None:
+                    enc_min = enc_min.view(quantizer.min.shape)
+                    enc_max = enc_max.view(quantizer.max.shape)
+                quantizer.set_range(enc_min, enc_max)
+    finally:
+        for group in itertools.chain.from_iterable(groups.values()):
+            group[0].encoding_analyzer.reset_stats()
@@ -37,6 +37,7 @@
 # pylint: disable=redefined-builtin
 """ Common utility functions """
 from typing import Callable, Tuple, Any
+import contextlib
 import functools
 import itertools
 
@@ -255,3 +256,37 @@ def allow_recompute(fn):
             return torch.utils.checkpoint.checkpoint(fn, *args, use_reentrant=False, **kwargs)
         return fn(*args, **kwargs)
     return wrapper
+
+
+def _set_low_memory_backward(module: torch.nn.Module, mode: bool) -> _ContextManager:
+    stack = contextlib.ExitStack()
+
+    def action():
+        for submodule in module.modules():
+            if hasattr(submodule, 'low_memory_backward'):
+                stack.enter_context(patch_attr(submodule, 'low_memory_backward', mode))
+
+    return _ContextManager(action, stack.close)
+
+
+def enable_low_memory_backward(module: torch.nn.Module) -> _ContextManager:
+    """
+    Temporarily enable low-memory backward of all quantize-dequantize quantizers in the given module.
+
+    Quantizers opted in save bit-packed clamping masks instead of the full-precision input for backward.
+    The input is still saved if the encodings are learnable, since the gradient w.r.t. scale depends on it.
+    Only the quantizers in the given module (e.g. the model of a quantsim, or a single quantizer)
+    are affected; the setting of each quantizer is restored on exit.
+
+    :param module: Module whose quantizers to opt in
+    """
+    return _set_low_memory_backward(module, True)
+
+
+def no_low_memory_backward(module: torch.nn.Module) -> _ContextManager:
+    """
+    Temporarily disable low-memory backward of all quantize-dequantize quantizers in the given module.
+
+    :param module: Module whose quantizers to opt out
+    """
+    return _set_low_memory_backward(module, False)
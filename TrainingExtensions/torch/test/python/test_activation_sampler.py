@@ -37,6 +37,8 @@
 
 """ Unit tests for Adaround """
 
+import os
+import tempfile
 import unittest
 import logging
 import torch
@@ -48,7 +50,7 @@ from aimet_torch.quantsim import QuantizationSimModel
 from aimet_torch.qc_quantize_op import QcQuantizeWrapper, StaticGridQuantWrapper
 from models.test_models import TinyModel
 from aimet_torch.utils import create_fake_data_loader
-from aimet_torch.adaround.activation_sampler import ActivationSampler
+from aimet_torch.adaround.activation_sampler import ActivationSampler, SequentialActivationSampler
 from aimet_torch.adaround.adaround_wrapper import AdaroundWrapper
 
 logger = AimetLogger.get_area_logger(AimetLogger.LogAreas.Test)
@@ -123,6 +125,45 @@ class TestAdaroundActivationSampler(unittest.TestCase):
         self.assertEqual(list(orig_out.shape), [batch_size * possible_batches, 12])
 
 
+    def test_sequential_activation_sampler(self):
+        """ Test SequentialActivationSampler samples the same module inputs as ActivationSampler """
+        model = TinyModel().eval()
+        sim = QuantizationSimModel(model, dummy_input=torch.randn(1, 3, 32, 32), quant_scheme='tf_enhanced',
+                                   default_param_bw=4)
+        sim.compute_encodings(lambda model, _: model(torch.randn(1, 3, 32, 32)), None)
+
+        for module in sim.model.modules():
+            if isinstance(module, QcQuantizeWrapper):
+                for quantizer in module.input_quantizers + module.output_quantizers:
+                    quantizer.enabled = False
+
+        data_loader = create_fake_data_loader(dataset_size=4, batch_size=2, image_size=(3, 32, 32))
+        cached_dataset = list(data_loader)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            # Frontier kept in host memory or on disk
+            for path in (None, tmp_dir):
+                seq_act_sampler = SequentialActivationSampler.create(model, sim.model, cached_dataset, path=path)
+                self.assertIsNotNone(seq_act_sampler)
+
+                for name in ('conv1', 'conv3', 'fc', 'conv2'):
+                    module_inputs = seq_act_sampler.sample_inputs(name)
+                    self.assertEqual(len(module_inputs), len(cached_dataset))
+
+                    act_sampler = ActivationSampler(getattr(model, name), getattr(sim.model, name), model, sim.model,
+                                                    forward_fn=None)
+                    for (orig_inputs, quant_inputs), batch in zip(module_inputs, cached_dataset):
+                        quant_inp, _ = act_sampler.sample_acts(batch, collect_input=True, collect_output=False)
+                        self.assertTrue(torch.allclose(quant_inputs[0], quant_inp))
+
+                        orig_out = SequentialActivationSampler.forward_fn(getattr(model, name),
+                                                                          (orig_inputs, quant_inputs))
+                        _, expected_orig_out = act_sampler.sample_acts(batch, collect_input=False,
+                                                                       collect_output=True)
+                        self.assertTrue(torch.allclose(orig_out, expected_orig_out))
+
+            self.assertTrue(os.listdir(os.path.join(tmp_dir, SequentialActivationSampler.ORIG_FRONTIER_DIR)))
+
     def test_adaround_tensor_quantizer(self):
         """ Test the Adarounding of a Tensor """
         modules_to_test = [torch.nn.Linear(12, 8),
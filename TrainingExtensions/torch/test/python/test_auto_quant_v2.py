@@ -37,26 +37,29 @@
 
 import contextlib
 from dataclasses import dataclass
+import io
 import itertools
 from unittest.mock import patch, MagicMock
 import os
-from bs4 import BeautifulSoup
 from aimet_torch.qc_quantize_op import StaticGridQuantWrapper
 import pytest
 import shutil
+import threading
 from typing import Callable
 import torch
 from torch.utils.data import Dataset, DataLoader
 
 from aimet_torch import utils
 from aimet_torch.model_preparer import prepare_model
-from aimet_torch.auto_quant_v2 import AutoQuant
+from aimet_torch.auto_quant_v2 import AutoQuant, _SpeculativeBranches
 from aimet_torch.adaround.adaround_weight import AdaroundParameters
 from aimet_torch.quantsim import QuantizationSimModel, OnnxExportApiArgs
 from aimet_torch.qc_quantize_op import StaticGridQuantWrapper
 from aimet_torch.save_utils import SaveUtils
 from aimet_common.defs import QuantScheme
 
+BeautifulSoup = pytest.importorskip("bs4").BeautifulSoup # Skip tests in this file if bs4 is not installed
+
 
 class Model(torch.nn.Module):
     """
@@ -122,6 +125,15 @@ def unlabeled_data_loader(dummy_input):
     return DataLoader(dataset)
 
 
+@pytest.fixture(scope="session")
+def onnx_export_available():
+    """ Skip tests that export the quantized model if ONNX export doesn't work in this environment """
+    try:
+        torch.onnx.export(torch.nn.Linear(1, 1), torch.randn(1, 1), io.BytesIO())
+    except Exception as e: # pylint: disable=broad-except
+        pytest.skip(f"ONNX export is unavailable: {e!r}")
+
+
 def assert_html(html_parsed, properties):
     for id_, prop in properties.items():
         elem = html_parsed.find(id=id_)
@@ -321,6 +333,33 @@ def patch_ptq_techniques(bn_folded_acc, cle_acc, adaround_acc, fp32_acc=None, w3
             pass
 
 
+def test_speculative_branches_cancel():
+    """ Test that cancel() stops running branches after their current stage and waits for them """
+    started, release = threading.Event(), threading.Event()
+
+    def apply_fn(model):
+        started.set()
+        release.wait()
+        return model
+
+    quantsim_factory = MagicMock()
+    branches = _SpeculativeBranches(max_workers=1)
+    branches.submit("running", apply_fn, MagicMock(), quantsim_factory, MagicMock())
+    branches.submit("pending", apply_fn, MagicMock(), quantsim_factory, MagicMock())
+    futures = list(branches._futures.values())
+    assert started.wait(timeout=10)
+
+    timer = threading.Timer(.1, release.set)
+    timer.start()
+    branches.cancel()
+    timer.join()
+
+    assert futures[0].done() and not futures[0].cancelled()
+    assert futures[1].cancelled()
+    quantsim_factory.assert_not_called()
+
+
+@pytest.mark.usefixtures("onnx_export_available")
 class TestAutoQuant:
     def test_auto_quant_run_inference(self, cpu_model, dummy_input, unlabeled_data_loader):
         bn_folded_acc = .5
@@ -745,16 +784,15 @@ class TestAutoQuant:
                                        results_dir=results_dir,
                                        cache_id=cache_id)
 
-                cache_files  = [
-                    os.path.join(results_dir, ".auto_quant_cache", cache_id, f"{key}.pkl")
-                    for key in ("batchnorm_folding", "cle", "adaround")
-                ]
+                cache_dir = os.path.join(results_dir, ".auto_quant_cache", cache_id)
 
                 # No previously cached results
                 auto_quant.optimize(allowed_accuracy_drop)
 
-                for cache_file in cache_files:
-                    assert os.path.exists(cache_file)
+                for key in ("batchnorm_folding", "cle", "adaround"):
+                    cache_files = [name for name in os.listdir(cache_dir)
+                                   if name.startswith(f"{key}-") and name.endswith(".pt")]
+                    assert len(cache_files) == 1
 
                 assert mocks.fold_all_batch_norms.call_count == 1
                 assert mocks.equalize_model.call_count == 1
@@ -774,6 +812,129 @@ class TestAutoQuant:
                 assert mocks.equalize_model.call_count == 1
                 assert mocks.apply_adaround.call_count == 1
 
+                auto_quant = AutoQuant(cpu_model,
+                                       dummy_input,
+                                       unlabeled_data_loader,
+                                       mocks.eval_callback,
+                                       results_dir=results_dir,
+                                       cache_id=cache_id)
+                auto_quant.set_adaround_params(
+                    AdaroundParameters(unlabeled_data_loader, num_batches=1, default_num_iterations=5)
+                )
+                # Cached result of adaround shouldn't be reused if adaround parameters change
+                auto_quant.optimize(allowed_accuracy_drop)
+
+                assert mocks.fold_all_batch_norms.call_count == 1
+                assert mocks.equalize_model.call_count == 1
+                assert mocks.apply_adaround.call_count == 2
+
+                # Cached result of adaround shouldn't be reused if the calibration data changes
+                other_data_loader = DataLoader([dummy_input[0, :] * 2 for _ in range(10)])
+                auto_quant = AutoQuant(cpu_model,
+                                       dummy_input,
+                                       unlabeled_data_loader,
+                                       mocks.eval_callback,
+                                       results_dir=results_dir,
+                                       cache_id=cache_id)
+                auto_quant.set_adaround_params(
+                    AdaroundParameters(other_data_loader, num_batches=1, default_num_iterations=5)
+                )
+                auto_quant.optimize(allowed_accuracy_drop)
+                assert mocks.apply_adaround.call_count == 3
+
+                # Cached result of adaround shouldn't be reused if the forward function changes
+                auto_quant = AutoQuant(cpu_model,
+                                       dummy_input,
+                                       unlabeled_data_loader,
+                                       mocks.eval_callback,
+                                       results_dir=results_dir,
+                                       cache_id=cache_id)
+                auto_quant.set_adaround_params(
+                    AdaroundParameters(other_data_loader, num_batches=1, default_num_iterations=5,
+                                       forward_fn=lambda model, inputs: model(inputs))
+                )
+                auto_quant.optimize(allowed_accuracy_drop)
+                assert mocks.apply_adaround.call_count == 4
+
+                # Cached result of adaround is reused with the same calibration data and forward function
+                auto_quant = AutoQuant(cpu_model,
+                                       dummy_input,
+                                       unlabeled_data_loader,
+                                       mocks.eval_callback,
+                                       results_dir=results_dir,
+                                       cache_id=cache_id)
+                auto_quant.set_adaround_params(
+                    AdaroundParameters(DataLoader([dummy_input[0, :] * 2 for _ in range(10)]), num_batches=1,
+                                       default_num_iterations=5, forward_fn=lambda model, inputs: model(inputs))
+                )
+                auto_quant.optimize(allowed_accuracy_drop)
+                assert mocks.apply_adaround.call_count == 4
+
+    @pytest.mark.parametrize(
+        "bn_folded_acc, cle_acc, adaround_acc",
+        itertools.permutations([.5, .6, .7])
+    )
+    @pytest.mark.parametrize("allowed_accuracy_drop", [.05, .15])
+    def test_auto_quant_parallel(
+            self, cpu_model, dummy_input, unlabeled_data_loader,
+            allowed_accuracy_drop, bn_folded_acc, cle_acc, adaround_acc,
+    ):
+        with patch_ptq_techniques(
+            bn_folded_acc, cle_acc, adaround_acc
+        ) as mocks:
+            with create_tmp_directory() as results_dir:
+                auto_quant = AutoQuant(cpu_model,
+                                       dummy_input,
+                                       unlabeled_data_loader,
+                                       mocks.eval_callback,
+                                       results_dir=results_dir)
+                auto_quant.set_scheduler_params(num_workers=3)
+                self._do_test_optimize_auto_quant(
+                    auto_quant, cpu_model, allowed_accuracy_drop,
+                    bn_folded_acc, cle_acc, adaround_acc
+                )
+
+    def test_auto_quant_resume(
+        self, cpu_model, dummy_input, unlabeled_data_loader,
+    ):
+        allowed_accuracy_drop = 0.0
+        bn_folded_acc, cle_acc, adaround_acc = .4, .5, .6
+
+        with patch_ptq_techniques(
+            bn_folded_acc, cle_acc, adaround_acc
+        ) as mocks:
+            with create_tmp_directory() as results_dir:
+                auto_quant = AutoQuant(cpu_model,
+                                       dummy_input,
+                                       unlabeled_data_loader,
+                                       mocks.eval_callback,
+                                       results_dir=results_dir)
+                auto_quant.set_scheduler_params(resume=True)
+                self._do_test_optimize_auto_quant(
+                    auto_quant, cpu_model, allowed_accuracy_drop,
+                    bn_folded_acc, cle_acc, adaround_acc
+                )
+                assert mocks.fold_all_batch_norms.call_count == 1
+                assert mocks.equalize_model.call_count == 1
+                assert mocks.apply_adaround.call_count == 1
+
+                # Resume from the sessions completed by the previous run
+                auto_quant = AutoQuant(cpu_model,
+                                       dummy_input,
+                                       unlabeled_data_loader,
+                                       mocks.eval_callback,
+                                       results_dir=results_dir)
+                auto_quant.set_scheduler_params(resume=True)
+                self._do_test_optimize_auto_quant(
+                    auto_quant, cpu_model, allowed_accuracy_drop,
+                    bn_folded_acc, cle_acc, adaround_acc
+                )
+
+                # PTQ functions should not be called twice.
+                assert mocks.fold_all_batch_norms.call_count == 1
+                assert mocks.equalize_model.call_count == 1
+                assert mocks.apply_adaround.call_count == 1
+
     def test_auto_quant_scheme_selection(
         self, cpu_model, dummy_input, unlabeled_data_loader,
     ):
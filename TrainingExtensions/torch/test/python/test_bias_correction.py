@@ -208,6 +208,42 @@ class TestTrainingExtensionBnFold(unittest.TestCase):
         # Assert bias has changed after running bias correction
         self.assertFalse(np.allclose(bias_before, bias_after))
 
+    def test_empirical_bias_update_from_running_sums(self):
+        torch.manual_seed(1)
+
+        for layer, shape in ((nn.Conv2d(3, 10, 5), (4, 10, 5, 5)), (nn.Linear(8, 10), (4, 10))):
+            bias_before = layer.bias.detach().clone()
+            bias_corr = bias_correction.EmpiricalBiasCorrection(layer)
+            reference_outputs = [torch.randn(shape) for _ in range(3)]
+            quantized_outputs = [torch.randn(shape) for _ in range(3)]
+
+            for reference_output_batch, quantized_model_output_batch in zip(reference_outputs, quantized_outputs):
+                bias_corr.store_reference_output(reference_output_batch)
+                bias_corr.store_quantized_output(quantized_model_output_batch)
+
+            bias_correction.call_empirical_mo_correct_bias(layer, bias_corr)
+
+            dims = [dim for dim in range(len(shape)) if dim != 1]
+            expected_error = torch.cat(quantized_outputs).mean(dim=dims) - torch.cat(reference_outputs).mean(dim=dims)
+            self.assertTrue(torch.allclose(layer.bias, bias_before - expected_error, atol=1e-6))
+
+    def test_empirical_bias_correction_reference_forward_passes(self):
+        torch.manual_seed(10)
+        model = mnist_model.Net().eval()
+        data_loader = create_fake_data_loader(dataset_size=4, batch_size=2, image_size=(1, 28, 28))
+        params = qsim.QuantParams(weight_bw=4, act_bw=4, round_mode="nearest",
+                                  quant_scheme=QuantScheme.post_training_tf)
+
+        with unittest.mock.patch('aimet_torch.bias_correction.store_reference_outputs',
+                                 wraps=bias_correction.store_reference_outputs) as reference_mock:
+            with unittest.mock.patch('aimet_torch.bias_correction.call_empirical_mo_correct_bias',
+                                     wraps=bias_correction.call_empirical_mo_correct_bias) as empirical_mock:
+                bias_correction.correct_bias(model, params, 4, data_loader, 4)
+
+        # Reference outputs of all the layers are collected with a single forward pass per batch
+        self.assertEqual(reference_mock.call_count, 2)
+        self.assertEqual(empirical_mock.call_count, 4)
+
     def test_bias_correction_analytical_and_empirical_ignore_layer(self):
 
         torch.manual_seed(10)
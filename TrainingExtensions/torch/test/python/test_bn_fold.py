@@ -875,6 +875,23 @@ class TestTrainingExtensionBnFold:
         assert model.conv1d.weight.device == model.conv1d.bias.device
         assert model.conv1d.weight.dtype == model.conv1d.bias.dtype
 
+    @pytest.mark.parametrize("dtype", [torch.float16, torch.bfloat16])
+    def test_fold_given_batch_norms_reduced_precision(self, dtype):
+        torch.random.manual_seed(10)
+        model = MyModel().eval()
+        _initialize_bn_params(model)
+        model_fp32 = copy.deepcopy(model)
+        model = model.to(dtype)
+
+        fold_given_batch_norms(model, [(model.conv1, model.bn1), (model.bn2, model.conv3)])
+        fold_given_batch_norms(model_fp32, [(model_fp32.conv1, model_fp32.bn1), (model_fp32.bn2, model_fp32.conv3)])
+
+        assert isinstance(model.bn1, torch.nn.Identity) and isinstance(model.bn2, torch.nn.Identity)
+        for layer, layer_fp32 in ((model.conv1, model_fp32.conv1), (model.conv3, model_fp32.conv3)):
+            assert layer.weight.dtype == dtype and layer.bias.dtype == dtype
+            assert torch.allclose(layer.weight.float(), layer_fp32.weight, rtol=1e-2, atol=1e-2)
+            assert torch.allclose(layer.bias.float(), layer_fp32.bias, rtol=1e-2, atol=1e-2)
+
 
 symmetric_quantsim_config ={
     "defaults": {
@@ -1737,4 +1754,4 @@ class TestTrainingExtensionBnFoldToScale:
         bn_modules = [m for m in model.modules() if isinstance(m, torch.nn.BatchNorm3d)]
         assert len(bn_modules) == 1
         assert isinstance(model.bn1, torch.nn.Identity)
-        assert isinstance(model.bn2, torch.nn.BatchNorm3d)
\ No newline at end of file
+        assert isinstance(model.bn2, torch.nn.BatchNorm3d)
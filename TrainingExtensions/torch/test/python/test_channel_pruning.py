@@ -412,6 +412,38 @@ class TestTrainingExtensionsChannelPruning(unittest.TestCase):
         # if data is increased, choose tolerance wisely
         self.assertTrue(np.allclose(to_numpy(outputs), to_numpy(new_outputs), atol=1e-5))
 
+    def test_reconstruct_params_from_normal_equations(self):
+        """ Test reconstruction from normal equations against least squares solution """
+        model = TestNet()
+        layer = model.conv2
+        number_of_images = 500
+        inputs = np.random.rand(number_of_images, layer.in_channels * layer.kernel_size[0] * layer.kernel_size[1])
+        outputs = np.random.rand(number_of_images, layer.out_channels)
+
+        augmented_inputs = np.concatenate([inputs, np.ones((number_of_images, 1))], axis=1)
+        expected, _, _, _ = np.linalg.lstsq(augmented_inputs, outputs, rcond=None)
+
+        xtx = torch.from_numpy(augmented_inputs.T @ augmented_inputs)
+        xty = torch.from_numpy(augmented_inputs.T @ outputs)
+        WeightReconstructor.reconstruct_params_for_conv2d_from_normal_equations(layer, xtx, xty)
+
+        self.assertEqual(layer.weight.dtype, torch.float32)
+        self.assertTrue(np.allclose(to_numpy(layer.weight).reshape(layer.out_channels, -1),
+                                    expected[:-1].T, atol=1e-4))
+        self.assertTrue(np.allclose(to_numpy(layer.bias), expected[-1], atol=1e-4))
+
+        # singular normal equations (all zero input channel) fall back to minimum norm solution
+        inputs[:, :layer.kernel_size[0] * layer.kernel_size[1]] = 0
+        xtx = torch.from_numpy(inputs.T @ inputs)
+        xty = torch.from_numpy(inputs.T @ outputs)
+        layer.bias = None
+        WeightReconstructor.reconstruct_params_for_conv2d_from_normal_equations(layer, xtx, xty)
+
+        expected, _, _, _ = np.linalg.lstsq(inputs, outputs, rcond=None)
+        self.assertTrue(np.allclose(to_numpy(layer.weight).reshape(layer.out_channels, -1),
+                                    expected.T, atol=1e-4))
+        self.assertTrue(np.all(to_numpy(layer.weight)[:, 0] == 0))
+
     def test_data_sub_sampling_and_reconstruction(self):
         """Test end to end data sub sampling and reconstruction for MNIST conv2 layer"""
         orig_model = mnist_model()
@@ -41,13 +41,14 @@ from unittest.mock import create_autospec
 from decimal import Decimal
 import math
 import os
+import pickle
 import signal
 
 from torch import nn
 import torch.nn.functional as functional
 import aimet_common.libpymo as pymo
 
-from aimet_common.defs import CostMetric, LayerCompRatioPair
+from aimet_common.defs import CostMetric, LayerCompRatioPair, ProgressiveEvalParameters
 from aimet_common.cost_calculator import SpatialSvdCostCalculator,WeightSvdCostCalculator
 from aimet_common import comp_ratio_select
 from aimet_common.bokeh_plots import BokehServerSession
@@ -175,6 +176,217 @@ class TestTrainingExtensionsCompRatioSelect(unittest.TestCase):
         self.assertEqual(51, eval_dict['conv2'][Decimal('0.5')])
         self.assertEqual(21, eval_dict['conv2'][Decimal('0.8')])
 
+    def _create_greedy_algo_for_eval_scores(self, pruner, saved_eval_scores_dict=None, num_workers=1,
+                                            progressive_eval_params=None):
+        model = mnist_torch_model.Net().to('cpu')
+
+        input_shape = (1, 1, 28, 28)
+        dummy_input = create_rand_tensors_given_shapes(input_shape, get_device(model))
+        layer_db = LayerDatabase(model, dummy_input)
+
+        layer1 = layer_db.find_layer_by_name('conv1')
+        layer2 = layer_db.find_layer_by_name('conv2')
+        layer_db.mark_picked_layers([layer1, layer2])
+
+        # Let the pruned "model" be the pruned layer name and comp ratio to get deterministic eval scores
+        pruner.prune_model.side_effect = \
+            lambda layer_db, pairs, *args, **kwargs: unittest.mock.MagicMock(model=(pairs[0].layer.name,
+                                                                                    pairs[0].comp_ratio))
+
+        def eval_func(model, _iterations, use_cuda=False, start_iteration=0):
+            layer_name, comp_ratio = model
+            return float(comp_ratio) * 100 + (1 if layer_name == 'conv2' else 0)
+
+        return comp_ratio_select.GreedyCompRatioSelectAlgo(layer_db, pruner, SpatialSvdCostCalculator(),
+                                                           eval_func, 20, CostMetric.mac, 0.5, 10, True,
+                                                           saved_eval_scores_dict, None, False,
+                                                           bokeh_session=None, num_workers=num_workers,
+                                                           progressive_eval_params=progressive_eval_params)
+
+    def test_eval_scores_in_parallel(self):
+
+        greedy_algo = self._create_greedy_algo_for_eval_scores(unittest.mock.MagicMock())
+        expected_eval_dict = greedy_algo._compute_eval_scores_for_all_comp_ratio_candidates()
+
+        greedy_algo = self._create_greedy_algo_for_eval_scores(unittest.mock.MagicMock(), num_workers=3)
+        eval_dict = greedy_algo._compute_eval_scores_for_all_comp_ratio_candidates()
+
+        self.assertEqual(expected_eval_dict, eval_dict)
+        self.assertEqual(list(expected_eval_dict), list(eval_dict))
+        self.assertEqual(list(expected_eval_dict['conv2']), list(eval_dict['conv2']))
+        self.assertEqual(51, eval_dict['conv2'][Decimal('0.5')])
+
+        # Eval scores should be checkpointed
+        self.assertEqual(eval_dict, greedy_algo._unpickle_eval_scores_dict(greedy_algo.PICKLE_FILE_EVAL_DICT))
+
+    def test_resume_eval_scores(self):
+
+        greedy_algo = self._create_greedy_algo_for_eval_scores(unittest.mock.MagicMock())
+        expected_eval_dict = greedy_algo._compute_eval_scores_for_all_comp_ratio_candidates()
+
+        # Emulate a sweep interrupted after analyzing conv1
+        greedy_algo._pickle_eval_scores_dict({'conv1': expected_eval_dict['conv1']})
+
+        pruner = unittest.mock.MagicMock()
+        greedy_algo = self._create_greedy_algo_for_eval_scores(pruner, greedy_algo.PICKLE_FILE_EVAL_DICT)
+        eval_dict = greedy_algo._construct_eval_dict()
+
+        self.assertEqual(expected_eval_dict, eval_dict)
+        # Only conv2 should be analyzed again
+        self.assertEqual(9, pruner.prune_model.call_count)
+        self.assertTrue(all(call.args[1][0].layer.name == 'conv2' for call in pruner.prune_model.call_args_list))
+
+        # Completed dictionary should be used as is
+        pruner = unittest.mock.MagicMock()
+        greedy_algo = self._create_greedy_algo_for_eval_scores(pruner, greedy_algo.PICKLE_FILE_EVAL_DICT)
+        self.assertEqual(expected_eval_dict, greedy_algo._construct_eval_dict())
+        pruner.prune_model.assert_not_called()
+
+    def test_eval_scores_dict_eval_mode(self):
+
+        greedy_algo = self._create_greedy_algo_for_eval_scores(unittest.mock.MagicMock())
+        expected_eval_dict = greedy_algo._compute_eval_scores_for_all_comp_ratio_candidates()
+
+        # Dictionary computed with full evaluation is not reused for progressive evaluation and vice versa
+        params = ProgressiveEvalParameters(threshold=50)
+        greedy_algo = self._create_greedy_algo_for_eval_scores(unittest.mock.MagicMock(),
+                                                               greedy_algo.PICKLE_FILE_EVAL_DICT,
+                                                               progressive_eval_params=params)
+        with self.assertRaises(ValueError):
+            greedy_algo._construct_eval_dict()
+
+        greedy_algo = self._create_greedy_algo_for_eval_scores(unittest.mock.MagicMock(),
+                                                               progressive_eval_params=params)
+        self.assertEqual(expected_eval_dict, greedy_algo._compute_eval_scores_for_all_comp_ratio_candidates())
+        greedy_algo = self._create_greedy_algo_for_eval_scores(unittest.mock.MagicMock(),
+                                                               greedy_algo.PICKLE_FILE_EVAL_DICT)
+        with self.assertRaises(ValueError):
+            greedy_algo._construct_eval_dict()
+
+        # Saved dictionary is still readable as a plain dictionary
+        with open(greedy_algo.PICKLE_FILE_EVAL_DICT, 'rb') as f:
+            self.assertEqual(expected_eval_dict, pickle.load(f))
+
+        # Dictionaries saved without an eval mode hold scores of full evaluation
+        with open(greedy_algo.PICKLE_FILE_EVAL_DICT, 'wb') as f:
+            pickle.dump(dict(expected_eval_dict), f)
+        pruner = unittest.mock.MagicMock()
+        greedy_algo = self._create_greedy_algo_for_eval_scores(pruner, greedy_algo.PICKLE_FILE_EVAL_DICT)
+        self.assertEqual(expected_eval_dict, greedy_algo._construct_eval_dict())
+        pruner.prune_model.assert_not_called()
+
+    def test_eval_scores_cache(self):
+
+        eval_scores_cache = './data/test_eval_scores_cache.pkl'
+        if os.path.exists(eval_scores_cache):
+            os.remove(eval_scores_cache)
+
+        try:
+            cache = comp_ratio_select.EvalScoreCache(eval_scores_cache, ('full',))
+            cache.add('conv1', Decimal('0.5'), 0.7)
+            self.assertEqual(0.7, cache.get('conv1', Decimal('0.5')))
+
+            # Scores are only written on save
+            self.assertFalse(os.path.exists(eval_scores_cache))
+            cache.save()
+            self.assertEqual(0.7, comp_ratio_select.EvalScoreCache(eval_scores_cache, ('full',)).get('conv1',
+                                                                                                  Decimal('0.5')))
+
+            # Scores of other eval configs are not returned, but kept in the file
+            cache = comp_ratio_select.EvalScoreCache(eval_scores_cache, ('progressive', 0.5, 4, 3.0))
+            self.assertIsNone(cache.get('conv1', Decimal('0.5')))
+            cache.add('conv1', Decimal('0.5'), 0.6)
+            cache.save()
+            self.assertEqual(0.7, comp_ratio_select.EvalScoreCache(eval_scores_cache, ('full',)).get('conv1',
+                                                                                                  Decimal('0.5')))
+            self.assertEqual([], [name for name in os.listdir('./data') if name.endswith('.tmp')])
+        finally:
+            os.remove(eval_scores_cache)
+
+    def test_tar_eval_score(self):
+
+        eval_scores_cache = './data/test_tar_eval_scores_cache.pkl'
+        if os.path.exists(eval_scores_cache):
+            os.remove(eval_scores_cache)
+
+        model = mnist_torch_model.Net().to('cpu')
+        dummy_input = create_rand_tensors_given_shapes((1, 1, 28, 28), get_device(model))
+        layer_db = LayerDatabase(model, dummy_input)
+        layer = layer_db.find_layer_by_name('conv2')
+
+        def create_tar_algo(pruner, eval_func, progressive_eval_params=None):
+            return comp_ratio_select.TarRankSelectAlgo(layer_db=layer_db, pruner=pruner,
+                                                       cost_calculator=WeightSvdCostCalculator(),
+                                                       eval_func=eval_func, eval_iterations=20,
+                                                       cost_metric=CostMetric.mac, num_rank_indices=20,
+                                                       use_cuda=False, pymo_utils_lib=pymo_utils,
+                                                       progressive_eval_params=progressive_eval_params,
+                                                       eval_scores_cache=eval_scores_cache)
+
+        try:
+            eval_func = unittest.mock.MagicMock(return_value=0.5)
+            tar_algo = create_tar_algo(unittest.mock.MagicMock(), eval_func)
+            self.assertEqual(0.5, tar_algo._compute_eval_score(layer, Decimal('0.5')))
+            self.assertEqual(0.5, tar_algo._compute_eval_score(layer, Decimal('0.5')))
+            self.assertEqual(1, eval_func.call_count)
+            tar_algo._eval_scores_cache.save()
+
+            # Scores are reused by another run with the same eval config only
+            eval_func = unittest.mock.MagicMock(return_value=0.4)
+            self.assertEqual(0.5, create_tar_algo(unittest.mock.MagicMock(), eval_func)._compute_eval_score(
+                layer, Decimal('0.5')))
+            eval_func.assert_not_called()
+
+            params = ProgressiveEvalParameters(threshold=0.8, num_stages=1)
+            tar_algo = create_tar_algo(unittest.mock.MagicMock(), eval_func, params)
+            self.assertEqual(0.4, tar_algo._compute_eval_score(layer, Decimal('0.5')))
+
+            # Pruned layer database is destroyed even if evaluation fails
+            pruner = unittest.mock.MagicMock()
+            tar_algo = create_tar_algo(pruner, unittest.mock.MagicMock(side_effect=RuntimeError))
+            with self.assertRaises(RuntimeError):
+                tar_algo._compute_eval_score(layer, Decimal('0.3'))
+            pruner.prune_model.return_value.destroy.assert_called_once()
+        finally:
+            os.remove(eval_scores_cache)
+
+    def test_evaluate_progressively(self):
+
+        per_batch_scores = [0.1, 0.2, 0.0, 0.15, 0.05, 0.1, 0.2, 0.0] * 4
+        evaluated_chunks = []
+
+        def eval_func(_model, iterations, use_cuda=False, start_iteration=0):
+            evaluated_chunks.append((start_iteration, iterations))
+            return sum(per_batch_scores[start_iteration:start_iteration + iterations]) / iterations
+
+        # Scores clearly below the threshold are decided after the third stage
+        params = ProgressiveEvalParameters(threshold=0.8)
+        eval_score = comp_ratio_select.evaluate_progressively(eval_func, None, 32, False, params)
+        self.assertEqual([(0, 2), (2, 2), (4, 4)], evaluated_chunks)
+        self.assertAlmostEqual(0.1, eval_score)
+
+        # Scores close to the threshold are evaluated on all the batches, each batch only once
+        evaluated_chunks.clear()
+        params = ProgressiveEvalParameters(threshold=0.11)
+        eval_score = comp_ratio_select.evaluate_progressively(eval_func, None, 32, False, params)
+        self.assertEqual([(0, 2), (2, 2), (4, 4), (8, 8), (16, 16)], evaluated_chunks)
+        self.assertAlmostEqual(0.1, eval_score)
+
+    def test_progressive_eval_schedule(self):
+
+        # Number of stages is derived from the eval iterations by default
+        params = ProgressiveEvalParameters(threshold=0.5)
+        self.assertEqual([2, 4, 8, 16, 32], comp_ratio_select._get_progressive_eval_schedule(32, params))
+        self.assertEqual([2, 4, 8, 16, 50], comp_ratio_select._get_progressive_eval_schedule(50, params))
+        self.assertEqual([1], comp_ratio_select._get_progressive_eval_schedule(1, params))
+
+        params = ProgressiveEvalParameters(threshold=0.5, num_stages=3, initial_iterations=4)
+        self.assertEqual([4, 8, 32], comp_ratio_select._get_progressive_eval_schedule(32, params))
+        self.assertEqual([4, 6], comp_ratio_select._get_progressive_eval_schedule(6, params))
+
+        params = ProgressiveEvalParameters(threshold=0.5, num_stages=1)
+        self.assertEqual([32], comp_ratio_select._get_progressive_eval_schedule(32, params))
+
     def test_find_min_max_eval_scores(self):
 
         eval_scores_dict = {'layer1': {Decimal('0.1'): 90, Decimal('0.5'): 50, Decimal('0.7'): 30, Decimal('0.8'): 20},
@@ -35,7 +35,11 @@
 #  @@-COPYRIGHT-END-@@
 # =============================================================================
 """ This file contains unit tests for testing ConnectedGraph module for PyTorch. """
+import concurrent.futures
 import copy
+import os
+import pickle
+import tempfile
 
 import pytest
 import unittest.mock
@@ -48,7 +52,8 @@ from aimet_common.connected_graph.connectedgraph_utils import get_all_input_ops,
     get_all_ops_with_constant_inputs, CG_SPLIT
 from models import test_models
 from aimet_common.connected_graph.product import Product
-from aimet_torch.meta.connectedgraph import ConnectedGraph
+from aimet_torch.meta import connectedgraph
+from aimet_torch.meta.connectedgraph import ConnectedGraph, get_connected_graph, clear_connected_graph_cache
 from aimet_torch.meta.operation import Op
 from aimet_torch.meta import connectedgraph_utils
 from aimet_torch.utils import create_rand_tensors_given_shapes, get_device
@@ -1015,3 +1020,162 @@ class TestConnectedGraphUtils(unittest.TestCase):
         assert len(add_1.inputs) == 2
         assert add_1.inputs == [p3, p4]
         assert p5.name not in mcg._products.keys()
+
+    def test_connected_graph_cache(self):
+        """ Test that cached connected graphs are reused and invalidated by structural edits """
+        model = test_models.SingleResidual().eval()
+        inp_shape = (1, 3, 32, 32)
+
+        with unittest.mock.patch('aimet_torch.meta.connectedgraph._load_or_create_connected_graph',
+                                 wraps=connectedgraph._load_or_create_connected_graph) as mock_connected_graph:
+            conn_graph = get_connected_graph(model, create_rand_tensors_given_shapes(inp_shape, get_device(model)))
+            # Same structure and input signature, different input values
+            assert get_connected_graph(model, create_rand_tensors_given_shapes(inp_shape, get_device(model))) \
+                   is conn_graph
+            assert mock_connected_graph.call_count == 1
+
+            # Different input shape
+            other_graph = get_connected_graph(model, create_rand_tensors_given_shapes((2, 3, 32, 32),
+                                                                                      get_device(model)))
+            assert other_graph is not conn_graph
+            assert mock_connected_graph.call_count == 2
+
+            # Module replacement
+            model.bn1 = torch.nn.Identity()
+            new_graph = get_connected_graph(model, create_rand_tensors_given_shapes(inp_shape, get_device(model)))
+            assert new_graph is not conn_graph
+            assert mock_connected_graph.call_count == 3
+            assert conn_graph.get_op_from_module_name('SingleResidual.bn1') is not None
+            assert new_graph.get_op_from_module_name('SingleResidual.bn1') is None
+
+            # Copies of the model reuse the cached graphs, bound to the copied modules
+            model_copy = copy.deepcopy(model)
+            copy_graph = get_connected_graph(model_copy,
+                                             create_rand_tensors_given_shapes(inp_shape, get_device(model_copy)))
+            assert copy_graph is not new_graph
+            assert mock_connected_graph.call_count == 3
+            assert [op.name for op in copy_graph.ordered_ops] == [op.name for op in new_graph.ordered_ops]
+            assert copy_graph.get_op_from_module_name('SingleResidual.conv1').get_module() is model_copy.conv1
+            assert get_all_input_ops(copy_graph)[0].get_module() is model_copy.conv1
+
+            # Edits of the copy don't affect the original
+            model_copy.relu1 = torch.nn.Identity()
+            get_connected_graph(model_copy, create_rand_tensors_given_shapes(inp_shape, get_device(model_copy)))
+            assert mock_connected_graph.call_count == 4
+            assert get_connected_graph(model, create_rand_tensors_given_shapes(inp_shape, get_device(model))) \
+                   is new_graph
+
+            clear_connected_graph_cache(model)
+            get_connected_graph(model, create_rand_tensors_given_shapes(inp_shape, get_device(model)))
+            assert mock_connected_graph.call_count == 5
+
+    def test_connected_graph_cache_threads(self):
+        """ Test that threads sharing a model trace it once and can copy it while it's being looked up """
+        model = test_models.SingleResidual().eval()
+        inp_shape = (1, 3, 32, 32)
+
+        def get_graph_and_copy(_):
+            conn_graph = get_connected_graph(model, create_rand_tensors_given_shapes(inp_shape, get_device(model)))
+            model_copy = copy.deepcopy(model)
+            get_connected_graph(model_copy, create_rand_tensors_given_shapes(inp_shape, get_device(model_copy)))
+            return conn_graph
+
+        with unittest.mock.patch('aimet_torch.meta.connectedgraph._load_or_create_connected_graph',
+                                 wraps=connectedgraph._load_or_create_connected_graph) as mock_connected_graph:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+                conn_graphs = list(executor.map(get_graph_and_copy, range(8)))
+
+        assert all(conn_graph is conn_graphs[0] for conn_graph in conn_graphs)
+        # The original is traced once and the copies, made after that, reuse its graph
+        assert mock_connected_graph.call_count == 1
+
+    def test_connected_graph_file_cache(self):
+        """ Test that connected graphs are restored from the persistent cache and bound to the new model's modules """
+        inp_shape = (1, 3, 32, 32)
+        model = test_models.SingleResidual().eval()
+        orig_cache_args = dict(connectedgraph.connected_graph_cache_args)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            connectedgraph.connected_graph_cache_args['cache_dir'] = tmp_dir
+            try:
+                conn_graph = get_connected_graph(model, create_rand_tensors_given_shapes(inp_shape, get_device(model)))
+                assert len(os.listdir(tmp_dir)) == 1
+
+                # Another instance of the same architecture is served from the cache file without tracing
+                new_model = test_models.SingleResidual().eval()
+                with unittest.mock.patch('aimet_torch.meta.connectedgraph.ConnectedGraph.__init__') as mock_init:
+                    new_graph = get_connected_graph(new_model,
+                                                    create_rand_tensors_given_shapes(inp_shape, get_device(new_model)))
+                    assert not mock_init.called
+
+                assert [op.name for op in new_graph.ordered_ops] == [op.name for op in conn_graph.ordered_ops]
+                assert [op.type for op in new_graph.ordered_ops] == [op.type for op in conn_graph.ordered_ops]
+                assert [op.output_shape for op in new_graph.ordered_ops] == \
+                       [op.output_shape for op in conn_graph.ordered_ops]
+                assert new_graph.get_op_from_module_name('SingleResidual.conv1').get_module() is new_model.conv1
+                assert new_graph.ordered_ops[0].output.consumers[0] is new_graph.ordered_ops[1]
+                assert get_all_input_ops(new_graph)[0].get_module() is new_model.conv1
+
+                # Different architecture results in a new cache file
+                new_model.bn1 = torch.nn.Identity()
+                get_connected_graph(new_model, create_rand_tensors_given_shapes(inp_shape, get_device(new_model)))
+                assert len(os.listdir(tmp_dir)) == 2
+            finally:
+                connectedgraph.connected_graph_cache_args.update(orig_cache_args)
+
+    def test_connected_graph_file_cache_rejects_untrusted_classes(self):
+        """ Test that cache files referencing classes outside the allowlist are not loaded """
+        class _Exploit:
+            def __reduce__(self):
+                return os.system, ('echo exploit',)
+
+        inp_shape = (1, 3, 32, 32)
+        orig_cache_args = dict(connectedgraph.connected_graph_cache_args)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            connectedgraph.connected_graph_cache_args['cache_dir'] = tmp_dir
+            try:
+                model = test_models.SingleResidual().eval()
+                get_connected_graph(model, create_rand_tensors_given_shapes(inp_shape, get_device(model)))
+                file_path = os.path.join(tmp_dir, os.listdir(tmp_dir)[0])
+                with open(file_path, 'wb') as f:
+                    pickle.dump(_Exploit(), f)
+
+                new_model = test_models.SingleResidual().eval()
+                with unittest.mock.patch('os.system') as mock_system:
+                    new_graph = get_connected_graph(new_model,
+                                                    create_rand_tensors_given_shapes(inp_shape, get_device(new_model)))
+                    assert not mock_system.called
+                assert new_graph.get_op_from_module_name('SingleResidual.conv1').get_module() is new_model.conv1
+            finally:
+                connectedgraph.connected_graph_cache_args.update(orig_cache_args)
+
+    def test_model_fingerprint(self):
+        """ Test that the model fingerprint covers helper methods, module-level functions and primitive attributes """
+        def _helper(x):
+            return x + 1
+
+        class Model(torch.nn.Module):
+            def __init__(self):
+                super().__init__()
+                self.conv = torch.nn.Conv2d(3, 4, 3)
+                self.use_relu = True
+
+            def forward(self, x):
+                return self._post(self.conv(x))
+
+            def _post(self, x):
+                return torch.relu(x) if self.use_relu else x
+
+        dummy_input = torch.randn(1, 3, 8, 8)
+        fingerprint = connectedgraph._get_model_fingerprint(Model(), dummy_input)
+        assert connectedgraph._get_model_fingerprint(Model(), dummy_input) == fingerprint
+
+        model = Model()
+        model.use_relu = False
+        assert connectedgraph._get_model_fingerprint(model, dummy_input) != fingerprint
+
+        orig_post = Model._post
+        try:
+            Model._post = lambda self, x: _helper(x)
+            assert connectedgraph._get_model_fingerprint(Model(), dummy_input) != fingerprint
+        finally:
+            Model._post = orig_post
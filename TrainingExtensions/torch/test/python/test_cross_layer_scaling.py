@@ -36,6 +36,7 @@
 # =============================================================================
 
 import unittest.mock
+import copy
 
 import pytest
 import torch
@@ -285,6 +286,31 @@ class TestTrainingExtensionsCrossLayerScaling(unittest.TestCase):
         assert not np.allclose(model.model[1][3].weight.detach().numpy(), w2)
         assert not np.allclose(model.model[2][3].weight.detach().numpy(), w3)
 
+    def test_scale_cls_sets_in_batches(self):
+        torch.manual_seed(10)
+        model = MockMobileNetV1().eval()
+        model_copy = copy.deepcopy(model)
+
+        def get_cls_sets(model):
+            return [(model.model[0][0], model.model[1][0], model.model[1][3]),
+                    (model.model[1][3], model.model[2][0], model.model[2][3]),
+                    (model.model[3][0], model.model[3][3]),
+                    (model.model[4][0], model.model[4][3])]
+
+        # Expected scale factor of a conv pair is range1 / sqrt(range1 * range2)
+        range_1 = np.amax(np.abs(model.model[3][0].weight.detach().numpy()), axis=(1, 2, 3))
+        range_2 = np.amax(np.abs(model.model[3][3].weight.detach().numpy()), axis=(0, 2, 3))
+        expected_scale_factor = range_1 / np.sqrt(range_1 * range_2)
+
+        scale_factors = CrossLayerScaling.scale_cls_sets(get_cls_sets(model))
+        sequential_scale_factors = [CrossLayerScaling.scale_cls_set(cls_set) for cls_set in get_cls_sets(model_copy)]
+
+        self.assertTrue(np.allclose(scale_factors[2], expected_scale_factor))
+        for scale_factor, sequential_scale_factor in zip(scale_factors, sequential_scale_factors):
+            self.assertTrue(np.allclose(np.array(scale_factor), np.array(sequential_scale_factor)))
+        for param, sequential_param in zip(model.parameters(), model_copy.parameters()):
+            self.assertTrue(torch.allclose(param, sequential_param))
+
     def test_find_layer_groups_to_scale_for_network_with_residuals(self):
 
         torch.manual_seed(10)
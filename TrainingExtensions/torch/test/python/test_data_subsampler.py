@@ -45,7 +45,7 @@ import torch.nn.functional as functional
 
 from aimet_torch.utils import create_fake_data_loader
 from models.test_models import MultiInput
-from aimet_torch.data_subsampler import DataSubSampler
+from aimet_torch.data_subsampler import DataSubSampler, Conv2dSubSampler, ActivationFrontier
 
 
 class TestNet(nn.Module):
@@ -230,6 +230,147 @@ class TestDataSubSampler(unittest.TestCase):
         # compare data of first batch only
         self.assertTrue(np.array_equal(fc1_input_data[0:10], fc1_input))
 
+    def test_sub_sampled_tensors_conv2d(self):
+        """ Test sub sampled input matches of strided and padded conv2d against its sub sampled outputs """
+        torch.manual_seed(0)
+        conv = nn.Conv2d(3, 4, kernel_size=(3, 5), stride=(2, 1), padding=(1, 2))
+        input_data = torch.randn(6, 3, 15, 17)
+        output_data = conv(input_data).detach()
+
+        sub_sampler = Conv2dSubSampler()
+        input_matches, output_matches = sub_sampler.get_sub_sampled_tensors(conv, input_data, output_data,
+                                                                            samples_per_image=10)
+        self.assertEqual(input_matches.shape, (60, 3 * 3 * 5))
+        self.assertEqual(output_matches.shape, (60, 4))
+
+        # each input match convolved with the weight should produce the corresponding output pixel
+        expected_output_matches = input_matches @ conv.weight.detach().reshape(4, -1).T + conv.bias.detach()
+        self.assertTrue(torch.allclose(expected_output_matches, output_matches, atol=1e-5))
+
+    def test_get_normal_equations(self):
+        """ Test normal equations accumulated over batches against the ones from sub sampled numpy data """
+        orig_model = TestNet()
+        comp_model = copy.deepcopy(orig_model)
+        data_loader = create_fake_data_loader(dataset_size=100, batch_size=10, image_size=(1, 28, 28))
+
+        xtx, xty = DataSubSampler.get_normal_equations(orig_layer=orig_model.fc1, pruned_layer=comp_model.fc1,
+                                                       orig_model=orig_model, comp_model=comp_model,
+                                                       data_loader=data_loader, num_reconstruction_samples=5000,
+                                                       fit_intercept=True)
+        self.assertEqual(xtx.dtype, torch.float64)
+        self.assertEqual(xtx.shape, (161, 161))
+        self.assertEqual(xty.shape, (161, 80))
+
+        # fully connected layers aren't sub sampled, so both should be computed from the same data
+        input_data, output_data = DataSubSampler.get_sub_sampled_data(orig_layer=orig_model.fc1,
+                                                                      pruned_layer=comp_model.fc1,
+                                                                      orig_model=orig_model, comp_model=comp_model,
+                                                                      data_loader=data_loader,
+                                                                      num_reconstruction_samples=5000)
+        input_data = np.concatenate([input_data, np.ones((input_data.shape[0], 1))], axis=1).astype(np.float64)
+        self.assertTrue(np.allclose(xtx.numpy(), input_data.T @ input_data))
+        self.assertTrue(np.allclose(xty.numpy(), input_data.T @ output_data.astype(np.float64)))
+
+    def test_activation_frontier(self):
+        """ Test normal equations from activation frontier, which runs original model once per batch """
+        torch.manual_seed(0)
+        orig_model = TestNet()
+        comp_model = copy.deepcopy(orig_model)
+        data_loader = create_fake_data_loader(dataset_size=100, batch_size=10, image_size=(1, 28, 28))
+
+        orig_model_forward_count = [0]
+        comp_model_forward_count = [0]
+
+        def count_forward(*_):
+            orig_model_forward_count[0] += 1
+
+        def count_comp_forward(*_):
+            comp_model_forward_count[0] += 1
+
+        orig_model.conv1.register_forward_hook(count_forward)
+        comp_model.conv1.register_forward_hook(count_comp_forward)
+
+        frontier = ActivationFrontier(orig_model, [orig_model.conv2, orig_model.fc1, orig_model.fc2],
+                                      data_loader, num_reconstruction_samples=1000)
+        self.assertTrue(orig_model.conv2 in frontier)
+        self.assertFalse(comp_model.conv2 in frontier)
+
+        xtx, xty = frontier.get_normal_equations(orig_model.conv2, comp_model.conv2, comp_model, fit_intercept=True)
+        # conv2 needs 10 batches of 10 images with 10 samples per image
+        self.assertEqual(orig_model_forward_count[0], 10)
+        self.assertEqual(comp_model_forward_count[0], 10)
+
+        # compressed model is same as original model, so reconstruction should give back original parameters
+        solution = torch.linalg.solve(xtx, xty).float()
+        self.assertTrue(torch.allclose(solution[:-1].T, orig_model.conv2.weight.detach().reshape(10, -1), atol=1e-3))
+        self.assertTrue(torch.allclose(solution[-1], orig_model.conv2.bias.detach(), atol=1e-3))
+
+        # fully connected layers aren't sub sampled, so should be same as the ones from DataSubSampler
+        xtx, xty = frontier.get_normal_equations(orig_model.fc2, comp_model.fc2, comp_model, fit_intercept=False)
+        # Both models are advanced from the frontier at conv2 instead of being run from the model inputs
+        self.assertEqual(orig_model_forward_count[0], 10)
+        self.assertEqual(comp_model_forward_count[0], 10)
+
+        orig_model_forward_count[0] = 0
+        expected_xtx, expected_xty = DataSubSampler.get_normal_equations(orig_layer=orig_model.fc2,
+                                                                         pruned_layer=comp_model.fc2,
+                                                                         orig_model=orig_model, comp_model=comp_model,
+                                                                         data_loader=data_loader,
+                                                                         num_reconstruction_samples=1000,
+                                                                         fit_intercept=False)
+        self.assertEqual(orig_model_forward_count[0], 10)
+        self.assertTrue(torch.allclose(xtx, expected_xtx))
+        self.assertTrue(torch.allclose(xty, expected_xty))
+        frontier.close()
+
+    def test_activation_frontier_invalidate(self):
+        """ Test that the frontier of the compressed model is recomputed if modules preceding it are modified """
+        torch.manual_seed(0)
+        orig_model = TestNet()
+        comp_model = copy.deepcopy(orig_model)
+        data_loader = create_fake_data_loader(dataset_size=100, batch_size=10, image_size=(1, 28, 28))
+
+        frontier = ActivationFrontier(orig_model, [orig_model.conv2, orig_model.fc1, orig_model.fc2],
+                                      data_loader, num_reconstruction_samples=1000)
+        frontier.get_normal_equations(orig_model.fc1, comp_model.fc1, comp_model, fit_intercept=True)
+
+        # Modules following the frontier don't invalidate it
+        frontier.invalidate(['fc2'])
+        self.assertEqual(frontier._sampler._position, frontier._sampler._nodes.index(
+            next(node for node in frontier._sampler._nodes if node.target == 'fc1')))
+
+        with torch.no_grad():
+            comp_model.conv2.weight.mul_(0.5)
+        frontier.invalidate(['conv2'])
+        xtx, xty = frontier.get_normal_equations(orig_model.fc2, comp_model.fc2, comp_model, fit_intercept=False)
+
+        expected_xtx, expected_xty = DataSubSampler.get_normal_equations(orig_layer=orig_model.fc2,
+                                                                         pruned_layer=comp_model.fc2,
+                                                                         orig_model=orig_model, comp_model=comp_model,
+                                                                         data_loader=data_loader,
+                                                                         num_reconstruction_samples=1000,
+                                                                         fit_intercept=False)
+        self.assertTrue(torch.allclose(xtx, expected_xtx))
+        self.assertTrue(torch.allclose(xty, expected_xty))
+        frontier.close()
+
+    @pytest.mark.cuda
+    def test_activation_frontier_gpu(self):
+        """ Test that activation frontier keeps the cached batches on CPU for models on GPU """
+        torch.manual_seed(0)
+        orig_model = TestNet().to(device=torch.device('cuda:0'))
+        comp_model = copy.deepcopy(orig_model)
+        data_loader = create_fake_data_loader(dataset_size=100, batch_size=10, image_size=(1, 28, 28))
+
+        frontier = ActivationFrontier(orig_model, [orig_model.conv2, orig_model.fc2],
+                                      data_loader, num_reconstruction_samples=1000)
+        xtx, xty = frontier.get_normal_equations(orig_model.conv2, comp_model.conv2, comp_model, fit_intercept=True)
+
+        self.assertTrue(all(batch.device.type == 'cpu' for batch in frontier._batches))
+
+        solution = torch.linalg.solve(xtx, xty).float()
+        self.assertTrue(torch.allclose(solution[:-1].T, orig_model.conv2.weight.detach().reshape(10, -1), atol=1e-3))
+
     @pytest.mark.cuda
     def test_forward_pass_with_single_input_gpu(self):
         """
@@ -253,3 +253,35 @@ class TestLayerOutputUtil:
 
         # Delete temp_dir
         shutil.rmtree(temp_dir_path, ignore_errors=False, onerror=None)
+
+    def test_generate_layer_outputs_streaming(self, tmp_path):
+        """ Test streaming a subset of layer-outputs in chunks to memory-mapped stores """
+        model = torch.nn.Sequential(torch.nn.Conv2d(3, 8, 3), torch.nn.ReLU(inplace=True), torch.nn.Conv2d(8, 4, 3))
+        model.eval()
+        input_batch = torch.rand(10, 3, 16, 16)
+
+        # conv output is modified in-place by the following relu, so the streamed output should be a copy
+        expected_outputs = LayerOutput(model=model, dir_path=str(tmp_path / 'reference')).get_outputs(input_batch)
+
+        # Generate layer-outputs for two batches
+        dir_path = str(tmp_path / 'streamed')
+        layer_output_util = LayerOutputUtil(model=model, dir_path=dir_path, layer_output_names=['0', '2'],
+                                            streaming=True, chunk_size=3)
+        layer_output_util.generate_layer_outputs(input_batch)
+        layer_output_util.generate_layer_outputs(input_batch)
+
+        for name in ('0', '2'):
+            layer_output = LayerOutputUtil.load_streamed_layer_output(dir_path, name)
+            assert torch.allclose(layer_output, torch.cat([expected_outputs[name]] * 2), atol=1e-6)
+        assert torch.equal(LayerOutputUtil.load_streamed_inputs(dir_path), torch.cat([input_batch] * 2))
+        assert sorted(os.listdir(os.path.join(dir_path, LayerOutputUtil.STREAMED_OUTPUTS_DIR))) == ['0', '2']
+
+        # Subset of layer-outputs and chunks also apply to raw files
+        dir_path = str(tmp_path / 'raw')
+        layer_output_util = LayerOutputUtil(model=model, dir_path=dir_path, layer_output_names=['2'], chunk_size=3)
+        layer_output_util.generate_layer_outputs(input_batch)
+        assert len(os.listdir(os.path.join(dir_path, 'outputs'))) == 10
+        assert os.listdir(os.path.join(dir_path, 'outputs', 'layer_outputs_9')) == ['2.raw']
+
+        with pytest.raises(ValueError):
+            LayerOutputUtil(model=model, dir_path=dir_path, layer_output_names=['3'])
@@ -37,8 +37,10 @@
 
 import pytest
 import json
+import pickle
 import os.path
 import shutil
+from collections import OrderedDict
 import torch
 from torch.utils.data import Dataset, DataLoader
 
@@ -48,7 +50,7 @@ from models.test_models import TinyModel
 from aimet_torch.tensor_quantizer import TensorQuantizer
 from aimet_torch.qc_quantize_op import QcQuantizeWrapper
 from aimet_torch.quantsim import QuantizationSimModel
-from aimet_torch.quant_analyzer import QuantAnalyzer, CallbackFunc
+from aimet_torch.quant_analyzer import QuantAnalyzer, CallbackFunc, _PerLayerEvaluator
 
 
 def calibrate(model: torch.nn.Module, dummy_input: torch.Tensor):
@@ -73,6 +75,15 @@ def evaluate(model: torch.nn.Module, dummy_input: torch.Tensor):
             model(dummy_input)
     return 0.8
 
+def evaluate_output_sum(model: torch.nn.Module, dummy_input: torch.Tensor):
+    """
+    Helper function to evaluate model performance as sum of model output given dummy input
+    :param model: PyTorch model
+    :param dummy_input: dummy input to model.
+    """
+    with torch.no_grad():
+        return model(dummy_input).sum().item()
+
 def unlabeled_data_loader(dummy_input):
     class MyDataset(Dataset):
         def __init__(self, data):
@@ -234,6 +245,53 @@ class TestQuantAnalyzer:
             if os.path.isdir("./tmp/"):
                 shutil.rmtree("./tmp/")
 
+    @pytest.mark.parametrize("num_workers, reuse_prefix", [(0, True), (2, False), (2, True)])
+    def test_parallel_per_layer_analysis(self, num_workers, reuse_prefix):
+        """ test parallel per layer analysis and prefix reuse match serial per layer analysis """
+        input_shape = (1, 3, 32, 32)
+        dummy_input = torch.randn(*input_shape)
+        model = TinyModel().eval()
+        sim = QuantizationSimModel(model, dummy_input)
+        sim.compute_encodings(evaluate, dummy_input)
+        forward_pass_callback = CallbackFunc(calibrate, dummy_input)
+        eval_callback = CallbackFunc(evaluate_output_sum, dummy_input)
+        quant_analyzer = QuantAnalyzer(model, dummy_input, forward_pass_callback, eval_callback)
+
+        serial_results = [quant_analyzer._perform_per_layer_analysis(sim, True, True, False),
+                          quant_analyzer._perform_per_layer_analysis(sim, False, False, True)]
+
+        quant_analyzer.enable_parallel_per_layer_analysis(num_workers, reuse_prefix)
+        parallel_results = [quant_analyzer._perform_per_layer_analysis(sim, True, True, False),
+                            quant_analyzer._perform_per_layer_analysis(sim, False, False, True)]
+        assert parallel_results == serial_results
+        assert len(serial_results[0]) == 10
+
+        # Quantizers and forward of quant wrappers should be restored.
+        for _, quant_wrapper in sim.quant_wrappers():
+            assert "forward" not in quant_wrapper.__dict__
+
+    def test_per_layer_evaluator_recorded_outputs(self, tmp_path):
+        """ test recorded outputs are written to the tensor store instead of being pickled with the evaluator """
+        torch.manual_seed(0)
+        dummy_input = torch.randn(64, 32)
+        model = torch.nn.Sequential(torch.nn.Linear(32, 256), torch.nn.ReLU(inplace=True),
+                                    torch.nn.Linear(256, 32)).eval()
+        sorted_quant_wrappers = OrderedDict((name, module) for name, module in model.named_children())
+        enabled_quant_wrappers = {module: [] for module in sorted_quant_wrappers.values()}
+        eval_callback = CallbackFunc(evaluate_output_sum, dummy_input)
+        evaluator = _PerLayerEvaluator(model, eval_callback, sorted_quant_wrappers, enabled_quant_wrappers,
+                                       enabled_before=False, enabled_after=True)
+        pickled_size = len(pickle.dumps(evaluator))
+        evaluator.record_outputs(str(tmp_path))
+        assert len(pickle.dumps(evaluator)) < pickled_size + 1024
+
+        # Unpickled copy of the evaluator should read the recorded outputs from the tensor store
+        expected = evaluate_output_sum(model, dummy_input)
+        worker_evaluator = pickle.loads(pickle.dumps(evaluator))
+        for name in ("1", "2", "1"):
+            assert evaluator.evaluate(name) == expected
+            assert worker_evaluator.evaluate(name) == expected
+
     def test_export_per_layer_stats_histogram(self):
         """ test export_per_layer_stats_histogram() """
         input_shape = (1, 3, 32, 32)
@@ -384,6 +442,50 @@ class TestQuantAnalyzer:
             if os.path.isdir("./tmp/"):
                 shutil.rmtree("./tmp/")
 
+    def test_export_per_layer_mse_loss_one_pass(self):
+        """ test one pass per layer MSE loss matches per layer MSE loss computed layer by layer """
+        input_shape = (1, 3, 32, 32)
+        dummy_input = torch.randn(*input_shape)
+        unlabeled_dataset_iterable = unlabeled_data_loader(dummy_input)
+        model = TinyModel().eval()
+        sim = QuantizationSimModel(model, dummy_input)
+        sim.compute_encodings(evaluate, dummy_input)
+        forward_pass_callback = CallbackFunc(calibrate, dummy_input)
+        eval_callback = CallbackFunc(evaluate, dummy_input)
+        quant_analyzer = QuantAnalyzer(model, dummy_input, forward_pass_callback, eval_callback)
+        try:
+            quant_analyzer.enable_per_layer_mse_loss(unlabeled_dataset_iterable, num_batches=4)
+            mse_loss_dict = quant_analyzer.export_per_layer_mse_loss(sim, results_dir="./tmp/")
+            quant_analyzer.enable_per_layer_mse_loss(unlabeled_dataset_iterable, num_batches=4, one_pass=True)
+            one_pass_mse_loss_dict = quant_analyzer.export_per_layer_mse_loss(sim, results_dir="./tmp/")
+            assert one_pass_mse_loss_dict == mse_loss_dict
+            assert os.path.isfile("./tmp/per_layer_mse_loss.html")
+        finally:
+            if os.path.isdir("./tmp/"):
+                shutil.rmtree("./tmp/")
+
+    def test_per_layer_mse_loss_one_pass_without_output(self):
+        """ test one pass per layer MSE loss skips layers which never produce a tensor output """
+        input_shape = (1, 3, 32, 32)
+        dummy_input = torch.randn(*input_shape)
+        unlabeled_dataset_iterable = unlabeled_data_loader(dummy_input)
+        model = TinyModel().eval()
+        sim = QuantizationSimModel(model, dummy_input)
+        sim.compute_encodings(evaluate, dummy_input)
+        forward_pass_callback = CallbackFunc(calibrate, dummy_input)
+        eval_callback = CallbackFunc(evaluate, dummy_input)
+        quant_analyzer = QuantAnalyzer(model, dummy_input, forward_pass_callback, eval_callback)
+        quant_analyzer.enable_per_layer_mse_loss(unlabeled_dataset_iterable, num_batches=4, one_pass=True)
+
+        unused = torch.nn.Conv2d(3, 3, 1)
+        name_to_quant_wrapper_dict = dict(sim.model.named_modules())
+        name_to_quant_wrapper_dict["unused"] = QcQuantizeWrapper(unused, weight_bw=8, activation_bw=8,
+                                                                 round_mode="nearest",
+                                                                 quant_scheme=QuantScheme.post_training_tf)
+        modules = [("conv1", model.conv1), ("unused", unused)]
+        mse_loss_dict = quant_analyzer._compute_mse_loss_one_pass(modules, name_to_quant_wrapper_dict, sim)
+        assert list(mse_loss_dict) == ["conv1"]
+
     @pytest.mark.cuda
     def test_analyze(self):
         """ test end to end for analyze() method """
@@ -189,6 +189,31 @@ class TestSeqMse:
                 assert not numpy.isclose(before.min, after.min)
                 assert not numpy.isclose(before.max, after.max)
 
+    @pytest.mark.parametrize("enable_pcq", [True, False])
+    @pytest.mark.parametrize("loss_fn", ['mse', 'l1', 'sqnr'])
+    @pytest.mark.parametrize("candidate_batch_size", [1, 7, 20])
+    def test_optimize_module_batched_candidates(self, enable_pcq, loss_fn, candidate_batch_size):
+        """ test batched candidate search chooses same encodings as serial search """
+        encodings = []
+        for batch_size in [None, candidate_batch_size]:
+            torch.manual_seed(0)
+            linear = torch.nn.Linear(64, 128)
+            wrapper = StaticGridQuantWrapper(linear, 4, 16, 'nearest', QuantScheme.post_training_tf)
+            wrapper.input_quantizers[0].enabled = False
+            wrapper.output_quantizers[0].enabled = False
+            if enable_pcq:
+                wrapper.enable_per_channel_quantization()
+
+            xq = torch.randn(8, 4, 32, 64)
+            params = SeqMseParams(num_batches=8, loss_fn=loss_fn, candidate_batch_size=batch_size)
+            optimize_module(wrapper, xq, xq, params)
+            encoding = wrapper.param_quantizers['weight'].encoding
+            encodings.append(encoding if enable_pcq else [encoding])
+
+        for serial, batched in zip(*encodings):
+            assert numpy.isclose(serial.min, batched.min)
+            assert numpy.isclose(serial.max, batched.max)
+
     @pytest.mark.cuda()
     @pytest.mark.parametrize("inp_symmetry", ['asym', 'symfp', 'symqt'])
     @pytest.mark.parametrize("loss_fn", ['mse', 'l1', 'sqnr'])
@@ -261,3 +261,41 @@ class TestSpatialSvdPruning(unittest.TestCase):
             print("   Module: " + str(layer.module))
 
         print(layer_db.model)
+
+    def test_prune_model_with_overlay(self):
+
+        model = mnist_torch_model.Net().eval()
+
+        # Create a layer database
+        input_shape = (1, 1, 28, 28)
+        dummy_input = create_rand_tensors_given_shapes(input_shape, get_device(model))
+        orig_layer_db = LayerDatabase(model, dummy_input)
+        orig_modules = dict(model.named_modules())
+        inp = torch.rand(input_shape)
+        orig_output = model(inp)
+
+        conv2 = orig_layer_db.find_layer_by_name('conv2')
+        pruner = SpatialSvdPruner()
+
+        expected_layer_db = pruner.prune_model(orig_layer_db, [LayerCompRatioPair(conv2, Decimal(0.5))],
+                                               CostMetric.mac, trainer=None)
+        layer_db = pruner.prune_model(orig_layer_db, [LayerCompRatioPair(conv2, Decimal(0.5))],
+                                      CostMetric.mac, trainer=None, use_overlay=True)
+
+        # Overlay should share the model and unmodified modules with the original layer database
+        self.assertIs(layer_db.model, model)
+        self.assertIs(layer_db.find_layer_by_name('conv1'), orig_layer_db.find_layer_by_name('conv1'))
+        self.assertIs(model.conv1, orig_modules['conv1'])
+        self.assertTrue(isinstance(model.conv2, torch.nn.Sequential))
+        self.assertEqual(53, layer_db.find_layer_by_name('conv2.0').module.out_channels)
+        self.assertTrue(torch.equal(expected_layer_db.model(inp), layer_db.model(inp)))
+
+        # Original layer database should be unchanged
+        self.assertIs(orig_layer_db.find_layer_by_name('conv2'), conv2)
+        with self.assertRaises(KeyError):
+            orig_layer_db.find_layer_by_name('conv2.0')
+
+        # Destroying the overlay should restore the original model
+        layer_db.destroy()
+        self.assertEqual(orig_modules, dict(model.named_modules()))
+        self.assertTrue(torch.equal(orig_output, model(inp)))
@@ -0,0 +1,180 @@
+# /usr/bin/env python
+# -*- mode: python -*-
+# =============================================================================
+#  @@-COPYRIGHT-START-@@
+#
+#  Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright notice,
+#     this list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright notice,
+#     this list of conditions and the following disclaimer in the documentation
+#     and/or other materials provided with the distribution.
+#
+#  3. Neither the name of the copyright holder nor the names of its contributors
+#     may be used to endorse or promote products derived from this software
+#     without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+#  SPDX-License-Identifier: BSD-3-Clause
+#
+# =============================================================================
+
+import os
+import pickle
+import pytest
+import torch
+
+from aimet_torch import utils
+from aimet_torch.tensor_store import TensorStore
+
+
+@pytest.fixture(autouse=True)
+def set_seed():
+    torch.manual_seed(0)
+
+
+class TestTensorStore:
+    def test_write_and_read(self, tmp_path):
+        store = TensorStore(str(tmp_path))
+        batch = (torch.randn(4, 3, 8, 8), torch.arange(4), {'mask': torch.ones(4, dtype=torch.bool), 'name': 'x'})
+        store[0] = batch
+        store.append([torch.randn(2).bfloat16(), torch.tensor(3.0)])
+
+        assert len(store) == 2
+        images, labels, kwargs = store[0]
+        assert torch.equal(images, batch[0])
+        assert torch.equal(labels, batch[1])
+        assert torch.equal(kwargs['mask'], batch[2]['mask'])
+        assert kwargs['name'] == 'x'
+
+        # All tensors are in a single data file
+        assert sorted(os.listdir(tmp_path)) == [TensorStore.INDEX_FILE, TensorStore.DATA_FILE]
+
+        # Reopening the store restores the index
+        reopened = TensorStore(str(tmp_path))
+        bf16, scalar = reopened[1]
+        assert bf16.dtype == torch.bfloat16
+        assert scalar.shape == () and scalar == 3.0
+
+        with pytest.raises(IndexError):
+            _ = store[2]
+
+    def test_overwrite(self, tmp_path):
+        store = TensorStore.open(str(tmp_path))
+        store[0] = torch.zeros(10)
+        old = store[0].clone()
+        store[0] = torch.ones(3, 3)
+
+        assert TensorStore.open(str(tmp_path)) is store
+        assert torch.equal(store[0], torch.ones(3, 3))
+        assert torch.equal(old, torch.zeros(10))
+
+    def test_overwrite_reuses_space(self, tmp_path):
+        store = TensorStore(str(tmp_path))
+        data_path = os.path.join(tmp_path, TensorStore.DATA_FILE)
+        batches = [torch.randn(16, 64) for _ in range(4)]
+        for i, batch in enumerate(batches):
+            store[i] = [batch, torch.arange(3)]
+
+        # Overwriting entries block by block doesn't grow the data file
+        data_sizes = []
+        for _ in range(8):
+            for i in range(len(batches)):
+                inputs = store[i]
+                # The new entry references the overwritten entry and is laid out differently
+                store[i] = [torch.arange(5), inputs[-2] * 2, inputs[-1]]
+                batches[i] = batches[i] * 2
+            data_sizes.append(os.path.getsize(data_path))
+        assert len(set(data_sizes)) == 1
+        data_size = data_sizes[0]
+
+        for i, batch in enumerate(batches):
+            arange, data, labels = store[i]
+            assert torch.equal(arange, torch.arange(5))
+            assert torch.allclose(data, batch)
+            assert torch.equal(labels, torch.arange(3))
+
+        # Space released by smaller entries is reused, and the free space is restored when reopening the store
+        store[0] = torch.zeros(0)
+        reopened = TensorStore(str(tmp_path))
+        reopened[10] = torch.randn(16, 64)
+        assert os.path.getsize(data_path) == data_size
+        assert torch.allclose(reopened[1][1], batches[1])
+
+    def test_batch_writes(self, tmp_path, monkeypatch):
+        store = TensorStore(str(tmp_path))
+        num_index_writes = 0
+        save_index = store._save_index
+
+        def counting_save_index():
+            nonlocal num_index_writes
+            num_index_writes += 1
+            save_index()
+
+        monkeypatch.setattr(store, '_save_index', counting_save_index)
+        with store.batch_writes():
+            for i in range(5):
+                store[i] = torch.randn(3)
+            assert num_index_writes == 0
+        assert num_index_writes == 1
+        assert len(TensorStore(str(tmp_path))) == 5
+
+    @pytest.mark.parametrize('compression_dtype', [torch.float16, torch.bfloat16])
+    def test_compression(self, tmp_path, compression_dtype):
+        store = TensorStore(str(tmp_path), compression_dtype=compression_dtype)
+        x = torch.randn(100)
+        store[0] = (x, torch.arange(5))
+        x_read, labels = store.get(0, populate=True)
+
+        assert x_read.dtype == torch.float32
+        assert torch.equal(x_read, x.to(compression_dtype).float())
+        assert torch.equal(labels, torch.arange(5))
+        assert os.path.getsize(os.path.join(tmp_path, TensorStore.DATA_FILE)) < x.numel() * x.element_size()
+
+        with pytest.raises(ValueError):
+            TensorStore(str(tmp_path), compression_dtype=torch.int8)
+
+
+class TestCachedDataset:
+    def test_cached_dataset_iteration(self, tmp_path):
+        data_loader = utils.create_fake_data_loader(dataset_size=64, batch_size=16, image_size=(1, 2, 2))
+        cached_dataset = utils.CachedDataset(data_loader, 3, str(tmp_path))
+
+        expected_batches = [batch for batch, _ in zip(data_loader, range(3))]
+        for batch, expected in zip(cached_dataset, expected_batches):
+            assert torch.equal(batch[0], expected[0])
+            assert torch.equal(batch[1], expected[1])
+        assert len(list(cached_dataset)) == 3
+
+        # Batches written with save_to_cache can be read back as a CachedDataset
+        for i, batch in enumerate(cached_dataset):
+            utils.save_to_cache([batch[0] * 2], str(tmp_path / 'doubled'), i)
+        doubled_dataset = utils.CachedDataset(None, 3, str(tmp_path / 'doubled'))
+        for batch, expected in zip(doubled_dataset, expected_batches):
+            assert torch.equal(batch[0], expected[0] * 2)
+
+    def test_cached_dataset_legacy_format(self, tmp_path):
+        batches = [torch.randn(2, 3) for _ in range(2)]
+        for i, batch in enumerate(batches):
+            with open(os.path.join(tmp_path, f'model_inputs_{i}'), 'wb') as file:
+                pickle.dump(batch, file)
+
+        cached_dataset = utils.CachedDataset(None, 2, str(tmp_path))
+        for batch, expected in zip(cached_dataset, batches):
+            assert torch.equal(batch, expected)
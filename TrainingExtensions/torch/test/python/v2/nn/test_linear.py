@@ -41,7 +41,7 @@ from torch import nn
 import torch.nn.functional as F
 from aimet_torch.v2.quantization.affine.backends import quantize_dequantize
 from aimet_torch.v2.quantization.affine import QuantizeDequantize
-from aimet_torch.v2.nn import FakeQuantizedLinear, FakeQuantizationMixin
+from aimet_torch.v2.nn import FakeQuantizedLinear, FakeQuantizationMixin, cache_quantized_parameters
 from aimet_torch.v2.quantization.encoding_analyzer import MinMaxEncodingAnalyzer
 
 
@@ -257,3 +257,69 @@ class TestFakeQuantizedLinear:
         """
         fp_linear.weight = nn.Parameter(torch.zeros(10, 10))
         assert not torch.any(fp_linear.weight == quant_linear.weight)
+
+    def test_cache_quantized_parameters(self, input):
+        quant_linear = FakeQuantizedLinear(10, 10)
+        quant_linear.param_quantizers['weight'] = QuantizeDequantize((10, 1), bitwidth=8, symmetric=True)
+        quant_linear.compute_param_encodings()
+        weight_quantizer = quant_linear.param_quantizers['weight']
+        expected_output = quant_linear(input)
+
+        call_count = 0
+        def count_calls(module, inp, out):
+            nonlocal call_count
+            call_count += 1
+
+        weight_quantizer.register_forward_hook(count_calls)
+
+        """
+        When: Run forward passes in cache_quantized_parameters context with gradient disabled
+        Then: Weight should be quantized only once
+        """
+        with cache_quantized_parameters(quant_linear), torch.no_grad():
+            for _ in range(3):
+                assert torch.equal(quant_linear(input), expected_output)
+            assert call_count == 1
+
+            """
+            When: Modify the weight or the encodings in-place
+            Then: Cached quantized weight should be invalidated
+            """
+            quant_linear.weight.mul_(2)
+            assert not torch.equal(quant_linear(input), expected_output)
+            assert call_count == 2
+
+            weight_quantizer.set_range(weight_quantizer.min * 2, weight_quantizer.max * 2)
+            quant_linear(input)
+            assert call_count == 3
+
+            weight_quantizer.bitwidth = 4
+            quant_linear(input)
+            quant_linear(input)
+            assert call_count == 4
+
+            """
+            When: Change the dtype of the module in the context
+            Then: Cached quantized weight should be invalidated
+            """
+            quant_linear.double()
+            output = quant_linear(input.double())
+            assert output.dtype == torch.float64
+            assert call_count == 5
+            quant_linear.float()
+            assert quant_linear(input).dtype == torch.float32
+            assert call_count == 6
+
+        """
+        When: Run forward passes with gradient enabled, or outside the context
+        Then: Weight should be quantized in every forward pass
+        """
+        with cache_quantized_parameters(quant_linear):
+            quant_linear(input).sum().backward()
+            quant_linear(input)
+            assert call_count == 8
+            assert quant_linear.weight.grad is not None
+
+        with torch.no_grad():
+            quant_linear(input)
+            assert call_count == 9
@@ -755,3 +755,71 @@ class TestQuantizationBackends:
                                                block_size=[1, 3])
         backend_module._validate_arguments(torch.randn(1, 4), torch.randn(1, 2), torch.randn(1, 2),
                                            block_size=[1, 2])
+
+
+
+
+@pytest.mark.parametrize('scale_requires_grad', [True, False])
+@pytest.mark.parametrize('offset_requires_grad', [True, False])
+@pytest.mark.parametrize('qmin, qmax', [(0, 255), (-128, 127), (0, 15)])
+@pytest.mark.parametrize('shape', [(2, 3, 4, 5), (7, 13)])
+def test_low_memory_qdq_backward(scale_requires_grad, offset_requires_grad, qmin, qmax, shape):
+    """
+    Given: Input, scale and offset with various requires_grad settings
+    When: Run quantize-dequantize with low-memory backward enabled
+    Then: Output and gradients should be identical to the default implementation
+    """
+    torch.manual_seed(0)
+    scale = torch.rand(shape[-1]) / 10 + 0.01
+    offset = torch.randint(-5, 5, shape[-1:]).to(torch.float32)
+    inp = torch.randn(shape) * 3
+
+    def run(low_memory_backward: bool):
+        x = inp.clone().requires_grad_(True)
+        s = scale.clone().requires_grad_(scale_requires_grad)
+        o = offset.clone().requires_grad_(offset_requires_grad)
+        out = torch_builtins.quantize_dequantize(x, s, o, qmin, qmax, low_memory_backward=low_memory_backward)
+        out.backward(torch.ones_like(out))
+        return out, x.grad, s.grad, o.grad
+
+    out, x_grad, scale_grad, offset_grad = run(low_memory_backward=False)
+    out_lm, x_grad_lm, scale_grad_lm, offset_grad_lm = run(low_memory_backward=True)
+    assert torch.equal(out, out_lm)
+    assert torch.equal(x_grad, x_grad_lm)
+
+    if offset_requires_grad:
+        assert torch.equal(offset_grad, offset_grad_lm)
+    else:
+        assert offset_grad_lm is None
+
+    if scale_requires_grad:
+        assert torch.equal(scale_grad, scale_grad_lm)
+    else:
+        assert scale_grad_lm is None
+
+
+@pytest.mark.parametrize('scale_requires_grad', [True, False])
+def test_low_memory_qdq_saved_tensors(scale_requires_grad):
+    """
+    When: Run quantize-dequantize with low-memory backward enabled
+    Then: 1) With frozen encoding, only a bit-packed mask should be saved instead of the input
+          2) With learnable scale, only the input and encodings should be saved
+    """
+    inp = torch.randn(1000, 100, requires_grad=True)
+    scale = torch.tensor(0.01, requires_grad=scale_requires_grad)
+    offset = torch.tensor(-128.)
+
+    out = torch_builtins.quantize_dequantize(inp, scale, offset, 0, 255, low_memory_backward=True)
+
+    grad_fn = out.grad_fn
+    while not isinstance(grad_fn, torch_builtins.QuantDequantFuncLowMemory._backward_cls):
+        grad_fn, _ = grad_fn.next_functions[0]
+    saved_tensors = grad_fn.saved_tensors
+
+    saved_bytes = sum(t.numel() * t.element_size() for t in saved_tensors)
+    if scale_requires_grad:
+        encoding_bytes = scale.element_size() + offset.element_size()
+        assert saved_bytes <= inp.numel() * inp.element_size() + encoding_bytes
+    else:
+        assert all(t is not inp for t in saved_tensors)
+        assert saved_bytes <= inp.numel() // 8 + scale.element_size()
@@ -0,0 +1,121 @@
+# -*- mode: python -*-
+# =============================================================================
+#  @@-COPYRIGHT-START-@@
+#
+#  Copyright (c) 2024, Qualcomm Innovation Center, Inc. All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright notice,
+#     this list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright notice,
+#     this list of conditions and the following disclaimer in the documentation
+#     and/or other materials provided with the distribution.
+#
+#  3. Neither the name of the copyright holder nor the names of its contributors
+#     may be used to endorse or promote products derived from this software
+#     without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+#  SPDX-License-Identifier: BSD-3-Clause
+#
+#  @@-COPYRIGHT-END-@@
+# =============================================================================
+import pytest
+import torch
+from aimet_torch.v2.quantization import affine
+from aimet_torch.v2.quantization.affine.backends import torch_builtins, fused, set_backend, get_backend
+
+
+# (input shape, encoding shape, block size)
+encoding_configs = [
+    ((8, 16, 14, 14), (), None),                 # per-tensor conv activation
+    ((32, 16, 3, 3), (32, 1, 1, 1), None),       # per-channel conv weight
+    ((64, 128), (64, 1), None),                  # per-channel linear weight
+    ((64, 128), (64, 4), [1, 32]),               # block-wise linear weight
+]
+
+
+def _get_args(input_shape, encoding_shape, dtype, qmin, qmax, requires_grad):
+    torch.manual_seed(0)
+    tensor = torch.randn(input_shape, dtype=dtype) * 2
+    scale = (torch.rand(encoding_shape) * 4 / (qmax - qmin) + 1e-3).to(dtype)
+    offset = torch.randint(-5, 5, encoding_shape).to(dtype)
+    return [t.requires_grad_(requires_grad) for t in (tensor, scale, offset)]
+
+
+@pytest.mark.parametrize('input_shape, encoding_shape, block_size', encoding_configs)
+@pytest.mark.parametrize('dtype', [torch.float32, torch.float16])
+@pytest.mark.parametrize('qmin, qmax', [(0, 255), (-8, 7)])
+def test_fused_backend_forward(input_shape, encoding_shape, block_size, dtype, qmin, qmax):
+    """
+    When: Run quantize, dequantize, and quantize-dequantize with fused backend
+    Then: The outputs should be identical to those of torch_builtins
+    """
+    tensor, scale, offset = _get_args(input_shape, encoding_shape, dtype, qmin, qmax, requires_grad=False)
+
+    expected = torch_builtins.quantize(tensor, scale, offset, qmin, qmax, block_size)
+    out = fused.quantize(tensor, scale, offset, qmin, qmax, block_size)
+    assert torch.equal(out, expected)
+
+    expected = torch_builtins.dequantize(out, scale, offset, block_size)
+    out = fused.dequantize(out, scale, offset, block_size)
+    assert torch.equal(out, expected)
+
+    expected = torch_builtins.quantize_dequantize(tensor, scale, offset, qmin, qmax, block_size)
+    out = fused.quantize_dequantize(tensor, scale, offset, qmin, qmax, block_size)
+    assert out.dtype == expected.dtype
+    assert torch.equal(out, expected)
+
+
+@pytest.mark.parametrize('input_shape, encoding_shape, block_size', encoding_configs)
+@pytest.mark.parametrize('op', ['quantize', 'dequantize', 'quantize_dequantize'])
+def test_fused_backend_backward(input_shape, encoding_shape, block_size, op):
+    """
+    When: Run backward through quantize, dequantize, and quantize-dequantize with fused backend
+    Then: The gradients should be equal to those of torch_builtins
+    """
+    qmin, qmax = 0, 255
+    results = []
+
+    for backend in (torch_builtins, fused):
+        tensor, scale, offset = _get_args(input_shape, encoding_shape, torch.float32, qmin, qmax, requires_grad=True)
+        if op == 'dequantize':
+            out = backend.dequantize(tensor, scale, offset, block_size)
+        else:
+            out = getattr(backend, op)(tensor, scale, offset, qmin, qmax, block_size)
+        out.backward(torch.arange(out.numel(), dtype=out.dtype).view_as(out) / out.numel())
+        results.append((out, tensor.grad, scale.grad, offset.grad))
+
+    for expected, actual in zip(*results):
+        assert torch.allclose(actual, expected, rtol=1e-5, atol=1e-5)
+
+
+def test_set_fused_backend():
+    """
+    When: Select fused backend with set_backend
+    Then: Quantization APIs should dispatch to the fused backend
+    """
+    tensor = torch.randn(10, 10)
+    scale = torch.tensor(0.1)
+    offset = torch.tensor(-128.)
+
+    with set_backend('fused'):
+        assert get_backend() is fused
+        out = affine.quantize_dequantize(tensor, scale, offset, bitwidth=8)
+
+    assert get_backend() is torch_builtins
+    assert torch.equal(out, affine.quantize_dequantize(tensor, scale, offset, bitwidth=8))
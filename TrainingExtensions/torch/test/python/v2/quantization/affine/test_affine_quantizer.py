@@ -46,6 +46,8 @@ from aimet_torch.v2.quantization.encoding_analyzer import MinMaxEncodingAnalyzer
 from aimet_torch.v2.quantization.affine import AffineQuantizerBase, Quantize, \
     QuantizeDequantize, Dequantize, GroupedBlockQuantizeDequantize
 from aimet_torch.v2.quantization import affine
+from aimet_torch.v2.quantization.affine.backends import torch_builtins
+from aimet_torch.v2.utils import enable_low_memory_backward
 import aimet_torch.v2.quantization as Q
 
 
@@ -1179,3 +1181,45 @@ def test_invalid_gbbq_settings():
                                            bitwidth=4,
                                            symmetric=True,
                                            decompressed_bw=3)
+
+
+@pytest.mark.parametrize('symmetric', [True, False])
+def test_low_memory_backward(x, symmetric):
+    """
+    Given: Two quantize-dequantize quantizers
+    When: Enable low-memory backward for only one of them
+    Then: 1) Only the opted-in quantizer should run the low-memory backward
+          2) Outputs and gradients should match the default backward
+          3) The quantizer should be restored upon exit
+    """
+    def grad_fn_types(tensor):
+        types = set()
+        grad_fns = [tensor.grad_fn]
+        while grad_fns:
+            grad_fn = grad_fns.pop()
+            if grad_fn is not None:
+                types.add(type(grad_fn))
+                grad_fns += [next_fn for next_fn, _ in grad_fn.next_functions]
+        return types
+
+    qdq = QuantizeDequantize((1,), bitwidth=8, symmetric=symmetric)
+    qdq_lm = copy.deepcopy(qdq)
+    with qdq.compute_encodings(), qdq_lm.compute_encodings():
+        qdq(x)
+        qdq_lm(x)
+
+    with enable_low_memory_backward(qdq_lm):
+        assert qdq_lm.low_memory_backward
+        assert not qdq.low_memory_backward
+        out = qdq(x)
+        out_lm = qdq_lm(x)
+    assert not qdq_lm.low_memory_backward
+
+    assert torch_builtins.QuantDequantFuncLowMemory._backward_cls not in grad_fn_types(out)
+    assert torch_builtins.QuantDequantFuncLowMemory._backward_cls in grad_fn_types(out_lm)
+    assert torch.equal(out, out_lm)
+
+    out.backward(torch.ones_like(out))
+    out_lm.backward(torch.ones_like(out_lm))
+    assert torch.equal(qdq.min.grad, qdq_lm.min.grad)
+    assert torch.equal(qdq.max.grad, qdq_lm.max.grad)
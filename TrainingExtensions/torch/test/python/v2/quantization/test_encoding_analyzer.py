@@ -507,7 +507,29 @@ class TestHistogramEncodingAnalyzer:
             m = i % 4
             assert torch.equal(histograms[i].min,  x[j,k,m].min())
             assert torch.equal(histograms[i].max,  x[j,k,m].max())
-    
+
+    @pytest.mark.parametrize('shape', [(8,), (3, 1), (3, 8)])
+    def test_collect_stats_matches_histc(self, shape):
+        x = torch.randn(2, 3, 8)
+        x[0, 0, 0] = float('inf')
+        x[1, 2, 7] = -float('inf')
+        observer = _HistogramObserver(shape, num_bins=16)
+        histograms = observer.collect_stats(x)
+
+        padded_shape = (1,) * (x.dim() - len(shape)) + shape
+        channel_dims = [axis for axis, dim in enumerate(padded_shape) if dim > 1]
+        other_dims = [axis for axis, dim in enumerate(padded_shape) if dim == 1]
+        hist_inputs = x.permute(channel_dims + other_dims).reshape(len(histograms), -1)
+
+        for histogram, hist_input in zip(histograms, hist_inputs):
+            finite_input = hist_input[hist_input.isfinite()]
+            expected = torch.histc(finite_input, bins=16, min=finite_input.min(), max=finite_input.max())
+            expected[0] += torch.sum(hist_input == -float('inf'))
+            expected[-1] += torch.sum(hist_input == float('inf'))
+            assert torch.equal(histogram.histogram, expected)
+            assert torch.equal(histogram.min, finite_input.min())
+            assert torch.equal(histogram.max, finite_input.max())
+
     def test_histogram_during_merging(self):
         observer = _HistogramObserver((1,), num_bins=10)
         input = torch.arange(-50, 51, dtype=torch.float)
@@ -536,7 +558,36 @@ class TestHistogramEncodingAnalyzer:
         # -75      -60      -45      -30      -15       0        15       30       45       60       75
         #
         #                                       (new_histogram)
-            
+
+    def test_merge_stats_per_channel(self):
+        shape = (1, 4)
+        observer = _HistogramObserver(shape, num_bins=10)
+        per_channel_observers = [_HistogramObserver((1,), num_bins=10) for _ in range(4)]
+
+        for scale in (1.0, 2.0, 0.5, 3.0):
+            x = torch.randn(8, 4) * scale
+            observer.merge_stats(observer.collect_stats(x), x)
+            for i, per_channel_observer in enumerate(per_channel_observers):
+                x_i = x[:, i]
+                per_channel_observer.merge_stats(per_channel_observer.collect_stats(x_i), x_i)
+
+        for merged, expected in zip(observer.stats, per_channel_observers):
+            assert torch.equal(merged.histogram, expected.stats[0].histogram)
+            assert torch.equal(merged.bin_edges, expected.stats[0].bin_edges)
+            assert torch.equal(merged.min, expected.stats[0].min)
+            assert torch.equal(merged.max, expected.stats[0].max)
+
+    def test_merge_stats_after_constant_input(self):
+        observer = _HistogramObserver((1,), num_bins=10)
+        for value in (1.0, 1.0, 2.0):
+            x = torch.full((5,), value)
+            observer.merge_stats(observer.collect_stats(x), x)
+
+        merged_histogram = observer.stats[0]
+        assert list(merged_histogram.histogram) == [10, 0, 0, 0, 0, 0, 0, 0, 0, 5]
+        assert merged_histogram.min == 1
+        assert merged_histogram.max == 2
+
 
 class TestPercentileEncodingAnalyzer():  
     @pytest.mark.parametrize("percentile_value", [-1, 49, 5, 101])
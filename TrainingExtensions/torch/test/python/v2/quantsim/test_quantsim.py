@@ -38,10 +38,13 @@ import torch
 import tempfile
 import os
 import json
+import unittest.mock
 import pytest
 from aimet_common.quantsim_config.utils import get_path_for_per_channel_config
+from aimet_torch.cross_layer_equalization import equalize_model
+from aimet_torch.meta import connectedgraph
 from aimet_torch.quantsim import load_encodings_to_sim
-from aimet_torch.v2.quantsim import QuantizationSimModel
+from aimet_torch.v2.quantsim import QuantizationSimModel, compute_encodings_in_single_pass
 from aimet_torch.v2.quantization.encoding_analyzer import PercentileEncodingAnalyzer
 from aimet_torch.v2.quantization.base import QuantizerBase
 from aimet_torch.v2.quantization.affine import AffineQuantizerBase, GroupedBlockQuantizeDequantize
@@ -803,6 +806,113 @@ class TestQuantsim:
         assert len(sim.model.rnn.output_quantizers) == 2
         assert type(sim.model.rnn.output_quantizers[0]) is type(sim.model.rnn.output_quantizers[1])
 
+    def test_compute_encodings_in_single_pass(self):
+        """
+        Given: QuantSims of the same model with different quant schemes, percentile values and bitwidths
+        When: Compute encodings of all QuantSims in a single pass
+        Then: 1) Forward pass callback is invoked only once
+              2) Encodings are equal to the encodings computed separately from the floating point statistics
+        """
+        model = test_models.BasicConv2d(kernel_size=3)
+        dummy_input = torch.rand(1, 64, 16, 16)
+        configs = [("tf", 8, None), ("tf_enhanced", 8, None), ("percentile", 8, 99.9), ("percentile", 4, 99.0)]
+
+        def create_sims():
+            sims = []
+            for quant_scheme, bitwidth, percentile in configs:
+                sim = QuantizationSimModel(model, dummy_input, quant_scheme=quant_scheme,
+                                           default_param_bw=bitwidth, default_output_bw=bitwidth)
+                if percentile is not None:
+                    sim.set_percentile_value(percentile)
+                sims.append(sim)
+            return sims
+
+        call_count = 0
+
+        def forward_pass(model, _):
+            nonlocal call_count
+            call_count += 1
+            model(dummy_input)
+
+        sims = create_sims()
+        compute_encodings_in_single_pass(sims, forward_pass, None)
+        assert call_count == 1
+
+        for sim, expected_sim in zip(sims, create_sims()):
+            # Compute expected encodings separately, collecting the activation statistics with unquantized parameters
+            param_quantizers = {}
+            for module in expected_sim.model.modules():
+                if isinstance(module, BaseQuantizationMixin):
+                    module.compute_param_encodings()
+                    param_quantizers[module] = dict(module.param_quantizers)
+                    for param_name in list(module.param_quantizers):
+                        module.param_quantizers[param_name] = None
+            expected_sim.compute_encodings(lambda model, _: model(dummy_input), None)
+            for module, quantizers in param_quantizers.items():
+                module.param_quantizers.update(quantizers)
+
+            expected_quantizers = dict(expected_sim.model.named_modules())
+            for name, quantizer in sim.model.named_modules():
+                if isinstance(quantizer, QuantizerBase):
+                    assert quantizer.is_initialized()
+                    assert encodings_are_close(quantizer, expected_quantizers[name])
+
+        sim = QuantizationSimModel(test_models.ModelWithUnusedAdd(), dummy_input=torch.randn(10, 10))
+        with pytest.raises(ValueError):
+            compute_encodings_in_single_pass([sims[0], sim], forward_pass, None)
+
+    @pytest.mark.parametrize("config_file", (None, get_path_for_per_channel_config()))
+    def test_compute_encodings_in_single_pass_matches_compute_encodings(self, config_file):
+        """
+        Given: Per-tensor or per-channel QuantSims with different quant schemes
+        When: Compute encodings in a single pass
+        Then: 1) All quantizers are initialized and the sims can run forward
+              2) Parameter encodings are equal to those computed by QuantizationSimModel.compute_encodings
+        """
+        model = test_models.TinyModel().eval()
+        dummy_input = torch.rand(1, 3, 32, 32)
+        sims = [QuantizationSimModel(model, dummy_input, quant_scheme=quant_scheme, config_file=config_file)
+                for quant_scheme in ("tf", "tf_enhanced")]
+        compute_encodings_in_single_pass(sims, lambda model, _: model(dummy_input), None)
+
+        for sim in sims:
+            expected_sim = QuantizationSimModel(model, dummy_input, quant_scheme=sim._quant_scheme,
+                                                config_file=config_file)
+            expected_sim.compute_encodings(lambda model, _: model(dummy_input), None)
+            expected_modules = dict(expected_sim.model.named_modules())
+            for name, module in sim.model.named_modules():
+                if isinstance(module, QuantizerBase):
+                    assert module.is_initialized()
+                if isinstance(module, BaseQuantizationMixin):
+                    for param_name, quantizer in module.param_quantizers.items():
+                        if quantizer is not None:
+                            expected_quantizer = expected_modules[name].param_quantizers[param_name]
+                            assert encodings_are_close(quantizer, expected_quantizer)
+            sim.model(dummy_input)
+
+    def test_quantsim_reuses_connected_graph(self):
+        """
+        Given: A model that was batchnorm-folded and cross-layer equalized
+        When: Create QuantSims of the model
+        Then: 1) The connected graph of the equalized model is reused and bound to the copied model
+              2) No connected graph is cached on the given model
+        """
+        model = test_models.TinyModel().eval()
+        dummy_input = torch.rand(1, 3, 32, 32)
+        with unittest.mock.patch('aimet_torch.meta.connectedgraph._load_or_create_connected_graph',
+                                 wraps=connectedgraph._load_or_create_connected_graph) as mock_create_graph:
+            equalize_model(model, (1, 3, 32, 32), dummy_input)
+            num_traces = mock_create_graph.call_count
+
+            sim = QuantizationSimModel(model, dummy_input)
+            assert mock_create_graph.call_count == num_traces
+            model_modules = set(model.modules())
+            assert all(op.get_module() not in model_modules for op in sim.connected_graph.ordered_ops)
+
+        model = test_models.TinyModel().eval()
+        QuantizationSimModel(model, dummy_input)
+        assert connectedgraph._CONNECTED_GRAPH_CACHE_ATTR not in model.__dict__
+
 
 class TestQuantsimUtilities:
 